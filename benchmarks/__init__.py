@@ -0,0 +1,15 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Payroll engine benchmarks.
+
+Builds synthetic planillas of configurable size and measures how fast the
+payroll engine calculates them. Run with ``python -m benchmarks --help``;
+see ``benchmarks/README.md``.
+"""
+
+from .payroll import compare_results, run_payroll_benchmark
+
+__all__ = [
+    "compare_results",
+    "run_payroll_benchmark",
+]
@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""payroll-bench: measure payroll engine throughput on a synthetic planilla.
+
+Usage::
+
+    python -m benchmarks --employees 2000 --runs 3 --output bench.json
+    python -m benchmarks --database-url postgresql://localhost/coati_bench --baseline bench.json
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import click
+from flask import Flask
+from flask_babel import Babel
+
+from coati_payroll.model import db
+from tests.factories.payroll_dataset_factory import create_payroll_dataset
+
+from .payroll import MODES, compare_results, run_payroll_benchmark
+
+
+def _create_app(database_url: str) -> Flask:
+    """Build a minimal application bound to the benchmark database."""
+    app = Flask("coati_payroll")
+    app.config.update(SQLALCHEMY_DATABASE_URI=database_url, SQLALCHEMY_TRACK_MODIFICATIONS=False)
+    db.init_app(app)
+    Babel(app)
+    return app
+
+
+def _print_summary(resultado: dict) -> None:
+    parametros = resultado["parameters"]
+    click.echo(
+        f"payroll-bench {parametros['mode']} on {resultado['environment']['database']}: "
+        f"{parametros['empleados']} employees, {parametros['percepciones']} perceptions, "
+        f"{parametros['deducciones']} deductions, {parametros['prestaciones']} benefits, "
+        f"{parametros['prestamos']} loans"
+    )
+    for indice, run in enumerate(resultado["runs"], 1):
+        estado = "ok" if not run["errors"] else f"{len(run['errors'])} error(s)"
+        click.echo(
+            f"  run {indice} ({run['periodo_inicio']}): {run['seconds']:.3f}s, "
+            f"{run['employees_per_second']} employees/s, {run['queries_per_employee']} queries/employee, "
+            f"peak RSS {run['peak_rss_kb']} KB [{estado}]"
+        )
+        for nombre, fase in run["phases"].items():
+            consultas = "" if fase["queries"] is None else f", {fase['queries']} queries"
+            click.echo(f"      {nombre:<12} {fase['seconds']:.3f}s{consultas}")
+    resumen = resultado["summary"]
+    if resumen.get("successful_runs"):
+        click.echo(
+            f"  median: {resumen['employees_per_second']} employees/s, "
+            f"{resumen['queries_per_employee']} queries/employee"
+        )
+    else:
+        click.echo("  no run completed without errors")
+
+
+@click.command("payroll-bench")
+@click.option("--employees", "-n", default=1000, show_default=True, help="Employees in the synthetic planilla")
+@click.option("--perceptions", default=3, show_default=True, help="Perceptions assigned to the planilla")
+@click.option("--deductions", default=4, show_default=True, help="Deductions (including formula-based taxes)")
+@click.option("--benefits", default=2, show_default=True, help="Employer benefits assigned to the planilla")
+@click.option("--loan-ratio", default=0.25, show_default=True, help="Share of employees with an active loan")
+@click.option("--vacations/--no-vacations", default=True, show_default=True, help="Attach a vacation policy")
+@click.option("--seed", default=42, show_default=True, help="Seed for salaries and loans")
+@click.option("--mode", type=click.Choice(MODES), default="sync", show_default=True, help="Payroll execution path")
+@click.option("--runs", default=3, show_default=True, help="Consecutive monthly periods to calculate")
+@click.option("--processes", default=0, show_default=True, help="Worker processes for sync runs")
+@click.option("--shard-size", default=500, show_default=True, help="Employees per shard in sharded mode")
+@click.option("--trace-memory", is_flag=True, help="Also report the tracemalloc peak (slower)")
+@click.option(
+    "--database-url",
+    default=None,
+    help="Scratch database to use (default: a temporary SQLite file). Synthetic data is left in it.",
+)
+@click.option("--output", "-o", type=click.Path(dir_okay=False), default=None, help="Write results as JSON")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), default=None, help="Compare to a result")
+@click.option("--tolerance", default=0.10, show_default=True, help="Relative change allowed against the baseline")
+def main(
+    employees,
+    perceptions,
+    deductions,
+    benefits,
+    loan_ratio,
+    vacations,
+    seed,
+    mode,
+    runs,
+    processes,
+    shard_size,
+    trace_memory,
+    database_url,
+    output,
+    baseline,
+    tolerance,
+):
+    """Measure payroll throughput on a synthetic planilla."""
+    with tempfile.TemporaryDirectory() as directorio:
+        app = _create_app(database_url or f"sqlite:///{Path(directorio) / 'payroll-bench.sqlite'}")
+        with app.app_context():
+            db.create_all()
+            click.echo(f"Building planilla with {employees} employees...")
+            dataset = create_payroll_dataset(
+                db.session,
+                employees,
+                percepciones=perceptions,
+                deducciones=deductions,
+                prestaciones=benefits,
+                loan_ratio=loan_ratio,
+                vacaciones=vacations,
+                seed=seed,
+            )
+            resultado = run_payroll_benchmark(
+                dataset,
+                mode=mode,
+                runs=runs,
+                processes=processes,
+                shard_size=shard_size,
+                trace_memory=trace_memory,
+            )
+            db.session.remove()
+            db.engine.dispose()
+
+    _print_summary(resultado)
+    if output:
+        Path(output).write_text(json.dumps(resultado, indent=2, default=str), encoding="utf-8")
+        click.echo(f"Results written to {output}")
+
+    if baseline:
+        comparacion = compare_results(resultado, json.loads(Path(baseline).read_text(encoding="utf-8")), tolerance)
+        for metrica, cambio in comparacion["changes"].items():
+            click.echo(f"  {metrica}: {'n/a' if cambio is None else f'{cambio:+.1%}'} vs baseline")
+        if comparacion["mismatched_parameters"]:
+            click.echo(f"  warning: parameters differ from baseline: {', '.join(comparacion['mismatched_parameters'])}")
+        if comparacion["regressions"]:
+            click.echo(f"Regression beyond {tolerance:.0%}: {', '.join(comparacion['regressions'])}", err=True)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
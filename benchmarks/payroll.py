@@ -0,0 +1,368 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Throughput measurement of payroll runs.
+
+Each run calculates one monthly period of a synthetic planilla and reports
+wall time, employees per second, SQL statements (total, per employee and
+per phase) and peak memory. Phases are measured by timing the methods the
+payroll services call for them, so the same figures are available for
+synchronous runs and for sharded background runs.
+"""
+
+from __future__ import annotations
+
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import date, datetime, timezone
+from functools import wraps
+from typing import Any, Callable
+
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import event
+
+from coati_payroll.model import Nomina, Planilla, db
+from coati_payroll.nomina_engine import NominaEngine
+from coati_payroll.nomina_engine.processors.accounting_processor import AccountingProcessor
+from coati_payroll.nomina_engine.processors.loan_processor import LoanProcessor
+from coati_payroll.nomina_engine.processors.vacation_processor import VacationProcessor
+from coati_payroll.nomina_engine.services.payroll_execution_service import PayrollExecutionService
+from coati_payroll.nomina_engine.services.snapshot_service import SnapshotService
+from coati_payroll.nomina_engine.validators.planilla_validator import PlanillaValidator
+from coati_payroll.queue import tasks
+from coati_payroll.queue.driver import QueueDriver
+from coati_payroll.version import __version__
+from tests.factories.payroll_dataset_factory import CREADO_POR, PayrollDataset
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+MODES = ("sync", "sharded")
+
+# Methods timed for each phase. A phase may span several methods; time not
+# spent in any of them is reported as "other" (commits, totals, lazy loads).
+PHASE_METHODS: tuple[tuple[str, type, str], ...] = (
+    ("validation", PlanillaValidator, "validate"),
+    ("snapshot", SnapshotService, "capture_complete_snapshot"),
+    ("calculation", PayrollExecutionService, "_calculate_employees"),
+    ("calculation", PayrollExecutionService, "_calculate_employees_in_pool"),
+    ("persistence", AccountingProcessor, "create_nomina_empleados_bulk"),
+    ("side_effects", PayrollExecutionService, "_update_accumulations"),
+    ("side_effects", VacationProcessor, "prepare"),
+    ("side_effects", PayrollExecutionService, "_apply_employee_side_effects"),
+    ("side_effects", LoanProcessor, "apply_pending_effects"),
+    ("voucher", PayrollExecutionService, "_generate_audit_voucher"),
+    ("log", PayrollExecutionService, "_save_log_entries"),
+)
+
+
+class QueryCounter:
+    """Count the SQL statements sent through an engine while active.
+
+    An executemany counts as one statement, like the round trip it is.
+    Statements run by worker processes are not seen.
+    """
+
+    def __init__(self, engine: Any):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *_args: Any) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+class PhaseRecorder:
+    """Time the methods of ``PHASE_METHODS`` while active, accumulating per phase."""
+
+    def __init__(self, counter: QueryCounter):
+        self.counter = counter
+        self.phases: dict[str, dict[str, Any]] = {}
+        self._originales: list[tuple[type, str, Callable]] = []
+
+    def _wrap(self, phase: str, metodo: Callable) -> Callable:
+        @wraps(metodo)
+        def medido(*args: Any, **kwargs: Any) -> Any:
+            inicio = time.perf_counter()
+            consultas = self.counter.count
+            try:
+                return metodo(*args, **kwargs)
+            finally:
+                datos = self.phases.setdefault(phase, {"seconds": 0.0, "queries": 0, "calls": 0})
+                datos["seconds"] += time.perf_counter() - inicio
+                datos["queries"] += self.counter.count - consultas
+                datos["calls"] += 1
+
+        return medido
+
+    def __enter__(self) -> "PhaseRecorder":
+        for phase, owner, nombre in PHASE_METHODS:
+            original = owner.__dict__[nombre]
+            self._originales.append((owner, nombre, original))
+            setattr(owner, nombre, self._wrap(phase, original))
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        for owner, nombre, original in reversed(self._originales):
+            setattr(owner, nombre, original)
+        self._originales.clear()
+
+
+class InlineQueueDriver(QueueDriver):
+    """Queue driver that keeps messages so the benchmark can deliver them in this process."""
+
+    def __init__(self) -> None:
+        self.mensajes: list[tuple[str, dict[str, Any]]] = []
+
+    def enqueue(self, task_name: str, *args: Any, delay: int | None = None, **kwargs: Any) -> Any:
+        self.mensajes.append((task_name, kwargs))
+        return f"inline-{len(self.mensajes)}"
+
+    def register_task(
+        self,
+        func: Callable,
+        name: str | None = None,
+        max_retries: int = 0,
+        min_backoff: int = 0,
+        max_backoff: int = 0,
+    ) -> Callable:
+        return func
+
+    def is_available(self) -> bool:
+        return True
+
+    def get_stats(self) -> dict[str, Any]:
+        return {"driver": "inline", "available": True, "pending": len(self.mensajes)}
+
+    def get_task_result(self, task_id: Any) -> dict[str, Any]:
+        return {"status": "completed", "task_id": task_id}
+
+    def get_bulk_results(self, task_ids: list[Any]) -> dict[str, Any]:
+        return {"total": len(task_ids), "completed": len(task_ids), "failed": 0, "pending": 0, "tasks": {}}
+
+
+def run_payroll_benchmark(
+    dataset: PayrollDataset,
+    mode: str = "sync",
+    runs: int = 3,
+    processes: int = 0,
+    shard_size: int = 500,
+    trace_memory: bool = False,
+    primer_periodo: date = date(2025, 1, 1),
+) -> dict[str, Any]:
+    """Run the payroll of a synthetic planilla ``runs`` times and collect the measurements.
+
+    Each run calculates the next monthly period, so annual accumulations,
+    loan balances and vacation ledgers grow the way they do in production.
+    Must run inside an application context.
+
+    Args:
+        dataset: Planilla built by ``create_payroll_dataset``.
+        mode: ``sync`` runs ``NominaEngine.ejecutar``; ``sharded`` runs the
+            background fan-out (``process_payroll_parallel``) delivering every
+            shard and the finalize message in this process.
+        runs: Number of consecutive periods to calculate.
+        processes: Worker processes for synchronous runs (``NominaEngine(procesos=...)``).
+        shard_size: Employees per shard in sharded mode.
+        trace_memory: Also report the Python allocation peak per run with
+            ``tracemalloc``; slows the run down noticeably.
+        primer_periodo: First day of the first period.
+
+    Returns:
+        JSON-serializable results with environment, parameters, runs and summary.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown benchmark mode: {mode}")
+
+    resultados = []
+    for indice in range(runs):
+        periodo_inicio = primer_periodo + relativedelta(months=indice)
+        periodo_fin = periodo_inicio + relativedelta(months=1, days=-1)
+        db.session.remove()
+        resultados.append(
+            _measure_run(dataset, mode, periodo_inicio, periodo_fin, processes, shard_size, trace_memory)
+        )
+
+    return {
+        "benchmark": "payroll",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "coati_payroll": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": db.engine.dialect.name,
+        },
+        "parameters": {
+            **dataset.to_dict(),
+            "mode": mode,
+            "runs": runs,
+            "processes": processes,
+            "shard_size": shard_size if mode == "sharded" else None,
+        },
+        "runs": resultados,
+        "summary": summarize(resultados),
+    }
+
+
+def _measure_run(
+    dataset: PayrollDataset,
+    mode: str,
+    periodo_inicio: date,
+    periodo_fin: date,
+    processes: int,
+    shard_size: int,
+    trace_memory: bool,
+) -> dict[str, Any]:
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with QueryCounter(db.engine) as counter, PhaseRecorder(counter) as recorder:
+            inicio = time.perf_counter()
+            if mode == "sync":
+                nomina_id, errores = _run_sync(dataset.planilla_id, periodo_inicio, periodo_fin, processes)
+            else:
+                nomina_id, errores = _run_sharded(dataset.planilla_id, periodo_inicio, periodo_fin, shard_size)
+            segundos = time.perf_counter() - inicio
+        peak_tracemalloc = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    nomina = db.session.get(Nomina, nomina_id) if nomina_id else None
+    empleados = len(nomina.nomina_empleados) if nomina else 0
+    phases = {
+        nombre: {**datos, "seconds": round(datos["seconds"], 6)} for nombre, datos in sorted(recorder.phases.items())
+    }
+    medido = sum(datos["seconds"] for datos in recorder.phases.values())
+    phases["other"] = {"seconds": round(max(segundos - medido, 0.0), 6), "queries": None, "calls": None}
+
+    return {
+        "periodo_inicio": periodo_inicio.isoformat(),
+        "periodo_fin": periodo_fin.isoformat(),
+        "nomina_estado": nomina.estado if nomina else None,
+        "employees": empleados,
+        "errors": errores,
+        "seconds": round(segundos, 6),
+        "employees_per_second": round(empleados / segundos, 3) if segundos else None,
+        "queries": counter.count,
+        "queries_per_employee": round(counter.count / empleados, 3) if empleados else None,
+        "peak_rss_kb": _peak_rss_kb(),
+        "peak_tracemalloc_kb": peak_tracemalloc // 1024 if peak_tracemalloc is not None else None,
+        "phases": phases,
+    }
+
+
+def _run_sync(planilla_id: str, periodo_inicio: date, periodo_fin: date, processes: int) -> tuple[str | None, list]:
+    planilla = db.session.get(Planilla, planilla_id)
+    engine = NominaEngine(
+        planilla=planilla,
+        periodo_inicio=periodo_inicio,
+        periodo_fin=periodo_fin,
+        fecha_calculo=periodo_fin,
+        usuario=CREADO_POR,
+        procesos=processes,
+    )
+    nomina = engine.ejecutar()
+    return (nomina.id if nomina else None), list(engine.errors)
+
+
+def _run_sharded(planilla_id: str, periodo_inicio: date, periodo_fin: date, shard_size: int) -> tuple[str | None, list]:
+    original = tasks.queue
+    inline = InlineQueueDriver()
+    tasks.queue = inline
+    try:
+        resultado = tasks.process_payroll_parallel(
+            planilla_id=planilla_id,
+            periodo_inicio=periodo_inicio.isoformat(),
+            periodo_fin=periodo_fin.isoformat(),
+            fecha_calculo=periodo_fin.isoformat(),
+            usuario=CREADO_POR,
+            shard_size=shard_size,
+        )
+        if not resultado.get("success"):
+            return None, [resultado.get("error")]
+        # Deliver every message the fan-out and the shards enqueue, like a worker pool would
+        entregados = 0
+        errores = []
+        while entregados < len(inline.mensajes):
+            task_name, kwargs = inline.mensajes[entregados]
+            entregados += 1
+            respuesta = getattr(tasks, task_name)(**kwargs)
+            if isinstance(respuesta, dict) and respuesta.get("error"):
+                errores.append(respuesta["error"])
+        return resultado["nomina_id"], errores
+    finally:
+        tasks.queue = original
+
+
+def _peak_rss_kb() -> int | None:
+    """Peak resident set size of this process so far (kilobytes on Linux)."""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def summarize(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Median throughput and query figures and the highest memory peak of a set of runs."""
+    completos = [run for run in runs if run["employees"] and not run["errors"]]
+    if not completos:
+        return {"successful_runs": 0}
+
+    def mediana(clave: str) -> float:
+        return statistics.median(run[clave] for run in completos)
+
+    phases: dict[str, float] = {}
+    for nombre in {nombre for run in completos for nombre in run["phases"]}:
+        segundos = [run["phases"].get(nombre, {}).get("seconds", 0.0) for run in completos]
+        phases[nombre] = round(statistics.median(segundos), 6)
+
+    return {
+        "successful_runs": len(completos),
+        "seconds": mediana("seconds"),
+        "employees_per_second": mediana("employees_per_second"),
+        "queries_per_employee": mediana("queries_per_employee"),
+        "peak_rss_kb": max((run["peak_rss_kb"] or 0) for run in completos) or None,
+        "phase_seconds": dict(sorted(phases.items())),
+    }
+
+
+def compare_results(actual: dict[str, Any], base: dict[str, Any], tolerance: float = 0.10) -> dict[str, Any]:
+    """Compare the summary of two benchmark results.
+
+    Args:
+        actual: Result of the run being checked.
+        base: Earlier result used as the reference.
+        tolerance: Relative change allowed before a metric counts as a regression.
+
+    Returns:
+        Relative change per metric and the list of regressed metrics.
+        Throughput regresses when it drops; queries per employee and wall
+        time regress when they grow.
+    """
+    # Metric -> True when a higher value is better
+    metricas = {"employees_per_second": True, "queries_per_employee": False, "seconds": False}
+    cambios: dict[str, float | None] = {}
+    regresiones = []
+    for metrica, mayor_es_mejor in metricas.items():
+        antes = base.get("summary", {}).get(metrica)
+        despues = actual.get("summary", {}).get(metrica)
+        if not antes or despues is None:
+            cambios[metrica] = None
+            continue
+        cambio = (despues - antes) / antes
+        cambios[metrica] = round(cambio, 4)
+        if (mayor_es_mejor and cambio < -tolerance) or (not mayor_es_mejor and cambio > tolerance):
+            regresiones.append(metrica)
+
+    parametros = ("empleados", "percepciones", "deducciones", "prestaciones", "mode", "processes")
+    distintos = [p for p in parametros if actual.get("parameters", {}).get(p) != base.get("parameters", {}).get(p)]
+    return {"changes": cambios, "regressions": regresiones, "mismatched_parameters": distintos}
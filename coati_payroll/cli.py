@@ -1447,6 +1447,47 @@ def maintenance_run_jobs(ctx):
         sys.exit(1)
 
 
+def _maintenance_reconcile_vacations(fix):
+    """Verify maintained vacation balances against the ledger.
+
+    Returns:
+        list: Accounts whose balance or ledger version did not match
+    """
+    from coati_payroll.vacation_service import reconciliar_saldos_vacaciones
+
+    diferencias = reconciliar_saldos_vacaciones(corregir=fix)
+    if fix:
+        db.session.commit()
+    else:
+        db.session.rollback()
+    return [{key: str(value) for key, value in diferencia.items()} for diferencia in diferencias]
+
+
+@maintenance.command("reconcile-vacations")
+@click.option("--fix/--check-only", default=True, help="Correct drifted balances (default) or only report them")
+@with_appcontext
+@pass_context
+def maintenance_reconcile_vacations(ctx, fix):
+    """Verify vacation account balances against the vacation ledger."""
+    try:
+        click.echo("Reconciling vacation balances...")
+        diferencias = _maintenance_reconcile_vacations(fix)
+        if not ctx.json_output:
+            for diferencia in diferencias:
+                click.echo(
+                    f"  {diferencia['account_id']}: balance {diferencia['current_balance']} "
+                    f"(v{diferencia['ledger_version']}) != ledger {diferencia['ledger_balance']} "
+                    f"({diferencia['ledger_entries']} entries)"
+                )
+        action = "corrected" if fix else "found"
+        output_result(ctx, f"Vacation balances reconciled: {len(diferencias)} account(s) {action}", diferencias)
+
+    except Exception as e:
+        output_result(ctx, f"Failed to reconcile vacation balances: {e}", None, False)
+        log.exception("Failed to reconcile vacation balances")
+        sys.exit(1)
+
+
 # ============================================================================
 # DEBUG COMMANDS
 # ============================================================================
@@ -210,5 +210,18 @@ CONFIGURACION["QUEUE_ENABLED"] = environ.get("QUEUE_ENABLED", "1") in [
 # - For high-performance systems: increase to 200 or 500
 CONFIGURACION["BACKGROUND_PAYROLL_THRESHOLD"] = int(environ.get("BACKGROUND_PAYROLL_THRESHOLD", "100"))
 
+# Worker processes used to calculate employees of synchronous payrolls (0 or 1: disabled).
+# Useful on installations without Redis; requires a database reachable from other processes.
+CONFIGURACION["PAYROLL_CALCULATION_PROCESSES"] = int(environ.get("PAYROLL_CALCULATION_PROCESSES", "0"))
+
+# Split background payrolls into employee shards processed by several workers at once.
+# Shard size is read by the workers from PAYROLL_SHARD_SIZE (default: 250 employees).
+CONFIGURACION["BACKGROUND_PAYROLL_SHARDED"] = environ.get("BACKGROUND_PAYROLL_SHARDED", "0") in [
+    "1",
+    "true",
+    "True",
+    "yes",
+]
+
 # < --------------------------------------------------------------------------------------------- >
 configuration = CONFIGURACION
@@ -87,6 +87,15 @@ class NominaEstado(StrEnum):
     ERROR = "error"  # Error during calculation (valid permanent state, can be retried)
 
 
+class NominaShardEstado(StrEnum):
+    """States of an employee shard of a payroll processed by parallel workers."""
+
+    PENDIENTE = "pending"  # Enqueued, not yet picked up by a worker
+    PROCESANDO = "processing"  # A worker is calculating the shard
+    COMPLETADO = "completed"  # Shard calculated and its NominaEmpleado rows committed
+    ERROR = "error"  # Shard failed; the whole nomina will be rolled back
+
+
 class LiquidacionEstado(StrEnum):
     """States of a termination settlement (Liquidacion)."""
 
@@ -97,6 +106,16 @@ class LiquidacionEstado(StrEnum):
     PAGADO = "paid"  # Paid out
 
 
+class LiquidacionLoteEstado(StrEnum):
+    """States of a batch of termination settlements calculated in the background."""
+
+    PENDIENTE = "pending"  # Enqueued, not yet picked up by a worker
+    PROCESANDO = "processing"  # Liquidaciones are being calculated
+    COMPLETADO = "completed"  # Every employee has a liquidacion
+    COMPLETADO_CON_ERRORES = "completed_with_errors"  # Some employees could not be liquidated
+    ERROR = "error"  # The batch failed before finishing
+
+
 class AdelantoEstado(StrEnum):
     """States of a loan or salary advance."""
 
@@ -0,0 +1,137 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Streaming Excel writer on top of openpyxl write-only workbooks.
+
+Rows are written to disk as they are appended instead of being kept as cell
+objects in memory, so exports can be fed from generators over server-side
+cursors. Write-only sheets have no random access: column widths and frozen
+panes are declared when the sheet is created, rows are appended in order and
+merged ranges are recorded by row and column.
+"""
+
+from __future__ import annotations
+
+# <-------------------------------------------------------------------------> #
+# Standard library
+# <-------------------------------------------------------------------------> #
+from io import BytesIO
+from typing import IO, Any, Iterable, Mapping, Sequence
+
+# <-------------------------------------------------------------------------> #
+# Third party libraries
+# <-------------------------------------------------------------------------> #
+try:
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
+# Rows fetched per round trip when exports iterate server-side cursors.
+STREAM_YIELD_PER = 1000
+
+# Rows inspected when estimating column widths from data.
+WIDTH_SAMPLE_ROWS = 200
+
+
+class StreamingSheet:
+    """Append-only worksheet that tracks the current row number."""
+
+    def __init__(self, ws: Any):
+        self.ws = ws
+        self.row = 0
+
+    def cell(
+        self,
+        value: Any = None,
+        *,
+        font: Any = None,
+        fill: Any = None,
+        border: Any = None,
+        alignment: Any = None,
+        number_format: str | None = None,
+    ) -> Any:
+        """Build a styled cell for ``append``."""
+        celda = WriteOnlyCell(self.ws, value=value)
+        if font is not None:
+            celda.font = font
+        if fill is not None:
+            celda.fill = fill
+        if border is not None:
+            celda.border = border
+        if alignment is not None:
+            celda.alignment = alignment
+        if number_format is not None:
+            celda.number_format = number_format
+        return celda
+
+    def append(self, values: Iterable[Any] = (), **style: Any) -> int:
+        """Write the next row and return its number.
+
+        ``style`` (font, fill, border, alignment, number_format) applies to
+        every plain value of the row; cells built with ``cell`` keep their own.
+        """
+        if style:
+            values = [value if isinstance(value, WriteOnlyCell) else self.cell(value, **style) for value in values]
+        self.ws.append(list(values))
+        self.row += 1
+        return self.row
+
+    def skip(self, rows: int = 1) -> None:
+        """Leave ``rows`` empty rows."""
+        for _ in range(rows):
+            self.append()
+
+    def merge(self, start_col: int, end_col: int, row: int | None = None) -> None:
+        """Merge columns ``start_col``..``end_col`` of ``row`` (default: the last written row)."""
+        row = row or self.row
+        self.ws.merged_cells.add(f"{get_column_letter(start_col)}{row}:{get_column_letter(end_col)}{row}")
+
+
+class StreamingWorkbook:
+    """Write-only workbook whose sheets are filled row by row."""
+
+    def __init__(self):
+        if not OPENPYXL_AVAILABLE:
+            raise ImportError("openpyxl is required for Excel export. Install it with: pip install openpyxl")
+        self.workbook = Workbook(write_only=True)
+
+    def add_sheet(
+        self,
+        title: str,
+        column_widths: Sequence[float] | Mapping[int, float] = (),
+        freeze_panes: str | None = None,
+    ) -> StreamingSheet:
+        """Create a sheet; widths (by 1-based column) and panes must be known before the first row."""
+        ws = self.workbook.create_sheet(title=title[:31])
+        anchos = column_widths.items() if isinstance(column_widths, Mapping) else enumerate(column_widths, start=1)
+        for columna, ancho in anchos:
+            ws.column_dimensions[get_column_letter(columna)].width = ancho
+        if freeze_panes:
+            ws.freeze_panes = freeze_panes
+        return StreamingSheet(ws)
+
+    def save(self, destino: str | IO[bytes]) -> None:
+        """Write the workbook to a path or binary file object."""
+        self.workbook.save(destino)
+
+    def to_bytes(self) -> BytesIO:
+        """Return the compressed workbook in memory, ready to be sent."""
+        output = BytesIO()
+        self.save(output)
+        output.seek(0)
+        return output
+
+
+def estimate_column_widths(
+    headers: Sequence[str], sample: Iterable[Sequence[Any]], minimum: float = 0, maximum: float = 50
+) -> list[float]:
+    """Column widths from the headers and a sample of rows, with padding and bounds."""
+    anchos = [len(str(header)) for header in headers]
+    for fila in sample:
+        for indice, valor in enumerate(fila[: len(anchos)]):
+            if valor is not None:
+                anchos[indice] = max(anchos[indice], len(str(valor)))
+    return [min(max(ancho + 2, minimum), maximum) for ancho in anchos]
@@ -31,6 +31,7 @@ from coati_payroll.formula_engine_examples import (
 
 # Import main engine and functions
 from .engine import FormulaEngine, calculate_with_rule, get_available_sources_for_ui
+from .compiled_formula import CompiledFormula, clear_compiled_formula_cache, get_compiled_formula
 
 # Import exceptions
 from .exceptions import CalculationError, FormulaEngineError, TaxEngineError, ValidationError
@@ -57,6 +58,10 @@ __all__ = [
     "FormulaEngine",
     "calculate_with_rule",
     "get_available_sources_for_ui",
+    # Compiled schemas
+    "CompiledFormula",
+    "get_compiled_formula",
+    "clear_compiled_formula_cache",
     # Exceptions
     "FormulaEngineError",
     "TaxEngineError",
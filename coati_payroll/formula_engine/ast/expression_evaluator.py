@@ -44,7 +44,7 @@ from typing import Any, Callable
 # Local modules
 # <-------------------------------------------------------------------------> #
 from coati_payroll.i18n import _
-from coati_payroll.log import TRACE_LEVEL_NUM, is_trace_enabled, log
+from coati_payroll.log import get_trace_sink
 from ..exceptions import CalculationError, ValidationError
 from .ast_visitor import SafeASTVisitor
 from .safe_operators import ALLOWED_AST_TYPES, validate_expression_complexity
@@ -84,20 +84,39 @@ class ExpressionEvaluator:
                       This dictionary is not modified during evaluation.
             trace_callback: Optional callback for trace logging.
                           Should be thread-safe if used in concurrent contexts.
+                          Defaults to the TRACE logger when it is enabled.
         """
         self.variables = variables
-        self.trace_callback = trace_callback or self._default_trace
+        self.trace_callback = trace_callback if trace_callback is not None else get_trace_sink()
         self.strict_mode = strict_mode
 
-    def _default_trace(self, message: str) -> None:
-        """Default trace callback."""
-        if is_trace_enabled():
-            try:
-                log.log(TRACE_LEVEL_NUM, message)
-            except Exception:
-                pass
+    @classmethod
+    def parse(cls, expression: str) -> ast.Expression:
+        """Parse an expression and run every security check on the resulting tree.
+
+        The returned tree can be handed back to :meth:`evaluate` to skip parsing
+        and validation on subsequent evaluations of the same expression.
+
+        Args:
+            expression: Mathematical expression string
+
+        Returns:
+            Validated AST for the expression
+
+        Raises:
+            SyntaxError: If the expression cannot be parsed
+            CalculationError: If the expression is unsafe or too complex
+        """
+        expression = expression.strip()
+        tree = ast.parse(expression, mode="eval")
+        cls._validate_ast_security(tree.body)
+        try:
+            validate_expression_complexity(tree, expression)
+        except ValueError as e:
+            raise CalculationError(str(e)) from e
+        return tree
 
-    def evaluate(self, expression: str) -> Any:  # Changed from Decimal to Any
+    def evaluate(self, expression: str, tree: ast.Expression | None = None) -> Any:  # Changed from Decimal to Any
         """Safely evaluate a mathematical expression using AST.
 
         This method implements multiple layers of security validation:
@@ -109,6 +128,8 @@ class ExpressionEvaluator:
 
         Args:
             expression: Mathematical expression string (e.g., 'a + b * 2')
+            tree: Optional tree previously returned by :meth:`parse` for this
+                expression. When given, parsing and validation are skipped.
 
         Returns:
             Result of the expression (Decimal for numbers, date for dates, etc.)
@@ -130,16 +151,12 @@ class ExpressionEvaluator:
         if not expression:
             return Decimal("0")
 
-        self.trace_callback(_("Evaluando expresión: '%(expr)s'") % {"expr": expression})
+        if self.trace_callback is not None:
+            self.trace_callback(_("Evaluando expresión: '%(expr)s'") % {"expr": expression})
 
         try:
-            tree = ast.parse(expression, mode="eval")
-
-            self._validate_ast_security(tree.body)
-            try:
-                validate_expression_complexity(tree, expression)
-            except ValueError as e:
-                raise CalculationError(str(e)) from e
+            if tree is None:
+                tree = self.parse(expression)
 
             visitor = SafeASTVisitor(self.variables, strict_mode=self.strict_mode)
             result = visitor.visit(tree.body)
@@ -157,9 +174,10 @@ class ExpressionEvaluator:
                 # If conversion fails, keep original result
                 final_result = result
 
-            self.trace_callback(
-                _("Resultado expresión '%(expr)s' => %(res)s") % {"expr": expression, "res": final_result}
-            )
+            if self.trace_callback is not None:
+                self.trace_callback(
+                    _("Resultado expresión '%(expr)s' => %(res)s") % {"expr": expression, "res": final_result}
+                )
             return final_result
         except SyntaxError as e:
             raise CalculationError(
@@ -175,7 +193,8 @@ class ExpressionEvaluator:
         except Exception as e:
             raise CalculationError(f"Unexpected error evaluating expression '{expression}': {e}") from e
 
-    def _validate_ast_security(self, node: ast.AST) -> None:
+    @staticmethod
+    def _validate_ast_security(node: ast.AST) -> None:
         """Validate that an AST node only contains safe operations.
 
         This method implements a whitelist-based security model. It walks the
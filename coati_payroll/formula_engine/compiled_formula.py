@@ -0,0 +1,162 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Compiled calculation schemas and their process-wide cache.
+
+Validating a schema, validating its tax tables, building step objects and
+parsing every expression is deterministic for a given schema. A payroll run
+evaluates the same handful of schemas for every employee, so that work is done
+once per distinct schema and the result is reused from a bounded LRU cache
+keyed by a content hash of the schema.
+"""
+
+from __future__ import annotations
+
+# <-------------------------------------------------------------------------> #
+# Standard library
+# <-------------------------------------------------------------------------> #
+import copy
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+
+# <-------------------------------------------------------------------------> #
+# Third party packages
+# <-------------------------------------------------------------------------> #
+import orjson
+
+# <-------------------------------------------------------------------------> #
+# Local modules
+# <-------------------------------------------------------------------------> #
+from coati_payroll.log import log
+
+from .exceptions import CalculationError, ValidationError
+from .steps.base_step import Step
+from .steps.step_factory import StepFactory
+from .tables.tax_table import CompiledTaxTable
+from .validation.schema_validator import SchemaValidator
+from .validation.tax_table_validator import TaxTableValidator
+
+# <-------------------- Constantes Locales --------------------> #
+COMPILED_FORMULA_CACHE_SIZE = 512
+
+_compiled_cache: OrderedDict[tuple[str, bool], "CompiledFormula"] = OrderedDict()
+_cache_lock = Lock()
+
+
+class CompiledFormula:
+    """A validated schema with its steps built and its expressions parsed.
+
+    Instances are immutable after construction and safe to share between
+    engines and threads. The schema is deep-copied so later changes to the
+    caller's dictionary cannot leak into cached step configurations.
+    """
+
+    def __init__(self, schema: dict[str, Any], strict_mode: bool = True, fingerprint: str | None = None):
+        """Validate and compile a calculation schema.
+
+        Args:
+            schema: JSON schema defining the calculation rules
+            strict_mode: If True, tax table warnings are treated as errors
+            fingerprint: Content hash of the schema, if already computed
+
+        Raises:
+            ValidationError: If schema is invalid
+        """
+        SchemaValidator().validate(schema)
+        warnings = TaxTableValidator(strict_mode).validate_all(schema.get("tax_tables", {}))
+        if warnings:
+            if strict_mode:
+                raise ValidationError(
+                    f"Advertencias en tablas de impuestos (modo estricto activado): {', '.join(warnings)}"
+                )
+            for warning in warnings:
+                log.warning("Validación de tabla de impuestos: %s", warning)
+
+        self.schema: dict[str, Any] = copy.deepcopy(dict(schema))
+        self.strict_mode = strict_mode
+        self.fingerprint = fingerprint
+        self.warnings: tuple[str, ...] = tuple(warnings)
+        self.name: str = self.schema.get("meta", {}).get("name", "sin nombre")
+        self.output: str = self.schema.get("output", "")
+        self.tax_tables: dict[str, Any] = self.schema.get("tax_tables", {})
+        # Sorted once per schema; every execution reuses the bisect-ready tables
+        self.compiled_tax_tables: dict[str, CompiledTaxTable] = {
+            name: CompiledTaxTable(name, table)
+            for name, table in self.tax_tables.items()
+            if isinstance(table, list) and table
+        }
+        self.inputs: tuple[tuple[str, Any, str], ...] = tuple(
+            (input_def.get("name"), input_def.get("default", 0), input_def.get("type", "decimal"))
+            for input_def in self.schema.get("inputs", [])
+        )
+
+        # An unknown step type is reported when the schema is executed, not
+        # when it is loaded, so the error is kept instead of raised here.
+        self.step_error: str | None = None
+        steps: list[Step] = []
+        try:
+            for step_config in self.schema.get("steps", []):
+                step = StepFactory.create_step(step_config)
+                step.compile()
+                steps.append(step)
+        except CalculationError as e:
+            self.step_error = str(e)
+            steps = []
+        self.steps: tuple[Step, ...] = tuple(steps)
+
+
+def schema_fingerprint(schema: dict[str, Any]) -> str | None:
+    """Return a SHA-256 hash of the canonical JSON form of a schema.
+
+    Returns None when the schema cannot be serialized, in which case it is
+    compiled without caching.
+    """
+    try:
+        canonical = orjson.dumps(schema, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    except (TypeError, orjson.JSONEncodeError):
+        return None
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def get_compiled_formula(schema: dict[str, Any], strict_mode: bool = True) -> CompiledFormula:
+    """Return the compiled form of a schema, compiling it on first use.
+
+    Args:
+        schema: JSON schema defining the calculation rules
+        strict_mode: If True, tax table warnings are treated as errors
+
+    Returns:
+        Shared CompiledFormula instance
+
+    Raises:
+        ValidationError: If schema is invalid. Failures are never cached.
+    """
+    if not isinstance(schema, dict):
+        return CompiledFormula(schema, strict_mode)
+
+    fingerprint = schema_fingerprint(schema)
+    if fingerprint is None:
+        return CompiledFormula(schema, strict_mode)
+
+    key = (fingerprint, strict_mode)
+    with _cache_lock:
+        compiled = _compiled_cache.get(key)
+        if compiled is not None:
+            _compiled_cache.move_to_end(key)
+            return compiled
+
+    compiled = CompiledFormula(schema, strict_mode, fingerprint=fingerprint)
+
+    with _cache_lock:
+        _compiled_cache[key] = compiled
+        _compiled_cache.move_to_end(key)
+        while len(_compiled_cache) > COMPILED_FORMULA_CACHE_SIZE:
+            _compiled_cache.popitem(last=False)
+    return compiled
+
+
+def clear_compiled_formula_cache() -> None:
+    """Drop every cached compiled schema."""
+    with _cache_lock:
+        _compiled_cache.clear()
@@ -8,7 +8,7 @@ from __future__ import annotations
 # Standard library
 # <-------------------------------------------------------------------------> #
 from decimal import Decimal
-from typing import Any
+from typing import Any, Callable, Iterable
 
 # <-------------------------------------------------------------------------> #
 # Third party packages
@@ -18,18 +18,16 @@ from typing import Any
 # Local modules
 # <-------------------------------------------------------------------------> #
 from coati_payroll.i18n import _
-from coati_payroll.log import TRACE_LEVEL_NUM, is_trace_enabled, log
+from coati_payroll.log import get_trace_sink
 
 from ..formula_engine.data_sources import AVAILABLE_DATA_SOURCES
 from .ast.type_converter import to_decimal
-from .exceptions import ValidationError
+from .compiled_formula import get_compiled_formula
+from .exceptions import CalculationError, FormulaEngineError
 from .execution.execution_context import ExecutionContext
 from .execution.step_executor import StepExecutor
-from .execution.variable_store import VariableStore
+from .results.batch_result import BatchRowResult
 from .results.execution_result import ExecutionResult
-from .steps.step_factory import StepFactory
-from .validation.schema_validator import SchemaValidator
-from .validation.tax_table_validator import TaxTableValidator
 
 
 class FormulaEngine:
@@ -60,30 +58,9 @@ class FormulaEngine:
         self.variables: dict[str, Decimal] = {}
         self.results: dict[str, Any] = {}
 
-        # Validate schema
-        schema_validator = SchemaValidator()
-        schema_validator.validate(schema)
-
-        # Validate tax tables
-        tax_table_validator = TaxTableValidator(strict_mode)
-        warnings = tax_table_validator.validate_all(schema.get("tax_tables", {}))
-
-        # Handle warnings
-        if warnings:
-            if strict_mode:
-                raise ValidationError(
-                    f"Advertencias en tablas de impuestos (modo estricto activado): {', '.join(warnings)}"
-                )
-            for warning in warnings:
-                log.warning("Validación de tabla de impuestos: %s", warning)
-
-    def _trace(self, message: str) -> None:
-        """Trace helper for logging."""
-        if is_trace_enabled():
-            try:
-                log.log(TRACE_LEVEL_NUM, message)
-            except Exception:
-                pass
+        # Validation, step construction and expression parsing are shared by
+        # every engine built from an identical schema.
+        self.compiled = get_compiled_formula(schema, strict_mode)
 
     def execute(self, inputs: dict[str, Any]) -> dict[str, Any]:
         """Execute the calculation schema with provided inputs.
@@ -97,58 +74,96 @@ class FormulaEngine:
         Raises:
             CalculationError: If execution fails
         """
-        # Initialize components
-        variable_store = VariableStore()
-        step_factory = StepFactory()
-        step_executor = StepExecutor()
+        # None while TRACE is disabled, so no trace message is ever built
+        trace = get_trace_sink()
+        return self._execute_row(inputs, self._new_context(trace), StepExecutor(), trace)
 
-        # Prepare initial variables
-        initial_vars = self._prepare_initial_variables(inputs)
-        variable_store.variables = initial_vars
+    def execute_many(self, rows: Iterable[dict[str, Any]]) -> list[BatchRowResult]:
+        """Execute the calculation schema over many input rows.
 
-        # Update instance variables for backward compatibility
-        self.variables = initial_vars.copy()
-        self.results = {}
+        The compiled schema, the step executor, the trace sink and the execution
+        context are set up once and reused by every row; only the variables are
+        rebuilt per row. A failing row does not stop the batch; its error is
+        reported in its own result.
 
-        # Create execution context
-        context = ExecutionContext(
-            variables=initial_vars,
-            tax_tables=self.schema.get("tax_tables", {}),
+        Args:
+            rows: Iterable of input dictionaries, one per row
+
+        Returns:
+            One BatchRowResult per row, in input order
+        """
+        trace = get_trace_sink()
+        context = self._new_context(trace)
+        step_executor = StepExecutor()
+
+        outcomes: list[BatchRowResult] = []
+        for index, inputs in enumerate(rows):
+            try:
+                result = self._execute_row(inputs, context, step_executor, trace)
+                outcomes.append(BatchRowResult(index=index, result=result))
+            except FormulaEngineError as e:
+                outcomes.append(BatchRowResult(index=index, error=e))
+        return outcomes
+
+    def _new_context(self, trace: Callable[[str], None] | None) -> ExecutionContext:
+        """Create an execution context for the compiled schema, without variables."""
+        return ExecutionContext(
+            variables={},
+            tax_tables=self.compiled.tax_tables,
+            compiled_tax_tables=self.compiled.compiled_tax_tables,
             strict_mode=self.strict_mode,
-            trace_callback=self._trace,
+            trace_callback=trace,
         )
 
-        meta = self.schema.get("meta", {})
-        self._trace(
-            _("Iniciando ejecución de esquema '%(name)s' pasos=%(count)s")
-            % {"name": meta.get("name", "sin nombre"), "count": len(self.schema.get("steps", []))}
-        )
+    def _execute_row(
+        self,
+        inputs: dict[str, Any],
+        context: ExecutionContext,
+        step_executor: StepExecutor,
+        trace: Callable[[str], None] | None,
+    ) -> dict[str, Any]:
+        """Run the compiled steps over one input row, reusing ``context``.
+
+        Raises:
+            CalculationError: If execution fails
+        """
+        compiled = self.compiled
+
+        # Prepare initial variables. Steps add their results to this same
+        # dictionary, which the context, the audit result and the instance
+        # attributes share instead of keeping copies.
+        variables = self._prepare_initial_variables(inputs, trace)
+        step_results: dict[str, Any] = {}
+        context.variables = variables
+
+        # Update instance variables for backward compatibility
+        self.variables = variables
+        self.results = step_results
 
-        # Create and execute steps
-        steps = [step_factory.create_step(step) for step in self.schema.get("steps", [])]
+        if trace:
+            trace(
+                _("Iniciando ejecución de esquema '%(name)s' pasos=%(count)s")
+                % {"name": compiled.name, "count": len(compiled.steps)}
+            )
+        if compiled.step_error:
+            raise CalculationError(compiled.step_error)
 
-        step_results = {}
-        for step in steps:
+        for step in compiled.steps:
             result = step_executor.execute(step, context)
             step_results[step.name] = result
 
             # Update context with step result
-            variable_value = step.get_variable_value(result)
-            context = context.with_variable(step.name, variable_value)
-            variable_store.set(step.name, variable_value, result)
-            self.variables[step.name] = variable_value
-            self.results[step.name] = result
-
-            if context.trace_callback:
-                context.trace_callback(
-                    _("Resultado paso '%(name)s' => %(result)s") % {"name": step.name, "result": result}
-                )
+            context.set_variable(step.name, step.get_variable_value(result))
+
+            if trace:
+                trace(_("Resultado paso '%(name)s' => %(result)s") % {"name": step.name, "result": result})
 
         # Get the final output
-        output_name = self.schema.get("output", "")
+        output_name = compiled.output
         final_result = context.variables.get(output_name, Decimal("0"))
 
-        self._trace(_("Resultado final '%(name)s' => %(value)s") % {"name": output_name, "value": final_result})
+        if trace:
+            trace(_("Resultado final '%(name)s' => %(value)s") % {"name": output_name, "value": final_result})
 
         # Create and return result
         execution_result = ExecutionResult(
@@ -159,21 +174,20 @@ class FormulaEngine:
 
         return execution_result.to_dict()
 
-    def _prepare_initial_variables(self, inputs: dict[str, Any]) -> dict[str, Any]:
+    def _prepare_initial_variables(
+        self, inputs: dict[str, Any], trace: Callable[[str], None] | None = None
+    ) -> dict[str, Any]:
         """Prepare initial variables from inputs and defaults.
 
         Args:
             inputs: Input values provided by caller
+            trace: Trace sink, or None when tracing is disabled
 
         Returns:
             Dictionary of variable names to values (Decimal for numbers, original type for dates/strings)
         """
         variables = {}
-        for input_def in self.schema.get("inputs", []):
-            name = input_def.get("name")
-            default = input_def.get("default", 0)
-            input_type = input_def.get("type", "decimal")
-
+        for name, default, input_type in self.compiled.inputs:
             # Get the value (from input or default)
             value = inputs.get(name, default)
 
@@ -185,11 +199,12 @@ class FormulaEngine:
                 # Convert numbers to Decimal
                 variables[name] = to_decimal(value)
 
-            source = "input" if name in inputs else "default"
-            self._trace(
-                _("Input '%(name)s' cargado desde %(source)s => %(value)s")
-                % {"name": name, "source": source, "value": variables[name]}
-            )
+            if trace:
+                source = "input" if name in inputs else "default"
+                trace(
+                    _("Input '%(name)s' cargado desde %(source)s => %(value)s")
+                    % {"name": name, "source": source, "value": variables[name]}
+                )
 
         return variables
 
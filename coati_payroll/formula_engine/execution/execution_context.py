@@ -30,9 +30,22 @@ class ExecutionContext:
     trace_callback: Callable[[str], None] | None = None
     safe_operators: dict[type, Any] = field(default_factory=lambda: cast(dict[type, Any], SAFE_OPERATORS))
     safe_functions: dict[str, Any] = field(default_factory=lambda: SAFE_FUNCTIONS)
+    compiled_tax_tables: dict[str, Any] = field(default_factory=dict)
+
+    def set_variable(self, name: str, value: Any) -> None:
+        """Store a step result in this context, in place.
+
+        Steps only read variables while they execute, so the engine writes
+        each result into the shared dictionary instead of copying it.
+
+        Args:
+            name: Variable name
+            value: Variable value
+        """
+        self.variables[name] = value
 
     def with_variable(self, name: str, value: Any) -> "ExecutionContext":  # Changed from Decimal to Any
-        """Create a new context with an additional variable.
+        """Create a new context with an additional variable, leaving this one untouched.
 
         Args:
             name: Variable name
@@ -49,4 +62,5 @@ class ExecutionContext:
             trace_callback=self.trace_callback,
             safe_operators=self.safe_operators,
             safe_functions=self.safe_functions,
+            compiled_tax_tables=self.compiled_tax_tables,
         )
@@ -13,9 +13,11 @@
 # <-------------------------------------------------------------------------> #
 # Local modules
 # <-------------------------------------------------------------------------> #
+from .batch_result import BatchRowResult
 from .execution_result import ExecutionResult
 
 # <==================[ Expose all varaibles and constants ]===================>
 __all__ = [
+    "BatchRowResult",
     "ExecutionResult",
 ]
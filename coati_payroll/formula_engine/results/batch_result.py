@@ -0,0 +1,43 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Batch execution result DTO."""
+
+from __future__ import annotations
+
+# <-------------------------------------------------------------------------> #
+# Standard library
+# <-------------------------------------------------------------------------> #
+from dataclasses import dataclass
+from typing import Any
+
+# <-------------------------------------------------------------------------> #
+# Third party packages
+# <-------------------------------------------------------------------------> #
+
+# <-------------------------------------------------------------------------> #
+# Local modules
+# <-------------------------------------------------------------------------> #
+from ..exceptions import FormulaEngineError
+
+
+@dataclass(frozen=True)
+class BatchRowResult:
+    """Outcome of one input row in a batch execution.
+
+    Exactly one of ``result`` and ``error`` is set. ``result`` has the same
+    shape as the dictionary returned by ``FormulaEngine.execute``.
+    """
+
+    index: int
+    result: dict[str, Any] | None = None
+    error: FormulaEngineError | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True when the row was calculated without errors."""
+        return self.error is None
+
+    @property
+    def output(self) -> Any:
+        """Return the final output of the row, or None if it failed."""
+        return self.result.get("output") if self.result is not None else None
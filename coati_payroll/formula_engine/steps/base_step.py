@@ -48,6 +48,13 @@ class Step(ABC):
             Step execution result
         """
 
+    def compile(self) -> None:
+        """Prepare any reusable state for repeated execution.
+
+        Called once when a schema is compiled. Steps without expressions have
+        nothing to prepare.
+        """
+
     def get_variable_value(self, result: Any) -> Any:  # Changed from Decimal to Any
         """Return the value to store for this step.
 
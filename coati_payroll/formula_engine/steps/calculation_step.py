@@ -7,6 +7,7 @@ from __future__ import annotations
 # <-------------------------------------------------------------------------> #
 # Standard library
 # <-------------------------------------------------------------------------> #
+import ast
 from typing import TYPE_CHECKING, Any
 
 # <-------------------------------------------------------------------------> #
@@ -26,6 +27,25 @@ if TYPE_CHECKING:
 class CalculationStep(Step):
     """Step for executing mathematical calculations."""
 
+    def __init__(self, name: str, config: dict[str, Any]):
+        """Initialize calculation step."""
+        super().__init__(name, config)
+        self._tree: ast.Expression | None = None
+
+    def compile(self) -> None:
+        """Parse and validate the formula once.
+
+        Invalid formulas are left uncompiled so the error is raised on
+        execution, exactly as for a schema that was never compiled.
+        """
+        formula = self.config.get("formula", "")
+        if not formula or not isinstance(formula, str) or not formula.strip():
+            return
+        try:
+            self._tree = ExpressionEvaluator.parse(formula)
+        except Exception:
+            self._tree = None
+
     def execute(self, context: "ExecutionContext") -> Any:  # Changed from Decimal to Any
         """Execute calculation step.
 
@@ -41,4 +61,4 @@ class CalculationStep(Step):
             trace_callback=context.trace_callback,
             strict_mode=context.strict_mode,
         )
-        return evaluator.evaluate(formula)
+        return evaluator.evaluate(formula, self._tree)
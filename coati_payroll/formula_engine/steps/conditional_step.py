@@ -7,6 +7,7 @@ from __future__ import annotations
 # <-------------------------------------------------------------------------> #
 # Standard library
 # <-------------------------------------------------------------------------> #
+import ast
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any
 
@@ -30,6 +31,26 @@ if TYPE_CHECKING:
 class ConditionalStep(Step):
     """Step for conditional logic (if/else)."""
 
+    def __init__(self, name: str, config: dict[str, Any]):
+        """Initialize conditional step."""
+        super().__init__(name, config)
+        self._trees: dict[str, ast.Expression] = {}
+
+    def compile(self) -> None:
+        """Parse and validate both branch expressions once.
+
+        Invalid branches are left uncompiled so the error is raised only when
+        that branch is selected, exactly as for a schema that was never compiled.
+        """
+        for branch in ("if_true", "if_false"):
+            expression = str(self.config.get(branch, "0")).strip()
+            if not expression:
+                continue
+            try:
+                self._trees[expression] = ExpressionEvaluator.parse(expression)
+            except Exception:
+                continue
+
     def execute(self, context: "ExecutionContext") -> Decimal:
         """Execute conditional step.
 
@@ -50,8 +71,9 @@ class ConditionalStep(Step):
         selected_value = if_true if condition_result else if_false
 
         # Evaluate selected expression
+        expression = str(selected_value)
         evaluator = ExpressionEvaluator(variables=context.variables, trace_callback=context.trace_callback)
-        return evaluator.evaluate(str(selected_value))
+        return evaluator.evaluate(expression, self._trees.get(expression.strip()))
 
     def _evaluate_condition(self, condition: dict[str, Any], context: "ExecutionContext") -> bool:
         """Evaluate a conditional expression.
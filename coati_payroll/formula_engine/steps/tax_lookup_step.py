@@ -48,7 +48,12 @@ class TaxLookupStep(Step):
                 )
             input_value = Decimal("0")
 
-        table_lookup = TableLookup(context.tax_tables, context.trace_callback, strict_mode=context.strict_mode)
+        table_lookup = TableLookup(
+            context.tax_tables,
+            context.trace_callback,
+            strict_mode=context.strict_mode,
+            compiled_tables=context.compiled_tax_tables,
+        )
         return table_lookup.lookup(table_name, input_value)
 
     def get_variable_value(self, result: dict[str, Decimal]) -> Decimal:
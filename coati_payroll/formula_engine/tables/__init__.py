@@ -13,12 +13,13 @@
 # <-------------------------------------------------------------------------> #
 # Local modules
 # <-------------------------------------------------------------------------> #
-from .tax_table import TaxTable
+from .tax_table import CompiledTaxTable, TaxTable
 from .bracket_calculator import BracketCalculator
 from .table_lookup import TableLookup
 
 # <==================[ Expose all varaibles and constants ]===================>
 __all__ = [
+    "CompiledTaxTable",
     "TaxTable",
     "BracketCalculator",
     "TableLookup",
@@ -37,7 +37,21 @@ class BracketCalculator:
         rate = to_decimal(bracket.get("rate", 0))
         fixed = to_decimal(bracket.get("fixed", 0))
         over = to_decimal(bracket.get("over", 0))
+        return BracketCalculator.calculate_from(rate, fixed, over, input_value)
 
+    @staticmethod
+    def calculate_from(rate: Decimal, fixed: Decimal, over: Decimal, input_value: Decimal) -> dict[str, Decimal]:
+        """Calculate tax from bracket parameters already converted to Decimal.
+
+        Args:
+            rate: Marginal rate of the bracket
+            fixed: Fixed amount of the bracket
+            over: Amount above which the rate applies
+            input_value: Value being taxed
+
+        Returns:
+            Dictionary with calculated tax components
+        """
         # Calculate tax: fixed + (input_value - over) * rate
         excess = max(input_value - over, Decimal("0"))
         tax = fixed + (excess * rate)
@@ -18,9 +18,9 @@ from typing import Any, Callable
 # Local modules
 # <-------------------------------------------------------------------------> #
 from coati_payroll.i18n import _
-from ..ast.type_converter import to_decimal
 from ..exceptions import CalculationError
 from .bracket_calculator import BracketCalculator
+from .tax_table import CompiledTaxTable
 
 
 class TableLookup:
@@ -31,6 +31,7 @@ class TableLookup:
         tax_tables: dict[str, Any],
         trace_callback: Callable[[str], None] | None = None,
         strict_mode: bool = False,
+        compiled_tables: dict[str, CompiledTaxTable] | None = None,
     ):
         """Initialize table lookup.
 
@@ -38,10 +39,14 @@ class TableLookup:
             tax_tables: Dictionary of tax table names to table definitions
             trace_callback: Optional callback for trace logging
             strict_mode: If True, treats table warnings as errors
+            compiled_tables: Optional cache of compiled tables, shared across lookups;
+                tables missing from it are compiled on first use
         """
         self.tax_tables = tax_tables
-        self.trace_callback = trace_callback or (lambda _: None)
+        # None when tracing is off: messages are then never built
+        self.trace_callback = trace_callback
         self.strict_mode = strict_mode
+        self.compiled_tables = compiled_tables if compiled_tables is not None else {}
 
     def lookup(self, table_name: str, input_value: Decimal) -> dict[str, Decimal]:
         """Look up tax bracket in a tax table.
@@ -66,9 +71,11 @@ class TableLookup:
         if not table:
             if self.strict_mode:
                 raise CalculationError(f"Tax table '{table_name}' is empty for input value {input_value}")
-            self.trace_callback(
-                _("Advertencia: tabla de impuestos '%(table)s' está vacía, devolviendo ceros") % {"table": table_name}
-            )
+            if self.trace_callback is not None:
+                self.trace_callback(
+                    _("Advertencia: tabla de impuestos '%(table)s' está vacía, devolviendo ceros")
+                    % {"table": table_name}
+                )
             return {
                 "tax": Decimal("0"),
                 "rate": Decimal("0"),
@@ -76,99 +83,97 @@ class TableLookup:
                 "over": Decimal("0"),
             }
 
-        self.trace_callback(
-            _("Buscando tabla de impuestos '%(table)s' con valor %(value)s; brackets=%(count)s")
-            % {"table": table_name, "value": input_value, "count": len(table)}
-        )
+        if self.trace_callback is not None:
+            self.trace_callback(
+                _("Buscando tabla de impuestos '%(table)s' con valor %(value)s; brackets=%(count)s")
+                % {"table": table_name, "value": input_value, "count": len(table)}
+            )
 
-        # Defensive: Sort brackets by min value if not already sorted
-        try:
-            sorted_table = sorted(table, key=lambda b: to_decimal(b.get("min", 0)))
-            if sorted_table != table:
-                if self.strict_mode:
-                    raise CalculationError(
-                        f"Tax table '{table_name}' is not ordered by 'min' values for input value {input_value}"
-                    )
+        compiled = self._compiled_table(table_name, table)
+
+        # Defensive: brackets are sorted by min value if not already sorted
+        if compiled.sort_error is not None:
+            if self.strict_mode:
+                raise CalculationError(
+                    f"Failed to validate ordering for table '{table_name}' with input value {input_value}: "
+                    f"{compiled.sort_error}"
+                )
+            if self.trace_callback is not None:
                 self.trace_callback(
-                    _("Advertencia: tabla '%(table)s' no estaba ordenada, ordenando automáticamente")
-                    % {"table": table_name}
+                    _("Advertencia: no se pudo ordenar la tabla '%(table)s': %(error)s")
+                    % {"table": table_name, "error": compiled.sort_error}
                 )
-                table = sorted_table
-        except Exception as e:
+        elif compiled.unsorted:
             if self.strict_mode:
                 raise CalculationError(
-                    f"Failed to validate ordering for table '{table_name}' with input value {input_value}: {e}"
-                ) from e
-            self.trace_callback(
-                _("Advertencia: no se pudo ordenar la tabla '%(table)s': %(error)s")
-                % {"table": table_name, "error": str(e)}
-            )
-
-        # Find the applicable bracket
-        matched_brackets: list[tuple[int, Any, Decimal, Decimal | None]] = []
-        for i, bracket in enumerate(table):
-            try:
-                min_val = to_decimal(bracket.get("min", 0))
-                max_val = bracket.get("max")
-
-                if max_val is None:
-                    # Open-ended bracket (highest tier)
-                    if input_value >= min_val:
-                        matched_brackets.append((i, bracket, min_val, None))
-                else:
-                    max_val = to_decimal(max_val)
-                    # Defensive: validate bracket range
-                    if max_val < min_val:
-                        msg = _("Advertencia: tramo %(index)s de tabla '%(table)s' tiene max < min, omitiendo")
-                        self.trace_callback(msg % {"index": i, "table": table_name})
-                        continue
-
-                    if min_val <= input_value <= max_val:
-                        matched_brackets.append((i, bracket, min_val, max_val))
-            except Exception as e:
-                # Defensive: skip invalid brackets
+                    f"Tax table '{table_name}' is not ordered by 'min' values for input value {input_value}"
+                )
+            if self.trace_callback is not None:
                 self.trace_callback(
-                    _("Advertencia: error procesando tramo %(index)s de tabla '%(table)s': %(error)s")
-                    % {"index": i, "table": table_name, "error": str(e)}
+                    _("Advertencia: tabla '%(table)s' no estaba ordenada, ordenando automáticamente")
+                    % {"table": table_name}
                 )
-                continue
+
+        # Defensive: invalid brackets were skipped when the table was compiled
+        if self.trace_callback is not None:
+            for i, error in compiled.skipped:
+                if error is None:
+                    msg = _("Advertencia: tramo %(index)s de tabla '%(table)s' tiene max < min, omitiendo")
+                    self.trace_callback(msg % {"index": i, "table": table_name})
+                else:
+                    self.trace_callback(
+                        _("Advertencia: error procesando tramo %(index)s de tabla '%(table)s': %(error)s")
+                        % {"index": i, "table": table_name, "error": error}
+                    )
+
+        # Find the applicable bracket
+        position, match_count = compiled.find(input_value)
 
         # Handle multiple matches (overlaps) - use the first valid match
-        if matched_brackets:
-            if len(matched_brackets) > 1:
+        if position is not None:
+            if match_count > 1:
                 # Multiple brackets match - this indicates an overlap
                 if self.strict_mode:
                     raise CalculationError(f"Multiple tax brackets match value {input_value} in table '{table_name}'")
-                self.trace_callback(
-                    _(
-                        "ADVERTENCIA CRÍTICA: múltiples tramos coinciden para valor %(value)s en tabla '%(table)s'. "
-                        "Esto indica solapamiento. Usando el primer tramo encontrado."
+                if self.trace_callback is not None:
+                    self.trace_callback(
+                        _(
+                            "ADVERTENCIA CRÍTICA: múltiples tramos coinciden para valor %(value)s "
+                            "en tabla '%(table)s'. "
+                            "Esto indica solapamiento. Usando el primer tramo encontrado."
+                        )
+                        % {"value": input_value, "table": table_name}
                     )
-                    % {"value": input_value, "table": table_name}
-                )
 
-            i, bracket, min_val, max_val = matched_brackets[0]
-            result = BracketCalculator.calculate(bracket, input_value)
-            if max_val is None:
-                self.trace_callback(
-                    _("Aplicando tramo abierto desde %(min)s para valor %(value)s -> %(result)s")
-                    % {"min": min_val, "value": input_value, "result": result}
-                )
+            min_val = compiled.mins[position]
+            max_val = compiled.maxs[position]
+            params = compiled.params[position]
+            if params is None:
+                result = BracketCalculator.calculate(compiled.brackets[position], input_value)
             else:
-                self.trace_callback(
-                    _("Aplicando tramo %(min)s - %(max)s para valor %(value)s -> %(result)s")
-                    % {"min": min_val, "max": max_val, "value": input_value, "result": result}
-                )
+                result = BracketCalculator.calculate_from(*params, input_value)
+            if self.trace_callback is not None:
+                if max_val is None:
+                    self.trace_callback(
+                        _("Aplicando tramo abierto desde %(min)s para valor %(value)s -> %(result)s")
+                        % {"min": min_val, "value": input_value, "result": result}
+                    )
+                else:
+                    self.trace_callback(
+                        _("Aplicando tramo %(min)s - %(max)s para valor %(value)s -> %(result)s")
+                        % {"min": min_val, "max": max_val, "value": input_value, "result": result}
+                    )
             return result
 
         # If no bracket found, return zeros
-        self.trace_callback(
-            _(
-                "No se encontró tramo para valor %(value)s en tabla '%(table)s', devolviendo ceros. "
-                "Esto puede indicar un gap en la configuración de la tabla."
+        if self.trace_callback is not None:
+            self.trace_callback(
+                _(
+                    "No se encontró tramo para valor %(value)s en tabla '%(table)s', devolviendo ceros. "
+                    "Esto puede indicar un gap en la configuración de la tabla."
+                )
+                % {"value": input_value, "table": table_name}
             )
-            % {"value": input_value, "table": table_name}
-        )
         if self.strict_mode:
             raise CalculationError(f"No tax bracket found for value {input_value} in table '{table_name}'")
         return {
@@ -177,3 +182,11 @@ class TableLookup:
             "fixed": Decimal("0"),
             "over": Decimal("0"),
         }
+
+    def _compiled_table(self, table_name: str, table: list[dict[str, Any]]) -> CompiledTaxTable:
+        """Return the compiled form of a table, compiling it on first use."""
+        compiled = self.compiled_tables.get(table_name)
+        if compiled is None or compiled.source is not table:
+            compiled = CompiledTaxTable(table_name, table)
+            self.compiled_tables[table_name] = compiled
+        return compiled
@@ -1,12 +1,14 @@
 # SPDX-License-Identifier: Apache-2.0
 # SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
-"""Tax table data structure."""
+"""Tax table data structures."""
 
 from __future__ import annotations
 
 # <-------------------------------------------------------------------------> #
 # Standard library
 # <-------------------------------------------------------------------------> #
+from bisect import bisect_right
+from decimal import Decimal
 from typing import Any
 
 # <-------------------------------------------------------------------------> #
@@ -16,6 +18,7 @@ from typing import Any
 # <-------------------------------------------------------------------------> #
 # Local modules
 # <-------------------------------------------------------------------------> #
+from ..ast.type_converter import to_decimal
 
 
 class TaxTable:
@@ -30,3 +33,100 @@ class TaxTable:
         """
         self.name = name
         self.brackets = brackets
+
+
+class CompiledTaxTable:
+    """Pre-sorted, read-only form of a tax table for O(log n) bracket lookups.
+
+    Brackets are sorted once by ``min`` and their limits and parameters are
+    converted to Decimal up front. When the valid brackets are disjoint and
+    only the last one is open-ended, a lookup is a binary search over the
+    ``min`` values. Tables with overlapping brackets keep the linear scan so
+    that the first matching bracket still wins and overlaps are reported.
+
+    Problems found while compiling (unordered table, invalid brackets) are
+    recorded rather than raised: ``TableLookup`` reports them on every lookup,
+    exactly as it did before tables were compiled.
+    """
+
+    def __init__(self, name: str, brackets: list[dict[str, Any]]):
+        """Compile a tax table.
+
+        Args:
+            name: Table name
+            brackets: List of bracket dictionaries, as defined in the schema
+        """
+        self.name = name
+        self.source = brackets
+        self.unsorted = False
+        self.sort_error: str | None = None
+        try:
+            ordered = sorted(brackets, key=lambda b: to_decimal(b.get("min", 0)))
+            self.unsorted = ordered != brackets
+        except Exception as e:
+            ordered = list(brackets)
+            self.sort_error = str(e)
+
+        # (index, error) for brackets skipped during lookup; error is None for max < min
+        self.skipped: list[tuple[int, str | None]] = []
+        self.brackets: list[dict[str, Any]] = []
+        self.mins: list[Decimal] = []
+        self.maxs: list[Decimal | None] = []
+        self.params: list[tuple[Decimal, Decimal, Decimal] | None] = []
+        for i, bracket in enumerate(ordered):
+            try:
+                min_val = to_decimal(bracket.get("min", 0))
+                max_val = bracket.get("max")
+                if max_val is not None:
+                    max_val = to_decimal(max_val)
+                    if max_val < min_val:
+                        self.skipped.append((i, None))
+                        continue
+            except Exception as e:
+                self.skipped.append((i, str(e)))
+                continue
+            self.brackets.append(bracket)
+            self.mins.append(min_val)
+            self.maxs.append(max_val)
+            self.params.append(self._bracket_params(bracket))
+
+        last = len(self.mins) - 1
+        self.disjoint = not self.sort_error and all(
+            self.maxs[k] is not None and self.maxs[k] < self.mins[k + 1] for k in range(last)  # type: ignore[operator]
+        )
+
+    @staticmethod
+    def _bracket_params(bracket: dict[str, Any]) -> tuple[Decimal, Decimal, Decimal] | None:
+        """Convert rate, fixed and over once; None defers a conversion error to lookup time."""
+        try:
+            return (
+                to_decimal(bracket.get("rate", 0)),
+                to_decimal(bracket.get("fixed", 0)),
+                to_decimal(bracket.get("over", 0)),
+            )
+        except Exception:
+            return None
+
+    def find(self, value: Decimal) -> tuple[int | None, int]:
+        """Find the bracket that applies to a value.
+
+        Args:
+            value: Value to look up
+
+        Returns:
+            Tuple of (position of the first matching bracket or None, number of matching brackets)
+        """
+        if self.disjoint:
+            pos = bisect_right(self.mins, value) - 1
+            if pos >= 0 and (self.maxs[pos] is None or value <= self.maxs[pos]):  # type: ignore[operator]
+                return pos, 1
+            return None, 0
+
+        # Overlapping brackets: when sorted, only those starting at or below the value can match
+        candidates = range(len(self.mins)) if self.sort_error else range(bisect_right(self.mins, value))
+        matches = [
+            k
+            for k in candidates
+            if self.mins[k] <= value and (self.maxs[k] is None or value <= self.maxs[k])  # type: ignore[operator]
+        ]
+        return (matches[0] if matches else None), len(matches)
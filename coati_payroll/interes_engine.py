@@ -16,9 +16,11 @@ from __future__ import annotations
 # <-------------------------------------------------------------------------> #
 # Standard library
 # <-------------------------------------------------------------------------> #
+from collections import OrderedDict
 from datetime import date
 from decimal import Decimal, ROUND_HALF_UP
-from typing import TYPE_CHECKING, NamedTuple
+from threading import Lock
+from typing import TYPE_CHECKING, Hashable, Iterable, Mapping, NamedTuple, TypeVar, cast
 
 # <-------------------------------------------------------------------------> #
 # Third party libraries
@@ -31,7 +33,15 @@ from dateutil.relativedelta import relativedelta
 from coati_payroll.enums import MetodoAmortizacion, TipoInteres
 
 if TYPE_CHECKING:
-    from coati_payroll.model import ConfiguracionCalculos
+    from coati_payroll.model import Adelanto, ConfiguracionCalculos
+
+# <-------------------- Constantes Locales --------------------> #
+AMORTIZACION_CACHE_SIZE = 1024
+
+_amortizacion_cache: OrderedDict[tuple, tuple["CuotaPrestamo", ...]] = OrderedDict()
+_cache_lock = Lock()
+
+K = TypeVar("K", bound=Hashable)
 
 
 class CuotaPrestamo(NamedTuple):
@@ -45,6 +55,44 @@ class CuotaPrestamo(NamedTuple):
     saldo: Decimal  # Remaining balance after payment
 
 
+class ParametrosAmortizacion(NamedTuple):
+    """Inputs of an amortization schedule, as accepted by ``generar_tabla_amortizacion``."""
+
+    principal: Decimal
+    tasa_anual: Decimal
+    num_cuotas: int
+    fecha_inicio: date
+    fecha_desembolso: date | None = None
+    metodo: MetodoAmortizacion = MetodoAmortizacion.FRANCES
+    tipo_interes: TipoInteres = TipoInteres.SIMPLE
+
+
+def parametros_prestamo(prestamo: "Adelanto") -> ParametrosAmortizacion | None:
+    """Return the schedule inputs of a loan, or None if it has no amount or installments.
+
+    Args:
+        prestamo: Loan object
+
+    Returns:
+        Parameters for ``generar_tabla_amortizacion`` or ``generar_tablas_amortizacion``
+    """
+    if not prestamo.cuotas_pactadas or prestamo.cuotas_pactadas <= 0:
+        return None
+
+    monto_base = prestamo.monto_aprobado or prestamo.monto_solicitado
+    if not monto_base or monto_base <= 0:
+        return None
+
+    return ParametrosAmortizacion(
+        principal=monto_base,
+        tasa_anual=prestamo.tasa_interes or Decimal("0.0000"),
+        num_cuotas=prestamo.cuotas_pactadas,
+        fecha_inicio=prestamo.fecha_aprobacion or prestamo.fecha_solicitud or date.today(),
+        metodo=cast(MetodoAmortizacion, prestamo.metodo_amortizacion or MetodoAmortizacion.FRANCES),
+        tipo_interes=cast(TipoInteres, prestamo.tipo_interes or TipoInteres.NINGUNO),
+    )
+
+
 def _obtener_config_default(empresa_id: str | None = None) -> "ConfiguracionCalculos":
     """Get default configuration for interest calculations.
 
@@ -281,9 +329,15 @@ def generar_tabla_amortizacion(
     fecha_desembolso: date | None = None,
     metodo: MetodoAmortizacion = MetodoAmortizacion.FRANCES,
     tipo_interes: TipoInteres = TipoInteres.SIMPLE,
+    config: "ConfiguracionCalculos | None" = None,
 ) -> list[CuotaPrestamo]:
     """Generate complete amortization schedule for a loan.
 
+    Schedules are memoized by their inputs and the financial-year settings of
+    the configuration, so regenerating the schedule of an unchanged loan (detail
+    page, Excel and PDF exports) reuses the first result. Editing the loan or
+    the configuration changes the key, so stale schedules are never returned.
+
     Args:
         principal: Loan amount
         tasa_anual: Annual nominal interest rate as percentage
@@ -298,6 +352,7 @@ def generar_tabla_amortizacion(
             so day-based interest can create small differences versus traditional
             monthly tables. Each installment is rounded to cents before being
             stored in the schedule, and negative day spans are treated as zero.
+        config: Optional configuration object (if not provided, will fetch defaults)
 
     Returns:
         List of loan installments
@@ -308,103 +363,160 @@ def generar_tabla_amortizacion(
     if principal <= 0 or num_cuotas <= 0:
         return []
 
-    tabla: list[CuotaPrestamo] = []
-    saldo = principal
-    # Get configuration for interest calculations.
-    # Note: This function doesn't have empresa_id, so we use defaults.
-    config = _obtener_config_default(None)
-    fecha_prev = fecha_desembolso or (fecha_inicio - relativedelta(months=1))
+    # Note: This function doesn't have empresa_id, so we use defaults. Callers
+    # resolve the company's configuration once per request or batch and pass it in.
+    if config is None:
+        config = _obtener_config_default(None)
+    parametros = ParametrosAmortizacion(
+        principal, tasa_anual, num_cuotas, fecha_inicio, fecha_desembolso, metodo, tipo_interes
+    )
+    return list(_tabla_en_cache(parametros, config))
 
-    # Calculate based on method
-    if metodo == MetodoAmortizacion.FRANCES:
-        # French method: constant payment
-        cuota_constante = calcular_cuota_frances(principal, tasa_anual, num_cuotas, config=config)
 
-        for i in range(num_cuotas):
-            numero = i + 1
-            fecha_estimada = fecha_inicio + relativedelta(months=numero - 1)
-            dias = max((fecha_estimada - fecha_prev).days, 0)
+def generar_tablas_amortizacion(
+    prestamos: Mapping[K, ParametrosAmortizacion] | Iterable[tuple[K, ParametrosAmortizacion]],
+    config: "ConfiguracionCalculos | None" = None,
+) -> dict[K, list[CuotaPrestamo]]:
+    """Generate the amortization schedules of many loans at once.
 
-            # Calculate interest for this period
-            if tipo_interes == TipoInteres.COMPUESTO:
-                interes = calcular_interes_compuesto(saldo, tasa_anual, dias, config=config)
-            else:
-                interes = calcular_interes_simple(saldo, tasa_anual, dias, config=config)
-            interes_q = interes.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    The configuration is resolved once for the whole batch and loans with
+    identical parameters share one calculation.
 
-            if cuota_constante <= interes_q and numero != num_cuotas:
-                raise ValueError("La cuota constante no cubre el interés; la amortización sería negativa.")
+    Args:
+        prestamos: Schedule parameters by loan key (e.g. the Adelanto id)
+        config: Optional configuration object (if not provided, will fetch defaults)
 
-            # For last payment, adjust to clear remaining balance
-            if numero == num_cuotas:
-                capital = saldo
-                cuota_total = capital + interes_q
-            else:
-                capital = cuota_constante - interes_q
-                cuota_total = capital + interes_q
+    Returns:
+        Installments by loan key; loans without principal or installments get an empty list.
 
-            capital_q = capital.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            cuota_total_q = cuota_total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            saldo_nuevo = saldo - capital_q
-            saldo_q = max(saldo_nuevo, Decimal("0.00")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-            tabla.append(
-                CuotaPrestamo(
-                    numero=numero,
-                    fecha_estimada=fecha_estimada,
-                    cuota_total=cuota_total_q,
-                    interes=interes_q,
-                    capital=capital_q,
-                    saldo=saldo_q,
-                )
-            )
+    Raises:
+        ValueError: If French method results in negative amortization for any loan.
+    """
+    items = prestamos.items() if isinstance(prestamos, Mapping) else prestamos
+    if config is None:
+        config = _obtener_config_default(None)
+
+    tablas: dict[K, list[CuotaPrestamo]] = {}
+    for clave, parametros in items:
+        if parametros.principal <= 0 or parametros.num_cuotas <= 0:
+            tablas[clave] = []
+        else:
+            tablas[clave] = list(_tabla_en_cache(parametros, config))
+    return tablas
+
+
+def clear_amortizacion_cache() -> None:
+    """Drop every cached amortization schedule."""
+    with _cache_lock:
+        _amortizacion_cache.clear()
+
+
+def _tabla_en_cache(parametros: ParametrosAmortizacion, config: "ConfiguracionCalculos") -> tuple[CuotaPrestamo, ...]:
+    """Return the schedule of ``parametros``, calculating it on first use.
+
+    Installments are immutable tuples, so cached schedules are shared as-is.
+    Failures are never cached.
+    """
+    dias_anio = int(config.dias_anio_financiero)
+    meses_anio = int(config.meses_anio_financiero)
+    key = (parametros, dias_anio, meses_anio)
+    with _cache_lock:
+        tabla = _amortizacion_cache.get(key)
+        if tabla is not None:
+            _amortizacion_cache.move_to_end(key)
+            return tabla
+
+    tabla = _calcular_tabla(parametros, config)
+
+    with _cache_lock:
+        _amortizacion_cache[key] = tabla
+        _amortizacion_cache.move_to_end(key)
+        while len(_amortizacion_cache) > AMORTIZACION_CACHE_SIZE:
+            _amortizacion_cache.popitem(last=False)
+    return tabla
+
+
+def _calcular_tabla(parametros: ParametrosAmortizacion, config: "ConfiguracionCalculos") -> tuple[CuotaPrestamo, ...]:
+    """Calculate an amortization schedule.
+
+    Payment dates and day spans are computed up front. Monthly periods only
+    span 28 to 31 days, so the per-day time factor (simple interest) or growth
+    factor (compound interest) is computed once per distinct span and reused,
+    with the same operations as ``calcular_interes_simple`` and
+    ``calcular_interes_compuesto``.
+    """
+    principal, tasa_anual, num_cuotas, fecha_inicio, fecha_desembolso, metodo, tipo_interes = parametros
+
+    fecha_prev = fecha_desembolso or (fecha_inicio - relativedelta(months=1))
+    fechas = [fecha_inicio + relativedelta(months=numero - 1) for numero in range(1, num_cuotas + 1)]
+    periodos: list[int] = []
+    for fecha_estimada in fechas:
+        periodos.append(max((fecha_estimada - fecha_prev).days, 0))
+        fecha_prev = fecha_estimada
 
-            saldo = saldo_q
-            fecha_prev = fecha_estimada
+    tasa_decimal = tasa_anual / Decimal("100")
+    dias_anio = Decimal(str(config.dias_anio_financiero))
+    compuesto = tipo_interes == TipoInteres.COMPUESTO
+    factores: dict[int, Decimal] = {}
+    for dias in set(periodos):
+        if compuesto:
+            factores[dias] = (Decimal("1") + (tasa_decimal / dias_anio)) ** dias
+        else:
+            factores[dias] = Decimal(dias) / dias_anio
+
+    def interes_periodo(saldo: Decimal, dias: int) -> Decimal:
+        if saldo <= 0 or tasa_anual <= 0 or dias <= 0:
+            return Decimal("0.00")
+        if compuesto:
+            interes = saldo * factores[dias] - saldo
+        else:
+            interes = saldo * tasa_decimal * factores[dias]
+        return interes.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
+    if metodo == MetodoAmortizacion.FRANCES:
+        # French method: constant payment
+        cuota_constante = calcular_cuota_frances(principal, tasa_anual, num_cuotas, config=config)
     elif metodo == MetodoAmortizacion.ALEMAN:
         # German method: constant principal amortization
         capital_constante = (principal / Decimal(num_cuotas)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    else:
+        return ()
 
-        for i in range(num_cuotas):
-            numero = i + 1
-            fecha_estimada = fecha_inicio + relativedelta(months=numero - 1)
-            dias = max((fecha_estimada - fecha_prev).days, 0)
+    tabla: list[CuotaPrestamo] = []
+    saldo = principal
+    for numero, (fecha_estimada, dias) in enumerate(zip(fechas, periodos), start=1):
+        interes_q = interes_periodo(saldo, dias)
 
-            # Calculate interest for this period
-            if tipo_interes == TipoInteres.COMPUESTO:
-                interes = calcular_interes_compuesto(saldo, tasa_anual, dias, config=config)
-            else:
-                interes = calcular_interes_simple(saldo, tasa_anual, dias, config=config)
-            interes_q = interes.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        if metodo == MetodoAmortizacion.FRANCES:
+            if cuota_constante <= interes_q and numero != num_cuotas:
+                raise ValueError("La cuota constante no cubre el interés; la amortización sería negativa.")
 
             # For last payment, adjust to clear remaining balance
-            if numero == num_cuotas:
-                capital = saldo
-            else:
-                capital = capital_constante
-
+            capital = saldo if numero == num_cuotas else cuota_constante - interes_q
+            capital_q = capital.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            cuota_total = capital + interes_q
+        else:
+            capital = saldo if numero == num_cuotas else capital_constante
             capital_q = capital.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
             cuota_total = capital_q + interes_q
-            cuota_total_q = cuota_total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            saldo_nuevo = saldo - capital_q
-            saldo_q = max(saldo_nuevo, Decimal("0.00")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-            tabla.append(
-                CuotaPrestamo(
-                    numero=numero,
-                    fecha_estimada=fecha_estimada,
-                    cuota_total=cuota_total_q,
-                    interes=interes_q,
-                    capital=capital_q,
-                    saldo=saldo_q,
-                )
-            )
 
-            saldo = saldo_q
-            fecha_prev = fecha_estimada
+        cuota_total_q = cuota_total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        saldo_nuevo = saldo - capital_q
+        saldo_q = max(saldo_nuevo, Decimal("0.00")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+        tabla.append(
+            CuotaPrestamo(
+                numero=numero,
+                fecha_estimada=fecha_estimada,
+                cuota_total=cuota_total_q,
+                interes=interes_q,
+                capital=capital_q,
+                saldo=saldo_q,
+            )
+        )
+        saldo = saldo_q
 
-    return tabla
+    return tuple(tabla)
 
 
 def calcular_interes_periodo(
@@ -5,10 +5,22 @@
 
 from __future__ import annotations
 
+from .batch import (
+    LiquidacionBatchEngine,
+    LiquidacionLoteResult,
+    crear_lote_liquidaciones,
+    procesar_lote_liquidaciones,
+)
 from .engine import LiquidacionEngine, ejecutar_liquidacion, recalcular_liquidacion
+from .prefetch import LiquidacionPrefetch
 
 __all__ = [
+    "LiquidacionBatchEngine",
     "LiquidacionEngine",
+    "LiquidacionLoteResult",
+    "LiquidacionPrefetch",
+    "crear_lote_liquidaciones",
     "ejecutar_liquidacion",
+    "procesar_lote_liquidaciones",
     "recalcular_liquidacion",
 ]
@@ -0,0 +1,276 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+
+"""Batch calculation of liquidaciones for mass terminations."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Iterable, cast
+
+from sqlalchemy import insert, select, update
+
+from coati_payroll.enums import LiquidacionEstado, LiquidacionLoteEstado
+from coati_payroll.log import log
+from coati_payroll.model import (
+    Empleado,
+    Liquidacion,
+    LiquidacionDetalle,
+    LiquidacionLote,
+    db,
+    generador_de_codigos_unicos,
+)
+from .engine import LiquidacionEngine
+from .prefetch import LiquidacionPrefetch
+
+# Employees calculated, inserted and committed together; progress is reported per chunk.
+BATCH_CHUNK_SIZE = 200
+
+# Rows per multi-row INSERT.
+BULK_CHUNK_SIZE = 500
+
+
+@dataclass
+class LiquidacionLoteResult:
+    """Outcome of a batch: created liquidaciones, per-employee errors and warnings, and a batch failure."""
+
+    liquidacion_ids: list[str] = field(default_factory=list)
+    errores: dict[str, list[str]] = field(default_factory=dict)
+    advertencias: dict[str, list[str]] = field(default_factory=dict)
+    error: str | None = None
+
+
+class LiquidacionBatchEngine:
+    """Calculate the liquidaciones of many employees with set-based reads and bulk inserts.
+
+    For every chunk of employees, last paid periods, configurations and pending
+    loans are prefetched with a few queries, each liquidacion is calculated in
+    memory, liquidaciones and their details are written with multi-row inserts,
+    and the loan and advance payments are then applied. Each chunk is committed,
+    so progress is visible while the batch runs and completed chunks survive a
+    later failure.
+    """
+
+    def __init__(
+        self,
+        empleado_ids: Iterable[str],
+        fecha_calculo: date | None = None,
+        concepto_id: str | None = None,
+        usuario: str | None = None,
+        lote: LiquidacionLote | None = None,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+    ):
+        """Initialize the batch.
+
+        Args:
+            empleado_ids: Employees to liquidate; duplicates are ignored
+            fecha_calculo: Date of calculation (defaults to today)
+            concepto_id: Termination concept applied to every liquidacion
+            usuario: Username executing the batch
+            lote: Batch record that receives progress, errors and the final state
+            chunk_size: Employees calculated and committed together
+        """
+        self.empleado_ids = list(dict.fromkeys(empleado_ids))
+        self.fecha_calculo = fecha_calculo or date.today()
+        self.concepto_id = concepto_id
+        self.usuario = usuario
+        self.lote = lote
+        self.chunk_size = chunk_size
+        self.result = LiquidacionLoteResult()
+
+    def ejecutar(self) -> LiquidacionLoteResult:
+        """Calculate and persist every liquidacion of the batch."""
+        if self.lote is not None:
+            self.lote.estado = LiquidacionLoteEstado.PROCESANDO
+            self.lote.iniciado_en = datetime.now(timezone.utc)
+            self.lote.total_empleados = len(self.empleado_ids)
+            db.session.commit()
+
+        for inicio in range(0, len(self.empleado_ids), self.chunk_size):
+            self._procesar_chunk(self.empleado_ids[inicio : inicio + self.chunk_size])
+            self._reportar_progreso()
+            db.session.commit()
+            log.info(
+                "Liquidaciones en lote: %s de %s empleados procesados",
+                len(self.result.liquidacion_ids) + len(self.result.errores),
+                len(self.empleado_ids),
+            )
+
+        if self.lote is not None:
+            self.lote.estado = LiquidacionLoteEstado.COMPLETADO
+            if self.result.errores:
+                self.lote.estado = LiquidacionLoteEstado.COMPLETADO_CON_ERRORES
+            self.lote.completado_en = datetime.now(timezone.utc)
+            db.session.commit()
+        return self.result
+
+    def _procesar_chunk(self, empleado_ids: list[str]) -> None:
+        empleados = {
+            empleado.id: empleado
+            for empleado in db.session.execute(select(Empleado).filter(Empleado.id.in_(empleado_ids))).scalars()
+        }
+        prefetch = LiquidacionPrefetch(db.session).load(empleados.values())
+
+        calculadas: list[tuple[Liquidacion, LiquidacionEngine]] = []
+        for empleado_id in empleado_ids:
+            empleado = empleados.get(empleado_id)
+            if empleado is None:
+                self.result.errores[empleado_id] = ["Empleado no encontrado."]
+                continue
+
+            liquidacion = Liquidacion(
+                id=generador_de_codigos_unicos(),
+                empleado_id=empleado.id,
+                concepto_id=self.concepto_id,
+                lote_id=self.lote.id if self.lote is not None else None,
+                fecha_calculo=self.fecha_calculo,
+                estado=LiquidacionEstado.BORRADOR,
+            )
+            engine = LiquidacionEngine(
+                empleado, fecha_calculo=self.fecha_calculo, usuario=self.usuario, prefetch=prefetch
+            )
+            try:
+                calculada = engine.calcular(liquidacion, diferir_abonos=True)
+            except Exception as e:
+                log.error("Error al calcular la liquidación del empleado %s: %s", empleado_id, e)
+                engine.errors.append(f"{type(e).__name__}: {e}")
+                calculada = None
+
+            if calculada is None:
+                self.result.errores[empleado_id] = list(engine.errors)
+                continue
+            if engine.warnings:
+                self.result.advertencias[empleado_id] = list(engine.warnings)
+            calculadas.append((calculada, engine))
+
+        self._insertar([liquidacion for liquidacion, _engine in calculadas])
+        for liquidacion, engine in calculadas:
+            if engine.loan_processor is not None:
+                engine.loan_processor.apply_pending_effects()
+            self.result.liquidacion_ids.append(liquidacion.id)
+
+    def _insertar(self, liquidaciones: list[Liquidacion]) -> None:
+        """Write liquidaciones and their details in chunked multi-row INSERTs."""
+        filas: list[dict[str, Any]] = []
+        detalles: list[dict[str, Any]] = []
+        for liquidacion in liquidaciones:
+            filas.append(
+                {
+                    "id": liquidacion.id,
+                    "empleado_id": liquidacion.empleado_id,
+                    "concepto_id": liquidacion.concepto_id,
+                    "lote_id": liquidacion.lote_id,
+                    "fecha_calculo": liquidacion.fecha_calculo,
+                    "ultimo_dia_pagado": liquidacion.ultimo_dia_pagado,
+                    "dias_por_pagar": liquidacion.dias_por_pagar,
+                    "estado": liquidacion.estado,
+                    "total_bruto": liquidacion.total_bruto,
+                    "total_deducciones": liquidacion.total_deducciones,
+                    "total_neto": liquidacion.total_neto,
+                    "errores_calculo": liquidacion.errores_calculo or {},
+                    "advertencias_calculo": liquidacion.advertencias_calculo or [],
+                    "creado_por": self.usuario,
+                }
+            )
+            detalles.extend(
+                {
+                    "id": generador_de_codigos_unicos(),
+                    "liquidacion_id": liquidacion.id,
+                    "tipo": detalle.tipo,
+                    "codigo": detalle.codigo,
+                    "descripcion": detalle.descripcion,
+                    "monto": detalle.monto,
+                    "orden": detalle.orden,
+                    "creado_por": self.usuario,
+                }
+                for detalle in liquidacion.detalles
+            )
+
+        for tabla, rows in ((Liquidacion.__table__, filas), (LiquidacionDetalle.__table__, detalles)):
+            for inicio in range(0, len(rows), BULK_CHUNK_SIZE):
+                db.session.execute(insert(tabla), rows[inicio : inicio + BULK_CHUNK_SIZE])
+
+    def _reportar_progreso(self) -> None:
+        if self.lote is None:
+            return
+        self.lote.empleados_procesados = len(self.result.liquidacion_ids)
+        self.lote.empleados_con_error = len(self.result.errores)
+        # New objects so the JSON columns are detected as changed
+        self.lote.errores = dict(self.result.errores)
+        self.lote.advertencias = dict(self.result.advertencias)
+
+
+def crear_lote_liquidaciones(
+    empleado_ids: Iterable[str],
+    concepto_id: str | None = None,
+    fecha_calculo: date | None = None,
+    usuario: str | None = None,
+) -> LiquidacionLote:
+    """Create a pending batch of liquidaciones, to be processed by ``procesar_lote_liquidaciones``."""
+    ids = list(dict.fromkeys(empleado_ids))
+    lote = LiquidacionLote(
+        concepto_id=concepto_id,
+        fecha_calculo=fecha_calculo or date.today(),
+        estado=LiquidacionLoteEstado.PENDIENTE,
+        empleado_ids=ids,
+        total_empleados=len(ids),
+        creado_por=usuario,
+    )
+    db.session.add(lote)
+    db.session.commit()
+    return lote
+
+
+def procesar_lote_liquidaciones(lote_id: str) -> LiquidacionLoteResult | None:
+    """Calculate every liquidacion of a pending batch.
+
+    The batch is claimed atomically (PENDIENTE to PROCESANDO), so a redelivered
+    or duplicated message never liquidates the same employees twice. If the
+    batch fails, the liquidaciones of completed chunks are kept, the batch is
+    set to ERROR and the failure is returned in ``error``.
+
+    Returns:
+        The batch result, or None when the batch does not exist or was already claimed.
+    """
+    claim = cast(
+        Any,
+        db.session.execute(
+            update(LiquidacionLote)
+            .where(LiquidacionLote.id == lote_id, LiquidacionLote.estado == LiquidacionLoteEstado.PENDIENTE)
+            .values(estado=LiquidacionLoteEstado.PROCESANDO, iniciado_en=datetime.now(timezone.utc))
+        ),
+    )
+    if getattr(claim, "rowcount", 0) != 1:
+        db.session.rollback()
+        return None
+    db.session.commit()
+
+    lote = db.session.get(LiquidacionLote, lote_id)
+
+    engine = LiquidacionBatchEngine(
+        lote.empleado_ids or [],
+        fecha_calculo=lote.fecha_calculo,
+        concepto_id=lote.concepto_id,
+        usuario=lote.creado_por,
+        lote=lote,
+    )
+    try:
+        return engine.ejecutar()
+    except Exception as e:
+        log.error("Error al procesar el lote de liquidaciones %s: %s", lote_id, e)
+        engine.result.error = f"{type(e).__name__}: {e}"
+        _marcar_lote_fallido(lote_id, engine.result.error)
+        return engine.result
+
+
+def _marcar_lote_fallido(lote_id: str, error: str) -> None:
+    """Discard the failed chunk and set the batch to ERROR, keeping committed chunks."""
+    db.session.rollback()
+    lote = db.session.get(LiquidacionLote, lote_id)
+    if lote is None:
+        return
+    lote.estado = LiquidacionLoteEstado.ERROR
+    lote.errores = {**(lote.errores or {}), "critical_error": [error]}
+    lote.completado_en = datetime.now(timezone.utc)
+    db.session.commit()
@@ -26,6 +26,7 @@ from coati_payroll.model import (
 )
 from coati_payroll.nomina_engine.repositories.config_repository import ConfigRepository
 from coati_payroll.nomina_engine.processors.loan_processor import LoanProcessor
+from .prefetch import LiquidacionPrefetch
 
 
 @dataclass(frozen=True)
@@ -38,32 +39,45 @@ class LiquidacionResult:
 class LiquidacionEngine:
     """Engine for calculating employee termination settlements (liquidaciones)."""
 
-    def __init__(self, empleado: Empleado, fecha_calculo: date | None = None, usuario: str | None = None):
+    def __init__(
+        self,
+        empleado: Empleado,
+        fecha_calculo: date | None = None,
+        usuario: str | None = None,
+        prefetch: LiquidacionPrefetch | None = None,
+    ):
         self.empleado = empleado
         self.fecha_calculo = fecha_calculo or date.today()
         self.usuario = usuario
+        self.prefetch = prefetch
+        self.loan_processor: LoanProcessor | None = None
         self.errors: list[str] = []
         self.warnings: list[str] = []
 
         self._config_repo = ConfigRepository(cast(Any, db.session))
 
     def _get_config(self) -> ConfiguracionCalculos:
-        return self._config_repo.get_for_empresa(self.empleado.empresa_id)
+        config = self.prefetch.get_config(self.empleado.empresa_id) if self.prefetch is not None else None
+        return config or self._config_repo.get_for_empresa(self.empleado.empresa_id)
 
     def determinar_ultimo_dia_pagado(self) -> date:
         """Get the last day covered by the employee's last applied/paid payroll."""
-        stmt = (
-            select(Nomina.periodo_fin)
-            .join(NominaEmpleado, NominaEmpleado.nomina_id == Nomina.id)
-            .where(
-                NominaEmpleado.empleado_id == self.empleado.id,
-                Nomina.estado.in_([NominaEstado.APLICADO, NominaEstado.PAGADO]),
-            )
-            .order_by(Nomina.periodo_fin.desc())
-            .limit(1)
+        found, ultimo = (
+            self.prefetch.get_ultimo_periodo_pagado(self.empleado.id) if self.prefetch is not None else (False, None)
         )
+        if not found:
+            stmt = (
+                select(Nomina.periodo_fin)
+                .join(NominaEmpleado, NominaEmpleado.nomina_id == Nomina.id)
+                .where(
+                    NominaEmpleado.empleado_id == self.empleado.id,
+                    Nomina.estado.in_([NominaEstado.APLICADO, NominaEstado.PAGADO]),
+                )
+                .order_by(Nomina.periodo_fin.desc())
+                .limit(1)
+            )
+            ultimo = db.session.execute(stmt).scalar_one_or_none()
 
-        ultimo = db.session.execute(stmt).scalar_one_or_none()
         if ultimo:
             return ultimo
 
@@ -83,8 +97,15 @@ class LiquidacionEngine:
         self.warnings.append("Modo de días de liquidación no reconocido; se usará calendario.")
         return int(config.liquidacion_factor_calendario)
 
-    def calcular(self, liquidacion: Liquidacion) -> Liquidacion | None:
-        """Calculate a liquidacion record in-place."""
+    def calcular(self, liquidacion: Liquidacion, diferir_abonos: bool = False) -> Liquidacion | None:
+        """Calculate a liquidacion record in-place.
+
+        Args:
+            liquidacion: Liquidacion to fill with its details and totals
+            diferir_abonos: Leave the loan and advance payments pending on
+                ``self.loan_processor`` instead of recording them, so the caller
+                can apply them once the liquidacion row has been inserted.
+        """
         config = self._get_config()
 
         liquidacion.total_bruto = Decimal("0.00")
@@ -134,7 +155,10 @@ class LiquidacionEngine:
             periodo_fin=self.fecha_calculo,
             liquidacion=liquidacion,
             calcular_interes=False,
+            apply_side_effects=not diferir_abonos,
+            prefetch=self.prefetch.adelantos if self.prefetch is not None else None,
         )
+        self.loan_processor = loan_processor
 
         prioridad_prestamos = config.liquidacion_prioridad_prestamos
         prioridad_adelantos = config.liquidacion_prioridad_adelantos
@@ -0,0 +1,95 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+
+"""Set-based prefetch of the data a batch of liquidaciones reads per employee."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Iterable, cast
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from coati_payroll.enums import NominaEstado
+from coati_payroll.model import ConfiguracionCalculos, Empleado, Nomina, NominaEmpleado
+from coati_payroll.nomina_engine.repositories.config_repository import ConfigRepository
+from coati_payroll.nomina_engine.repositories.payroll_prefetch import PREFETCH_CHUNK_SIZE, PayrollPrefetch
+
+
+class LiquidacionPrefetch:
+    """In-memory view of the rows ``LiquidacionEngine`` reads for each employee.
+
+    Calculating one liquidacion queries the employee's last applied payroll,
+    the company configuration and the pending loans and advances. ``load``
+    resolves them for a whole batch with a few grouped ``IN (...)`` queries and
+    one configuration lookup per company.
+
+    Lookups report whether the employee was prefetched, so the engine can fall
+    back to its own queries for anything else.
+    """
+
+    def __init__(self, session: Session, chunk_size: int = PREFETCH_CHUNK_SIZE):
+        self.session = session
+        self.chunk_size = chunk_size
+        self.adelantos = PayrollPrefetch(session, chunk_size=chunk_size)
+        self._empleado_ids: frozenset[str] = frozenset()
+        self._ultimos_periodos: dict[str, date] = {}
+        self._configuraciones: dict[str | None, ConfiguracionCalculos] = {}
+
+    def load(self, empleados: Iterable[Empleado]) -> "LiquidacionPrefetch":
+        """Load last paid periods, configurations and pending loans of the employees.
+
+        Args:
+            empleados: Employees that will be liquidated.
+
+        Returns:
+            This prefetch, for chaining.
+        """
+        empleados = list(empleados)
+        ids = sorted({empleado.id for empleado in empleados})
+        self._empleado_ids = frozenset(ids)
+
+        self._load_ultimos_periodos(ids)
+        self._load_configuraciones({empleado.empresa_id for empleado in empleados})
+        self.adelantos.load_adelantos(ids)
+        return self
+
+    # <-------------------- Lookups --------------------> #
+
+    def get_ultimo_periodo_pagado(self, empleado_id: str) -> tuple[bool, date | None]:
+        """Return ``(found, periodo_fin)`` of the employee's last applied or paid nomina.
+
+        ``found`` is False when the employee was not prefetched; ``periodo_fin``
+        is None when the employee has no applied or paid nomina.
+        """
+        if empleado_id not in self._empleado_ids:
+            return False, None
+        return True, self._ultimos_periodos.get(empleado_id)
+
+    def get_config(self, empresa_id: str | None) -> ConfiguracionCalculos | None:
+        """Return the prefetched calculation configuration of a company."""
+        return self._configuraciones.get(empresa_id)
+
+    # <-------------------- Loaders --------------------> #
+
+    def _load_ultimos_periodos(self, ids: list[str]) -> None:
+        ultimos: dict[str, date] = {}
+        for inicio in range(0, len(ids), self.chunk_size):
+            chunk = ids[inicio : inicio + self.chunk_size]
+            rows = self.session.execute(
+                select(NominaEmpleado.empleado_id, func.max(Nomina.periodo_fin))
+                .join(Nomina, Nomina.id == NominaEmpleado.nomina_id)
+                .filter(
+                    NominaEmpleado.empleado_id.in_(chunk),
+                    Nomina.estado.in_([NominaEstado.APLICADO, NominaEstado.PAGADO]),
+                )
+                .group_by(NominaEmpleado.empleado_id)
+            ).all()
+            ultimos.update({empleado_id: periodo_fin for empleado_id, periodo_fin in rows if periodo_fin})
+        self._ultimos_periodos = ultimos
+
+    def _load_configuraciones(self, empresa_ids: set[str | None]) -> None:
+        # One lookup per company, not per employee.
+        repo = ConfigRepository(cast(Any, self.session))
+        self._configuraciones = {empresa_id: repo.get_for_empresa(empresa_id) for empresa_id in empresa_ids}
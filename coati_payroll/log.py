@@ -10,7 +10,7 @@ from __future__ import annotations
 import logging
 from os import environ
 from sys import stdout
-from typing import Any, cast
+from typing import Any, Callable, cast
 
 # <-------------------------------------------------------------------------> #
 # Third-party libraries
@@ -135,3 +135,20 @@ def is_trace_enabled(*, force_refresh: bool = False, debug_flag: bool | None = N
     if force_refresh or _TRACE_ACTIVE is None:
         _TRACE_ACTIVE = _compute_trace_active(debug_flag)
     return _TRACE_ACTIVE
+
+
+def _log_trace(message: str) -> None:
+    """Emit an already built message at TRACE level."""
+    try:
+        log.log(TRACE_LEVEL_NUM, message)
+    except Exception:
+        pass
+
+
+def get_trace_sink() -> Callable[[str], None] | None:
+    """Return a callable that logs at TRACE level, or None when TRACE is disabled.
+
+    Callers build (translate and format) trace messages only when a sink is
+    returned, so tracing costs nothing in hot loops while it is off.
+    """
+    return _log_trace if is_trace_enabled() else None
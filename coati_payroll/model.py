@@ -18,7 +18,7 @@ from flask_login import UserMixin
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import TypeDecorator, JSON
 from sqlalchemy.ext.mutable import MutableDict
-from sqlalchemy.orm import validates
+from sqlalchemy.orm import object_session, validates
 from ulid import ULID
 
 # <-------------------------------------------------------------------------> #
@@ -32,7 +32,9 @@ from coati_payroll.enums import (
     CargaInicialEstado,
     EstadoAprobacion,
     LiquidacionEstado,
+    LiquidacionLoteEstado,
     NominaEstado,
+    NominaShardEstado,
     Periodicidad,
     TipoAcumulacionPrestacion,
     TipoUsuario,
@@ -91,6 +93,7 @@ FK_PRESTACION_ID = "prestacion.id"
 FK_EMPLEADO_ID = "empleado.id"
 FK_NOMINA_ID = "nomina.id"
 FK_REPORT_ID = "report.id"
+FK_SNAPSHOT_HASH = "snapshot_contenido.hash"
 
 
 # Utiliza orjon para serializar/deserializar JSON
@@ -877,6 +880,44 @@ class PlanillaEmpleado(database.Model, BaseTabla):
 
 
 # Nominas (ejecuciones de planillas)
+class SnapshotContenido(database.Model):
+    """Contenido inmutable de un snapshot, direccionado por el SHA-256 de su JSON canonico.
+
+    Las nominas referencian el contenido por hash, de modo que configuraciones,
+    tipos de cambio y catalogos identicos se guardan una sola vez.
+    """
+
+    __tablename__ = "snapshot_contenido"
+
+    hash = database.Column(database.String(64), primary_key=True)
+    tipo = database.Column(database.String(30), nullable=False)  # configuracion, tipos_cambio, catalogos
+    contenido = database.Column(JSON, nullable=False)
+    tamano = database.Column(database.Integer, nullable=False)  # Bytes del JSON canonico
+    timestamp = database.Column(database.DateTime, default=utc_now, nullable=False)
+
+
+def _snapshot_property(campo: str) -> property:
+    """Nomina snapshot read from the content store, or from the inline JSON column of older nominas.
+
+    Assigning a value stores it inline and drops the hash reference.
+    """
+    columna_hash = f"{campo}_hash"
+    columna_json = f"_{campo}"
+
+    def leer(self):
+        clave = getattr(self, columna_hash)
+        if clave is None:
+            return getattr(self, columna_json)
+        contenido = (object_session(self) or database.session).get(SnapshotContenido, clave)
+        return contenido.contenido if contenido is not None else None
+
+    def escribir(self, valor):
+        setattr(self, columna_json, valor)
+        setattr(self, columna_hash, None)
+
+    return property(leer, escribir)
+
+
 class Nomina(database.Model, BaseTabla):
     __tablename__ = "nomina"
 
@@ -917,12 +958,29 @@ class Nomina(database.Model, BaseTabla):
     # Recalculation consistency: Snapshot of calculation context
     # Stores immutable copy of all data needed to reproduce exact same calculation
     fecha_calculo_original = database.Column(database.Date, nullable=True)  # Original calculation date
-    configuracion_snapshot = database.Column(JSON, nullable=True)  # Company config at calculation time
-    tipos_cambio_snapshot = database.Column(JSON, nullable=True)  # Exchange rates used
-    catalogos_snapshot = database.Column(JSON, nullable=True)  # Percepciones/Deducciones/Prestaciones formulas
+    # Snapshots live in SnapshotContenido and are referenced by hash; the inline JSON
+    # columns hold the snapshots of nominas calculated before the content store existed.
+    configuracion_snapshot_hash = database.Column(
+        database.String(64), database.ForeignKey(FK_SNAPSHOT_HASH), nullable=True, index=True
+    )
+    tipos_cambio_snapshot_hash = database.Column(
+        database.String(64), database.ForeignKey(FK_SNAPSHOT_HASH), nullable=True, index=True
+    )
+    catalogos_snapshot_hash = database.Column(
+        database.String(64), database.ForeignKey(FK_SNAPSHOT_HASH), nullable=True, index=True
+    )
+    _configuracion_snapshot = database.Column("configuracion_snapshot", JSON, nullable=True)
+    _tipos_cambio_snapshot = database.Column("tipos_cambio_snapshot", JSON, nullable=True)
+    _catalogos_snapshot = database.Column("catalogos_snapshot", JSON, nullable=True)
+    configuracion_snapshot = _snapshot_property("configuracion_snapshot")  # Company config at calculation time
+    tipos_cambio_snapshot = _snapshot_property("tipos_cambio_snapshot")  # Exchange rates used
+    catalogos_snapshot = _snapshot_property("catalogos_snapshot")  # Percepciones/Deducciones/Prestaciones formulas
     es_recalculo = database.Column(database.Boolean, nullable=False, default=False)  # Flag if this is a recalculation
     nomina_original_id = database.Column(database.String(26), nullable=True)  # Reference to original if recalculated
 
+    # Execution profile: wall time and SQL statements per phase, per-employee percentiles
+    perfil_ejecucion = database.Column(JSON, nullable=True)
+
     planilla = database.relationship("Planilla", back_populates="nominas")
     nomina_empleados = database.relationship(
         "NominaEmpleado",
@@ -995,10 +1053,52 @@ class NominaProgress(database.Model, BaseTabla):
     log_procesamiento = database.Column(JSON, nullable=True)
     empleado_actual = database.Column(database.String(255), nullable=True)
     actualizado_en = database.Column(database.DateTime, nullable=True)
+    # Secuencia del último evento agregado en nomina_progress_evento
+    ultimo_evento = database.Column(database.Integer, nullable=False, default=0)
 
     nomina = database.relationship("Nomina", backref="progress")
 
 
+# Bitácora de progreso de una nómina: solo se agregan eventos, nunca se reescriben
+class NominaProgressEvento(database.Model, BaseTabla):
+    __tablename__ = "nomina_progress_evento"
+    __table_args__ = (
+        database.UniqueConstraint("nomina_id", "secuencia", name="uq_nomina_progress_evento_secuencia"),
+    )
+
+    nomina_id = database.Column(database.String(26), database.ForeignKey(FK_NOMINA_ID), nullable=False, index=True)
+    job_id = database.Column(database.String(64), nullable=True)
+    secuencia = database.Column(database.Integer, nullable=False)  # Cursor para leer solo eventos nuevos
+    empleado = database.Column(database.String(255), nullable=True)
+    status = database.Column(database.String(20), nullable=False)
+    message = database.Column(database.Text, nullable=True)
+
+
+# Fragmentos de empleados de una nómina procesados por workers en paralelo
+class NominaShard(database.Model, BaseTabla):
+    __tablename__ = "nomina_shard"
+    __table_args__ = (database.UniqueConstraint("nomina_id", "indice", name="uq_nomina_shard_nomina_indice"),)
+
+    nomina_id = database.Column(database.String(26), database.ForeignKey(FK_NOMINA_ID), nullable=False, index=True)
+    job_id = database.Column(database.String(64), nullable=True)
+    indice = database.Column(database.Integer, nullable=False)
+    estado = database.Column(database.String(20), nullable=False, default=NominaShardEstado.PENDIENTE)
+    empleado_ids = database.Column(JSON, nullable=False)  # Lista de IDs de empleados del fragmento
+    total_empleados = database.Column(database.Integer, nullable=False, default=0)
+    empleados_procesados = database.Column(database.Integer, nullable=False, default=0)
+    empleados_con_error = database.Column(database.Integer, nullable=False, default=0)
+    errores = database.Column(JSON, nullable=True)
+    advertencias = database.Column(JSON, nullable=True)
+    # Resultados por empleado necesarios para aplicar acumulados, vacaciones y préstamos al cerrar
+    resultados = database.Column(JSON, nullable=True)
+    iniciado_en = database.Column(database.DateTime, nullable=True)
+    completado_en = database.Column(database.DateTime, nullable=True)
+    # Tiempo y consultas SQL por fase del cálculo del fragmento; se combinan en Nomina.perfil_ejecucion
+    perfil_ejecucion = database.Column(JSON, nullable=True)
+
+    nomina = database.relationship("Nomina", backref="shards")
+
+
 class NominaEmpleado(database.Model, BaseTabla):
     __tablename__ = "nomina_empleado"
     __table_args__ = (database.Index("ix_nomina_empleado_nomina_empleado", "nomina_id", "empleado_id"),)
@@ -1067,12 +1167,36 @@ class LiquidacionConcepto(database.Model, BaseTabla):
     activo = database.Column(database.Boolean(), default=True, nullable=False)
 
 
+class LiquidacionLote(database.Model, BaseTabla):
+    """Liquidaciones of many employees calculated together by a background job."""
+
+    __tablename__ = "liquidacion_lote"
+
+    concepto_id = database.Column(database.String(26), database.ForeignKey("liquidacion_concepto.id"), nullable=True)
+    fecha_calculo = database.Column(database.Date, nullable=False, default=date.today)
+    estado = database.Column(database.String(30), nullable=False, default=LiquidacionLoteEstado.PENDIENTE)
+    empleado_ids = database.Column(JSON, nullable=False)  # Lista de IDs de empleados a liquidar
+    total_empleados = database.Column(database.Integer, nullable=False, default=0)
+    empleados_procesados = database.Column(database.Integer, nullable=False, default=0)
+    empleados_con_error = database.Column(database.Integer, nullable=False, default=0)
+    errores = database.Column(JSON, nullable=True)  # {empleado_id: [errores]}
+    advertencias = database.Column(JSON, nullable=True)  # {empleado_id: [advertencias]}
+    iniciado_en = database.Column(database.DateTime, nullable=True)
+    completado_en = database.Column(database.DateTime, nullable=True)
+
+    concepto = database.relationship("LiquidacionConcepto")
+    liquidaciones = database.relationship("Liquidacion", back_populates="lote")
+
+
 class Liquidacion(database.Model, BaseTabla):
     __tablename__ = "liquidacion"
     __table_args__ = (database.Index("ix_liquidacion_concepto_fk", "concepto_id"),)
 
     empleado_id = database.Column(database.String(26), database.ForeignKey(FK_EMPLEADO_ID), nullable=False, index=True)
     concepto_id = database.Column(database.String(26), database.ForeignKey("liquidacion_concepto.id"), nullable=True)
+    lote_id = database.Column(
+        database.String(26), database.ForeignKey("liquidacion_lote.id"), nullable=True, index=True
+    )
 
     fecha_calculo = database.Column(database.Date, nullable=False, default=date.today)
     ultimo_dia_pagado = database.Column(database.Date, nullable=True)
@@ -1091,6 +1215,7 @@ class Liquidacion(database.Model, BaseTabla):
 
     empleado = database.relationship("Empleado")
     concepto = database.relationship("LiquidacionConcepto")
+    lote = database.relationship("LiquidacionLote", back_populates="liquidaciones")
     detalles = database.relationship("LiquidacionDetalle", back_populates="liquidacion", cascade="all,delete-orphan")
 
 
@@ -2189,7 +2314,10 @@ class VacationAccount(database.Model, BaseTabla):
     policy = database.relationship("VacationPolicy", back_populates="accounts")
 
     # Current balance (calculated from ledger)
+    # Se mantiene de forma incremental con cada asiento del ledger; ledger_version
+    # cuenta los asientos ya reflejados en el saldo y permite verificarlo contra el ledger.
     current_balance = database.Column(database.Numeric(10, 4), nullable=False, default=Decimal("0.0000"))
+    ledger_version = database.Column(database.Integer, nullable=False, default=0)
 
     # Last accrual date (for automated accrual processing)
     last_accrual_date = database.Column(database.Date, nullable=True)
@@ -22,7 +22,13 @@ class BenefitCalculator:
 
     def calculate(self, emp_calculo: EmpleadoCalculo, planilla: Planilla, fecha_calculo: date) -> list[PrestacionItem]:
         """Calculate all benefits for an employee."""
-        prestaciones = []
+        return self.calculate_many([emp_calculo], planilla, fecha_calculo)[0]
+
+    def calculate_many(
+        self, emp_calculos: list[EmpleadoCalculo], planilla: Planilla, fecha_calculo: date
+    ) -> list[list[PrestacionItem]]:
+        """Calculate all benefits for many employees, one concept at a time."""
+        prestaciones: list[list[PrestacionItem]] = [[] for _ in emp_calculos]
         planilla_prestaciones = cast(list[Any], planilla.planilla_prestaciones)
 
         for planilla_prestacion in planilla_prestaciones:
@@ -40,8 +46,8 @@ class BenefitCalculator:
                 continue
 
             # Calculate benefit amount
-            monto = self.concept_calculator.calculate(
-                emp_calculo,
+            montos = self.concept_calculator.calculate_many(
+                emp_calculos,
                 prestacion.formula_tipo,
                 prestacion.monto_default,
                 prestacion.porcentaje,
@@ -54,17 +60,20 @@ class BenefitCalculator:
             )
 
             # Apply ceiling if defined
-            if prestacion.tope_aplicacion and monto > Decimal(str(prestacion.tope_aplicacion)):
-                monto = Decimal(str(prestacion.tope_aplicacion))
-
-            if monto > 0:
-                item = PrestacionItem(
-                    codigo=prestacion.codigo,
-                    nombre=prestacion.nombre,
-                    monto=monto,
-                    orden=planilla_prestacion.orden or 0,
-                    prestacion_id=prestacion.id,
-                )
-                prestaciones.append(item)
+            tope = Decimal(str(prestacion.tope_aplicacion)) if prestacion.tope_aplicacion else None
+
+            for items, monto in zip(prestaciones, montos):
+                if tope is not None and monto > tope:
+                    monto = tope
+
+                if monto > 0:
+                    item = PrestacionItem(
+                        codigo=prestacion.codigo,
+                        nombre=prestacion.nombre,
+                        monto=monto,
+                        orden=planilla_prestacion.orden or 0,
+                        prestacion_id=prestacion.id,
+                    )
+                    items.append(item)
 
         return prestaciones
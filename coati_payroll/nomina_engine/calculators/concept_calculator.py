@@ -17,14 +17,19 @@
 from __future__ import annotations
 
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Any
+from typing import Any, Sequence
 
 from coati_payroll.enums import FormulaType
 from coati_payroll.formula_engine import FormulaEngine, FormulaEngineError
-from coati_payroll.model import db, Deduccion, Prestacion, Percepcion, ReglaCalculo
+from coati_payroll.model import db
 from ..domain.employee_calculation import EmpleadoCalculo
+from ..repositories.concept_rule_index import ConceptRuleIndex
 from ..results.warning_collector import WarningCollectorProtocol
 
+CERO = Decimal("0.00")
+CENTAVO = Decimal("0.01")
+CIEN = Decimal("100")
+
 
 class ConceptCalculator:
     """Calculator for payroll concepts using Strategy pattern."""
@@ -34,6 +39,7 @@ class ConceptCalculator:
         self.warnings = warnings
         self.deducciones_snapshot: dict[str, Any] | None = None
         self.configuracion_snapshot: dict[str, Any] | None = None
+        self.rule_index: ConceptRuleIndex | None = None
 
     def calculate(
         self,
@@ -49,305 +55,274 @@ class ConceptCalculator:
         unidad_calculo: str | None = None,
     ) -> Decimal:
         """Calculate concept amount."""
-        normalized_formula_tipo = FormulaType.normalize(formula_tipo)
+        return self.calculate_many(
+            [emp_calculo],
+            formula_tipo,
+            monto_default,
+            porcentaje,
+            formula,
+            monto_override,
+            porcentaje_override,
+            codigo_concepto=codigo_concepto,
+            base_calculo=base_calculo,
+            unidad_calculo=unidad_calculo,
+        )[0]
+
+    def calculate_many(
+        self,
+        emp_calculos: Sequence[EmpleadoCalculo],
+        formula_tipo: str,
+        monto_default: Decimal | None,
+        porcentaje: Decimal | None,
+        formula: dict | None,
+        monto_override: Decimal | None,
+        porcentaje_override: Decimal | None,
+        codigo_concepto: str | None = None,
+        base_calculo: str | None = None,
+        unidad_calculo: str | None = None,
+    ) -> list[Decimal]:
+        """Calculate one concept for many employees, in the order of ``emp_calculos``.
+
+        Simple formula types (fixed amounts, percentages, hours and days) are
+        evaluated column-wise: the concept's parameters are converted once and
+        applied to every employee's base with the same Decimal operations and
+        ROUND_HALF_UP rounding as a single calculation. Formula and
+        calculation-rule concepts compile their schema once and run it over
+        every employee's inputs with ``FormulaEngine.execute_many``.
+        """
+        montos = self._calculate_column(
+            emp_calculos,
+            formula_tipo,
+            monto_default,
+            porcentaje,
+            monto_override,
+            porcentaje_override,
+            codigo_concepto,
+            base_calculo,
+        )
+        if montos is None:
+            if FormulaType.normalize(formula_tipo) == FormulaType.FORMULA:
+                montos = self._calculate_formula_column(emp_calculos, formula)
+            else:
+                montos = self._calculate_regla_calculo_column(emp_calculos, codigo_concepto)
+
+        # Ensure calculated amounts are never negative
+        for posicion, monto_calculado in enumerate(montos):
+            if monto_calculado < 0:
+                self.warnings.append(
+                    f"Concepto '{codigo_concepto or 'desconocido'}': ConfiguraciÃ³n incorrecta resultÃ³ en "
+                    f"monto negativo ({monto_calculado}). Ajustando a 0.00. "
+                    f"Verifique la configuraciÃ³n del concepto (porcentaje o monto)."
+                )
+                montos[posicion] = CERO
+
+        return montos
+
+    def _calculate_column(
+        self,
+        emp_calculos: Sequence[EmpleadoCalculo],
+        formula_tipo: str,
+        monto_default: Decimal | None,
+        porcentaje: Decimal | None,
+        monto_override: Decimal | None,
+        porcentaje_override: Decimal | None,
+        codigo_concepto: str | None,
+        base_calculo: str | None,
+    ) -> list[Decimal] | None:
+        """Evaluate a simple concept for every employee, or return None for formula types."""
         # Use overrides if provided
         if monto_override:
-            monto_calculado = Decimal(str(monto_override))
-        elif porcentaje_override:
-            monto_calculado = (emp_calculo.salario_base * Decimal(str(porcentaje_override)) / Decimal("100")).quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
-            )
-        else:
-            match normalized_formula_tipo or formula_tipo:
-                case FormulaType.FIJO:
-                    monto_calculado = Decimal(str(monto_default or 0))
-
-                case FormulaType.PORCENTAJE_SALARIO | FormulaType.PORCENTAJE:
-                    if porcentaje:
-                        monto_calculado = (
-                            emp_calculo.salario_base * Decimal(str(porcentaje)) / Decimal("100")
-                        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                    else:
-                        monto_calculado = Decimal("0.00")
-
-                case FormulaType.PORCENTAJE_BRUTO:
-                    if porcentaje:
-                        monto_calculado = (
-                            emp_calculo.salario_bruto * Decimal(str(porcentaje)) / Decimal("100")
-                        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                    else:
-                        monto_calculado = Decimal("0.00")
-
-                case FormulaType.HORAS:
-                    monto_calculado = self._calculate_hours(emp_calculo, porcentaje, codigo_concepto, base_calculo)
-
-                case FormulaType.DIAS:
-                    monto_calculado = self._calculate_days(emp_calculo, porcentaje, codigo_concepto, base_calculo)
-
-                case FormulaType.FORMULA:
-                    monto_calculado = self._calculate_formula(emp_calculo, formula, codigo_concepto)
-
-                case FormulaType.REGLA_CALCULO:
-                    monto_calculado = self._calculate_regla_calculo(emp_calculo, codigo_concepto)
-
-                case _:
-                    monto_calculado = Decimal(str(monto_default or 0))
+            return [Decimal(str(monto_override))] * len(emp_calculos)
+        if porcentaje_override:
+            return self._percentage_column([emp.salario_base for emp in emp_calculos], porcentaje_override)
 
-        # Ensure calculated amounts are never negative
-        if monto_calculado < 0:
-            self.warnings.append(
-                f"Concepto '{codigo_concepto or 'desconocido'}': ConfiguraciÃ³n incorrecta resultÃ³ en "
-                f"monto negativo ({monto_calculado}). Ajustando a 0.00. "
-                f"Verifique la configuraciÃ³n del concepto (porcentaje o monto)."
-            )
-            return Decimal("0.00")
+        match FormulaType.normalize(formula_tipo) or formula_tipo:
+            case FormulaType.FIJO:
+                return [Decimal(str(monto_default or 0))] * len(emp_calculos)
+
+            case FormulaType.PORCENTAJE_SALARIO | FormulaType.PORCENTAJE:
+                return self._percentage_column([emp.salario_base for emp in emp_calculos], porcentaje)
+
+            case FormulaType.PORCENTAJE_BRUTO:
+                return self._percentage_column([emp.salario_bruto for emp in emp_calculos], porcentaje)
+
+            case FormulaType.HORAS:
+                return self._calculate_hours_column(emp_calculos, porcentaje, codigo_concepto, base_calculo)
 
-        return monto_calculado
+            case FormulaType.DIAS:
+                return self._calculate_days_column(emp_calculos, porcentaje, codigo_concepto, base_calculo)
 
-    def _calculate_hours(
+            case FormulaType.FORMULA | FormulaType.REGLA_CALCULO:
+                return None
+
+            case _:
+                return [Decimal(str(monto_default or 0))] * len(emp_calculos)
+
+    @staticmethod
+    def _percentage_column(bases: list[Decimal], porcentaje: Decimal | None) -> list[Decimal]:
+        if not porcentaje:
+            return [CERO] * len(bases)
+        factor = Decimal(str(porcentaje))
+        return [(base * factor / CIEN).quantize(CENTAVO, rounding=ROUND_HALF_UP) for base in bases]
+
+    def _novelty_column(self, emp_calculos: Sequence[EmpleadoCalculo], codigo_concepto: str | None) -> list[Decimal]:
+        """Return each employee's novelty quantity for the concept (0 when absent)."""
+        if not codigo_concepto:
+            return [CERO] * len(emp_calculos)
+        return [emp.novedades.get(codigo_concepto, CERO) for emp in emp_calculos]
+
+    def _calculate_hours_column(
         self,
-        emp_calculo: EmpleadoCalculo,
+        emp_calculos: Sequence[EmpleadoCalculo],
         porcentaje: Decimal | None,
         codigo_concepto: str | None,
         base_calculo: str | None,
-    ) -> Decimal:
+    ) -> list[Decimal]:
         """Calculate based on hours."""
-        if not codigo_concepto or codigo_concepto not in emp_calculo.novedades:
-            return Decimal("0.00")
-
-        horas = emp_calculo.novedades[codigo_concepto]
-        if horas <= 0:
-            return Decimal("0.00")
-
-        # Determine base for calculation
-        if base_calculo == "salario_bruto":
-            base = emp_calculo.salario_bruto
-        else:
-            base = emp_calculo.salario_mensual
+        horas_column = self._novelty_column(emp_calculos, codigo_concepto)
+        if all(horas <= 0 for horas in horas_column):
+            return [CERO] * len(emp_calculos)
 
         # Calculate hourly rate using configuration
-        config = self._get_config(emp_calculo.planilla.empresa_id)
+        config = self._get_config(emp_calculos[0].planilla.empresa_id)
         dias_base = Decimal(str(config.dias_mes_nomina))
         horas_dia = Decimal(str(config.horas_jornada_diaria))
-        tasa_hora = (base / dias_base / horas_dia).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-        # Apply percentage
-        if porcentaje:
-            tasa_hora = (tasa_hora * Decimal(str(porcentaje)) / Decimal("100")).quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
-            )
-
-        # Calculate total for hours
-        return (tasa_hora * horas).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-    def _calculate_days(
+        factor = Decimal(str(porcentaje)) if porcentaje else None
+
+        montos = []
+        for emp_calculo, horas in zip(emp_calculos, horas_column):
+            if horas <= 0:
+                montos.append(CERO)
+                continue
+            # Determine base for calculation
+            base = emp_calculo.salario_bruto if base_calculo == "salario_bruto" else emp_calculo.salario_mensual
+            tasa_hora = (base / dias_base / horas_dia).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+            # Apply percentage
+            if factor is not None:
+                tasa_hora = (tasa_hora * factor / CIEN).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+            # Calculate total for hours
+            montos.append((tasa_hora * horas).quantize(CENTAVO, rounding=ROUND_HALF_UP))
+        return montos
+
+    def _calculate_days_column(
         self,
-        emp_calculo: EmpleadoCalculo,
+        emp_calculos: Sequence[EmpleadoCalculo],
         porcentaje: Decimal | None,
         codigo_concepto: str | None,
         base_calculo: str | None,
-    ) -> Decimal:
+    ) -> list[Decimal]:
         """Calculate based on days."""
-        if not codigo_concepto or codigo_concepto not in emp_calculo.novedades:
-            return Decimal("0.00")
-
-        dias = emp_calculo.novedades[codigo_concepto]
-        if dias <= 0:
-            return Decimal("0.00")
-
-        # Determine base for calculation
-        if base_calculo == "salario_bruto":
-            base = emp_calculo.salario_bruto
-        else:
-            base = emp_calculo.salario_mensual
+        dias_column = self._novelty_column(emp_calculos, codigo_concepto)
+        if all(dias <= 0 for dias in dias_column):
+            return [CERO] * len(emp_calculos)
 
         # Calculate daily rate using configuration
-        config = self._get_config(emp_calculo.planilla.empresa_id)
+        config = self._get_config(emp_calculos[0].planilla.empresa_id)
         dias_base = Decimal(str(config.dias_mes_nomina))
-        tasa_dia = (base / dias_base).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-        # Apply percentage
-        if porcentaje:
-            tasa_dia = (tasa_dia * Decimal(str(porcentaje)) / Decimal("100")).quantize(
-                Decimal("0.01"), rounding=ROUND_HALF_UP
-            )
-
-        # Calculate total for days
-        return (tasa_dia * dias).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-    def _calculate_formula(
-        self, emp_calculo: EmpleadoCalculo, formula: dict | None, codigo_concepto: str | None
-    ) -> Decimal:
+        factor = Decimal(str(porcentaje)) if porcentaje else None
+
+        montos = []
+        for emp_calculo, dias in zip(emp_calculos, dias_column):
+            if dias <= 0:
+                montos.append(CERO)
+                continue
+            # Determine base for calculation
+            base = emp_calculo.salario_bruto if base_calculo == "salario_bruto" else emp_calculo.salario_mensual
+            tasa_dia = (base / dias_base).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+            # Apply percentage
+            if factor is not None:
+                tasa_dia = (tasa_dia * factor / CIEN).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+            # Calculate total for days
+            montos.append((tasa_dia * dias).quantize(CENTAVO, rounding=ROUND_HALF_UP))
+        return montos
+
+    def _calculate_formula_column(self, emp_calculos: Sequence[EmpleadoCalculo], formula: dict | None) -> list[Decimal]:
         """Calculate using formula engine."""
         if not formula or not isinstance(formula, dict):
-            return Decimal("0.00")
-
-        try:
-            # Merge variables with formula inputs
-            inputs = {**emp_calculo.variables_calculo}
-            inputs["salario_bruto"] = emp_calculo.salario_bruto
-            inputs["total_percepciones"] = emp_calculo.total_percepciones
-            inputs["total_deducciones"] = emp_calculo.total_deducciones
-
-            # Map generic formula input sources to input names when present
-            for input_def in formula.get("inputs", []) if isinstance(formula.get("inputs"), list) else []:
-                name = input_def.get("name")
-                source = input_def.get("source")
-                if not name or not source:
-                    continue
-                if source in inputs:
-                    inputs[name] = inputs[source]
-                    continue
-                # Support dotted notation for potential namespaced sources (e.g., "novedad.HORAS_EXTRA")
-                # Extract the last segment after the final dot as a fallback lookup key
-                if "." in source:
-                    source_key = source.split(".")[-1]
-                    if source_key in inputs:
-                        inputs[name] = inputs[source_key]
-
-            # Calculate before-tax deductions already processed in this period
-            deducciones_antes_impuesto_periodo = Decimal("0.00")
-            for ded in emp_calculo.deducciones:
-                if not ded.deduccion_id:
-                    continue
-                ded_metadata = self._get_deduccion_metadata(ded.deduccion_id)
-                if ded_metadata and ded_metadata.get("antes_impuesto"):
-                    deducciones_antes_impuesto_periodo += ded.monto
-            inputs["deducciones_antes_impuesto_periodo"] = deducciones_antes_impuesto_periodo
-            # Legacy alias for backward compatibility (deprecated but kept to avoid breaking existing schemas)
-            inputs["inss_periodo"] = deducciones_antes_impuesto_periodo
-            # New generic aliases (preferred for new schemas)
-            inputs["pre_tax_deductions"] = deducciones_antes_impuesto_periodo
-            inputs["social_security_deduction"] = deducciones_antes_impuesto_periodo
-
-            engine = FormulaEngine(formula)
-            result = engine.execute(inputs)
-            return Decimal(str(result.get("output", 0))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        except FormulaEngineError as e:
-            self.warnings.append(f"Error en f\u00f3rmula: {str(e)}")
-            return Decimal("0.00")
-
-    def _calculate_regla_calculo(self, emp_calculo: EmpleadoCalculo, codigo_concepto: str | None) -> Decimal:
-        """Calculate using ReglaCalculo from snapshot (if available) or live DB."""
-        # First try to get ReglaCalculo from snapshot (for reproducibility)
-        regla_schema = None
-        regla_codigo = None
-        if self.deducciones_snapshot and codigo_concepto:
-            deduccion_data = self.deducciones_snapshot.get(codigo_concepto)
-            if deduccion_data and "regla_calculo" in deduccion_data:
-                regla_schema = deduccion_data["regla_calculo"]["esquema_json"]
-                regla_codigo = deduccion_data["regla_calculo"]["codigo"]
-        # Fallback to live DB if not in snapshot (backward compatibility)
-        if not regla_schema:
-            from sqlalchemy import select, or_
-
-            regla = None
-            # If caller passed a concept ID, try direct FK matches first.
-            if codigo_concepto:
-                regla = db.session.execute(
-                    select(ReglaCalculo).filter(
-                        ReglaCalculo.activo.is_(True),
-                        or_(
-                            ReglaCalculo.deduccion_id == codigo_concepto,
-                            ReglaCalculo.prestacion_id == codigo_concepto,
-                            ReglaCalculo.percepcion_id == codigo_concepto,
-                        ),
-                    )
-                ).scalar_one_or_none()
-            if not regla and codigo_concepto:
-                # Fallback by concept code -> concept ID -> linked ReglaCalculo.
-                deduccion_obj = db.session.execute(
-                    select(Deduccion).filter_by(codigo=codigo_concepto)
-                ).scalar_one_or_none()
-                if deduccion_obj:
-                    regla = db.session.execute(
-                        select(ReglaCalculo)
-                        .filter_by(deduccion_id=deduccion_obj.id)
-                        .filter(ReglaCalculo.activo.is_(True))
-                    ).scalar_one_or_none()
-            if not regla and codigo_concepto:
-                prestacion_obj = db.session.execute(
-                    select(Prestacion).filter_by(codigo=codigo_concepto)
-                ).scalar_one_or_none()
-                if prestacion_obj:
-                    regla = db.session.execute(
-                        select(ReglaCalculo)
-                        .filter_by(prestacion_id=prestacion_obj.id)
-                        .filter(ReglaCalculo.activo.is_(True))
-                    ).scalar_one_or_none()
-            if not regla and codigo_concepto:
-                percepcion_obj = db.session.execute(
-                    select(Percepcion).filter_by(codigo=codigo_concepto)
-                ).scalar_one_or_none()
-                if percepcion_obj:
-                    regla = db.session.execute(
-                        select(ReglaCalculo)
-                        .filter_by(percepcion_id=percepcion_obj.id)
-                        .filter(ReglaCalculo.activo.is_(True))
-                    ).scalar_one_or_none()
-            if regla and regla.esquema_json:
-                regla_schema = regla.esquema_json
-                regla_codigo = regla.codigo
+            return [CERO] * len(emp_calculos)
+        return self._execute_schema_column(emp_calculos, formula, "Error en f\u00f3rmula")
+
+    def _calculate_regla_calculo_column(
+        self, emp_calculos: Sequence[EmpleadoCalculo], codigo_concepto: str | None
+    ) -> list[Decimal]:
+        """Calculate using the ReglaCalculo resolved by the run's rule index (snapshot first, then live rules)."""
+        regla = self._get_rule_index().resolve_rule(codigo_concepto)
+        regla_schema, regla_codigo = regla if regla else (None, None)
         if not regla_schema:
             self.warnings.append(f"ReglaCalculo no encontrada para concepto {codigo_concepto}")
-            return Decimal("0.00")
+            return [CERO] * len(emp_calculos)
+        return self._execute_schema_column(emp_calculos, regla_schema, f"Error en ReglaCalculo {regla_codigo}")
+
+    def _execute_schema_column(
+        self, emp_calculos: Sequence[EmpleadoCalculo], schema: dict, prefijo_error: str
+    ) -> list[Decimal]:
+        """Run one schema over every employee; a failing employee gets 0.00 and a warning."""
         try:
-            # Prepare inputs for formula engine
-            inputs = {**emp_calculo.variables_calculo}
-            inputs["salario_bruto"] = emp_calculo.salario_bruto
-            inputs["total_percepciones"] = emp_calculo.total_percepciones
-            inputs["total_deducciones"] = emp_calculo.total_deducciones
-            # Map generic schema input sources to input names when present.
-            # This keeps parity with FormulaType.FORMULA behavior and allows
-            # rules that declare sources such as "nomina.salario_bruto".
-            if isinstance(regla_schema, dict):
-                for input_def in regla_schema.get("inputs", []):
-                    name = input_def.get("name")
-                    source = input_def.get("source")
-                    if not name or not source:
-                        continue
-                    if source in inputs:
-                        inputs[name] = inputs[source]
-                        continue
-                    if "." in source:
-                        source_key = source.split(".")[-1]
-                        if source_key in inputs:
-                            inputs[name] = inputs[source_key]
-            # Calculate before-tax deductions already processed
-            deducciones_antes_impuesto_periodo = Decimal("0.00")
-            for ded in emp_calculo.deducciones:
-                if not ded.deduccion_id:
-                    continue
-                ded_metadata = self._get_deduccion_metadata(ded.deduccion_id)
-                if ded_metadata and ded_metadata.get("antes_impuesto"):
-                    deducciones_antes_impuesto_periodo += ded.monto
-            inputs["deducciones_antes_impuesto_periodo"] = deducciones_antes_impuesto_periodo
-            # Legacy alias for backward compatibility (deprecated but kept to avoid breaking existing schemas)
-            inputs["inss_periodo"] = deducciones_antes_impuesto_periodo
-            # New generic aliases (preferred for new schemas)
-            inputs["pre_tax_deductions"] = deducciones_antes_impuesto_periodo
-            inputs["social_security_deduction"] = deducciones_antes_impuesto_periodo
-            engine = FormulaEngine(regla_schema)
-            result = engine.execute(inputs)
-            return Decimal(str(result.get("output", 0))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            engine = FormulaEngine(schema)
         except FormulaEngineError as e:
-            self.warnings.append(f"Error en ReglaCalculo {regla_codigo}: {str(e)}")
-            return Decimal("0.00")
+            for _emp_calculo in emp_calculos:
+                self.warnings.append(f"{prefijo_error}: {str(e)}")
+            return [CERO] * len(emp_calculos)
+
+        montos = []
+        for outcome in engine.execute_many([self._formula_inputs(emp, schema) for emp in emp_calculos]):
+            if outcome.error is not None:
+                self.warnings.append(f"{prefijo_error}: {str(outcome.error)}")
+                montos.append(CERO)
+            else:
+                montos.append(Decimal(str(outcome.output or 0)).quantize(CENTAVO, rounding=ROUND_HALF_UP))
+        return montos
+
+    def _formula_inputs(self, emp_calculo: EmpleadoCalculo, schema: dict) -> dict[str, Any]:
+        """Build the formula engine inputs of one employee."""
+        # Merge variables with formula inputs
+        inputs = {**emp_calculo.variables_calculo}
+        inputs["salario_bruto"] = emp_calculo.salario_bruto
+        inputs["total_percepciones"] = emp_calculo.total_percepciones
+        inputs["total_deducciones"] = emp_calculo.total_deducciones
+
+        # Map generic schema input sources to input names when present, so rules
+        # may declare sources such as "nomina.salario_bruto".
+        entradas = schema.get("inputs") if isinstance(schema, dict) else None
+        for input_def in entradas if isinstance(entradas, list) else []:
+            name = input_def.get("name")
+            source = input_def.get("source")
+            if not name or not source:
+                continue
+            if source in inputs:
+                inputs[name] = inputs[source]
+                continue
+            # Support dotted notation for potential namespaced sources (e.g., "novedad.HORAS_EXTRA")
+            # Extract the last segment after the final dot as a fallback lookup key
+            if "." in source:
+                source_key = source.split(".")[-1]
+                if source_key in inputs:
+                    inputs[name] = inputs[source_key]
+
+        # Calculate before-tax deductions already processed in this period
+        deducciones_antes_impuesto_periodo = Decimal("0.00")
+        for ded in emp_calculo.deducciones:
+            if not ded.deduccion_id:
+                continue
+            ded_metadata = self._get_deduccion_metadata(ded.deduccion_id)
+            if ded_metadata and ded_metadata.get("antes_impuesto"):
+                deducciones_antes_impuesto_periodo += ded.monto
+        inputs["deducciones_antes_impuesto_periodo"] = deducciones_antes_impuesto_periodo
+        # Legacy alias for backward compatibility (deprecated but kept to avoid breaking existing schemas)
+        inputs["inss_periodo"] = deducciones_antes_impuesto_periodo
+        # New generic aliases (preferred for new schemas)
+        inputs["pre_tax_deductions"] = deducciones_antes_impuesto_periodo
+        inputs["social_security_deduction"] = deducciones_antes_impuesto_periodo
+        return inputs
 
     def _get_deduccion_metadata(self, deduccion_id: str) -> dict[str, Any] | None:
-        deducciones_snapshot = self.deducciones_snapshot
-        # pylint: disable=unsupported-membership-test,unsubscriptable-object
-        if isinstance(deducciones_snapshot, dict) and deduccion_id in deducciones_snapshot:
-            return deducciones_snapshot[deduccion_id]
-
-        deduccion_obj = db.session.get(Deduccion, deduccion_id)
-        if not deduccion_obj:
-            return None
-
-        return {
-            "antes_impuesto": deduccion_obj.antes_impuesto,
-            "es_impuesto": deduccion_obj.es_impuesto,
-        }
+        return self._get_rule_index().get_deduccion_metadata(deduccion_id)
+
+    def _get_rule_index(self) -> ConceptRuleIndex:
+        """Return the rule index of the bound snapshot, loading it once per run."""
+        if self.rule_index is None or self.rule_index.deducciones_snapshot is not self.deducciones_snapshot:
+            self.rule_index = ConceptRuleIndex(db.session, self.deducciones_snapshot).load()
+        return self.rule_index
 
     def _get_config(self, empresa_id: str) -> Any:
         if self.configuracion_snapshot:
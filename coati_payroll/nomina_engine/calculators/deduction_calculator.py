@@ -23,7 +23,13 @@ class DeductionCalculator:
 
     def calculate(self, emp_calculo: EmpleadoCalculo, planilla: Planilla, fecha_calculo: date) -> list[DeduccionItem]:
         """Calculate all deductions for an employee, applying priority order."""
-        deducciones_pendientes: list[DeduccionItem] = []
+        return self.calculate_many([emp_calculo], planilla, fecha_calculo)[0]
+
+    def calculate_many(
+        self, emp_calculos: list[EmpleadoCalculo], planilla: Planilla, fecha_calculo: date
+    ) -> list[list[DeduccionItem]]:
+        """Calculate all deductions for many employees, one concept at a time, applying priority order."""
+        pendientes: list[list[DeduccionItem]] = [[] for _ in emp_calculos]
         planilla_deducciones = cast(list[Any], planilla.planilla_deducciones)
 
         for planilla_deduccion in planilla_deducciones:
@@ -34,18 +40,24 @@ class DeductionCalculator:
             if not deduccion or not deduccion.activo:
                 continue
 
-            if deduccion.codigo in emp_calculo.inasistencia_codigos_descuento:
-                continue
-
             # Check validity dates
             if deduccion.vigente_desde and deduccion.vigente_desde > fecha_calculo:
                 continue
             if deduccion.valido_hasta and deduccion.valido_hasta < fecha_calculo:
                 continue
 
+            # Employees whose absence discount already covers this deduction skip it
+            posiciones = [
+                posicion
+                for posicion, emp_calculo in enumerate(emp_calculos)
+                if deduccion.codigo not in emp_calculo.inasistencia_codigos_descuento
+            ]
+            if not posiciones:
+                continue
+
             # Calculate deduction amount
-            monto = self.concept_calculator.calculate(
-                emp_calculo,
+            montos = self.concept_calculator.calculate_many(
+                [emp_calculos[posicion] for posicion in posiciones],
                 deduccion.formula_tipo,
                 deduccion.monto_default,
                 deduccion.porcentaje,
@@ -57,17 +69,27 @@ class DeductionCalculator:
                 unidad_calculo=getattr(deduccion, "unidad_calculo", None),
             )
 
-            if monto > 0:
-                item = DeduccionItem(
-                    codigo=deduccion.codigo,
-                    nombre=deduccion.nombre,
-                    monto=monto,
-                    prioridad=planilla_deduccion.prioridad,
-                    es_obligatoria=planilla_deduccion.es_obligatoria,
-                    deduccion_id=deduccion.id,
-                )
-                deducciones_pendientes.append(item)
-
+            for posicion, monto in zip(posiciones, montos):
+                if monto > 0:
+                    item = DeduccionItem(
+                        codigo=deduccion.codigo,
+                        nombre=deduccion.nombre,
+                        monto=monto,
+                        prioridad=planilla_deduccion.prioridad,
+                        es_obligatoria=planilla_deduccion.es_obligatoria,
+                        deduccion_id=deduccion.id,
+                    )
+                    pendientes[posicion].append(item)
+
+        return [
+            self._apply_priority(emp_calculo, deducciones_pendientes)
+            for emp_calculo, deducciones_pendientes in zip(emp_calculos, pendientes)
+        ]
+
+    def _apply_priority(
+        self, emp_calculo: EmpleadoCalculo, deducciones_pendientes: list[DeduccionItem]
+    ) -> list[DeduccionItem]:
+        """Apply an employee's deductions in priority order while gross salary lasts."""
         # Sort by priority (lower number = higher priority)
         deducciones_pendientes.sort(key=lambda x: x.prioridad)
 
@@ -21,7 +21,13 @@ class PerceptionCalculator:
 
     def calculate(self, emp_calculo: EmpleadoCalculo, planilla: Planilla, fecha_calculo: date) -> list[PercepcionItem]:
         """Calculate all perceptions for an employee."""
-        percepciones = []
+        return self.calculate_many([emp_calculo], planilla, fecha_calculo)[0]
+
+    def calculate_many(
+        self, emp_calculos: list[EmpleadoCalculo], planilla: Planilla, fecha_calculo: date
+    ) -> list[list[PercepcionItem]]:
+        """Calculate all perceptions for many employees, one concept at a time."""
+        percepciones: list[list[PercepcionItem]] = [[] for _ in emp_calculos]
         planilla_percepciones = cast(list[Any], planilla.planilla_percepciones)
 
         for planilla_percepcion in planilla_percepciones:
@@ -39,8 +45,8 @@ class PerceptionCalculator:
                 continue
 
             # Calculate perception amount
-            monto = self.concept_calculator.calculate(
-                emp_calculo,
+            montos = self.concept_calculator.calculate_many(
+                emp_calculos,
                 percepcion.formula_tipo,
                 percepcion.monto_default,
                 percepcion.porcentaje,
@@ -52,15 +58,16 @@ class PerceptionCalculator:
                 unidad_calculo=getattr(percepcion, "unidad_calculo", None),
             )
 
-            if monto > 0:
-                item = PercepcionItem(
-                    codigo=percepcion.codigo,
-                    nombre=percepcion.nombre,
-                    monto=monto,
-                    orden=planilla_percepcion.orden or 0,
-                    gravable=percepcion.gravable,
-                    percepcion_id=percepcion.id,
-                )
-                percepciones.append(item)
+            for items, monto in zip(percepciones, montos):
+                if monto > 0:
+                    item = PercepcionItem(
+                        codigo=percepcion.codigo,
+                        nombre=percepcion.nombre,
+                        monto=monto,
+                        orden=planilla_percepcion.orden or 0,
+                        gravable=percepcion.gravable,
+                        percepcion_id=percepcion.id,
+                    )
+                    items.append(item)
 
         return percepciones
@@ -45,6 +45,75 @@ class EmpleadoCalculo:
         self.inasistencia_codigos_descuento: set[str] = set()
         self.variables_calculo: dict[str, Any] = {}
 
+    def to_payload(self) -> dict[str, Any]:
+        """Return the calculation results as plain JSON-serializable data.
+
+        Decimals are kept as strings so no precision is lost. ORM objects are
+        referenced by ID only; ``variables_calculo`` is not included.
+        """
+        return {
+            "empleado_id": self.empleado.id,
+            "salario_base": str(self.salario_base),
+            "salario_mensual": str(self.salario_mensual),
+            "salario_bruto": str(self.salario_bruto),
+            "salario_neto": str(self.salario_neto),
+            "salario_neto_inasistencia": str(self.salario_neto_inasistencia),
+            "total_percepciones": str(self.total_percepciones),
+            "total_deducciones": str(self.total_deducciones),
+            "total_prestaciones": str(self.total_prestaciones),
+            "tipo_cambio": str(self.tipo_cambio),
+            "moneda_origen_id": self.moneda_origen_id,
+            "inasistencia_dias": str(self.inasistencia_dias),
+            "inasistencia_horas": str(self.inasistencia_horas),
+            "inasistencia_descuento": str(self.inasistencia_descuento),
+            "inasistencia_codigos_descuento": sorted(self.inasistencia_codigos_descuento),
+            "novedades": {codigo: str(valor) for codigo, valor in self.novedades.items()},
+            "percepciones": [
+                [p.codigo, p.nombre, str(p.monto), p.orden, p.gravable, p.percepcion_id] for p in self.percepciones
+            ],
+            "deducciones": [
+                [d.codigo, d.nombre, str(d.monto), d.prioridad, d.es_obligatoria, d.deduccion_id, d.tipo]
+                for d in self.deducciones
+            ],
+            "prestaciones": [[p.codigo, p.nombre, str(p.monto), p.orden, p.prestacion_id] for p in self.prestaciones],
+        }
+
+    @classmethod
+    def from_payload(cls, empleado: Empleado, planilla: Planilla, payload: dict[str, Any]) -> "EmpleadoCalculo":
+        """Rebuild a calculation from the output of ``to_payload``."""
+        emp_calculo = cls(empleado, planilla)
+        for campo in (
+            "salario_base",
+            "salario_mensual",
+            "salario_bruto",
+            "salario_neto",
+            "salario_neto_inasistencia",
+            "total_percepciones",
+            "total_deducciones",
+            "total_prestaciones",
+            "tipo_cambio",
+            "inasistencia_dias",
+            "inasistencia_horas",
+            "inasistencia_descuento",
+        ):
+            setattr(emp_calculo, campo, Decimal(payload[campo]))
+        emp_calculo.moneda_origen_id = payload.get("moneda_origen_id")
+        emp_calculo.inasistencia_codigos_descuento = set(payload.get("inasistencia_codigos_descuento", []))
+        emp_calculo.novedades = {codigo: Decimal(valor) for codigo, valor in payload.get("novedades", {}).items()}
+        emp_calculo.percepciones = [
+            PercepcionItem(codigo, nombre, Decimal(monto), orden, gravable, percepcion_id)
+            for codigo, nombre, monto, orden, gravable, percepcion_id in payload.get("percepciones", [])
+        ]
+        emp_calculo.deducciones = [
+            DeduccionItem(codigo, nombre, Decimal(monto), prioridad, es_obligatoria, deduccion_id, tipo)
+            for codigo, nombre, monto, prioridad, es_obligatoria, deduccion_id, tipo in payload.get("deducciones", [])
+        ]
+        emp_calculo.prestaciones = [
+            PrestacionItem(codigo, nombre, Decimal(monto), orden, prestacion_id)
+            for codigo, nombre, monto, orden, prestacion_id in payload.get("prestaciones", [])
+        ]
+        return emp_calculo
+
 
 # Alias for backward compatibility
 EmployeeCalculation = EmpleadoCalculo
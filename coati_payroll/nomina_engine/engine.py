@@ -13,6 +13,15 @@ from .domain.employee_calculation import EmpleadoCalculo
 from .services.payroll_execution_service import PayrollExecutionService
 
 
+def _configured_processes() -> int:
+    """Return PAYROLL_CALCULATION_PROCESSES from the application config, if any."""
+    from flask import current_app, has_app_context
+
+    if not has_app_context():
+        return 0
+    return int(current_app.config.get("PAYROLL_CALCULATION_PROCESSES", 0) or 0)
+
+
 class NominaEngine:
     """Engine for executing payroll runs.
 
@@ -34,6 +43,7 @@ class NominaEngine:
         fecha_calculo: date | None = None,
         usuario: str | None = None,
         excluded_nomina_id: str | None = None,
+        procesos: int | None = None,
     ):
         """Initialize the payroll engine.
 
@@ -45,6 +55,8 @@ class NominaEngine:
             usuario: Username executing the payroll
             excluded_nomina_id: Nomina ID to ignore in overlap/duplicate validation.
                 Used by recalculation flow to ignore the source nomina.
+            procesos: Worker processes used to calculate employees (defaults to
+                PAYROLL_CALCULATION_PROCESSES; 0 or 1 calculates in this process)
         """
         self.planilla = planilla
         self.periodo_inicio = periodo_inicio
@@ -52,6 +64,7 @@ class NominaEngine:
         self.fecha_calculo = fecha_calculo or date.today()
         self.usuario = usuario
         self.excluded_nomina_id = excluded_nomina_id
+        self.procesos = procesos if procesos is not None else _configured_processes()
         self.nomina: Nomina | None = None
         self.empleados_calculo: list[EmpleadoCalculo] = []
         self.errors: list[str] = []
@@ -107,6 +120,7 @@ class NominaEngine:
             self.fecha_calculo,
             self.usuario,
             excluded_nomina_id=self.excluded_nomina_id,
+            processes=self.procesos,
         )
 
         self.nomina = nomina
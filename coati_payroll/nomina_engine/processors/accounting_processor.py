@@ -7,83 +7,158 @@ from __future__ import annotations
 from datetime import date
 from decimal import Decimal
 
+from typing import Any
+
+from sqlalchemy import insert, select
+
 from coati_payroll.enums import TipoAcumulacionPrestacion, TipoDetalle
-from coati_payroll.model import db, Nomina, NominaEmpleado, NominaDetalle, Prestacion, PrestacionAcumulada
+from coati_payroll.model import (
+    db,
+    generador_de_codigos_unicos,
+    Nomina,
+    NominaEmpleado,
+    NominaDetalle,
+    Prestacion,
+    PrestacionAcumulada,
+)
 from ..domain.employee_calculation import EmpleadoCalculo
 from ..utils.rounding import round_money
 
+# Rows per multi-row INSERT / IN (...) list when persisting employees in bulk.
+BULK_CHUNK_SIZE = 500
+
 
 class AccountingProcessor:
     """Processor for creating accounting records (NominaEmpleado, NominaDetalle, PrestacionAcumulada)."""
 
     def create_nomina_empleado(self, emp_calculo: EmpleadoCalculo, nomina: Nomina) -> NominaEmpleado:
         """Create NominaEmpleado record with all details."""
-        empleado = emp_calculo.empleado
-
-        nomina_empleado = NominaEmpleado(
-            nomina_id=nomina.id,
-            empleado_id=empleado.id,
-            salario_bruto=round_money(emp_calculo.salario_bruto),
-            total_ingresos=round_money(emp_calculo.total_percepciones),
-            total_deducciones=round_money(emp_calculo.total_deducciones),
-            salario_neto=round_money(emp_calculo.salario_neto),
-            moneda_origen_id=emp_calculo.moneda_origen_id,
-            tipo_cambio_aplicado=emp_calculo.tipo_cambio,
-            cargo_snapshot=empleado.cargo,
-            area_snapshot=empleado.area,
-            centro_costos_snapshot=empleado.centro_costos,
-            sueldo_base_historico=round_money(emp_calculo.salario_base),
-            inasistencia_dias=emp_calculo.inasistencia_dias,
-            inasistencia_horas=emp_calculo.inasistencia_horas,
-            inasistencia_descuento=round_money(emp_calculo.inasistencia_descuento),
-        )
+        nomina_empleado = NominaEmpleado(**self._nomina_empleado_values(emp_calculo, nomina))
         db.session.add(nomina_empleado)
         db.session.flush()
 
-        # Create detail records for perceptions
-        orden = 0
+        for valores in self._nomina_detalle_values(emp_calculo, nomina_empleado.id):
+            db.session.add(NominaDetalle(**valores))
+
+        return nomina_empleado
+
+    def create_nomina_empleados_bulk(
+        self, empleados_calculo: list[EmpleadoCalculo], nomina: Nomina
+    ) -> list[NominaEmpleado]:
+        """Create NominaEmpleado and NominaDetalle records for many employees at once.
+
+        IDs are generated client-side, so every row of a chunk goes out in one
+        multi-row INSERT through Core instead of one ORM flush per employee.
+
+        Returns:
+            The persisted NominaEmpleado records, in the order of ``empleados_calculo``.
+        """
+        if not empleados_calculo:
+            return []
+
+        # Flush pending ORM state (the nomina itself) once, before the Core inserts
+        db.session.flush()
+        ids: list[str] = []
+        with db.session.no_autoflush:
+            for inicio in range(0, len(empleados_calculo), BULK_CHUNK_SIZE):
+                empleados_rows: list[dict[str, Any]] = []
+                detalles_rows: list[dict[str, Any]] = []
+                for emp_calculo in empleados_calculo[inicio : inicio + BULK_CHUNK_SIZE]:
+                    nomina_empleado_id = generador_de_codigos_unicos()
+                    ids.append(nomina_empleado_id)
+                    empleados_rows.append(
+                        {"id": nomina_empleado_id, **self._nomina_empleado_values(emp_calculo, nomina)}
+                    )
+                    detalles_rows.extend(
+                        {"id": generador_de_codigos_unicos(), **valores}
+                        for valores in self._nomina_detalle_values(emp_calculo, nomina_empleado_id)
+                    )
+
+                db.session.execute(insert(NominaEmpleado.__table__), empleados_rows)
+                for detalle_inicio in range(0, len(detalles_rows), BULK_CHUNK_SIZE):
+                    lote = detalles_rows[detalle_inicio : detalle_inicio + BULK_CHUNK_SIZE]
+                    db.session.execute(insert(NominaDetalle.__table__), lote)
+
+            # Rows bypassed the unit of work: load them back for callers that need ORM objects
+            por_id: dict[str, NominaEmpleado] = {}
+            for inicio in range(0, len(ids), BULK_CHUNK_SIZE):
+                por_id.update(
+                    (nomina_empleado.id, nomina_empleado)
+                    for nomina_empleado in db.session.execute(
+                        select(NominaEmpleado).filter(NominaEmpleado.id.in_(ids[inicio : inicio + BULK_CHUNK_SIZE]))
+                    )
+                    .scalars()
+                    .all()
+                )
+        db.session.expire(nomina, ["nomina_empleados"])
+
+        return [por_id[nomina_empleado_id] for nomina_empleado_id in ids]
+
+    @staticmethod
+    def _nomina_empleado_values(emp_calculo: EmpleadoCalculo, nomina: Nomina) -> dict[str, Any]:
+        empleado = emp_calculo.empleado
+        return {
+            "nomina_id": nomina.id,
+            "empleado_id": empleado.id,
+            "salario_bruto": round_money(emp_calculo.salario_bruto),
+            "total_ingresos": round_money(emp_calculo.total_percepciones),
+            "total_deducciones": round_money(emp_calculo.total_deducciones),
+            "salario_neto": round_money(emp_calculo.salario_neto),
+            "moneda_origen_id": emp_calculo.moneda_origen_id,
+            "tipo_cambio_aplicado": emp_calculo.tipo_cambio,
+            "cargo_snapshot": empleado.cargo,
+            "area_snapshot": empleado.area,
+            "centro_costos_snapshot": empleado.centro_costos,
+            "sueldo_base_historico": round_money(emp_calculo.salario_base),
+            "inasistencia_dias": emp_calculo.inasistencia_dias,
+            "inasistencia_horas": emp_calculo.inasistencia_horas,
+            "inasistencia_descuento": round_money(emp_calculo.inasistencia_descuento),
+        }
+
+    @staticmethod
+    def _nomina_detalle_values(emp_calculo: EmpleadoCalculo, nomina_empleado_id: str) -> list[dict[str, Any]]:
+        """Detail lines in display order: perceptions, deductions, then benefits."""
+        detalles: list[dict[str, Any]] = []
         for percepcion in emp_calculo.percepciones:
-            orden += 1
-            detalle = NominaDetalle(
-                nomina_empleado_id=nomina_empleado.id,
-                tipo=TipoDetalle.INGRESO,
-                codigo=percepcion.codigo,
-                descripcion=percepcion.nombre,
-                monto=round_money(percepcion.monto),
-                orden=orden,
-                percepcion_id=percepcion.percepcion_id,
+            detalles.append(
+                {
+                    "tipo": TipoDetalle.INGRESO,
+                    "codigo": percepcion.codigo,
+                    "descripcion": percepcion.nombre,
+                    "monto": round_money(percepcion.monto),
+                    "percepcion_id": percepcion.percepcion_id,
+                    "deduccion_id": None,
+                    "prestacion_id": None,
+                }
             )
-            db.session.add(detalle)
-
-        # Create detail records for deductions
         for deduccion in emp_calculo.deducciones:
-            orden += 1
-            detalle = NominaDetalle(
-                nomina_empleado_id=nomina_empleado.id,
-                tipo=TipoDetalle.DEDUCCION,
-                codigo=deduccion.codigo,
-                descripcion=deduccion.nombre,
-                monto=round_money(deduccion.monto),
-                orden=orden,
-                deduccion_id=deduccion.deduccion_id,
+            detalles.append(
+                {
+                    "tipo": TipoDetalle.DEDUCCION,
+                    "codigo": deduccion.codigo,
+                    "descripcion": deduccion.nombre,
+                    "monto": round_money(deduccion.monto),
+                    "percepcion_id": None,
+                    "deduccion_id": deduccion.deduccion_id,
+                    "prestacion_id": None,
+                }
             )
-            db.session.add(detalle)
-
-        # Create detail records for benefits
         for prestacion in emp_calculo.prestaciones:
-            orden += 1
-            detalle = NominaDetalle(
-                nomina_empleado_id=nomina_empleado.id,
-                tipo=TipoDetalle.PRESTACION,
-                codigo=prestacion.codigo,
-                descripcion=prestacion.nombre,
-                monto=round_money(prestacion.monto),
-                orden=orden,
-                prestacion_id=prestacion.prestacion_id,
+            detalles.append(
+                {
+                    "tipo": TipoDetalle.PRESTACION,
+                    "codigo": prestacion.codigo,
+                    "descripcion": prestacion.nombre,
+                    "monto": round_money(prestacion.monto),
+                    "percepcion_id": None,
+                    "deduccion_id": None,
+                    "prestacion_id": prestacion.prestacion_id,
+                }
             )
-            db.session.add(detalle)
-
-        return nomina_empleado
+        for orden, detalle in enumerate(detalles, 1):
+            detalle["nomina_empleado_id"] = nomina_empleado_id
+            detalle["orden"] = orden
+        return detalles
 
     def create_prestacion_transactions(
         self,
@@ -108,8 +183,6 @@ class AccountingProcessor:
                 continue
 
             # Get the previous balance
-            from sqlalchemy import select
-
             ultima_transaccion = (
                 db.session.execute(
                     select(PrestacionAcumulada)
@@ -170,7 +243,7 @@ class AccountingProcessor:
         This method is idempotent: for each (nomina, empleado, prestacion) tuple it
         creates at most one transaction of type ``adicion``.
         """
-        from sqlalchemy import func, select
+        from sqlalchemy import func
 
         periodo_anio = nomina.periodo_fin.year
         periodo_mes = nomina.periodo_fin.month
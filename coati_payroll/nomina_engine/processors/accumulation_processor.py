@@ -5,12 +5,14 @@
 from __future__ import annotations
 
 from datetime import date
+from decimal import Decimal
 from typing import Any
 
 from coati_payroll.model import db, Deduccion
 from coati_payroll.i18n import _
 from ..domain.employee_calculation import EmpleadoCalculo
 from ..repositories.acumulado_repository import AcumuladoRepository
+from ..utils.fiscal_period import fiscal_period_start
 from ..validators import ValidationError
 
 
@@ -31,28 +33,13 @@ class AccumulationProcessor:
         empresa_primer_anio_nomina: int | None = None,
     ) -> None:
         """Update accumulated annual values for the employee."""
-        if not planilla.tipo_planilla:
+        periodo_fiscal_inicio = fiscal_period_start(planilla, periodo_inicio)
+        if periodo_fiscal_inicio is None:
             return
 
         tipo_planilla = planilla.tipo_planilla
         empleado = emp_calculo.empleado
-
-        # Calculate fiscal period
-        anio = periodo_inicio.year
-        mes_inicio = int(planilla.mes_inicio_fiscal or tipo_planilla.mes_inicio_fiscal)
-        dia_inicio = tipo_planilla.dia_inicio_fiscal
-
-        if periodo_inicio.month < mes_inicio:
-            anio -= 1
-
-        periodo_fiscal_inicio = date(anio, mes_inicio, dia_inicio)
-
-        # Determine empresa_id
-        empresa_id = planilla.empresa_id or empleado.empresa_id
-        if not empresa_id:
-            raise ValidationError(
-                _("No se puede crear acumulado anual: ni la planilla ni el empleado tienen empresa_id asignado")
-            )
+        empresa_id = self._empresa_id(planilla, empleado)
 
         # Get or create accumulated record
         acumulado = self.acumulado_repo.get_or_create(
@@ -63,7 +50,7 @@ class AccumulationProcessor:
             periodo_inicio=periodo_inicio,
             empresa_primer_mes_nomina=empresa_primer_mes_nomina,
             empresa_primer_anio_nomina=empresa_primer_anio_nomina,
-            fiscal_start_month=mes_inicio,
+            fiscal_start_month=periodo_fiscal_inicio.month,
             periodos_por_anio=int(tipo_planilla.periodos_por_anio or 12),
         )
 
@@ -71,19 +58,88 @@ class AccumulationProcessor:
         acumulado.reset_mes_acumulado_if_needed(periodo_fin)
 
         # Update accumulated values
-        acumulado.salario_bruto_acumulado += emp_calculo.salario_bruto
-        acumulado.salario_acumulado_mes += emp_calculo.salario_bruto
+        deltas = self._calculate_deltas(emp_calculo, deducciones_snapshot)
+        acumulado.salario_bruto_acumulado += deltas["salario_bruto"]
+        acumulado.salario_acumulado_mes += deltas["salario_bruto"]
         acumulado.periodos_procesados += 1
         acumulado.ultimo_periodo_procesado = periodo_fin
+        acumulado.salario_gravable_acumulado += deltas["salario_gravable"]
+        acumulado.impuesto_retenido_acumulado += deltas["impuesto_retenido"]
+        acumulado.deducciones_antes_impuesto_acumulado += deltas["deducciones_antes_impuesto"]
+
+    def update_accumulations_bulk(
+        self,
+        empleados_calculo: list[EmpleadoCalculo],
+        planilla: Any,
+        periodo_inicio: date,
+        periodo_fin: date,
+        deducciones_snapshot: dict[str, dict] | None = None,
+        empresa_primer_mes_nomina: int | None = None,
+        empresa_primer_anio_nomina: int | None = None,
+    ) -> None:
+        """Update accumulated annual values for every employee of a payroll run.
+
+        Existing rows come from the repository's fiscal-period cache (already
+        filled while building calculation variables); missing rows are
+        inserted and all of them incremented with set-based statements.
+        """
+        periodo_fiscal_inicio = fiscal_period_start(planilla, periodo_inicio)
+        if periodo_fiscal_inicio is None or not empleados_calculo:
+            return
+
+        tipo_planilla = planilla.tipo_planilla
+
+        # Group by company: employees fall back to their own empresa_id
+        por_empresa: dict[str, list[EmpleadoCalculo]] = {}
+        for emp_calculo in empleados_calculo:
+            por_empresa.setdefault(self._empresa_id(planilla, emp_calculo.empleado), []).append(emp_calculo)
+
+        for empresa_id, grupo in por_empresa.items():
+            existentes = self.acumulado_repo.load_period(
+                [emp_calculo.empleado.id for emp_calculo in grupo], tipo_planilla.id, empresa_id, periodo_fiscal_inicio
+            )
+            deltas: dict[str, dict[str, Decimal]] = {}
+            nuevos: dict[str, dict[str, Any]] = {}
+            for emp_calculo in grupo:
+                empleado = emp_calculo.empleado
+                deltas[empleado.id] = self._calculate_deltas(emp_calculo, deducciones_snapshot)
+                if empleado.id not in existentes:
+                    nuevos[empleado.id] = self.acumulado_repo.initial_values(
+                        empleado,
+                        tipo_planilla.id,
+                        empresa_id,
+                        periodo_fiscal_inicio,
+                        periodo_inicio=periodo_inicio,
+                        empresa_primer_mes_nomina=empresa_primer_mes_nomina,
+                        empresa_primer_anio_nomina=empresa_primer_anio_nomina,
+                        fiscal_start_month=periodo_fiscal_inicio.month,
+                        periodos_por_anio=int(tipo_planilla.periodos_por_anio or 12),
+                    )
+            self.acumulado_repo.apply_deltas(
+                tipo_planilla.id, empresa_id, periodo_fiscal_inicio, periodo_fin, deltas, nuevos
+            )
+
+    def _empresa_id(self, planilla: Any, empleado: Any) -> str:
+        empresa_id = planilla.empresa_id or empleado.empresa_id
+        if not empresa_id:
+            raise ValidationError(
+                _("No se puede crear acumulado anual: ni la planilla ni el empleado tienen empresa_id asignado")
+            )
+        return empresa_id
 
+    def _calculate_deltas(
+        self, emp_calculo: EmpleadoCalculo, deducciones_snapshot: dict[str, dict] | None
+    ) -> dict[str, Decimal]:
+        """Return the amounts one payroll period adds to the employee's acumulado."""
         # Calculate gravable income (perceptions that are gravable)
         salario_gravable = emp_calculo.salario_base
         for percepcion in emp_calculo.percepciones:
             if percepcion.gravable:
                 salario_gravable += percepcion.monto
-        acumulado.salario_gravable_acumulado += salario_gravable
 
         # Sum up before-tax deductions and taxes
+        impuesto_retenido = Decimal("0.00")
+        deducciones_antes_impuesto = Decimal("0.00")
         for deduccion in emp_calculo.deducciones:
             if not deduccion.deduccion_id:
                 continue
@@ -98,6 +154,13 @@ class AccumulationProcessor:
             if not deduccion_metadata:
                 continue
             if deduccion_metadata.get("es_impuesto"):
-                acumulado.impuesto_retenido_acumulado += deduccion.monto
+                impuesto_retenido += deduccion.monto
             elif deduccion_metadata.get("antes_impuesto"):
-                acumulado.deducciones_antes_impuesto_acumulado += deduccion.monto
+                deducciones_antes_impuesto += deduccion.monto
+
+        return {
+            "salario_bruto": emp_calculo.salario_bruto,
+            "salario_gravable": salario_gravable,
+            "impuesto_retenido": impuesto_retenido,
+            "deducciones_antes_impuesto": deducciones_antes_impuesto,
+        }
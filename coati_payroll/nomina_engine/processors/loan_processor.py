@@ -8,10 +8,12 @@ from datetime import date
 from decimal import Decimal
 from typing import cast
 
-from coati_payroll.model import db, Adelanto, AdelantoAbono, Nomina, Liquidacion
+from coati_payroll.model import db, Adelanto, AdelantoAbono, ConfiguracionCalculos, Nomina, Liquidacion
 from coati_payroll.enums import AdelantoEstado, TipoInteres
 from coati_payroll.i18n import _
 from ..domain.calculation_items import DeduccionItem
+from ..repositories.config_repository import ConfigRepository
+from ..repositories.payroll_prefetch import PayrollPrefetch
 
 
 class LoanProcessor:
@@ -26,6 +28,7 @@ class LoanProcessor:
         liquidacion: Liquidacion | None = None,
         calcular_interes: bool = True,
         apply_side_effects: bool = True,
+        prefetch: PayrollPrefetch | None = None,
     ):
         self.nomina = nomina
         self.liquidacion = liquidacion
@@ -34,7 +37,11 @@ class LoanProcessor:
         self.periodo_fin = periodo_fin
         self.calcular_interes = calcular_interes
         self.apply_side_effects = apply_side_effects
+        # Prefetched rows are only safe while balances are not being mutated
+        # in the loop, i.e. when side effects are deferred.
+        self.prefetch = prefetch if not apply_side_effects else None
         self._pending_actions: list[tuple[Adelanto, Decimal, bool]] = []
+        self._interest_config: ConfiguracionCalculos | None = None
 
     def process_loans(
         self, empleado_id: str, saldo_disponible: Decimal, aplicar_prestamos: bool, prioridad_prestamos: int
@@ -46,20 +53,22 @@ class LoanProcessor:
             return deductions
 
         # Get active loans
-        from sqlalchemy import select
-
-        prestamos = list(
-            db.session.execute(
-                select(Adelanto).filter(
-                    Adelanto.empleado_id == empleado_id,
-                    Adelanto.estado == AdelantoEstado.APROBADO,
-                    Adelanto.saldo_pendiente > 0,
-                    Adelanto.deduccion_id.isnot(None),  # Only loans, not advances
+        prestamos = self.prefetch.get_loans(empleado_id) if self.prefetch is not None else None
+        if prestamos is None:
+            from sqlalchemy import select
+
+            prestamos = list(
+                db.session.execute(
+                    select(Adelanto).filter(
+                        Adelanto.empleado_id == empleado_id,
+                        Adelanto.estado == AdelantoEstado.APROBADO,
+                        Adelanto.saldo_pendiente > 0,
+                        Adelanto.deduccion_id.isnot(None),  # Only loans, not advances
+                    )
                 )
+                .scalars()
+                .all()
             )
-            .scalars()
-            .all()
-        )
 
         for prestamo in prestamos:
             if saldo_disponible <= 0:
@@ -103,20 +112,22 @@ class LoanProcessor:
         if not aplicar_adelantos:
             return deductions
 
-        from sqlalchemy import select
-
-        adelantos = list(
-            db.session.execute(
-                select(Adelanto).filter(
-                    Adelanto.empleado_id == empleado_id,
-                    Adelanto.estado == AdelantoEstado.APROBADO,
-                    Adelanto.saldo_pendiente > 0,
-                    Adelanto.deduccion_id.is_(None),  # Only advances, not loans
+        adelantos = self.prefetch.get_advances(empleado_id) if self.prefetch is not None else None
+        if adelantos is None:
+            from sqlalchemy import select
+
+            adelantos = list(
+                db.session.execute(
+                    select(Adelanto).filter(
+                        Adelanto.empleado_id == empleado_id,
+                        Adelanto.estado == AdelantoEstado.APROBADO,
+                        Adelanto.saldo_pendiente > 0,
+                        Adelanto.deduccion_id.is_(None),  # Only advances, not loans
+                    )
                 )
+                .scalars()
+                .all()
             )
-            .scalars()
-            .all()
-        )
 
         for adelanto in adelantos:
             if saldo_disponible <= 0:
@@ -184,6 +195,7 @@ class LoanProcessor:
             fecha_desde=fecha_desde,
             fecha_hasta=fecha_hasta,
             tipo_interes=tipo_interes,
+            config=self._get_interest_config(),
         )
 
         if interes_calculado <= 0:
@@ -212,6 +224,13 @@ class LoanProcessor:
         prestamo.interes_acumulado = (prestamo.interes_acumulado or Decimal("0.00")) + interes_calculado
         prestamo.fecha_ultimo_calculo_interes = fecha_hasta
 
+    def _get_interest_config(self) -> ConfiguracionCalculos:
+        """Resolve the financial configuration of the payroll's company once for every loan."""
+        if self._interest_config is None:
+            empresa_id = self.nomina.planilla.empresa_id if self.nomina and self.nomina.planilla else None
+            self._interest_config = ConfigRepository(db.session).get_for_empresa(empresa_id)
+        return self._interest_config
+
     def _record_payment(self, adelanto: Adelanto, monto: Decimal) -> None:
         """Record a payment towards a loan/advance."""
         if self.nomina:
@@ -241,6 +260,27 @@ class LoanProcessor:
         if adelanto.saldo_pendiente <= 0:
             adelanto.estado = AdelantoEstado.PAGADO
 
+    def pending_effects_payload(self) -> list[list]:
+        """Return deferred loan/advance effects as plain data (IDs and amounts)."""
+        return [
+            [adelanto.id, str(monto), requires_interest] for adelanto, monto, requires_interest in self._pending_actions
+        ]
+
+    def restore_pending_effects(self, payload: list[list]) -> None:
+        """Queue deferred effects produced by ``pending_effects_payload`` in another process."""
+        if not payload:
+            return
+
+        ids = {adelanto_id for adelanto_id, _, _ in payload}
+        adelantos = {
+            adelanto.id: adelanto
+            for adelanto in db.session.execute(db.select(Adelanto).filter(Adelanto.id.in_(ids))).scalars().all()
+        }
+        for adelanto_id, monto, requires_interest in payload:
+            adelanto = adelantos.get(adelanto_id)
+            if adelanto is not None:
+                self._pending_actions.append((adelanto, Decimal(monto), bool(requires_interest)))
+
     def apply_pending_effects(self) -> None:
         """Apply deferred loan/advance side effects after successful payroll."""
         if self.apply_side_effects or not self._pending_actions:
@@ -4,11 +4,16 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Iterable
+
 from coati_payroll.model import Planilla, Empleado, NominaEmpleado
 from coati_payroll.log import log
 from ..domain.employee_calculation import EmpleadoCalculo
 from ..results.warning_collector import WarningCollectorProtocol
 
+if TYPE_CHECKING:
+    from coati_payroll.vacation_service import VacationService
+
 
 class VacationProcessor:
     """Processor for vacation accrual and usage."""
@@ -30,6 +35,26 @@ class VacationProcessor:
         self.warnings = warnings if warnings is not None else []
         self.apply_side_effects = apply_side_effects
         self.snapshot = snapshot
+        self.vacation_service: VacationService | None = None
+
+    def _build_service(self) -> VacationService:
+        from coati_payroll.vacation_service import VacationService
+
+        return VacationService(
+            planilla=self.planilla,
+            periodo_inicio=self.periodo_inicio,
+            periodo_fin=self.periodo_fin,
+            apply_side_effects=self.apply_side_effects,
+            snapshot=self.snapshot,
+        )
+
+    def prepare(self, empleados: Iterable[Empleado], nomina_empleado_ids: Iterable[str] | None = None) -> None:
+        """Resolve vacation accounts and novelties for the whole planilla run at once.
+
+        Subsequent ``process_vacations`` calls share one planilla-scoped
+        VacationService instead of querying per employee.
+        """
+        self.vacation_service = self._build_service().preparar_lote(empleados, nomina_empleado_ids)
 
     def process_vacations(
         self, empleado: Empleado, emp_calculo: EmpleadoCalculo, nomina_empleado: NominaEmpleado
@@ -38,15 +63,7 @@ class VacationProcessor:
         from coati_payroll.nomina_engine.validators import ValidationError, NominaEngineError
 
         try:
-            from coati_payroll.vacation_service import VacationService
-
-            vacation_service = VacationService(
-                planilla=self.planilla,
-                periodo_inicio=self.periodo_inicio,
-                periodo_fin=self.periodo_fin,
-                apply_side_effects=self.apply_side_effects,
-                snapshot=self.snapshot,
-            )
+            vacation_service = self.vacation_service or self._build_service()
 
             resumen_before = vacation_service.obtener_resumen_vacaciones(empleado)
 
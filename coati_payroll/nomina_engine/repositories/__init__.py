@@ -9,6 +9,9 @@ from .acumulado_repository import AcumuladoRepository
 from .novelty_repository import NoveltyRepository
 from .exchange_rate_repository import ExchangeRateRepository
 from .config_repository import ConfigRepository
+from .payroll_prefetch import PayrollPrefetch
+from .concept_rule_index import ConceptRuleIndex
+from .snapshot_repository import SnapshotRepository
 
 __all__ = [
     "BaseRepository",
@@ -18,4 +21,7 @@ __all__ = [
     "NoveltyRepository",
     "ExchangeRateRepository",
     "ConfigRepository",
+    "PayrollPrefetch",
+    "ConceptRuleIndex",
+    "SnapshotRepository",
 ]
@@ -5,14 +5,41 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional
+from decimal import Decimal
+from typing import Any, Iterable, Optional
 
-from coati_payroll.model import AcumuladoAnual, Empleado
+from sqlalchemy import bindparam, case, insert, select, update
+from sqlalchemy.orm import Session
+
+from coati_payroll.model import AcumuladoAnual, Empleado, generador_de_codigos_unicos
 from .base_repository import BaseRepository
 
+# Keep IN (...) lists and executemany batches below the bind parameter limits of every backend.
+ACUMULADO_CHUNK_SIZE = 500
+
+# Columns that identify one accumulation row (uq_acumulado_empleado_tipo_empresa_periodo).
+_CLAVE_ACUMULADO = ("empleado_id", "tipo_planilla_id", "empresa_id", "periodo_fiscal_inicio")
+
+# Delta keys accepted by ``apply_deltas`` and the column each one increments.
+DELTA_COLUMNAS = {
+    "salario_bruto": "salario_bruto_acumulado",
+    "salario_gravable": "salario_gravable_acumulado",
+    "deducciones_antes_impuesto": "deducciones_antes_impuesto_acumulado",
+    "impuesto_retenido": "impuesto_retenido_acumulado",
+}
+
 
 class AcumuladoRepository(BaseRepository[AcumuladoAnual]):
-    """Repository for AcumuladoAnual operations."""
+    """Repository for AcumuladoAnual operations.
+
+    Keeps a per-run cache of the rows of each fiscal period, so the lookup
+    done while building calculation variables is reused when the same run
+    updates the accumulations.
+    """
+
+    def __init__(self, session: Session):
+        super().__init__(session)
+        self._periodos: dict[tuple[str, str, date], dict[str, AcumuladoAnual | None]] = {}
 
     def get_by_id(self, acumulado_id: str) -> Optional[AcumuladoAnual]:
         """Get acumulado by ID."""
@@ -31,8 +58,6 @@ class AcumuladoRepository(BaseRepository[AcumuladoAnual]):
         periodos_por_anio: int = 12,
     ) -> AcumuladoAnual:
         """Get or create acumulado for employee and fiscal period."""
-        from sqlalchemy import select
-
         acumulado = (
             self.session.execute(
                 select(AcumuladoAnual).filter(
@@ -47,46 +72,200 @@ class AcumuladoRepository(BaseRepository[AcumuladoAnual]):
         )
 
         if not acumulado:
-            from decimal import Decimal
-
-            periodo_fiscal_fin = date(
-                periodo_fiscal_inicio.year + 1, periodo_fiscal_inicio.month, periodo_fiscal_inicio.day
-            )
-
-            salario_inicial_acumulado = Decimal("0.00")
-            impuesto_retenido_inicial = Decimal("0.00")
-            periodos_iniciales = 0
-
-            if self._is_initial_company_period(
-                periodo_inicio=periodo_inicio,
-                empresa_primer_mes_nomina=empresa_primer_mes_nomina,
-                empresa_primer_anio_nomina=empresa_primer_anio_nomina,
-            ):
-                salario_inicial_acumulado = Decimal(str(empleado.salario_acumulado or 0))
-                impuesto_retenido_inicial = Decimal(str(empleado.impuesto_acumulado or 0))
-                periodos_iniciales = self._calculate_initial_processed_periods(
+            acumulado = AcumuladoAnual(
+                **self.initial_values(
+                    empleado,
+                    tipo_planilla_id,
+                    empresa_id,
+                    periodo_fiscal_inicio,
                     periodo_inicio=periodo_inicio,
+                    empresa_primer_mes_nomina=empresa_primer_mes_nomina,
+                    empresa_primer_anio_nomina=empresa_primer_anio_nomina,
                     fiscal_start_month=fiscal_start_month,
                     periodos_por_anio=periodos_por_anio,
                 )
-
-            acumulado = AcumuladoAnual(
-                empleado_id=empleado.id,
-                tipo_planilla_id=tipo_planilla_id,
-                empresa_id=empresa_id,
-                periodo_fiscal_inicio=periodo_fiscal_inicio,
-                periodo_fiscal_fin=periodo_fiscal_fin,
-                salario_bruto_acumulado=salario_inicial_acumulado,
-                salario_gravable_acumulado=Decimal("0.00"),
-                deducciones_antes_impuesto_acumulado=Decimal("0.00"),
-                impuesto_retenido_acumulado=impuesto_retenido_inicial,
-                periodos_procesados=periodos_iniciales,
-                salario_acumulado_mes=Decimal("0.00"),
             )
             self.session.add(acumulado)
 
         return acumulado
 
+    def initial_values(
+        self,
+        empleado: Empleado,
+        tipo_planilla_id: str,
+        empresa_id: str,
+        periodo_fiscal_inicio: date,
+        periodo_inicio: date | None = None,
+        empresa_primer_mes_nomina: int | None = None,
+        empresa_primer_anio_nomina: int | None = None,
+        fiscal_start_month: int = 1,
+        periodos_por_anio: int = 12,
+    ) -> dict[str, Any]:
+        """Return the column values of a new acumulado, bootstrapped in the company's initial period."""
+        periodo_fiscal_fin = date(
+            periodo_fiscal_inicio.year + 1, periodo_fiscal_inicio.month, periodo_fiscal_inicio.day
+        )
+
+        salario_inicial_acumulado = Decimal("0.00")
+        impuesto_retenido_inicial = Decimal("0.00")
+        periodos_iniciales = 0
+
+        if self._is_initial_company_period(
+            periodo_inicio=periodo_inicio,
+            empresa_primer_mes_nomina=empresa_primer_mes_nomina,
+            empresa_primer_anio_nomina=empresa_primer_anio_nomina,
+        ):
+            salario_inicial_acumulado = Decimal(str(empleado.salario_acumulado or 0))
+            impuesto_retenido_inicial = Decimal(str(empleado.impuesto_acumulado or 0))
+            periodos_iniciales = self._calculate_initial_processed_periods(
+                periodo_inicio=periodo_inicio,
+                fiscal_start_month=fiscal_start_month,
+                periodos_por_anio=periodos_por_anio,
+            )
+
+        return {
+            "empleado_id": empleado.id,
+            "tipo_planilla_id": tipo_planilla_id,
+            "empresa_id": empresa_id,
+            "periodo_fiscal_inicio": periodo_fiscal_inicio,
+            "periodo_fiscal_fin": periodo_fiscal_fin,
+            "salario_bruto_acumulado": salario_inicial_acumulado,
+            "salario_gravable_acumulado": Decimal("0.00"),
+            "deducciones_antes_impuesto_acumulado": Decimal("0.00"),
+            "impuesto_retenido_acumulado": impuesto_retenido_inicial,
+            "periodos_procesados": periodos_iniciales,
+            "salario_acumulado_mes": Decimal("0.00"),
+        }
+
+    def load_period(
+        self, empleado_ids: Iterable[str], tipo_planilla_id: str, empresa_id: str, periodo_fiscal_inicio: date
+    ) -> dict[str, AcumuladoAnual]:
+        """Return the existing acumulados of many employees for one fiscal period, keyed by empleado_id.
+
+        Employees already looked up in this run are answered from the cache;
+        the rest are loaded with chunked ``IN (...)`` queries.
+        """
+        cache = self._periodos.setdefault((tipo_planilla_id, empresa_id, periodo_fiscal_inicio), {})
+        faltantes = sorted({empleado_id for empleado_id in empleado_ids if empleado_id not in cache})
+        for inicio in range(0, len(faltantes), ACUMULADO_CHUNK_SIZE):
+            chunk = faltantes[inicio : inicio + ACUMULADO_CHUNK_SIZE]
+            cache.update(dict.fromkeys(chunk))
+            for acumulado in (
+                self.session.execute(
+                    select(AcumuladoAnual).filter(
+                        AcumuladoAnual.empleado_id.in_(chunk),
+                        AcumuladoAnual.tipo_planilla_id == tipo_planilla_id,
+                        AcumuladoAnual.empresa_id == empresa_id,
+                        AcumuladoAnual.periodo_fiscal_inicio == periodo_fiscal_inicio,
+                    )
+                )
+                .unique()
+                .scalars()
+                .all()
+            ):
+                cache[acumulado.empleado_id] = acumulado
+        return {empleado_id: acumulado for empleado_id, acumulado in cache.items() if acumulado is not None}
+
+    def clear_cache(self) -> None:
+        """Forget the fiscal periods loaded by ``load_period``."""
+        self._periodos.clear()
+
+    def apply_deltas(
+        self,
+        tipo_planilla_id: str,
+        empresa_id: str,
+        periodo_fiscal_inicio: date,
+        periodo_fin: date,
+        deltas: dict[str, dict[str, Decimal]],
+        nuevos: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        """Add one payroll period to the acumulados of many employees with set-based statements.
+
+        Rows in ``nuevos`` are inserted first, skipping any that another
+        transaction created meanwhile. Every row in ``deltas`` is then
+        incremented in the database (``col = col + :delta``) with a single
+        executemany UPDATE, so concurrent runs never overwrite each other's
+        totals. The monthly accumulation restarts when ``periodo_fin`` falls in
+        a different month than the last processed period.
+
+        Args:
+            tipo_planilla_id: Payroll type of the fiscal period.
+            empresa_id: Company of the fiscal period.
+            periodo_fiscal_inicio: Fiscal year start date.
+            periodo_fin: Last day of the payroll period being added.
+            deltas: Amounts per empleado_id, keyed like ``DELTA_COLUMNAS``.
+            nuevos: Column values from ``initial_values`` for employees without a row.
+        """
+        if not deltas:
+            return
+
+        tabla = AcumuladoAnual.__table__
+        clave = {
+            "tipo_planilla_id": tipo_planilla_id,
+            "empresa_id": empresa_id,
+            "periodo_fiscal_inicio": periodo_fiscal_inicio,
+        }
+
+        # Core statements bypass the unit of work: write pending ORM state first
+        self.session.flush()
+
+        nuevos_rows = [{"id": generador_de_codigos_unicos(), **valores} for valores in (nuevos or {}).values()]
+        insertar = self._insert_if_absent(tabla)
+        for inicio in range(0, len(nuevos_rows), ACUMULADO_CHUNK_SIZE):
+            self.session.execute(insertar, nuevos_rows[inicio : inicio + ACUMULADO_CHUNK_SIZE])
+
+        # Bind names must differ from column names in an executemany UPDATE
+        valores: dict[str, Any] = {
+            columna: tabla.c[columna] + bindparam(f"d_{delta}", type_=tabla.c[columna].type)
+            for delta, columna in DELTA_COLUMNAS.items()
+        }
+        valores["salario_acumulado_mes"] = case(
+            (tabla.c.mes_actual == bindparam("b_mes"), tabla.c.salario_acumulado_mes), else_=0
+        ) + bindparam("d_salario_bruto", type_=tabla.c.salario_acumulado_mes.type)
+        valores["mes_actual"] = bindparam("b_mes")
+        valores["periodos_procesados"] = tabla.c.periodos_procesados + 1
+        valores["ultimo_periodo_procesado"] = bindparam("b_ultimo_periodo")
+        incrementar = (
+            update(tabla)
+            .where(*(tabla.c[columna] == bindparam(f"k_{columna}") for columna in _CLAVE_ACUMULADO))
+            .values(valores)
+        )
+        rows = [
+            {
+                **{f"k_{columna}": valor for columna, valor in clave.items()},
+                "k_empleado_id": empleado_id,
+                **{f"d_{nombre}": montos.get(nombre, Decimal("0.00")) for nombre in DELTA_COLUMNAS},
+                "b_mes": periodo_fin.month,
+                "b_ultimo_periodo": periodo_fin,
+            }
+            for empleado_id, montos in deltas.items()
+        ]
+        for inicio in range(0, len(rows), ACUMULADO_CHUNK_SIZE):
+            self.session.execute(incrementar, rows[inicio : inicio + ACUMULADO_CHUNK_SIZE])
+
+        # Loaded objects no longer match the database; reload them on next access
+        self._periodos.pop((tipo_planilla_id, empresa_id, periodo_fiscal_inicio), None)
+        for instancia in list(self.session.identity_map.values()):
+            if isinstance(instancia, AcumuladoAnual):
+                self.session.expire(instancia)
+
+    def _insert_if_absent(self, tabla: Any) -> Any:
+        """Build an INSERT that skips rows already present under the accumulation's unique key."""
+        dialecto = self.session.get_bind().dialect.name
+        if dialecto == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
+            return postgresql_insert(tabla).on_conflict_do_nothing(index_elements=list(_CLAVE_ACUMULADO))
+        if dialecto == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            return sqlite_insert(tabla).on_conflict_do_nothing(index_elements=list(_CLAVE_ACUMULADO))
+        if dialecto in ("mysql", "mariadb"):
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+            return mysql_insert(tabla).on_duplicate_key_update(id=tabla.c.id)
+        return insert(tabla)
+
     def save(self, acumulado: AcumuladoAnual) -> AcumuladoAnual:
         """Save acumulado."""
         self.session.add(acumulado)
@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Run-scoped index of calculation rules and deduction metadata."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from coati_payroll.model import Deduccion, Percepcion, Prestacion, ReglaCalculo
+
+
+class ConceptRuleIndex:
+    """In-memory resolver of the ReglaCalculo and deduction metadata a payroll run reads.
+
+    Without it, every concept calculated with a calculation rule resolves the
+    rule with up to seven queries per employee (by foreign key, then by
+    deduction, benefit and perception code). ``load`` reads every active rule
+    together with the code of its concept in one query, and the metadata of
+    every deduction in another; lookups then answer from dictionaries.
+
+    Rules captured in the deductions snapshot take precedence over live
+    rules, so recalculations stay reproducible.
+    """
+
+    def __init__(self, session: Session, deducciones_snapshot: dict[str, dict] | None = None):
+        self.session = session
+        self.deducciones_snapshot = deducciones_snapshot
+        self._reglas_snapshot: dict[str, tuple[dict, str | None]] = {}
+        self._reglas_por_id: dict[str, tuple[dict, str | None]] = {}
+        self._reglas_por_codigo: tuple[dict[str, tuple[dict, str | None]], ...] = ({}, {}, {})
+        self._deducciones: dict[str, dict[str, Any]] = {}
+
+    def load(self) -> "ConceptRuleIndex":
+        """Load active rules and deduction metadata, and index the snapshot.
+
+        Returns:
+            This index, for chaining.
+        """
+        por_deduccion: dict[str, tuple[dict, str | None]] = {}
+        por_prestacion: dict[str, tuple[dict, str | None]] = {}
+        por_percepcion: dict[str, tuple[dict, str | None]] = {}
+        rows = self.session.execute(
+            select(
+                ReglaCalculo.codigo,
+                ReglaCalculo.esquema_json,
+                ReglaCalculo.deduccion_id,
+                ReglaCalculo.prestacion_id,
+                ReglaCalculo.percepcion_id,
+                Deduccion.codigo,
+                Prestacion.codigo,
+                Percepcion.codigo,
+            )
+            .outerjoin(Deduccion, Deduccion.id == ReglaCalculo.deduccion_id)
+            .outerjoin(Prestacion, Prestacion.id == ReglaCalculo.prestacion_id)
+            .outerjoin(Percepcion, Percepcion.id == ReglaCalculo.percepcion_id)
+            .filter(ReglaCalculo.activo.is_(True))
+        ).all()
+        for codigo, esquema, deduccion_id, prestacion_id, percepcion_id, cod_ded, cod_pre, cod_per in rows:
+            regla = (esquema, codigo)
+            for concepto_id in (deduccion_id, prestacion_id, percepcion_id):
+                if concepto_id:
+                    self._reglas_por_id.setdefault(concepto_id, regla)
+            for indice, concepto_codigo in (
+                (por_deduccion, cod_ded),
+                (por_prestacion, cod_pre),
+                (por_percepcion, cod_per),
+            ):
+                if concepto_codigo:
+                    indice.setdefault(concepto_codigo, regla)
+        self._reglas_por_codigo = (por_deduccion, por_prestacion, por_percepcion)
+
+        self._deducciones = {
+            deduccion_id: {"antes_impuesto": antes_impuesto, "es_impuesto": es_impuesto}
+            for deduccion_id, antes_impuesto, es_impuesto in self.session.execute(
+                select(Deduccion.id, Deduccion.antes_impuesto, Deduccion.es_impuesto)
+            ).all()
+        }
+
+        for deduccion_data in (self.deducciones_snapshot or {}).values():
+            regla_data = deduccion_data.get("regla_calculo")
+            if not regla_data:
+                continue
+            regla = (regla_data["esquema_json"], regla_data["codigo"])
+            for clave in (deduccion_data.get("id"), deduccion_data.get("codigo")):
+                if clave:
+                    self._reglas_snapshot.setdefault(clave, regla)
+        return self
+
+    def resolve_rule(self, concepto: str | None) -> tuple[dict, str | None] | None:
+        """Return ``(esquema_json, codigo)`` of the rule for a concept ID or code, or None."""
+        if not concepto:
+            return None
+        regla = self._reglas_snapshot.get(concepto)
+        if regla and regla[0]:
+            return regla
+        for indice in (self._reglas_por_id, *self._reglas_por_codigo):
+            regla = indice.get(concepto)
+            if regla:
+                # Same order as resolving one query at a time: an empty schema ends the search
+                return regla if regla[0] else None
+        return None
+
+    def get_deduccion_metadata(self, deduccion_id: str) -> dict[str, Any] | None:
+        """Return ``antes_impuesto``/``es_impuesto`` flags of a deduction, preferring the snapshot."""
+        if self.deducciones_snapshot and deduccion_id in self.deducciones_snapshot:
+            return self.deducciones_snapshot[deduccion_id]
+        return self._deducciones.get(deduccion_id)
@@ -10,17 +10,25 @@ from typing import Optional
 
 from coati_payroll.model import TipoCambio
 from .base_repository import BaseRepository
+from .payroll_prefetch import PayrollPrefetch
 
 
 class ExchangeRateRepository(BaseRepository[TipoCambio]):
     """Repository for TipoCambio operations."""
 
+    prefetch: PayrollPrefetch | None = None
+
     def get_by_id(self, tipo_cambio_id: str) -> Optional[TipoCambio]:
         """Get exchange rate by ID."""
         return self.session.get(TipoCambio, tipo_cambio_id)
 
     def get_rate(self, moneda_origen_id: str, moneda_destino_id: str, fecha: date) -> Optional[Decimal]:
         """Get exchange rate for currency pair on or before given date."""
+        if self.prefetch is not None:
+            found, rate = self.prefetch.get_rate(moneda_origen_id, moneda_destino_id, fecha)
+            if found:
+                return rate
+
         from sqlalchemy import select
 
         tipo_cambio = (
@@ -32,9 +40,10 @@ class ExchangeRateRepository(BaseRepository[TipoCambio]):
                     TipoCambio.fecha <= fecha,
                 )
                 .order_by(TipoCambio.fecha.desc())
+                .limit(1)
             )
-            .unique()
-            .scalar_one_or_none()
+            .scalars()
+            .first()
         )
 
         if tipo_cambio:
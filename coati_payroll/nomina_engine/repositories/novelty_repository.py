@@ -9,11 +9,14 @@ from typing import Optional
 
 from coati_payroll.model import NominaNovedad
 from .base_repository import BaseRepository
+from .payroll_prefetch import PayrollPrefetch
 
 
 class NoveltyRepository(BaseRepository[NominaNovedad]):
     """Repository for NominaNovedad operations."""
 
+    prefetch: PayrollPrefetch | None = None
+
     def get_by_id(self, novelty_id: str) -> Optional[NominaNovedad]:
         """Get novelty by ID."""
         return self.session.get(NominaNovedad, novelty_id)
@@ -22,6 +25,11 @@ class NoveltyRepository(BaseRepository[NominaNovedad]):
         self, empleado_id: str, periodo_inicio: date, periodo_fin: date
     ) -> list[NominaNovedad]:
         """Get novelties for employee within period."""
+        if self.prefetch is not None:
+            novedades = self.prefetch.get_novelties(empleado_id, periodo_inicio, periodo_fin)
+            if novedades is not None:
+                return novedades
+
         from sqlalchemy import select
 
         return list(
@@ -0,0 +1,237 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Set-based prefetch of per-employee payroll data."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from coati_payroll.enums import AdelantoEstado
+from coati_payroll.model import AcumuladoAnual, Adelanto, Empleado, NominaNovedad, Planilla, TipoCambio
+from ..utils.fiscal_period import fiscal_period_start
+from .acumulado_repository import AcumuladoRepository
+
+# Keep IN (...) lists well below the bind parameter limits of every supported backend.
+PREFETCH_CHUNK_SIZE = 500
+
+
+def _chunks(values: Sequence[str], size: int) -> Iterator[Sequence[str]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+class PayrollPrefetch:
+    """In-memory view of the rows a payroll run reads for every employee.
+
+    The employee loop would otherwise issue one query per employee for
+    novelties, annual accumulations, loans, advances and exchange rates.
+    ``load`` fetches them for the whole planilla with a few ``IN (...)``
+    queries; repositories and processors then answer from dictionaries.
+
+    Every lookup returns None when the requested key was not prefetched, so
+    callers can fall back to their own query.
+
+    Annual accumulations are loaded through ``acumulado_repository``, whose
+    fiscal-period cache the same run reuses when it updates them.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        chunk_size: int = PREFETCH_CHUNK_SIZE,
+        acumulado_repository: AcumuladoRepository | None = None,
+    ):
+        self.session = session
+        self.chunk_size = chunk_size
+        self.acumulado_repo = acumulado_repository or AcumuladoRepository(session)
+        self._empleado_ids: frozenset[str] = frozenset()
+        self._periodo: tuple[date, date] | None = None
+        self._novedades: dict[str, list[NominaNovedad]] = {}
+        self._acumulado_key: tuple[str, str, date] | None = None
+        self._acumulados: dict[str, AcumuladoAnual] = {}
+        self._prestamos: dict[str, list[Adelanto]] = {}
+        self._adelantos: dict[str, list[Adelanto]] = {}
+        self._fecha_tipo_cambio: date | None = None
+        self._tipos_cambio: dict[tuple[str, str], Decimal | None] = {}
+
+    def load(
+        self,
+        empleados: Iterable[Empleado],
+        planilla: Planilla,
+        periodo_inicio: date,
+        periodo_fin: date,
+        fecha_calculo: date,
+        tipos_cambio_snapshot: dict[str, Any] | None = None,
+    ) -> "PayrollPrefetch":
+        """Load per-employee data for every employee of a payroll run.
+
+        Args:
+            empleados: Employees that will be processed.
+            planilla: Planilla being processed.
+            periodo_inicio: First day of the payroll period.
+            periodo_fin: Last day of the payroll period.
+            fecha_calculo: Calculation date used for exchange rates.
+            tipos_cambio_snapshot: Exchange rates already captured in the snapshot.
+
+        Returns:
+            This prefetch, for chaining.
+        """
+        empleados = list(empleados)
+        ids = sorted({empleado.id for empleado in empleados})
+        self._empleado_ids = frozenset(ids)
+
+        self._load_novedades(ids, periodo_inicio, periodo_fin)
+        self._load_acumulados(ids, planilla, periodo_inicio)
+        self._load_adelantos(ids)
+        self._load_tipos_cambio(empleados, planilla, fecha_calculo, tipos_cambio_snapshot)
+        return self
+
+    def load_adelantos(self, empleado_ids: Iterable[str]) -> "PayrollPrefetch":
+        """Load only the pending loans and advances of the given employees.
+
+        Used outside payroll runs (liquidaciones), where novelties,
+        accumulations and exchange rates are not read.
+
+        Returns:
+            This prefetch, for chaining.
+        """
+        ids = sorted(set(empleado_ids))
+        self._empleado_ids = frozenset(ids)
+        self._load_adelantos(ids)
+        return self
+
+    # <-------------------- Lookups --------------------> #
+
+    def get_novelties(self, empleado_id: str, periodo_inicio: date, periodo_fin: date) -> list[NominaNovedad] | None:
+        """Return prefetched novelties for an employee and period."""
+        if empleado_id not in self._empleado_ids or self._periodo != (periodo_inicio, periodo_fin):
+            return None
+        return list(self._novedades.get(empleado_id, []))
+
+    def get_acumulado(
+        self, empleado_id: str, tipo_planilla_id: str, empresa_id: str, periodo_fiscal_inicio: date
+    ) -> tuple[bool, AcumuladoAnual | None]:
+        """Return ``(found, acumulado)`` for an employee's fiscal year.
+
+        ``found`` is False when the key was not prefetched; ``acumulado`` may
+        be None when it was prefetched but no row exists yet.
+        """
+        if empleado_id not in self._empleado_ids:
+            return False, None
+        if self._acumulado_key != (tipo_planilla_id, empresa_id, periodo_fiscal_inicio):
+            return False, None
+        return True, self._acumulados.get(empleado_id)
+
+    def get_loans(self, empleado_id: str) -> list[Adelanto] | None:
+        """Return approved loans with pending balance for an employee."""
+        if empleado_id not in self._empleado_ids:
+            return None
+        return list(self._prestamos.get(empleado_id, []))
+
+    def get_advances(self, empleado_id: str) -> list[Adelanto] | None:
+        """Return approved salary advances with pending balance for an employee."""
+        if empleado_id not in self._empleado_ids:
+            return None
+        return list(self._adelantos.get(empleado_id, []))
+
+    def get_rate(self, moneda_origen_id: str, moneda_destino_id: str, fecha: date) -> tuple[bool, Decimal | None]:
+        """Return ``(found, rate)`` for a currency pair on the prefetched date."""
+        key = (moneda_origen_id, moneda_destino_id)
+        if fecha != self._fecha_tipo_cambio or key not in self._tipos_cambio:
+            return False, None
+        return True, self._tipos_cambio[key]
+
+    # <-------------------- Loaders --------------------> #
+
+    def _load_novedades(self, ids: list[str], periodo_inicio: date, periodo_fin: date) -> None:
+        novedades: dict[str, list[NominaNovedad]] = defaultdict(list)
+        for chunk in _chunks(ids, self.chunk_size):
+            rows = (
+                self.session.execute(
+                    select(NominaNovedad).filter(
+                        NominaNovedad.empleado_id.in_(chunk),
+                        NominaNovedad.fecha_novedad >= periodo_inicio,
+                        NominaNovedad.fecha_novedad <= periodo_fin,
+                    )
+                )
+                .unique()
+                .scalars()
+                .all()
+            )
+            for novedad in rows:
+                novedades[novedad.empleado_id].append(novedad)
+        self._novedades = dict(novedades)
+        self._periodo = (periodo_inicio, periodo_fin)
+
+    def _load_acumulados(self, ids: list[str], planilla: Planilla, periodo_inicio: date) -> None:
+        periodo_fiscal_inicio = fiscal_period_start(planilla, periodo_inicio)
+        if periodo_fiscal_inicio is None:
+            return
+
+        key = (planilla.tipo_planilla.id, planilla.empresa_id, periodo_fiscal_inicio)
+        self._acumulados = self.acumulado_repo.load_period(ids, *key)
+        self._acumulado_key = key
+
+    def _load_adelantos(self, ids: list[str]) -> None:
+        prestamos: dict[str, list[Adelanto]] = defaultdict(list)
+        adelantos: dict[str, list[Adelanto]] = defaultdict(list)
+        for chunk in _chunks(ids, self.chunk_size):
+            rows = (
+                self.session.execute(
+                    select(Adelanto).filter(
+                        Adelanto.empleado_id.in_(chunk),
+                        Adelanto.estado == AdelantoEstado.APROBADO,
+                        Adelanto.saldo_pendiente > 0,
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            for adelanto in rows:
+                target = prestamos if adelanto.deduccion_id is not None else adelantos
+                target[adelanto.empleado_id].append(adelanto)
+        self._prestamos = dict(prestamos)
+        self._adelantos = dict(adelantos)
+
+    def _load_tipos_cambio(
+        self,
+        empleados: list[Empleado],
+        planilla: Planilla,
+        fecha_calculo: date,
+        tipos_cambio_snapshot: dict[str, Any] | None,
+    ) -> None:
+        snapshot = tipos_cambio_snapshot or {}
+        monedas = {
+            empleado.moneda_id
+            for empleado in empleados
+            if empleado.moneda_id
+            and empleado.moneda_id != planilla.moneda_id
+            and not (snapshot.get(empleado.moneda_id) or {}).get("tasa")
+        }
+
+        # One query per distinct currency, not per employee.
+        tipos_cambio: dict[tuple[str, str], Decimal | None] = {}
+        for moneda_id in sorted(monedas):
+            tipo_cambio = (
+                self.session.execute(
+                    select(TipoCambio)
+                    .filter(
+                        TipoCambio.moneda_origen_id == moneda_id,
+                        TipoCambio.moneda_destino_id == planilla.moneda_id,
+                        TipoCambio.fecha <= fecha_calculo,
+                    )
+                    .order_by(TipoCambio.fecha.desc())
+                    .limit(1)
+                )
+                .scalars()
+                .first()
+            )
+            tipos_cambio[(moneda_id, planilla.moneda_id)] = Decimal(str(tipo_cambio.tasa)) if tipo_cambio else None
+        self._tipos_cambio = tipos_cambio
+        self._fecha_tipo_cambio = fecha_calculo
@@ -0,0 +1,78 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Repository for content-addressed snapshots."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from sqlalchemy import insert
+
+from coati_payroll.model import Nomina, SnapshotContenido
+from .base_repository import BaseRepository
+
+# Snapshot keys stored on a nomina, by snapshot type.
+SNAPSHOT_TYPES = ("configuracion", "tipos_cambio", "catalogos")
+
+
+def canonical_json(contenido: Any) -> bytes:
+    """Serialize ``contenido`` with sorted keys, so equal snapshots give equal bytes."""
+    return orjson.dumps(contenido, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+
+
+def snapshot_hash(contenido: Any) -> str:
+    """SHA-256 hex digest of the canonical JSON of ``contenido``."""
+    return hashlib.sha256(canonical_json(contenido)).hexdigest()
+
+
+class SnapshotRepository(BaseRepository[SnapshotContenido]):
+    """Store snapshots once per distinct content and reference them by hash."""
+
+    def get_by_id(self, id_: str) -> Optional[SnapshotContenido]:
+        """Get snapshot content by hash."""
+        return self.session.get(SnapshotContenido, id_)
+
+    def save(self, entity: SnapshotContenido) -> SnapshotContenido:
+        """Save snapshot content."""
+        self.session.add(entity)
+        return entity
+
+    def put(self, tipo: str, contenido: Any) -> str:
+        """Store ``contenido`` unless an identical snapshot exists and return its hash.
+
+        The row is written with an insert that skips existing hashes, so
+        concurrent runs capturing the same catalogs do not conflict.
+        """
+        serializado = canonical_json(contenido)
+        clave = hashlib.sha256(serializado).hexdigest()
+        if self.session.get(SnapshotContenido, clave) is None:
+            self.session.execute(
+                self._insert_if_absent(SnapshotContenido.__table__),
+                {"hash": clave, "tipo": tipo, "contenido": contenido, "tamano": len(serializado)},
+            )
+        return clave
+
+    def attach(self, nomina: Nomina, snapshot: dict[str, Any]) -> None:
+        """Store the configuration, exchange-rate and catalog parts of ``snapshot`` and reference them on ``nomina``."""
+        for tipo in SNAPSHOT_TYPES:
+            setattr(nomina, f"{tipo}_snapshot_hash", self.put(tipo, snapshot[tipo]))
+            setattr(nomina, f"_{tipo}_snapshot", None)
+
+    def _insert_if_absent(self, tabla: Any) -> Any:
+        """Build an INSERT that skips hashes already present."""
+        dialecto = self.session.get_bind().dialect.name
+        if dialecto == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+
+            return postgresql_insert(tabla).on_conflict_do_nothing(index_elements=["hash"])
+        if dialecto == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            return sqlite_insert(tabla).on_conflict_do_nothing(index_elements=["hash"])
+        if dialecto in ("mysql", "mariadb"):
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+            return mysql_insert(tabla).on_duplicate_key_update(hash=tabla.c.hash)
+        return insert(tabla)
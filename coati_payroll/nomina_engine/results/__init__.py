@@ -5,9 +5,12 @@
 from .validation_result import ValidationResult
 from .error_result import ErrorResult
 from .payroll_result import PayrollResult
+from .run_profile import merge_profiles, RunProfiler
 
 __all__ = [
     "ValidationResult",
     "ErrorResult",
     "PayrollResult",
+    "RunProfiler",
+    "merge_profiles",
 ]
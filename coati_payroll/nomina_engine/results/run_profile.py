@@ -0,0 +1,141 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Execution profile of a payroll run."""
+
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Bumped when the layout returned by ``RunProfiler.to_dict`` changes.
+PROFILE_VERSION = 1
+
+# Profiler of the run executing in the current thread (or task), if any.
+_perfil_activo: ContextVar["RunProfiler | None"] = ContextVar("coati_payroll_run_profiler", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _contar_sentencia(*_args: Any) -> None:
+    """Count a statement for the profiler active in this context (registered once, for every engine)."""
+    perfil = _perfil_activo.get()
+    if perfil is not None:
+        perfil.queries += 1
+
+
+class RunProfiler:
+    """Record wall time and SQL statements per phase of a payroll run.
+
+    SQL statements are counted by one ``before_cursor_execute`` listener
+    registered on every engine when this module is imported. It credits the
+    profiler made active by ``start`` in the current context, so concurrent
+    requests and workers sharing the engine are not counted and no listener
+    is added or removed while the application serves requests. Per-employee
+    stages are summarized as p50/p95/max in milliseconds.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, dict[str, float | int]] = {}
+        self.employee_samples: dict[str, list[float]] = {}
+        self.queries = 0
+        self._token: Token | None = None
+        self._inicio: float | None = None
+        self._segundos = 0.0
+
+    def start(self) -> "RunProfiler":
+        """Start the wall clock and count the statements of the current context."""
+        self._inicio = time.perf_counter()
+        self._token = _perfil_activo.set(self)
+        return self
+
+    def stop(self) -> None:
+        """Stop the wall clock and the statement counter. Safe to call twice."""
+        if self._inicio is None:
+            return
+        self._segundos = time.perf_counter() - self._inicio
+        self._inicio = None
+        if self._token is not None:
+            _perfil_activo.reset(self._token)
+            self._token = None
+
+    @contextmanager
+    def phase(self, nombre: str) -> Iterator[None]:
+        """Accumulate the time and statements of the enclosed block under ``nombre``."""
+        inicio = time.perf_counter()
+        consultas = self.queries
+        try:
+            yield
+        finally:
+            datos = self.phases.setdefault(nombre, {"seconds": 0.0, "queries": 0})
+            datos["seconds"] += time.perf_counter() - inicio
+            datos["queries"] += self.queries - consultas
+
+    @contextmanager
+    def employee(self, etapa: str) -> Iterator[None]:
+        """Record the duration of one employee's ``etapa`` (e.g. preparation)."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.employee_samples.setdefault(etapa, []).append(time.perf_counter() - inicio)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the profile as JSON-serializable data."""
+        segundos = self._segundos if self._inicio is None else time.perf_counter() - self._inicio
+        medido = sum(float(datos["seconds"]) for datos in self.phases.values())
+        return {
+            "version": PROFILE_VERSION,
+            "total_seconds": round(segundos, 4),
+            "total_queries": self.queries,
+            "unaccounted_seconds": round(max(segundos - medido, 0.0), 4),
+            "phases": {
+                nombre: {"seconds": round(float(datos["seconds"]), 4), "queries": int(datos["queries"])}
+                for nombre, datos in self.phases.items()
+            },
+            "employees": {etapa: _distribution(muestras) for etapa, muestras in self.employee_samples.items()},
+        }
+
+
+def merge_profiles(perfiles: list[dict[str, Any]]) -> dict[str, Any]:
+    """Combine the profiles of the parts of a sharded run into one profile.
+
+    Seconds and statements are summed per phase, so ``total_seconds`` is the
+    time spent across all workers rather than wall time. Percentiles cannot be
+    recombined: each employee stage keeps the total count and the highest
+    p50/p95/max of the parts.
+    """
+    fases: dict[str, dict[str, float | int]] = {}
+    empleados: dict[str, dict[str, float | int]] = {}
+    for perfil in perfiles:
+        for nombre, datos in perfil.get("phases", {}).items():
+            fase = fases.setdefault(nombre, {"seconds": 0.0, "queries": 0})
+            fase["seconds"] = round(float(fase["seconds"]) + datos["seconds"], 4)
+            fase["queries"] = int(fase["queries"]) + datos["queries"]
+        for etapa, datos in perfil.get("employees", {}).items():
+            actual = empleados.setdefault(etapa, {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0})
+            actual["count"] = int(actual["count"]) + datos["count"]
+            for clave in ("p50_ms", "p95_ms", "max_ms"):
+                actual[clave] = max(actual[clave], datos[clave])
+    return {
+        "version": PROFILE_VERSION,
+        "total_seconds": round(sum(perfil.get("total_seconds", 0.0) for perfil in perfiles), 4),
+        "total_queries": sum(perfil.get("total_queries", 0) for perfil in perfiles),
+        "unaccounted_seconds": round(sum(perfil.get("unaccounted_seconds", 0.0) for perfil in perfiles), 4),
+        "phases": fases,
+        "employees": empleados,
+    }
+
+
+def _distribution(muestras: list[float]) -> dict[str, float | int]:
+    """Count and nearest-rank p50/p95/max of durations, in milliseconds."""
+    ordenadas = sorted(muestras)
+
+    def percentil(p: float) -> float:
+        return round(ordenadas[max(math.ceil(p * len(ordenadas)) - 1, 0)] * 1000, 3)
+
+    return {"count": len(ordenadas), "p50_ms": percentil(0.50), "p95_ms": percentil(0.95), "max_ms": percentil(1.0)}
@@ -31,6 +31,10 @@ class WarningCollector:
     def extend(self, warnings: list[str]) -> None:
         self._warnings.extend(warnings)
 
+    def truncate(self, size: int) -> None:
+        """Discard the warnings appended after the first ``size``."""
+        del self._warnings[size:]
+
     def __iter__(self):
         return iter(self._warnings)
 
@@ -4,13 +4,19 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Any, cast
+from typing import Any, Iterator, Sequence, cast
 from collections import defaultdict
 from datetime import date
 
+from sqlalchemy import func, insert
+from sqlalchemy.orm import joinedload
+
+from coati_payroll.enums import AdelantoEstado
 from coati_payroll.model import (
     db,
+    generador_de_codigos_unicos,
     Nomina,
     NominaEmpleado,
     NominaDetalle,
@@ -23,12 +29,69 @@ from coati_payroll.model import (
     ComprobanteContable,
     ComprobanteContableLinea,
     Moneda,
+    VacationAccount,
     VacationLedger,
     VacationPolicy,
     ConfiguracionCalculos,
     NominaNovedad,
 )
-from ..utils.rounding import round_money
+from ..utils.rounding import MONEY_DECIMALS, round_money
+
+# Voucher lines per multi-row INSERT.
+BULK_CHUNK_SIZE = 500
+
+
+@dataclass
+class _VoucherLines:
+    """Voucher lines built in memory before being inserted in bulk."""
+
+    comprobante_id: str
+    filas: list[dict[str, Any]] = field(default_factory=list)
+    total_debitos: Decimal = Decimal("0.00")
+    total_creditos: Decimal = Decimal("0.00")
+    null_account_count: int = 0
+
+    def add_pair(
+        self,
+        ne: NominaEmpleado,
+        debito: tuple[str | None, str | None],
+        credito: tuple[str | None, str | None],
+        monto: Decimal,
+        concepto: str,
+        tipo_concepto: str,
+        concepto_codigo: str,
+    ) -> None:
+        """Add the debit and credit lines of one movement; missing accounts are kept as NULL."""
+        empleado = ne.empleado
+        comunes = {
+            "comprobante_id": self.comprobante_id,
+            "nomina_empleado_id": ne.id,
+            "empleado_id": empleado.id,
+            "empleado_codigo": empleado.codigo_empleado,
+            "empleado_nombre": f"{empleado.primer_nombre} {empleado.primer_apellido}",
+            "centro_costos": ne.centro_costos_snapshot or empleado.centro_costos,
+            "monto_calculado": monto,
+            "concepto": concepto,
+            "tipo_concepto": tipo_concepto,
+            "concepto_codigo": concepto_codigo,
+        }
+        for tipo_debito_credito, (codigo_cuenta, descripcion_cuenta) in (("debito", debito), ("credito", credito)):
+            if codigo_cuenta is None:
+                self.null_account_count += 1
+            self.filas.append(
+                {
+                    **comunes,
+                    "id": generador_de_codigos_unicos(),
+                    "codigo_cuenta": codigo_cuenta,
+                    "descripcion_cuenta": descripcion_cuenta,
+                    "tipo_debito_credito": tipo_debito_credito,
+                    "debito": monto if tipo_debito_credito == "debito" else Decimal("0.00"),
+                    "credito": monto if tipo_debito_credito == "credito" else Decimal("0.00"),
+                    "orden": len(self.filas) + 1,
+                }
+            )
+        self.total_debitos += monto
+        self.total_creditos += monto
 
 
 class AccountingVoucherService:
@@ -195,29 +258,30 @@ class AccountingVoucherService:
 
     def _build_paid_vacation_liability_lines(
         self,
-        comprobante: ComprobanteContable,
+        lineas: _VoucherLines,
         nomina: Nomina,
         planilla: Planilla,
-        nomina_empleados: list[NominaEmpleado],
-        orden: int,
-        null_account_count: int,
-    ) -> tuple[Decimal, Decimal, int, int]:
+        nomina_empleados: Sequence[NominaEmpleado],
+    ) -> None:
         """Build accounting lines for paid vacation liability movements tied to this payroll."""
         planilla_moneda = cast(Moneda | None, planilla.moneda)
-        total_debitos = Decimal("0.00")
-        total_creditos = Decimal("0.00")
 
         nomina_empleado_ids = [ne.id for ne in nomina_empleados if ne.id]
         if not nomina_empleado_ids:
-            return total_debitos, total_creditos, orden, null_account_count
+            return
+
+        con_politica = joinedload(cast(Any, VacationLedger.account)).joinedload(cast(Any, VacationAccount.policy))
 
         # ACCRUAL entries are linked by reference_type=nomina_empleado.
         accrual_entries = (
             self.session.execute(
-                db.select(VacationLedger).filter(
+                db.select(VacationLedger)
+                .join(NominaEmpleado, NominaEmpleado.id == VacationLedger.reference_id)
+                .filter(
                     VacationLedger.reference_type == "nomina_empleado",
-                    VacationLedger.reference_id.in_(nomina_empleado_ids),
+                    NominaEmpleado.nomina_id == nomina.id,
                 )
+                .options(con_politica)
             )
             .scalars()
             .all()
@@ -238,6 +302,7 @@ class AccountingVoucherService:
                     NominaNovedad.nomina_id == nomina.id,
                     NominaNovedad.es_descanso_vacaciones.is_(True),
                 )
+                .options(con_politica)
             )
             .scalars()
             .all()
@@ -263,9 +328,6 @@ class AccountingVoucherService:
                 continue
 
             empleado = ne.empleado
-            centro_costos = ne.centro_costos_snapshot or empleado.centro_costos
-            empleado_nombre_completo = f"{empleado.primer_nombre} {empleado.primer_apellido}"
-
             units = Decimal(str(abs(entry.quantity)))
             # Use employee's monthly salary and apply currency conversion from payroll
             # ne.sueldo_base_historico stores period salary, but vacation liability must use monthly salary
@@ -286,55 +348,15 @@ class AccountingVoucherService:
                 cuenta_debito, cuenta_credito = cuenta_credito, cuenta_debito
                 desc_debito, desc_credito = desc_credito, desc_debito
 
-            orden += 1
-            if cuenta_debito is None:
-                null_account_count += 1
-            linea_debe = ComprobanteContableLinea(
-                comprobante_id=comprobante.id,
-                nomina_empleado_id=ne.id,
-                empleado_id=empleado.id,
-                empleado_codigo=empleado.codigo_empleado,
-                empleado_nombre=empleado_nombre_completo,
-                codigo_cuenta=cuenta_debito,
-                descripcion_cuenta=(desc_debito if cuenta_debito else None),
-                centro_costos=centro_costos,
-                tipo_debito_credito="debito",
-                debito=monto,
-                credito=Decimal("0.00"),
-                monto_calculado=monto,
-                concepto="Vacaciones pagadas",
-                tipo_concepto="vacation_liability",
-                concepto_codigo="VAC_PAID_LIAB",
-                orden=orden,
+            lineas.add_pair(
+                ne,
+                (cuenta_debito, desc_debito if cuenta_debito else None),
+                (cuenta_credito, desc_credito if cuenta_credito else None),
+                monto,
+                "Vacaciones pagadas",
+                "vacation_liability",
+                "VAC_PAID_LIAB",
             )
-            self.session.add(linea_debe)
-            total_debitos += monto
-
-            orden += 1
-            if cuenta_credito is None:
-                null_account_count += 1
-            linea_haber = ComprobanteContableLinea(
-                comprobante_id=comprobante.id,
-                nomina_empleado_id=ne.id,
-                empleado_id=empleado.id,
-                empleado_codigo=empleado.codigo_empleado,
-                empleado_nombre=empleado_nombre_completo,
-                codigo_cuenta=cuenta_credito,
-                descripcion_cuenta=(desc_credito if cuenta_credito else None),
-                centro_costos=centro_costos,
-                tipo_debito_credito="credito",
-                debito=Decimal("0.00"),
-                credito=monto,
-                monto_calculado=monto,
-                concepto="Vacaciones pagadas",
-                tipo_concepto="vacation_liability",
-                concepto_codigo="VAC_PAID_LIAB",
-                orden=orden,
-            )
-            self.session.add(linea_haber)
-            total_creditos += monto
-
-        return total_debitos, total_creditos, orden, null_account_count
 
     def generate_accounting_voucher(
         self, nomina: Nomina, planilla: Planilla, fecha_calculo: date | None = None, usuario: str | None = None
@@ -347,6 +369,10 @@ class AccountingVoucherService:
     ) -> ComprobanteContable:
         """Generate accounting voucher for a nomina with individual lines per employee.
 
+        Detail lines are loaded with their concepts in one joined query, loan
+        control accounts in another, and the voucher lines are written with
+        chunked multi-row inserts.
+
         Args:
             nomina: The nomina to generate voucher for
             planilla: The planilla configuration
@@ -420,390 +446,113 @@ class AccountingVoucherService:
             self.session.add(comprobante)
             self.session.flush()
 
-        # Get all nomina employees with their details
+        # Get all nomina employees with their employee record
         nomina_empleados = (
-            self.session.execute(db.select(NominaEmpleado).filter_by(nomina_id=nomina.id)).scalars().all()
+            self.session.execute(
+                db.select(NominaEmpleado)
+                .filter_by(nomina_id=nomina.id)
+                .options(joinedload(cast(Any, NominaEmpleado.empleado)))
+            )
+            .scalars()
+            .all()
         )
+        detalles_por_empleado = self._load_voucher_details(nomina.id)
+        cuentas_prestamo = self._load_loan_control_accounts(nomina.id)
 
-        # Accumulate totals
-        total_debitos = Decimal("0.00")
-        total_creditos = Decimal("0.00")
-        orden = 0
-        null_account_count = 0
-
+        lineas = _VoucherLines(comprobante.id)
         debe_salario, desc_debe_salario, haber_salario, desc_haber_salario, _account_scope = (
             self._resolve_base_salary_accounts(planilla)
         )
+        # Loans/advances debit salary payable (same as base salary credit account, can be NULL)
+        cuenta_salario_por_pagar = (
+            haber_salario,
+            (desc_haber_salario or "Salario por Pagar") if haber_salario else None,
+        )
 
         # Process each employee
         for ne in nomina_empleados:
-            empleado = ne.empleado
-            centro_costos = ne.centro_costos_snapshot or empleado.centro_costos
-            empleado_nombre_completo = f"{empleado.primer_nombre} {empleado.primer_apellido}"
-
             # 1. Base Salary Accounting
             # Always generate lines even if accounts are missing (use NULL for missing accounts)
             salario_base = round_money(ne.sueldo_base_historico, planilla_moneda)
-
-            # Debit: Salary Expense
-            orden += 1
-            if debe_salario is None:
-                null_account_count += 1
-            linea_debe = ComprobanteContableLinea(
-                comprobante_id=comprobante.id,
-                nomina_empleado_id=ne.id,
-                empleado_id=empleado.id,
-                empleado_codigo=empleado.codigo_empleado,
-                empleado_nombre=empleado_nombre_completo,
-                codigo_cuenta=debe_salario,  # Can be None if not configured
-                descripcion_cuenta=desc_debe_salario or ("Gasto por Salario" if debe_salario else None),
-                centro_costos=centro_costos,
-                tipo_debito_credito="debito",
-                debito=salario_base,
-                credito=Decimal("0.00"),
-                monto_calculado=salario_base,
-                concepto="Salario Base",
-                tipo_concepto="salario_base",
-                concepto_codigo="SALARIO_BASE",
-                orden=orden,
-            )
-            self.session.add(linea_debe)
-            total_debitos += salario_base
-
-            # Credit: Salary Payable
-            orden += 1
-            if haber_salario is None:
-                null_account_count += 1
-            linea_haber = ComprobanteContableLinea(
-                comprobante_id=comprobante.id,
-                nomina_empleado_id=ne.id,
-                empleado_id=empleado.id,
-                empleado_codigo=empleado.codigo_empleado,
-                empleado_nombre=empleado_nombre_completo,
-                codigo_cuenta=haber_salario,  # Can be None if not configured
-                descripcion_cuenta=desc_haber_salario or ("Salario por Pagar" if haber_salario else None),
-                centro_costos=centro_costos,
-                tipo_debito_credito="credito",
-                debito=Decimal("0.00"),
-                credito=salario_base,
-                monto_calculado=salario_base,
-                concepto="Salario Base",
-                tipo_concepto="salario_base",
-                concepto_codigo="SALARIO_BASE",
-                orden=orden,
-            )
-            self.session.add(linea_haber)
-            total_creditos += salario_base
-
-            # 2. Process Loans and Advances (special treatment)
-            # Loans/advances debit salary payable and credit loan control account
-            detalles = (
-                self.session.execute(
-                    db.select(NominaDetalle).filter_by(nomina_empleado_id=ne.id).order_by(NominaDetalle.orden)
-                )
-                .scalars()
-                .all()
+            lineas.add_pair(
+                ne,
+                (debe_salario, desc_debe_salario or ("Gasto por Salario" if debe_salario else None)),
+                (haber_salario, desc_haber_salario or ("Salario por Pagar" if haber_salario else None)),
+                salario_base,
+                "Salario Base",
+                "salario_base",
+                "SALARIO_BASE",
             )
 
-            for detalle in detalles:
-                # Check if this is a loan/advance deduction
-                is_loan_advance = False
-                cuenta_control_prestamo = None
-
-                if detalle.deduccion_id:
-                    deduccion = self.session.get(Deduccion, detalle.deduccion_id)
-                    if deduccion:
-                        # Check if this deduction is associated with loans/advances
-                        adelantos = (
-                            self.session.execute(
-                                db.select(Adelanto).filter_by(empleado_id=empleado.id, deduccion_id=deduccion.id)
-                            )
-                            .scalars()
-                            .all()
-                        )
-                        if adelantos:
-                            is_loan_advance = True
-                            # Get loan control account from first active loan
-                            for adelanto in adelantos:
-                                if adelanto.estado in ("approved", "applied"):
-                                    cuenta_control_prestamo = adelanto.cuenta_haber
-                                    break
-
-                if is_loan_advance:
-                    # Loan/advance: Debit salary payable, Credit loan control
-                    # Always create both lines even if accounts are NULL
-
-                    # Debit: Salary Payable (same as base salary credit account, can be NULL)
-                    orden += 1
-                    if haber_salario is None:
-                        null_account_count += 1
-                    detalle_monto = round_money(detalle.monto, planilla_moneda)
-                    linea_debe = ComprobanteContableLinea(
-                        comprobante_id=comprobante.id,
-                        nomina_empleado_id=ne.id,
-                        empleado_id=empleado.id,
-                        empleado_codigo=empleado.codigo_empleado,
-                        empleado_nombre=empleado_nombre_completo,
-                        codigo_cuenta=haber_salario,  # Can be None
-                        descripcion_cuenta=((desc_haber_salario or "Salario por Pagar") if haber_salario else None),
-                        centro_costos=centro_costos,
-                        tipo_debito_credito="debito",
-                        debito=detalle_monto,
-                        credito=Decimal("0.00"),
-                        monto_calculado=detalle_monto,
-                        concepto=detalle.descripcion or "Préstamo/Adelanto",
-                        tipo_concepto="loan",
-                        concepto_codigo=detalle.codigo,
-                        orden=orden,
+            # 2. Loans and advances (special treatment) and regular concepts
+            for detalle, percepcion, deduccion, prestacion in detalles_por_empleado.get(ne.id, []):
+                detalle_monto = round_money(detalle.monto, planilla_moneda)
+                clave_prestamo = (ne.empleado_id, detalle.deduccion_id)
+
+                if deduccion is not None and clave_prestamo in cuentas_prestamo:
+                    # Loan/advance: Debit salary payable, Credit loan control (both can be NULL)
+                    cuenta_control_prestamo = cuentas_prestamo[clave_prestamo]
+                    lineas.add_pair(
+                        ne,
+                        cuenta_salario_por_pagar,
+                        (
+                            cuenta_control_prestamo,
+                            "Cuenta de Control Préstamos/Adelantos" if cuenta_control_prestamo else None,
+                        ),
+                        detalle_monto,
+                        detalle.descripcion or "Préstamo/Adelanto",
+                        "loan",
+                        detalle.codigo,
                     )
-                    self.session.add(linea_debe)
-                    total_debitos += detalle_monto
-
-                    # Credit: Loan Control Account (can be NULL)
-                    orden += 1
-                    if cuenta_control_prestamo is None:
-                        null_account_count += 1
-                    linea_haber = ComprobanteContableLinea(
-                        comprobante_id=comprobante.id,
-                        nomina_empleado_id=ne.id,
-                        empleado_id=empleado.id,
-                        empleado_codigo=empleado.codigo_empleado,
-                        empleado_nombre=empleado_nombre_completo,
-                        codigo_cuenta=cuenta_control_prestamo,  # Can be None
-                        descripcion_cuenta="Cuenta de Control Préstamos/Adelantos" if cuenta_control_prestamo else None,
-                        centro_costos=centro_costos,
-                        tipo_debito_credito="credito",
-                        debito=Decimal("0.00"),
-                        credito=detalle_monto,
-                        monto_calculado=detalle_monto,
-                        concepto=detalle.descripcion or "Préstamo/Adelanto",
-                        tipo_concepto="loan",
-                        concepto_codigo=detalle.codigo,
-                        orden=orden,
+
+                # Regular concept - use configured accounts (or NULL if missing)
+                elif detalle.tipo == "income" and percepcion is not None and percepcion.contabilizable:
+                    debe, haber = self._concept_accounts(
+                        percepcion, getattr(percepcion, "invertir_asiento_contable", False)
+                    )
+                    lineas.add_pair(
+                        ne,
+                        debe,
+                        haber,
+                        detalle_monto,
+                        detalle.descripcion or percepcion.nombre,
+                        "percepcion",
+                        percepcion.codigo,
                     )
-                    self.session.add(linea_haber)
-                    total_creditos += detalle_monto
-
-                else:
-                    # Regular concept - use configured accounts (or NULL if missing)
-                    if detalle.tipo == "income" and detalle.percepcion_id:
-                        percepcion = self.session.get(Percepcion, detalle.percepcion_id)
-                        if percepcion and percepcion.contabilizable:
-                            invertir_asiento = getattr(percepcion, "invertir_asiento_contable", False)
-                            debe_codigo = (
-                                percepcion.codigo_cuenta_haber if invertir_asiento else percepcion.codigo_cuenta_debe
-                            )
-                            haber_codigo = (
-                                percepcion.codigo_cuenta_debe if invertir_asiento else percepcion.codigo_cuenta_haber
-                            )
-                            debe_descripcion = (
-                                (percepcion.descripcion_cuenta_haber or percepcion.nombre)
-                                if invertir_asiento
-                                else (percepcion.descripcion_cuenta_debe or percepcion.nombre)
-                            )
-                            haber_descripcion = (
-                                (percepcion.descripcion_cuenta_debe or percepcion.nombre)
-                                if invertir_asiento
-                                else (percepcion.descripcion_cuenta_haber or percepcion.nombre)
-                            )
-                            # Always create debit line (even if account is NULL)
-                            orden += 1
-                            if debe_codigo is None:
-                                null_account_count += 1
-                            detalle_monto = round_money(detalle.monto, planilla_moneda)
-                            linea_debe = ComprobanteContableLinea(
-                                comprobante_id=comprobante.id,
-                                nomina_empleado_id=ne.id,
-                                empleado_id=empleado.id,
-                                empleado_codigo=empleado.codigo_empleado,
-                                empleado_nombre=empleado_nombre_completo,
-                                codigo_cuenta=debe_codigo,  # Can be None
-                                descripcion_cuenta=(debe_descripcion if debe_codigo else None),
-                                centro_costos=centro_costos,
-                                tipo_debito_credito="debito",
-                                debito=detalle_monto,
-                                credito=Decimal("0.00"),
-                                monto_calculado=detalle_monto,
-                                concepto=detalle.descripcion or percepcion.nombre,
-                                tipo_concepto="percepcion",
-                                concepto_codigo=percepcion.codigo,
-                                orden=orden,
-                            )
-                            self.session.add(linea_debe)
-                            total_debitos += detalle_monto
-
-                            # Always create credit line (even if account is NULL)
-                            orden += 1
-                            if haber_codigo is None:
-                                null_account_count += 1
-                            linea_haber = ComprobanteContableLinea(
-                                comprobante_id=comprobante.id,
-                                nomina_empleado_id=ne.id,
-                                empleado_id=empleado.id,
-                                empleado_codigo=empleado.codigo_empleado,
-                                empleado_nombre=empleado_nombre_completo,
-                                codigo_cuenta=haber_codigo,  # Can be None
-                                descripcion_cuenta=(haber_descripcion if haber_codigo else None),
-                                centro_costos=centro_costos,
-                                tipo_debito_credito="credito",
-                                debito=Decimal("0.00"),
-                                credito=detalle_monto,
-                                monto_calculado=detalle_monto,
-                                concepto=detalle.descripcion or percepcion.nombre,
-                                tipo_concepto="percepcion",
-                                concepto_codigo=percepcion.codigo,
-                                orden=orden,
-                            )
-                            self.session.add(linea_haber)
-                            total_creditos += detalle_monto
-
-                    elif detalle.tipo == "deduction" and detalle.deduccion_id:
-                        deduccion = self.session.get(Deduccion, detalle.deduccion_id)
-                        if deduccion and deduccion.contabilizable:
-                            invertir_asiento = getattr(deduccion, "invertir_asiento_contable", False)
-                            debe_codigo = (
-                                deduccion.codigo_cuenta_haber if invertir_asiento else deduccion.codigo_cuenta_debe
-                            )
-                            haber_codigo = (
-                                deduccion.codigo_cuenta_debe if invertir_asiento else deduccion.codigo_cuenta_haber
-                            )
-                            debe_descripcion = (
-                                (deduccion.descripcion_cuenta_haber or deduccion.nombre)
-                                if invertir_asiento
-                                else (deduccion.descripcion_cuenta_debe or deduccion.nombre)
-                            )
-                            haber_descripcion = (
-                                (deduccion.descripcion_cuenta_debe or deduccion.nombre)
-                                if invertir_asiento
-                                else (deduccion.descripcion_cuenta_haber or deduccion.nombre)
-                            )
-                            # Always create debit line (even if account is NULL)
-                            orden += 1
-                            if debe_codigo is None:
-                                null_account_count += 1
-                            detalle_monto = round_money(detalle.monto, planilla_moneda)
-                            linea_debe = ComprobanteContableLinea(
-                                comprobante_id=comprobante.id,
-                                nomina_empleado_id=ne.id,
-                                empleado_id=empleado.id,
-                                empleado_codigo=empleado.codigo_empleado,
-                                empleado_nombre=empleado_nombre_completo,
-                                codigo_cuenta=debe_codigo,  # Can be None
-                                descripcion_cuenta=(debe_descripcion if debe_codigo else None),
-                                centro_costos=centro_costos,
-                                tipo_debito_credito="debito",
-                                debito=detalle_monto,
-                                credito=Decimal("0.00"),
-                                monto_calculado=detalle_monto,
-                                concepto=detalle.descripcion or deduccion.nombre,
-                                tipo_concepto="deduction",
-                                concepto_codigo=deduccion.codigo,
-                                orden=orden,
-                            )
-                            self.session.add(linea_debe)
-                            total_debitos += detalle_monto
-
-                            # Always create credit line (even if account is NULL)
-                            orden += 1
-                            if haber_codigo is None:
-                                null_account_count += 1
-                            linea_haber = ComprobanteContableLinea(
-                                comprobante_id=comprobante.id,
-                                nomina_empleado_id=ne.id,
-                                empleado_id=empleado.id,
-                                empleado_codigo=empleado.codigo_empleado,
-                                empleado_nombre=empleado_nombre_completo,
-                                codigo_cuenta=haber_codigo,  # Can be None
-                                descripcion_cuenta=(haber_descripcion if haber_codigo else None),
-                                centro_costos=centro_costos,
-                                tipo_debito_credito="credito",
-                                debito=Decimal("0.00"),
-                                credito=detalle_monto,
-                                monto_calculado=detalle_monto,
-                                concepto=detalle.descripcion or deduccion.nombre,
-                                tipo_concepto="deduction",
-                                concepto_codigo=deduccion.codigo,
-                                orden=orden,
-                            )
-                            self.session.add(linea_haber)
-                            total_creditos += detalle_monto
-
-                    elif detalle.tipo == "benefit" and detalle.prestacion_id:
-                        prestacion = self.session.get(Prestacion, detalle.prestacion_id)
-                        if prestacion and prestacion.contabilizable:
-                            # Always create debit line (even if account is NULL)
-                            orden += 1
-                            if prestacion.codigo_cuenta_debe is None:
-                                null_account_count += 1
-                            detalle_monto = round_money(detalle.monto, planilla_moneda)
-                            linea_debe = ComprobanteContableLinea(
-                                comprobante_id=comprobante.id,
-                                nomina_empleado_id=ne.id,
-                                empleado_id=empleado.id,
-                                empleado_codigo=empleado.codigo_empleado,
-                                empleado_nombre=empleado_nombre_completo,
-                                codigo_cuenta=prestacion.codigo_cuenta_debe,  # Can be None
-                                descripcion_cuenta=(
-                                    (prestacion.descripcion_cuenta_debe or prestacion.nombre)
-                                    if prestacion.codigo_cuenta_debe
-                                    else None
-                                ),
-                                centro_costos=centro_costos,
-                                tipo_debito_credito="debito",
-                                debito=detalle_monto,
-                                credito=Decimal("0.00"),
-                                monto_calculado=detalle_monto,
-                                concepto=detalle.descripcion or prestacion.nombre,
-                                tipo_concepto="benefit",
-                                concepto_codigo=prestacion.codigo,
-                                orden=orden,
-                            )
-                            self.session.add(linea_debe)
-                            total_debitos += detalle_monto
-
-                            # Always create credit line (even if account is NULL)
-                            orden += 1
-                            if prestacion.codigo_cuenta_haber is None:
-                                null_account_count += 1
-                            linea_haber = ComprobanteContableLinea(
-                                comprobante_id=comprobante.id,
-                                nomina_empleado_id=ne.id,
-                                empleado_id=empleado.id,
-                                empleado_codigo=empleado.codigo_empleado,
-                                empleado_nombre=empleado_nombre_completo,
-                                codigo_cuenta=prestacion.codigo_cuenta_haber,  # Can be None
-                                descripcion_cuenta=(
-                                    (prestacion.descripcion_cuenta_haber or prestacion.nombre)
-                                    if prestacion.codigo_cuenta_haber
-                                    else None
-                                ),
-                                centro_costos=centro_costos,
-                                tipo_debito_credito="credito",
-                                debito=Decimal("0.00"),
-                                credito=detalle_monto,
-                                monto_calculado=detalle_monto,
-                                concepto=detalle.descripcion or prestacion.nombre,
-                                tipo_concepto="benefit",
-                                concepto_codigo=prestacion.codigo,
-                                orden=orden,
-                            )
-                            self.session.add(linea_haber)
-                            total_creditos += detalle_monto
-
-        vac_debitos, vac_creditos, orden, null_account_count = self._build_paid_vacation_liability_lines(
-            comprobante,
-            nomina,
-            planilla,
-            nomina_empleados,
-            orden,
-            null_account_count,
-        )
-        total_debitos += vac_debitos
-        total_creditos += vac_creditos
+
+                elif detalle.tipo == "deduction" and deduccion is not None and deduccion.contabilizable:
+                    debe, haber = self._concept_accounts(
+                        deduccion, getattr(deduccion, "invertir_asiento_contable", False)
+                    )
+                    lineas.add_pair(
+                        ne,
+                        debe,
+                        haber,
+                        detalle_monto,
+                        detalle.descripcion or deduccion.nombre,
+                        "deduction",
+                        deduccion.codigo,
+                    )
+
+                elif detalle.tipo == "benefit" and prestacion is not None and prestacion.contabilizable:
+                    debe, haber = self._concept_accounts(prestacion, False)
+                    lineas.add_pair(
+                        ne,
+                        debe,
+                        haber,
+                        detalle_monto,
+                        detalle.descripcion or prestacion.nombre,
+                        "benefit",
+                        prestacion.codigo,
+                    )
+
+        self._build_paid_vacation_liability_lines(lineas, nomina, planilla, nomina_empleados)
+        self._insert_lines(lineas.filas)
+        self.session.expire(comprobante, ["lineas"])
 
         # Calculate balance (should be 0 for balanced voucher)
-        total_debitos = round_money(total_debitos, planilla_moneda)
-        total_creditos = round_money(total_creditos, planilla_moneda)
+        total_debitos = round_money(lineas.total_debitos, planilla_moneda)
+        total_creditos = round_money(lineas.total_creditos, planilla_moneda)
         balance = round_money(total_debitos - total_creditos, planilla_moneda)
 
         # Validate balance
@@ -816,10 +565,10 @@ class AccountingVoucherService:
             if balance_warning not in warnings:
                 warnings.append(balance_warning)
 
-        if null_account_count:
+        if lineas.null_account_count:
             warning_message = (
                 "ADVERTENCIA: La configuración contable está incompleta. "
-                f"Se detectaron {null_account_count} líneas con cuenta contable NULL."
+                f"Se detectaron {lineas.null_account_count} líneas con cuenta contable NULL."
             )
             if warning_message not in warnings:
                 warnings.append(warning_message)
@@ -832,11 +581,98 @@ class AccountingVoucherService:
 
         return comprobante
 
+    def _load_voucher_details(
+        self, nomina_id: str
+    ) -> dict[str, list[tuple[NominaDetalle, Percepcion | None, Deduccion | None, Prestacion | None]]]:
+        """Load every detail line of the nomina with its concept, grouped by NominaEmpleado."""
+        filas = self.session.execute(
+            db.select(NominaDetalle, Percepcion, Deduccion, Prestacion)
+            .join(NominaEmpleado, NominaEmpleado.id == NominaDetalle.nomina_empleado_id)
+            .outerjoin(Percepcion, Percepcion.id == NominaDetalle.percepcion_id)
+            .outerjoin(Deduccion, Deduccion.id == NominaDetalle.deduccion_id)
+            .outerjoin(Prestacion, Prestacion.id == NominaDetalle.prestacion_id)
+            .filter(NominaEmpleado.nomina_id == nomina_id)
+            .order_by(NominaDetalle.nomina_empleado_id, NominaDetalle.orden)
+        ).all()
+
+        detalles: dict[str, list[tuple[NominaDetalle, Percepcion | None, Deduccion | None, Prestacion | None]]] = (
+            defaultdict(list)
+        )
+        for detalle, percepcion, deduccion, prestacion in filas:
+            detalles[detalle.nomina_empleado_id].append((detalle, percepcion, deduccion, prestacion))
+        return detalles
+
+    def _load_loan_control_accounts(self, nomina_id: str) -> dict[tuple[str, str], str | None]:
+        """Map (empleado_id, deduccion_id) of loans and advances of the nomina employees to a control account.
+
+        A key exists for every deduction tied to a loan or advance of the
+        employee; its value is the credit account of the first approved or
+        applied one (None when there is none).
+        """
+        filas = self.session.execute(
+            db.select(Adelanto.empleado_id, Adelanto.deduccion_id, Adelanto.estado, Adelanto.cuenta_haber)
+            .join(NominaEmpleado, NominaEmpleado.empleado_id == Adelanto.empleado_id)
+            .filter(NominaEmpleado.nomina_id == nomina_id, Adelanto.deduccion_id.is_not(None))
+        ).all()
+
+        cuentas: dict[tuple[str, str], str | None] = {}
+        resueltas: set[tuple[str, str]] = set()
+        for empleado_id, deduccion_id, estado, cuenta_haber in filas:
+            clave = (empleado_id, deduccion_id)
+            cuentas.setdefault(clave, None)
+            if clave not in resueltas and estado in (AdelantoEstado.APROBADO, AdelantoEstado.APLICADO):
+                cuentas[clave] = cuenta_haber
+                resueltas.add(clave)
+        return cuentas
+
+    @staticmethod
+    def _concept_accounts(
+        concepto: Percepcion | Deduccion | Prestacion, invertir_asiento: bool
+    ) -> tuple[tuple[str | None, str | None], tuple[str | None, str | None]]:
+        """Debit and credit (account, description) of a concept, swapped when its entry is inverted."""
+        debe = (concepto.codigo_cuenta_debe, concepto.descripcion_cuenta_debe or concepto.nombre)
+        haber = (concepto.codigo_cuenta_haber, concepto.descripcion_cuenta_haber or concepto.nombre)
+        if invertir_asiento:
+            debe, haber = haber, debe
+        return (debe[0], debe[1] if debe[0] else None), (haber[0], haber[1] if haber[0] else None)
+
+    def _insert_lines(self, filas: list[dict[str, Any]]) -> None:
+        """Write voucher lines in chunked multi-row INSERTs."""
+        for inicio in range(0, len(filas), BULK_CHUNK_SIZE):
+            self.session.execute(insert(ComprobanteContableLinea.__table__), filas[inicio : inicio + BULK_CHUNK_SIZE])
+
     def validate_line_integrity(self, comprobante: ComprobanteContable) -> None:
-        """Validate integrity rules for voucher lines."""
+        """Validate integrity rules for voucher lines.
+
+        Candidate lines are selected in SQL; only those are checked (and reported) here.
+        Lines with an amount that ``round_money`` would change are always
+        candidates, so the SQL rules on raw amounts agree with the rounded checks.
+        """
         comprobante_moneda = cast(Moneda | None, comprobante.moneda)
+        linea_tabla = ComprobanteContableLinea
+        tiene_debito = linea_tabla.debito > 0
+        tiene_credito = linea_tabla.credito > 0
+        fuera_de_escala = db.or_(
+            *(
+                db.func.round(columna, MONEY_DECIMALS) != columna
+                for columna in (linea_tabla.debito, linea_tabla.credito, linea_tabla.monto_calculado)
+            )
+        )
         lineas = (
-            self.session.execute(db.select(ComprobanteContableLinea).filter_by(comprobante_id=comprobante.id))
+            self.session.execute(
+                db.select(linea_tabla).filter(
+                    linea_tabla.comprobante_id == comprobante.id,
+                    db.or_(
+                        fuera_de_escala,
+                        db.and_(tiene_debito, tiene_credito),
+                        db.and_(db.not_(tiene_debito), db.not_(tiene_credito)),
+                        linea_tabla.monto_calculado != linea_tabla.debito + linea_tabla.credito,
+                        linea_tabla.tipo_debito_credito.not_in(("debito", "credito")),
+                        db.and_(linea_tabla.tipo_debito_credito == "debito", db.not_(tiene_debito)),
+                        db.and_(linea_tabla.tipo_debito_credito == "credito", db.not_(tiene_credito)),
+                    ),
+                )
+            )
             .scalars()
             .all()
         )
@@ -891,41 +727,46 @@ class AccountingVoucherService:
         """
         self.validate_line_integrity(comprobante)
         comprobante_moneda = cast(Moneda | None, comprobante.moneda)
-        # Dictionary to accumulate by (account, cost_center)
-        summary_dict: dict[tuple[str, str | None], dict[str, Any]] = defaultdict(
-            lambda: {"debito": Decimal("0.00"), "credito": Decimal("0.00"), "descripcion": ""}
-        )
+        linea = ComprobanteContableLinea
+        cuenta_centro = (linea.codigo_cuenta, linea.centro_costos)
 
-        # Get all lines
-        lineas = (
-            self.session.execute(
-                db.select(ComprobanteContableLinea)
-                .filter_by(comprobante_id=comprobante.id)
-                .order_by(ComprobanteContableLinea.orden)
-            )
-            .scalars()
-            .all()
-        )
+        # Debits and credits per account + cost center, summed in SQL (lines are stored rounded)
+        sumas = self.session.execute(
+            db.select(*cuenta_centro, func.sum(linea.debito), func.sum(linea.credito))
+            .filter(linea.comprobante_id == comprobante.id)
+            .group_by(*cuenta_centro)
+        ).all()
 
         # Check for NULL accounts and raise error if found
-        null_account_lines = [linea for linea in lineas if linea.codigo_cuenta is None]
-        if null_account_lines:
+        if any(codigo_cuenta is None for codigo_cuenta, _centro, _debito, _credito in sumas):
             raise ValueError(
                 "No se puede generar comprobante sumarizado: existen líneas con cuentas contables sin configurar. "
                 "Por favor configure todas las cuentas contables o utilice el comprobante de auditoría."
             )
 
-        # Accumulate by account + cost center (only lines with valid accounts)
-        for linea in lineas:
-            if linea.codigo_cuenta is None:
-                continue  # Skip NULL accounts
-
-            key = (linea.codigo_cuenta, linea.centro_costos)
-            summary_dict[key]["debito"] += round_money(linea.debito, comprobante_moneda)
-            summary_dict[key]["credito"] += round_money(linea.credito, comprobante_moneda)
-            # Use first description found for this account
-            if not summary_dict[key]["descripcion"]:
-                summary_dict[key]["descripcion"] = linea.descripcion_cuenta or ""
+        # Use first description found for each account + cost center (by line order)
+        descripciones: dict[tuple[str, str | None], tuple[int, str]] = {}
+        for codigo_cuenta, centro_costos, descripcion, primer_orden in self.session.execute(
+            db.select(*cuenta_centro, linea.descripcion_cuenta, func.min(linea.orden))
+            .filter(
+                linea.comprobante_id == comprobante.id,
+                linea.descripcion_cuenta.is_not(None),
+                linea.descripcion_cuenta != "",
+            )
+            .group_by(*cuenta_centro, linea.descripcion_cuenta)
+        ):
+            key = (codigo_cuenta, centro_costos)
+            if key not in descripciones or primer_orden < descripciones[key][0]:
+                descripciones[key] = (primer_orden, descripcion)
+
+        summary_dict: dict[tuple[str, str | None], dict[str, Any]] = {
+            (codigo_cuenta, centro_costos): {
+                "debito": round_money(debito, comprobante_moneda),
+                "credito": round_money(credito, comprobante_moneda),
+                "descripcion": descripciones.get((codigo_cuenta, centro_costos), (0, ""))[1],
+            }
+            for codigo_cuenta, centro_costos, debito, credito in sumas
+        }
 
         # Create summarized entries with netting
         summarized_entries = []
@@ -1024,3 +865,33 @@ class AccountingVoucherService:
             detailed_entries.append(current_entry)
 
         return detailed_entries
+
+    def iter_detailed_voucher_lines(self, comprobante: ComprobanteContable, yield_per: int = 1000) -> Iterator[Any]:
+        """Stream the voucher lines in employee order, for exports of any size.
+
+        Unlike ``get_detailed_voucher_by_employee`` nothing is grouped in memory:
+        rows are fetched ``yield_per`` at a time and expose ``empleado_codigo``,
+        ``empleado_nombre``, ``concepto``, ``codigo_cuenta``, ``descripcion_cuenta``,
+        ``debito`` and ``credito``.
+
+        Args:
+            comprobante: The comprobante to read
+            yield_per: Rows fetched per round trip
+
+        Yields:
+            One row per accounting line
+        """
+        yield from self.session.execute(
+            db.select(
+                ComprobanteContableLinea.empleado_codigo,
+                ComprobanteContableLinea.empleado_nombre,
+                ComprobanteContableLinea.concepto,
+                ComprobanteContableLinea.codigo_cuenta,
+                ComprobanteContableLinea.descripcion_cuenta,
+                ComprobanteContableLinea.debito,
+                ComprobanteContableLinea.credito,
+            )
+            .filter_by(comprobante_id=comprobante.id)
+            .order_by(ComprobanteContableLinea.empleado_codigo, ComprobanteContableLinea.orden)
+            .execution_options(yield_per=yield_per)
+        )
@@ -14,7 +14,9 @@ from coati_payroll.model import AcumuladoAnual, Empleado, Planilla
 from ..domain.employee_calculation import EmpleadoCalculo
 from ..repositories.acumulado_repository import AcumuladoRepository
 from ..repositories.config_repository import ConfigRepository
+from ..repositories.payroll_prefetch import PayrollPrefetch
 from ..results.warning_collector import WarningCollectorProtocol
+from ..utils.fiscal_period import fiscal_period_start
 
 
 class EmployeeProcessingService:
@@ -27,6 +29,7 @@ class EmployeeProcessingService:
     ):
         self.config_repo = config_repository
         self.acumulado_repo = acumulado_repository
+        self.prefetch: PayrollPrefetch | None = None
 
     def build_calculation_variables(
         self,
@@ -209,20 +212,18 @@ class EmployeeProcessingService:
         self, empleado: Empleado, planilla: Planilla, periodo_inicio: date
     ) -> AcumuladoAnual | None:
         """Get accumulated annual values for employee."""
-        if not planilla.tipo_planilla:
+        periodo_fiscal_inicio = fiscal_period_start(planilla, periodo_inicio)
+        if periodo_fiscal_inicio is None:
             return None
 
         tipo_planilla = planilla.tipo_planilla
 
-        # Calculate fiscal period
-        anio = periodo_inicio.year
-        mes_inicio = int(planilla.mes_inicio_fiscal or tipo_planilla.mes_inicio_fiscal)
-        dia_inicio = tipo_planilla.dia_inicio_fiscal
-
-        if periodo_inicio.month < mes_inicio:
-            anio -= 1
-
-        periodo_fiscal_inicio = date(anio, mes_inicio, dia_inicio)
+        if self.prefetch is not None:
+            found, acumulado = self.prefetch.get_acumulado(
+                empleado.id, tipo_planilla.id, planilla.empresa_id, periodo_fiscal_inicio
+            )
+            if found:
+                return acumulado
 
         # Look up existing accumulated record
         from sqlalchemy import select
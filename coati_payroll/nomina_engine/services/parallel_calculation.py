@@ -0,0 +1,183 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Process-pool calculation of payroll employees for synchronous runs.
+
+The parent process keeps ownership of the transaction: it creates the
+Nomina, writes NominaEmpleado/NominaDetalle rows and applies every side
+effect. Worker processes only calculate. Each worker opens its own
+read-only database session, receives the configuration snapshot once at
+start-up and returns plain data (``EmpleadoCalculo.to_payload`` and the
+deferred loan effects), never ORM objects.
+"""
+
+from __future__ import annotations
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from multiprocessing import get_context
+from typing import Any, Sequence, cast
+
+from coati_payroll.log import log
+
+# Smallest number of employees worth sending to a worker; below this the
+# cost of starting processes outweighs the calculation itself.
+MIN_EMPLEADOS_POR_LOTE = 25
+
+# Chunks per worker, so a slow chunk does not leave the other workers idle.
+LOTES_POR_PROCESO = 4
+
+# Configuration keys a worker needs to rebuild its Flask application.
+_CONFIG_PREFIXES = ("SQLALCHEMY_", "BABEL_")
+
+_worker_state: dict[str, Any] = {}
+
+
+def supports_process_pool(database_uri: str | None) -> bool:
+    """Return True when worker processes can open their own connection to the database.
+
+    In-memory SQLite databases only exist inside the parent process.
+    """
+    if not database_uri:
+        return False
+    if database_uri.startswith("sqlite"):
+        return ":memory:" not in database_uri and database_uri.rstrip("/") not in ("sqlite:", "sqlite+pysqlite:")
+    return True
+
+
+def plan_chunks(ids: Sequence[str], procesos: int) -> list[list[str]]:
+    """Split planilla employee IDs into chunks for ``procesos`` workers.
+
+    Returns an empty list when the planilla is too small to benefit from
+    multiple processes.
+    """
+    if procesos < 2 or len(ids) < 2 * MIN_EMPLEADOS_POR_LOTE:
+        return []
+    size = max(MIN_EMPLEADOS_POR_LOTE, math.ceil(len(ids) / (procesos * LOTES_POR_PROCESO)))
+    return [list(ids[inicio : inicio + size]) for inicio in range(0, len(ids), size)]
+
+
+def worker_config(config: Any) -> dict[str, Any]:
+    """Extract the picklable configuration a worker needs from the Flask config."""
+    return {
+        clave: valor
+        for clave, valor in config.items()
+        if clave.startswith(_CONFIG_PREFIXES) and isinstance(valor, (str, int, float, bool, list, tuple, dict))
+    }
+
+
+def calculate_in_process_pool(
+    procesos: int,
+    config: dict[str, Any],
+    chunks: list[list[str]],
+    planilla_id: str,
+    periodo_inicio: date,
+    periodo_fin: date,
+    fecha_calculo: date,
+    snapshot: dict[str, Any],
+    bootstrap_context: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """Calculate every chunk of planilla employees in a pool of worker processes.
+
+    Args:
+        procesos: Number of worker processes.
+        config: Output of ``worker_config``.
+        chunks: PlanillaEmpleado IDs per chunk, from ``plan_chunks``.
+        planilla_id: Planilla being calculated.
+        periodo_inicio: First day of the payroll period.
+        periodo_fin: Last day of the payroll period.
+        fecha_calculo: Calculation date.
+        snapshot: Configuration snapshot captured by the parent.
+        bootstrap_context: Company bootstrap context resolved by the parent.
+
+    Returns:
+        One result per chunk, in chunk order, each with ``empleados``,
+        ``prestamos``, ``errors`` and ``warnings``.
+    """
+    contexto = {
+        "planilla_id": planilla_id,
+        "periodo_inicio": periodo_inicio,
+        "periodo_fin": periodo_fin,
+        "fecha_calculo": fecha_calculo,
+        "snapshot": snapshot,
+        "bootstrap_context": bootstrap_context,
+    }
+    log.info("Calculating %s employee chunks in %s processes", len(chunks), procesos)
+    # spawn: workers must not inherit the parent's open transaction and connections
+    with ProcessPoolExecutor(
+        max_workers=min(procesos, len(chunks)),
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(config, contexto),
+    ) as executor:
+        return list(executor.map(_calculate_chunk, chunks))
+
+
+def _init_worker(config: dict[str, Any], contexto: dict[str, Any]) -> None:
+    """Build a minimal application for a worker process (runs once per worker)."""
+    from flask import Flask
+    from flask_babel import Babel
+
+    from coati_payroll.model import db
+
+    app = Flask("coati_payroll")
+    app.config.from_mapping(config)
+    db.init_app(app)
+    Babel(app)
+    app.app_context().push()
+    _worker_state.update(contexto)
+
+
+def _calculate_chunk(planilla_empleado_ids: list[str]) -> dict[str, Any]:
+    """Calculate one chunk of planilla employees inside a worker process."""
+    from sqlalchemy.orm import joinedload
+
+    from coati_payroll.model import db, Planilla, PlanillaEmpleado
+    from ..results.warning_collector import WarningCollector
+    from .payroll_execution_service import PayrollExecutionService
+
+    errors: list[str] = []
+    warnings = WarningCollector()
+    try:
+        service = PayrollExecutionService(db.session)
+        service.concept_calculator.warnings = warnings
+        service.deduction_calculator.warnings = warnings
+
+        snapshot = _worker_state["snapshot"]
+        service._bind_snapshot(snapshot)
+
+        planilla = db.session.get(Planilla, _worker_state["planilla_id"])
+        posicion = {planilla_empleado_id: i for i, planilla_empleado_id in enumerate(planilla_empleado_ids)}
+        planilla_empleados = sorted(
+            db.session.execute(
+                db.select(PlanillaEmpleado)
+                .options(joinedload(cast(Any, PlanillaEmpleado.empleado)))
+                .filter(PlanillaEmpleado.id.in_(planilla_empleado_ids))
+            )
+            .scalars()
+            .all(),
+            key=lambda planilla_empleado: posicion[planilla_empleado.id],
+        )
+
+        empleados_calculo, loan_processor = service._calculate_employees(
+            None,
+            planilla,
+            planilla_empleados,
+            _worker_state["periodo_inicio"],
+            _worker_state["periodo_fin"],
+            _worker_state["fecha_calculo"],
+            snapshot,
+            _worker_state["bootstrap_context"],
+            errors,
+            warnings,
+        )
+        return {
+            "empleados": [emp_calculo.to_payload() for emp_calculo in empleados_calculo],
+            "prestamos": loan_processor.pending_effects_payload(),
+            "errors": errors,
+            "warnings": warnings.to_list(),
+        }
+    finally:
+        # Workers never write: discard anything the calculation may have touched
+        db.session.rollback()
+        db.session.remove()
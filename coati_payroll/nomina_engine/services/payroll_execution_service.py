@@ -4,12 +4,13 @@
 
 from __future__ import annotations
 
+from contextlib import AbstractContextManager, nullcontext
 from datetime import date, datetime, timezone
 from decimal import Decimal
 from typing import Any, cast
 from types import SimpleNamespace
 
-from coati_payroll.model import db, Planilla, Empleado, Nomina, Moneda
+from coati_payroll.model import db, Planilla, Empleado, Nomina, NominaEmpleado, Moneda
 from coati_payroll.enums import NominaEstado
 from coati_payroll.formula_engine import FormulaEngineError
 from coati_payroll.log import log
@@ -19,6 +20,8 @@ from ..repositories.config_repository import ConfigRepository
 from ..repositories.exchange_rate_repository import ExchangeRateRepository
 from ..repositories.novelty_repository import NoveltyRepository
 from ..repositories.acumulado_repository import AcumuladoRepository
+from ..repositories.payroll_prefetch import PayrollPrefetch
+from ..repositories.snapshot_repository import SnapshotRepository
 from ..validators.planilla_validator import PlanillaValidator
 from ..validators.employee_validator import EmployeeValidator
 from ..validators import ValidationError, NominaEngineError
@@ -35,8 +38,15 @@ from ..processors.novelty_processor import NoveltyProcessor
 from ..processors.accounting_processor import AccountingProcessor
 from ..services.employee_processing_service import EmployeeProcessingService
 from ..services.snapshot_service import SnapshotService
+from ..results.run_profile import RunProfiler
 from ..results.warning_collector import WarningCollector
 from ..services.accounting_voucher_service import AccountingVoucherService
+from .parallel_calculation import (
+    calculate_in_process_pool,
+    plan_chunks,
+    supports_process_pool,
+    worker_config,
+)
 from ..utils.rounding import round_money
 
 
@@ -48,6 +58,7 @@ class PayrollExecutionService:
 
         # Initialize repositories
         self.planilla_repo = PlanillaRepository(session)
+        self.snapshot_repo = SnapshotRepository(session)
         self.config_repo = ConfigRepository(session)
         self.exchange_rate_repo = ExchangeRateRepository(session)
         self.novelty_repo = NoveltyRepository(session)
@@ -75,6 +86,9 @@ class PayrollExecutionService:
         self.snapshot_service = SnapshotService(session)
         self.accounting_voucher_service = AccountingVoucherService(session)
 
+        # Profile of the run in progress, set by execute_payroll
+        self.profiler: RunProfiler | None = None
+
     def execute_payroll(
         self,
         planilla: Planilla,
@@ -83,8 +97,42 @@ class PayrollExecutionService:
         fecha_calculo: date,
         usuario: str | None,
         excluded_nomina_id: str | None = None,
+        processes: int = 0,
+    ) -> tuple[Nomina | None, list[EmpleadoCalculo], list[str], list[str]]:
+        """Execute a complete payroll run.
+
+        With ``processes`` > 1, employee calculations of large planillas run in
+        a pool of worker processes; persistence and side effects stay here.
+        Time and SQL statements per phase are stored in ``nomina.perfil_ejecucion``.
+        """
+        profiler = RunProfiler().start()
+        self.profiler = profiler
+        try:
+            return self._execute_payroll(
+                planilla,
+                periodo_inicio,
+                periodo_fin,
+                fecha_calculo,
+                usuario,
+                excluded_nomina_id,
+                processes,
+                profiler,
+            )
+        finally:
+            profiler.stop()
+            self.profiler = None
+
+    def _execute_payroll(
+        self,
+        planilla: Planilla,
+        periodo_inicio: date,
+        periodo_fin: date,
+        fecha_calculo: date,
+        usuario: str | None,
+        excluded_nomina_id: str | None,
+        processes: int,
+        profiler: RunProfiler,
     ) -> tuple[Nomina | None, list[EmpleadoCalculo], list[str], list[str]]:
-        """Execute a complete payroll run."""
         errors: list[str] = []
         warnings = WarningCollector()
 
@@ -104,19 +152,19 @@ class PayrollExecutionService:
             excluded_nomina_id=excluded_nomina_id,
         )
 
-        validation_result = self.planilla_validator.validate(context)
+        with profiler.phase("validation"):
+            validation_result = self.planilla_validator.validate(context)
         if not validation_result.is_valid:
             errors.extend(validation_result.errors)
             return None, [], errors, warnings.to_list()
 
         # Capture configuration snapshots for recalculation consistency
-        snapshot = self.snapshot_service.capture_complete_snapshot(planilla, periodo_inicio, periodo_fin, fecha_calculo)
-        deducciones_snapshot = {
-            deduccion["id"]: deduccion for deduccion in snapshot.get("catalogos", {}).get("deducciones", [])
-        }
-        self.concept_calculator.deducciones_snapshot = deducciones_snapshot
-        self.concept_calculator.configuracion_snapshot = snapshot.get("configuracion") or None
-        bootstrap_context = self._resolve_company_bootstrap_context(planilla, periodo_inicio, warnings)
+        with profiler.phase("snapshot"):
+            snapshot = self.snapshot_service.capture_complete_snapshot(
+                planilla, periodo_inicio, periodo_fin, fecha_calculo
+            )
+            deducciones_snapshot = self._bind_snapshot(snapshot)
+            bootstrap_context = self._resolve_company_bootstrap_context(planilla, periodo_inicio, warnings)
 
         # Prevent duplicate execution for the same period
         # Exclude ERROR state to allow retries
@@ -153,153 +201,591 @@ class PayrollExecutionService:
             total_deducciones=Decimal("0.00"),
             total_neto=Decimal("0.00"),
             fecha_calculo_original=fecha_calculo,
-            configuracion_snapshot=snapshot["configuracion"],
-            tipos_cambio_snapshot=snapshot["tipos_cambio"],
-            catalogos_snapshot=snapshot["catalogos"],
         )
+        with profiler.phase("snapshot"):
+            self.snapshot_repo.attach(nomina, snapshot)
         db.session.add(nomina)
         db.session.flush()
 
-        # Initialize processors that need nomina
-        loan_processor = LoanProcessor(
-            nomina, fecha_calculo, periodo_inicio, periodo_fin, calcular_interes=True, apply_side_effects=False
-        )
-
         # Update warnings reference for calculators (shared list)
         self.concept_calculator.warnings = warnings
         self.deduction_calculator.warnings = warnings
 
         # Process each employee
-        empleados_calculo: list[EmpleadoCalculo] = []
-        planilla_empleados = cast(list[Any], planilla.planilla_empleados)
+        calculation_args = (
+            nomina,
+            planilla,
+            cast(list[Any], planilla.planilla_empleados),
+            periodo_inicio,
+            periodo_fin,
+            fecha_calculo,
+            snapshot,
+            bootstrap_context,
+            errors,
+            warnings,
+        )
+        with profiler.phase("calculation"):
+            calculado = self._calculate_employees_in_pool(*calculation_args, processes) if processes > 1 else None
+            empleados_calculo, loan_processor = calculado or self._calculate_employees(*calculation_args)
 
-        for planilla_empleado in planilla_empleados:
-            if not planilla_empleado.activo:
-                continue
+            # Calculate totals
+            self._calculate_totals(nomina, empleados_calculo)
 
-            empleado = planilla_empleado.empleado
-            if not empleado.activo:
-                warnings.append(
-                    f"Empleado {empleado.primer_nombre} {empleado.primer_apellido} no está activo y será omitido."
-                )
-                continue
+        if not errors:
+            with profiler.phase("persistence"):
+                nomina_empleados = self.accounting_processor.create_nomina_empleados_bulk(empleados_calculo, nomina)
 
-            try:
-                emp_calculo = self._process_employee(
-                    empleado,
-                    planilla,
-                    periodo_inicio,
-                    periodo_fin,
-                    fecha_calculo,
-                    loan_processor,
-                    snapshot.get("configuracion"),
-                    snapshot.get("tipos_cambio"),
-                    bootstrap_context,
-                    warnings,
+            with profiler.phase("side_effects"):
+                vacation_processor = self._build_vacation_processor(
+                    planilla, periodo_inicio, periodo_fin, usuario, warnings, snapshot
                 )
-                empleados_calculo.append(emp_calculo)
-            except (NominaEngineError, FormulaEngineError) as e:
-                # Capture all payroll engine and formula errors
-                errors.append(
-                    f"Error procesando empleado {empleado.primer_nombre} {empleado.primer_apellido}: {str(e)}"
+                self._update_accumulations(
+                    empleados_calculo, planilla, periodo_inicio, periodo_fin, deducciones_snapshot, bootstrap_context
                 )
-            except Exception as e:
-                # Capture any unexpected error to prevent 500 errors
-                errors.append(
-                    f"Error inesperado procesando empleado {empleado.primer_nombre} {empleado.primer_apellido}: "
-                    f"{type(e).__name__}: {str(e)}"
+                vacation_processor.prepare(
+                    [emp_calculo.empleado for emp_calculo in empleados_calculo],
+                    [nomina_empleado.id for nomina_empleado in nomina_empleados],
                 )
+                for emp_calculo, nomina_empleado in zip(empleados_calculo, nomina_empleados):
+                    with profiler.employee("side_effects"):
+                        self._apply_employee_side_effects(
+                            emp_calculo, nomina, vacation_processor, nomina_empleado=nomina_empleado
+                        )
 
-        # Calculate totals
-        self._calculate_totals(nomina, empleados_calculo)
+                loan_processor.apply_pending_effects()
 
-        if not errors:
-            vacation_snapshot = snapshot.get("vacaciones", {}).copy()
-            vacation_snapshot["configuracion"] = snapshot.get("configuracion")
-            vacation_processor = VacationProcessor(
+                # Update planilla last execution
+                planilla.ultima_ejecucion = datetime.now(timezone.utc)
+
+            # Generate accounting voucher
+            with profiler.phase("voucher"):
+                self._generate_audit_voucher(nomina, planilla, fecha_calculo, usuario, warnings)
+
+        with profiler.phase("log"):
+            if errors:
+                nomina.estado = NominaEstado.ERROR
+                # Save error logs for audit trail before any rollback
+                self._save_log_entries(nomina, errors, warnings.to_list(), empleados_calculo)
+                # Flush to persist the ERROR nomina and logs, but don't commit yet
+                # Engine will decide whether to commit (for audit trail) or rollback
+                db.session.flush()
+            else:
+                nomina.estado = NominaEstado.GENERADO
+                # Save errors and warnings to log_procesamiento for transparency
+                self._save_log_entries(nomina, errors, warnings.to_list(), empleados_calculo)
+
+        profiler.stop()
+        nomina.perfil_ejecucion = profiler.to_dict()
+        log.info(
+            "Payroll run profile for nomina %s: %ss, %s SQL statements",
+            nomina.id,
+            nomina.perfil_ejecucion["total_seconds"],
+            nomina.perfil_ejecucion["total_queries"],
+        )
+        return nomina, empleados_calculo, errors, warnings.to_list()
+
+    def prepare_sharded_run(
+        self, nomina: Nomina, planilla: Planilla, periodo_inicio: date, periodo_fin: date, fecha_calculo: date
+    ) -> None:
+        """Capture the configuration snapshot on a nomina before its shards are calculated.
+
+        Every shard reads the snapshot back from the nomina, so all workers use
+        exactly the same configuration, exchange rates and catalogs.
+        """
+        snapshot = self.snapshot_service.capture_complete_snapshot(planilla, periodo_inicio, periodo_fin, fecha_calculo)
+        nomina.fecha_calculo_original = fecha_calculo
+        self.snapshot_repo.attach(nomina, snapshot)
+
+    def calculate_shard(
+        self,
+        nomina: Nomina,
+        planilla: Planilla,
+        empleado_ids: list[str],
+        periodo_inicio: date,
+        periodo_fin: date,
+        fecha_calculo: date,
+    ) -> tuple[dict[str, Any], list[str], list[str]]:
+        """Calculate one shard of a nomina and write its NominaEmpleado/NominaDetalle rows.
+
+        Accumulations, vacations and loan payments are not applied here: they
+        are returned as plain data and applied once by ``finalize_sharded_run``
+        after every shard succeeded. The NominaEmpleado rows are therefore the
+        only thing a shard commits, and the caller removes them if any shard of
+        the nomina fails.
+
+        Returns:
+            Tuple of (resultados, errors, warnings). ``resultados`` holds the
+            employee payloads and the deferred loan effects; it is empty when
+            there are errors, in which case nothing is written.
+        """
+        from coati_payroll.model import PlanillaEmpleado
+
+        errors: list[str] = []
+        warnings = WarningCollector()
+        self.concept_calculator.warnings = warnings
+        self.deduction_calculator.warnings = warnings
+
+        with self._phase("snapshot"):
+            snapshot = self._snapshot_from_nomina(nomina)
+            self._bind_snapshot(snapshot)
+            bootstrap_context = self._resolve_company_bootstrap_context(planilla, periodo_inicio, warnings)
+
+        with self._phase("calculation"):
+            planilla_empleados = list(
+                self.session.execute(
+                    db.select(PlanillaEmpleado).filter(
+                        PlanillaEmpleado.planilla_id == planilla.id,
+                        PlanillaEmpleado.empleado_id.in_(empleado_ids),
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+            empleados_calculo, loan_processor = self._calculate_employees(
+                nomina,
                 planilla,
+                planilla_empleados,
                 periodo_inicio,
                 periodo_fin,
-                usuario,
+                fecha_calculo,
+                snapshot,
+                bootstrap_context,
+                errors,
                 warnings,
-                apply_side_effects=False,
-                snapshot=vacation_snapshot,
             )
+        if errors:
+            return {}, errors, warnings.to_list()
+
+        with self._phase("persistence"):
+            self.accounting_processor.create_nomina_empleados_bulk(empleados_calculo, nomina)
+
+        resultados = {
+            "empleados": [emp_calculo.to_payload() for emp_calculo in empleados_calculo],
+            "prestamos": loan_processor.pending_effects_payload(),
+        }
+        return resultados, errors, warnings.to_list()
+
+    def finalize_sharded_run(
+        self,
+        nomina: Nomina,
+        planilla: Planilla,
+        periodo_inicio: date,
+        periodo_fin: date,
+        fecha_calculo: date,
+        usuario: str | None,
+        resultados: list[dict[str, Any]],
+        shard_warnings: list[str] | None = None,
+    ) -> list[str]:
+        """Apply the deferred side effects of every shard and close the nomina.
+
+        Args:
+            resultados: ``resultados`` returned by ``calculate_shard`` for each shard.
+            shard_warnings: Warnings collected while calculating the shards.
 
+        Returns:
+            All warnings of the run.
+        """
+        warnings = WarningCollector()
+        warnings.extend(shard_warnings or [])
+
+        with self._phase("snapshot"):
+            snapshot = self._snapshot_from_nomina(nomina)
+            deducciones_snapshot = self._bind_snapshot(snapshot)
+            bootstrap_context = self._resolve_company_bootstrap_context(planilla, periodo_inicio, warnings)
+
+        with self._phase("side_effects"):
+            payloads = [payload for resultado in resultados for payload in resultado.get("empleados", [])]
+            empleado_ids = [payload["empleado_id"] for payload in payloads]
+            empleados = {
+                empleado.id: empleado
+                for empleado in self.session.execute(db.select(Empleado).filter(Empleado.id.in_(empleado_ids)))
+                .scalars()
+                .all()
+            }
+            nomina_empleados = {
+                nomina_empleado.empleado_id: nomina_empleado
+                for nomina_empleado in self.session.execute(
+                    db.select(NominaEmpleado).filter(NominaEmpleado.nomina_id == nomina.id)
+                )
+                .scalars()
+                .all()
+            }
+            empleados_calculo = [
+                EmpleadoCalculo.from_payload(empleados[payload["empleado_id"]], planilla, payload)
+                for payload in payloads
+            ]
+
+            self._update_accumulations(
+                empleados_calculo, planilla, periodo_inicio, periodo_fin, deducciones_snapshot, bootstrap_context
+            )
+            vacation_processor = self._build_vacation_processor(
+                planilla, periodo_inicio, periodo_fin, usuario, warnings, snapshot
+            )
+            vacation_processor.prepare(
+                [emp_calculo.empleado for emp_calculo in empleados_calculo],
+                [nomina_empleado.id for nomina_empleado in nomina_empleados.values()],
+            )
             for emp_calculo in empleados_calculo:
                 self._apply_employee_side_effects(
                     emp_calculo,
                     nomina,
-                    planilla,
-                    periodo_inicio,
-                    periodo_fin,
                     vacation_processor,
-                    deducciones_snapshot,
-                    bootstrap_context,
+                    nomina_empleado=nomina_empleados.get(emp_calculo.empleado.id),
                 )
 
+            loan_processor = LoanProcessor(
+                nomina, fecha_calculo, periodo_inicio, periodo_fin, calcular_interes=True, apply_side_effects=False
+            )
+            for resultado in resultados:
+                loan_processor.restore_pending_effects(resultado.get("prestamos", []))
             loan_processor.apply_pending_effects()
 
-            # Update planilla last execution
+            self._calculate_totals(nomina, empleados_calculo)
             planilla.ultima_ejecucion = datetime.now(timezone.utc)
 
-            # Generate accounting voucher
+        with self._phase("voucher"):
+            self._generate_audit_voucher(nomina, planilla, fecha_calculo, usuario, warnings)
+
+        with self._phase("log"):
+            nomina.estado = NominaEstado.GENERADO
+            self._save_log_entries(nomina, [], warnings.to_list(), empleados_calculo)
+        return warnings.to_list()
+
+    def _phase(self, nombre: str) -> AbstractContextManager[None]:
+        """Time a phase on the active profiler, if the caller attached one."""
+        return self.profiler.phase(nombre) if self.profiler else nullcontext()
+
+    def _snapshot_from_nomina(self, nomina: Nomina) -> dict[str, Any]:
+        """Rebuild the snapshot dictionary stored on a nomina by ``prepare_sharded_run``."""
+        catalogos = nomina.catalogos_snapshot or {}
+        return {
+            "configuracion": nomina.configuracion_snapshot,
+            "tipos_cambio": nomina.tipos_cambio_snapshot,
+            "catalogos": catalogos,
+            "vacaciones": catalogos.get("vacaciones") or {},
+        }
+
+    def _bind_snapshot(self, snapshot: dict[str, Any]) -> dict[str, dict]:
+        """Point the concept calculator at a snapshot and return deductions by ID."""
+        deducciones_snapshot = {
+            deduccion["id"]: deduccion for deduccion in (snapshot.get("catalogos") or {}).get("deducciones", [])
+        }
+        self.concept_calculator.deducciones_snapshot = deducciones_snapshot
+        self.concept_calculator.configuracion_snapshot = snapshot.get("configuracion") or None
+        return deducciones_snapshot
+
+    def _calculate_employees(
+        self,
+        nomina: Nomina | None,
+        planilla: Planilla,
+        planilla_empleados: list[Any],
+        periodo_inicio: date,
+        periodo_fin: date,
+        fecha_calculo: date,
+        snapshot: dict[str, Any],
+        bootstrap_context: dict[str, Any],
+        errors: list[str],
+        warnings: WarningCollector,
+    ) -> tuple[list[EmpleadoCalculo], LoanProcessor]:
+        """Calculate every active employee, collecting per-employee errors.
+
+        Loan and advance payments are deferred on the returned LoanProcessor.
+        """
+        # Load per-employee rows for all employees in a few set-based queries; the
+        # acumulados stay cached on the repository for the accumulation update
+        self.acumulado_repo.clear_cache()
+        prefetch = PayrollPrefetch(self.session, acumulado_repository=self.acumulado_repo).load(
+            [pe.empleado for pe in planilla_empleados if pe.activo and pe.empleado.activo],
+            planilla,
+            periodo_inicio,
+            periodo_fin,
+            fecha_calculo,
+            snapshot.get("tipos_cambio"),
+        )
+
+        # Initialize processors that need nomina
+        loan_processor = LoanProcessor(
+            nomina,
+            fecha_calculo,
+            periodo_inicio,
+            periodo_fin,
+            calcular_interes=True,
+            apply_side_effects=False,
+            prefetch=prefetch,
+        )
+
+        empleados_calculo: list[EmpleadoCalculo] = []
+        self._set_prefetch(prefetch)
+        try:
+            for planilla_empleado in planilla_empleados:
+                if not planilla_empleado.activo:
+                    continue
+
+                empleado = planilla_empleado.empleado
+                if not empleado.activo:
+                    warnings.append(
+                        f"Empleado {empleado.primer_nombre} {empleado.primer_apellido} no está activo y será omitido."
+                    )
+                    continue
+
+                try:
+                    with self.profiler.employee("preparation") if self.profiler else nullcontext():
+                        emp_calculo = self._prepare_employee(
+                            empleado,
+                            planilla,
+                            periodo_inicio,
+                            periodo_fin,
+                            fecha_calculo,
+                            snapshot.get("configuracion"),
+                            snapshot.get("tipos_cambio"),
+                            bootstrap_context,
+                            warnings,
+                        )
+                    empleados_calculo.append(emp_calculo)
+                except Exception as e:
+                    errors.append(self._employee_error(empleado, e))
+
+            empleados_calculo = self._calculate_concepts(
+                empleados_calculo, planilla, fecha_calculo, loan_processor, errors, warnings
+            )
+        finally:
+            self._set_prefetch(None)
+
+        return empleados_calculo, loan_processor
+
+    def _employee_error(self, empleado: Empleado, error: Exception) -> str:
+        """Format the error reported for an employee that could not be calculated."""
+        if isinstance(error, (NominaEngineError, FormulaEngineError)):
+            # Capture all payroll engine and formula errors
+            return f"Error procesando empleado {empleado.primer_nombre} {empleado.primer_apellido}: {str(error)}"
+        # Capture any unexpected error to prevent 500 errors
+        return (
+            f"Error inesperado procesando empleado {empleado.primer_nombre} {empleado.primer_apellido}: "
+            f"{type(error).__name__}: {str(error)}"
+        )
+
+    def _calculate_concepts(
+        self,
+        empleados_calculo: list[EmpleadoCalculo],
+        planilla: Planilla,
+        fecha_calculo: date,
+        loan_processor: LoanProcessor,
+        errors: list[str],
+        warnings: WarningCollector,
+    ) -> list[EmpleadoCalculo]:
+        """Calculate perceptions, deductions, loans and benefits of every prepared employee.
+
+        Each concept is evaluated for all employees at once; only the steps that
+        depend on an employee's own running balance (loans and advances, the
+        negative-net check) run employee by employee.
+
+        Returns:
+            The employees calculated successfully, in their original order.
+        """
+        empleados_calculo, percepciones = self._run_concept_phase(
+            self.perception_calculator, empleados_calculo, planilla, fecha_calculo, errors, warnings
+        )
+        for emp_calculo, items_percepcion in zip(empleados_calculo, percepciones):
+            emp_calculo.percepciones = items_percepcion
+            emp_calculo.total_percepciones = sum(p.monto for p in items_percepcion)
+            # Calculate gross salary
+            emp_calculo.salario_bruto = emp_calculo.salario_neto_inasistencia + emp_calculo.total_percepciones
+
+        empleados_calculo, deducciones = self._run_concept_phase(
+            self.deduction_calculator, empleados_calculo, planilla, fecha_calculo, errors, warnings
+        )
+        con_neto: list[EmpleadoCalculo] = []
+        for emp_calculo, items_deduccion in zip(empleados_calculo, deducciones):
+            emp_calculo.deducciones = items_deduccion
+            emp_calculo.total_deducciones = sum(d.monto for d in items_deduccion)
             try:
-                self.accounting_voucher_service.generate_audit_voucher(nomina, planilla, fecha_calculo, usuario)
-                db.session.flush()
+                self._apply_loans_and_net(emp_calculo, planilla, loan_processor)
             except Exception as e:
-                # Don't fail the payroll if voucher generation fails
-                error_message = (
-                    "Advertencia al generar comprobante contable de auditoría: " f"{type(e).__name__}: {str(e)}"
+                errors.append(self._employee_error(emp_calculo.empleado, e))
+                continue
+            con_neto.append(emp_calculo)
+
+        # Process employer benefits
+        con_neto, prestaciones = self._run_concept_phase(
+            self.benefit_calculator, con_neto, planilla, fecha_calculo, errors, warnings
+        )
+        for emp_calculo, items_prestacion in zip(con_neto, prestaciones):
+            emp_calculo.prestaciones = items_prestacion
+            emp_calculo.total_prestaciones = sum(p.monto for p in items_prestacion)
+
+        return con_neto
+
+    def _run_concept_phase(
+        self,
+        calculator: PerceptionCalculator | DeductionCalculator | BenefitCalculator,
+        empleados_calculo: list[EmpleadoCalculo],
+        planilla: Planilla,
+        fecha_calculo: date,
+        errors: list[str],
+        warnings: WarningCollector,
+    ) -> tuple[list[EmpleadoCalculo], list[Any]]:
+        """Run a concept calculator for all employees, isolating failures per employee.
+
+        When the batch raises, its warnings are discarded and the phase is
+        repeated one employee at a time, so only the failing employees are
+        reported and dropped.
+
+        Returns:
+            Tuple of (employees that succeeded, their calculated items).
+        """
+        marca = len(warnings)
+        try:
+            return empleados_calculo, calculator.calculate_many(empleados_calculo, planilla, fecha_calculo)
+        except Exception:
+            warnings.truncate(marca)
+
+        calculados: list[EmpleadoCalculo] = []
+        resultados: list[Any] = []
+        for emp_calculo in empleados_calculo:
+            try:
+                resultados.append(calculator.calculate(emp_calculo, planilla, fecha_calculo))
+            except Exception as e:
+                errors.append(self._employee_error(emp_calculo.empleado, e))
+                continue
+            calculados.append(emp_calculo)
+        return calculados, resultados
+
+    def _calculate_employees_in_pool(
+        self,
+        nomina: Nomina,
+        planilla: Planilla,
+        planilla_empleados: list[Any],
+        periodo_inicio: date,
+        periodo_fin: date,
+        fecha_calculo: date,
+        snapshot: dict[str, Any],
+        bootstrap_context: dict[str, Any],
+        errors: list[str],
+        warnings: WarningCollector,
+        processes: int,
+    ) -> tuple[list[EmpleadoCalculo], LoanProcessor] | None:
+        """Calculate employees in worker processes, like ``_calculate_employees``.
+
+        Returns None when the planilla is too small, the database cannot be
+        shared with other processes or the pool fails, so the caller falls back
+        to calculating in this process.
+        """
+        from flask import current_app
+
+        chunks = plan_chunks([planilla_empleado.id for planilla_empleado in planilla_empleados], processes)
+        if not chunks or not supports_process_pool(current_app.config.get("SQLALCHEMY_DATABASE_URI")):
+            return None
+
+        try:
+            resultados = calculate_in_process_pool(
+                processes,
+                worker_config(current_app.config),
+                chunks,
+                planilla.id,
+                periodo_inicio,
+                periodo_fin,
+                fecha_calculo,
+                snapshot,
+                bootstrap_context,
+            )
+        except Exception as e:
+            log.warning("Process pool payroll calculation failed, calculating in-process: %s", e)
+            return None
+
+        empleados = {pe.empleado.id: pe.empleado for pe in planilla_empleados}
+        loan_processor = LoanProcessor(
+            nomina, fecha_calculo, periodo_inicio, periodo_fin, calcular_interes=True, apply_side_effects=False
+        )
+        empleados_calculo: list[EmpleadoCalculo] = []
+        for resultado in resultados:
+            errors.extend(resultado["errors"])
+            warnings.extend(resultado["warnings"])
+            empleados_calculo.extend(
+                EmpleadoCalculo.from_payload(empleados[payload["empleado_id"]], planilla, payload)
+                for payload in resultado["empleados"]
+            )
+            loan_processor.restore_pending_effects(resultado["prestamos"])
+        return empleados_calculo, loan_processor
+
+    def _build_vacation_processor(
+        self,
+        planilla: Planilla,
+        periodo_inicio: date,
+        periodo_fin: date,
+        usuario: str | None,
+        warnings: WarningCollector,
+        snapshot: dict[str, Any],
+    ) -> VacationProcessor:
+        vacation_snapshot = (snapshot.get("vacaciones") or {}).copy()
+        vacation_snapshot["configuracion"] = snapshot.get("configuracion")
+        return VacationProcessor(
+            planilla,
+            periodo_inicio,
+            periodo_fin,
+            usuario,
+            warnings,
+            apply_side_effects=False,
+            snapshot=vacation_snapshot,
+        )
+
+    def _generate_audit_voucher(
+        self,
+        nomina: Nomina,
+        planilla: Planilla,
+        fecha_calculo: date,
+        usuario: str | None,
+        warnings: WarningCollector,
+    ) -> None:
+        """Generate the audit voucher, enqueueing a retry instead of failing the payroll."""
+        try:
+            self.accounting_voucher_service.generate_audit_voucher(nomina, planilla, fecha_calculo, usuario)
+            db.session.flush()
+        except Exception as e:
+            # Don't fail the payroll if voucher generation fails
+            error_message = (
+                "Advertencia al generar comprobante contable de auditoría: " f"{type(e).__name__}: {str(e)}"
+            )
+            warnings.append(error_message)
+            log.error(
+                "Fallo al generar comprobante contable de auditoría",
+                extra={
+                    "nomina_id": nomina.id,
+                    "planilla_id": planilla.id,
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                },
+            )
+            nomina.errores_calculo = nomina.errores_calculo or {}
+            nomina.errores_calculo["audit_voucher_error"] = error_message
+            try:
+                from coati_payroll.queue import get_queue_driver
+
+                queue = get_queue_driver()
+                task_id = queue.enqueue(
+                    "generate_audit_voucher",
+                    nomina_id=nomina.id,
+                    planilla_id=planilla.id,
+                    fecha_calculo=(fecha_calculo.isoformat() if fecha_calculo else None),
+                    usuario=usuario or nomina.generado_por,
                 )
-                warnings.append(error_message)
+                nomina.errores_calculo["audit_voucher_retry_task_id"] = task_id
+            except Exception as enqueue_error:
                 log.error(
-                    "Fallo al generar comprobante contable de auditoría",
+                    "No se pudo encolar el reintento del comprobante contable de auditoría",
                     extra={
                         "nomina_id": nomina.id,
                         "planilla_id": planilla.id,
-                        "error": str(e),
-                        "error_type": type(e).__name__,
+                        "error": str(enqueue_error),
+                        "error_type": type(enqueue_error).__name__,
                     },
                 )
-                nomina.errores_calculo = nomina.errores_calculo or {}
-                nomina.errores_calculo["audit_voucher_error"] = error_message
-                try:
-                    from coati_payroll.queue import get_queue_driver
-
-                    queue = get_queue_driver()
-                    task_id = queue.enqueue(
-                        "generate_audit_voucher",
-                        nomina_id=nomina.id,
-                        planilla_id=planilla.id,
-                        fecha_calculo=(fecha_calculo.isoformat() if fecha_calculo else None),
-                        usuario=usuario or nomina.generado_por,
-                    )
-                    nomina.errores_calculo["audit_voucher_retry_task_id"] = task_id
-                except Exception as enqueue_error:
-                    log.error(
-                        "No se pudo encolar el reintento del comprobante contable de auditoría",
-                        extra={
-                            "nomina_id": nomina.id,
-                            "planilla_id": planilla.id,
-                            "error": str(enqueue_error),
-                            "error_type": type(enqueue_error).__name__,
-                        },
-                    )
-
-        if errors:
-            nomina.estado = NominaEstado.ERROR
-            # Save error logs for audit trail before any rollback
-            self._save_log_entries(nomina, errors, warnings.to_list(), empleados_calculo)
-            # Flush to persist the ERROR nomina and logs, but don't commit yet
-            # Engine will decide whether to commit (for audit trail) or rollback
-            db.session.flush()
-        else:
-            nomina.estado = NominaEstado.GENERADO
-            # Save errors and warnings to log_procesamiento for transparency
-            self._save_log_entries(nomina, errors, warnings.to_list(), empleados_calculo)
 
-        return nomina, empleados_calculo, errors, warnings.to_list()
+    def _set_prefetch(self, prefetch: PayrollPrefetch | None) -> None:
+        """Point the per-employee lookups at a prefetch, or back at the database."""
+        self.novelty_repo.prefetch = prefetch
+        self.exchange_rate_repo.prefetch = prefetch
+        self.employee_processing_service.prefetch = prefetch
 
     def _save_log_entries(
         self,
@@ -365,20 +851,22 @@ class PayrollExecutionService:
 
         nomina.log_procesamiento = log_entries
 
-    def _process_employee(
+    def _prepare_employee(
         self,
         empleado: Empleado,
         planilla: Planilla,
         periodo_inicio: date,
         periodo_fin: date,
         fecha_calculo: date,
-        loan_processor: LoanProcessor,
         configuracion_snapshot: dict[str, Any] | None,
         tipos_cambio_snapshot: dict[str, Any] | None,
         bootstrap_context: dict[str, Any],
         warnings: WarningCollector,
     ) -> EmpleadoCalculo:
-        """Process a single employee's payroll."""
+        """Validate an employee and compute salary, novelties and calculation variables.
+
+        Concepts are calculated afterwards for all employees at once by ``_calculate_concepts``.
+        """
         # Validate employee
         employee_validation = self.employee_validator.validate_employee(
             empleado, planilla.empresa_id, periodo_inicio, periodo_fin
@@ -460,18 +948,13 @@ class PayrollExecutionService:
             warnings=warnings,
         )
 
-        # Process perceptions
-        percepciones = self.perception_calculator.calculate(emp_calculo, planilla, fecha_calculo)
-        emp_calculo.percepciones = percepciones
-        emp_calculo.total_percepciones = sum(p.monto for p in percepciones)
-
-        # Calculate gross salary
-        emp_calculo.salario_bruto = emp_calculo.salario_neto_inasistencia + emp_calculo.total_percepciones
+        return emp_calculo
 
-        # Process deductions
-        deducciones = self.deduction_calculator.calculate(emp_calculo, planilla, fecha_calculo)
-        emp_calculo.deducciones = deducciones
-        emp_calculo.total_deducciones = sum(d.monto for d in deducciones)
+    def _apply_loans_and_net(
+        self, emp_calculo: EmpleadoCalculo, planilla: Planilla, loan_processor: LoanProcessor
+    ) -> None:
+        """Apply automatic loan/advance deductions and compute the employee's net salary."""
+        empleado = emp_calculo.empleado
 
         # Apply automatic loan/advance deductions
         saldo_disponible = emp_calculo.salario_bruto - emp_calculo.total_deducciones
@@ -499,13 +982,6 @@ class PayrollExecutionService:
                 f"Neto negativo para empleado {empleado.codigo_empleado}: {emp_calculo.salario_neto}"
             )
 
-        # Process employer benefits
-        prestaciones = self.benefit_calculator.calculate(emp_calculo, planilla, fecha_calculo)
-        emp_calculo.prestaciones = prestaciones
-        emp_calculo.total_prestaciones = sum(p.monto for p in prestaciones)
-
-        return emp_calculo
-
     def _calculate_absence_discount(
         self,
         salario_mensual: Decimal,
@@ -536,21 +1012,18 @@ class PayrollExecutionService:
 
         return self.config_repo.get_for_empresa(empresa_id)
 
-    def _apply_employee_side_effects(
+    def _update_accumulations(
         self,
-        emp_calculo: EmpleadoCalculo,
-        nomina: Nomina,
+        empleados_calculo: list[EmpleadoCalculo],
         planilla: Planilla,
         periodo_inicio: date,
         periodo_fin: date,
-        vacation_processor: VacationProcessor,
         deducciones_snapshot: dict[str, dict],
         bootstrap_context: dict[str, Any],
     ) -> None:
-        """Apply persistence side effects for a successful payroll run."""
-        nomina_empleado = self.accounting_processor.create_nomina_empleado(emp_calculo, nomina)
-        self.accumulation_processor.update_accumulations(
-            emp_calculo,
+        """Add the run to every employee's annual accumulation in set-based statements."""
+        self.accumulation_processor.update_accumulations_bulk(
+            empleados_calculo,
             planilla,
             periodo_inicio,
             periodo_fin,
@@ -558,6 +1031,22 @@ class PayrollExecutionService:
             empresa_primer_mes_nomina=bootstrap_context.get("primer_mes_nomina"),
             empresa_primer_anio_nomina=bootstrap_context.get("primer_anio_nomina"),
         )
+
+    def _apply_employee_side_effects(
+        self,
+        emp_calculo: EmpleadoCalculo,
+        nomina: Nomina,
+        vacation_processor: VacationProcessor,
+        nomina_empleado: NominaEmpleado | None = None,
+    ) -> None:
+        """Apply per-employee persistence side effects for a successful payroll run.
+
+        ``nomina_empleado`` is passed when the record was already written, as
+        in sharded runs; otherwise it is created here. Annual accumulations
+        are updated for the whole run by ``_update_accumulations``.
+        """
+        if nomina_empleado is None:
+            nomina_empleado = self.accounting_processor.create_nomina_empleado(emp_calculo, nomina)
         setattr(
             emp_calculo,
             "vacaciones_resumen",
@@ -6,15 +6,22 @@ to ensure payroll calculations can be recalculated consistently.
 
 from __future__ import annotations
 
+from copy import deepcopy
 from datetime import date
 from typing import Any
 
+from sqlalchemy import func, null, union_all
+
 from coati_payroll.model import (
     ConfiguracionCalculos,
     Percepcion,
     Deduccion,
     Prestacion,
     Planilla,
+    PlanillaDeduccion,
+    PlanillaIngreso,
+    PlanillaPrestacion,
+    ReglaCalculo,
     TipoCambio,
     VacationPolicy,
     VacationNovelty,
@@ -24,12 +31,56 @@ from coati_payroll.model import (
 )
 
 
+# Catalog snapshots reused while their fingerprint is unchanged, by planilla ID.
+# Shared by the services of a process; the oldest entries are evicted first.
+_CATALOGOS_CACHE: dict[str, tuple[tuple, dict[str, Any]]] = {}
+CATALOGOS_CACHE_SIZE = 256
+
+
 class SnapshotService:
     """Service for capturing configuration snapshots for payroll consistency."""
 
     def __init__(self, session):
         self.session = session
 
+    def catalogs_fingerprint(self, planilla: Planilla) -> tuple:
+        """Row counts and latest ``timestamp``/``modificado`` of everything the catalogs snapshot reads.
+
+        Any insert, update or delete of the planilla's concept links, of the
+        linked perceptions, deductions and benefits or of their calculation
+        rules changes the fingerprint. It is computed with a single query.
+        """
+        partes = []
+        for asociacion, concepto, columna in (
+            (PlanillaIngreso, Percepcion, PlanillaIngreso.percepcion_id),
+            (PlanillaDeduccion, Deduccion, PlanillaDeduccion.deduccion_id),
+            (PlanillaPrestacion, Prestacion, PlanillaPrestacion.prestacion_id),
+        ):
+            partes.append(
+                db.select(
+                    func.count(),
+                    func.max(asociacion.timestamp),
+                    func.max(asociacion.modificado),
+                    func.max(concepto.timestamp),
+                    func.max(concepto.modificado),
+                )
+                .select_from(asociacion)
+                .outerjoin(concepto, concepto.id == columna)
+                .filter(asociacion.planilla_id == planilla.id)
+            )
+        partes.append(
+            db.select(func.count(), null(), null(), func.max(ReglaCalculo.timestamp), func.max(ReglaCalculo.modificado))
+            .select_from(ReglaCalculo)
+            .filter(
+                ReglaCalculo.deduccion_id.in_(
+                    db.select(PlanillaDeduccion.deduccion_id).filter(PlanillaDeduccion.planilla_id == planilla.id)
+                )
+            )
+        )
+        filas = self.session.execute(union_all(*partes)).all()
+        # UNION ALL does not guarantee row order
+        return tuple(sorted(tuple("" if valor is None else str(valor) for valor in fila) for fila in filas))
+
     def capture_configuration_snapshot(self, empresa_id: str) -> dict[str, Any]:
         """Capture complete company configuration snapshot.
 
@@ -129,15 +180,38 @@ class SnapshotService:
 
         return rates
 
-    def capture_catalogs_snapshot(self, planilla: Planilla) -> dict[str, Any]:
+    def capture_catalogs_snapshot(self, planilla: Planilla, use_cache: bool = True) -> dict[str, Any]:
         """Capture complete catalogs snapshot (percepciones, deducciones, prestaciones).
 
+        With ``use_cache`` the snapshot of a previous capture for the same
+        planilla is returned while ``catalogs_fingerprint`` is unchanged. The
+        cache keeps its own deep copy and hands out a fresh one on every hit, so
+        a nomina that changes its snapshot never alters another run's.
+
         Args:
             planilla: Planilla being processed
+            use_cache: Reuse the last snapshot of the planilla if its catalogs did not change
 
         Returns:
             Dictionary with all catalog items and their formulas
         """
+        if not use_cache:
+            return self._build_catalogs_snapshot(planilla)
+
+        huella = self.catalogs_fingerprint(planilla)
+        cached = _CATALOGOS_CACHE.get(planilla.id)
+        if cached is not None and cached[0] == huella:
+            return deepcopy(cached[1])
+
+        snapshot = self._build_catalogs_snapshot(planilla)
+        _CATALOGOS_CACHE.pop(planilla.id, None)
+        _CATALOGOS_CACHE[planilla.id] = (huella, deepcopy(snapshot))
+        while len(_CATALOGOS_CACHE) > CATALOGOS_CACHE_SIZE:
+            del _CATALOGOS_CACHE[next(iter(_CATALOGOS_CACHE))]
+        return snapshot
+
+    def _build_catalogs_snapshot(self, planilla: Planilla) -> dict[str, Any]:
+        """Read the planilla's catalogs and serialize them into the snapshot layout."""
         snapshot: dict[str, list[Any]] = {
             "percepciones": [],
             "deducciones": [],
@@ -145,8 +219,6 @@ class SnapshotService:
         }
 
         # Capture Percepciones linked to this planilla
-        from coati_payroll.model import PlanillaIngreso
-
         percepciones_ids = (
             self.session.execute(
                 db.select(PlanillaIngreso.percepcion_id).filter(
@@ -190,8 +262,6 @@ class SnapshotService:
             )
 
         # Capture Deducciones linked to this planilla
-        from coati_payroll.model import PlanillaDeduccion
-
         deducciones_ids = (
             self.session.execute(
                 db.select(PlanillaDeduccion.deduccion_id).filter(
@@ -218,8 +288,6 @@ class SnapshotService:
             deducciones = []
 
         # Also capture linked ReglaCalculo for reproducibility
-        from coati_payroll.model import ReglaCalculo
-
         reglas_by_deduccion = {}
         if deducciones_ids:
             reglas = (
@@ -264,8 +332,6 @@ class SnapshotService:
             snapshot["deducciones"].append(deduccion_data)
 
         # Capture Prestaciones linked to this planilla
-        from coati_payroll.model import PlanillaPrestacion
-
         prestaciones_ids = (
             self.session.execute(
                 db.select(PlanillaPrestacion.prestacion_id).filter(
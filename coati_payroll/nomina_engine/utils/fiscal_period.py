@@ -0,0 +1,33 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Fiscal period helpers shared by payroll services and processors."""
+
+from __future__ import annotations
+
+from datetime import date
+
+from coati_payroll.model import Planilla
+
+
+def fiscal_period_start(planilla: Planilla, periodo_inicio: date) -> date | None:
+    """Return the start date of the fiscal year containing a payroll period.
+
+    Args:
+        planilla: Planilla being processed (source of truth for mes_inicio_fiscal).
+        periodo_inicio: First day of the payroll period.
+
+    Returns:
+        Fiscal year start date, or None when the planilla has no tipo_planilla.
+    """
+    tipo_planilla = planilla.tipo_planilla
+    if not tipo_planilla:
+        return None
+
+    anio = periodo_inicio.year
+    mes_inicio = int(planilla.mes_inicio_fiscal or tipo_planilla.mes_inicio_fiscal)
+    dia_inicio = tipo_planilla.dia_inicio_fiscal
+
+    if periodo_inicio.month < mes_inicio:
+        anio -= 1
+
+    return date(anio, mes_inicio, dia_inicio)
@@ -8,6 +8,9 @@ from decimal import Decimal, ROUND_HALF_UP
 
 from coati_payroll.model import Moneda
 
+# Decimal places kept by ``round_money``.
+MONEY_DECIMALS = 2
+
 
 def round_money(amount: Decimal | None, moneda: Moneda | None = None) -> Decimal:
     """Round monetary amounts using the accounting policy.
@@ -23,4 +26,4 @@ def round_money(amount: Decimal | None, moneda: Moneda | None = None) -> Decimal
         return Decimal("0.00")
     if not isinstance(amount, Decimal):
         amount = Decimal(str(amount))
-    return amount.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return amount.quantize(Decimal(1).scaleb(-MONEY_DECIMALS), rounding=ROUND_HALF_UP)
@@ -15,7 +15,7 @@ Tasks are automatically registered with the available queue driver
 from __future__ import annotations
 
 import os
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any, cast
 from uuid import uuid4
@@ -33,12 +33,17 @@ from coati_payroll.model import (
     NominaEmpleado as NominaEmpleadoModel,
     NominaDetalle as NominaDetalleModel,
     NominaProgress as NominaProgressModel,
+    NominaProgressEvento as NominaProgressEventoModel,
+    NominaShard as NominaShardModel,
     PrestacionAcumulada,
     AdelantoAbono,
     InteresAdelanto,
 )
+from coati_payroll.liquidacion_engine import procesar_lote_liquidaciones
 from coati_payroll.nomina_engine import NominaEngine
+from coati_payroll.nomina_engine.results import merge_profiles, RunProfiler
 from coati_payroll.nomina_engine.services.accounting_voucher_service import AccountingVoucherService
+from coati_payroll.nomina_engine.services.payroll_execution_service import PayrollExecutionService
 from coati_payroll.nomina_engine.validators import NominaEngineError, ValidationError as NominaValidationError
 from coati_payroll.queue import get_queue_driver
 from coati_payroll.schema_validator import ValidationError as SchemaValidationError
@@ -69,6 +74,24 @@ def _get_payroll_retry_config() -> dict[str, int]:
     }
 
 
+def _get_payroll_shard_size() -> int:
+    """Get the number of employees per shard for parallel payroll processing.
+
+    Returns:
+        Value of PAYROLL_SHARD_SIZE (default 250), never less than 1.
+    """
+    return max(1, int(os.getenv("PAYROLL_SHARD_SIZE", "250")))
+
+
+def _get_payroll_shard_stale_minutes() -> int:
+    """Get the minutes after which a shard still in PROCESANDO is considered abandoned.
+
+    Returns:
+        Value of PAYROLL_SHARD_STALE_MINUTES (default 60), never less than 1.
+    """
+    return max(1, int(os.getenv("PAYROLL_SHARD_STALE_MINUTES", "60")))
+
+
 def _is_recoverable_error(error: Exception) -> bool:
     """Determine if an error is recoverable (can be retried).
 
@@ -180,9 +203,19 @@ def _upsert_nomina_progress(
     empleados_procesados: int | None = None,
     empleados_con_error: int | None = None,
     errores_calculo: dict | None = None,
-    log_procesamiento: list | None = None,
     empleado_actual: str | None = None,
+    eventos: list[dict] | None = None,
+    incrementar_procesados: int = 0,
+    incrementar_errores: int = 0,
 ) -> None:
+    """Update the progress row of a nomina and append progress events.
+
+    Counters passed as values are overwritten; ``incrementar_*`` are applied
+    as ``column = column + n`` in SQL so concurrent workers never lose updates.
+    ``eventos`` are appended to NominaProgressEvento with consecutive
+    ``secuencia`` numbers. Nothing already written is rewritten, so a run
+    writes progress data proportional to its number of employees.
+    """
     progress = (
         tracking_session.execute(db.select(NominaProgressModel).filter(NominaProgressModel.nomina_id == nomina_id))
         .scalars()
@@ -194,11 +227,11 @@ def _upsert_nomina_progress(
             nomina_id=nomina_id,
             job_id=job_id,
             total_empleados=total_empleados or 0,
-            empleados_procesados=empleados_procesados or 0,
-            empleados_con_error=empleados_con_error or 0,
+            empleados_procesados=(empleados_procesados or 0) + incrementar_procesados,
+            empleados_con_error=(empleados_con_error or 0) + incrementar_errores,
             errores_calculo=errores_calculo or {},
-            log_procesamiento=log_procesamiento or [],
             empleado_actual=empleado_actual,
+            ultimo_evento=len(eventos or []),
             actualizado_en=datetime.now(timezone.utc),
         )
         tracking_session.add(progress)
@@ -208,16 +241,40 @@ def _upsert_nomina_progress(
             progress.total_empleados = total_empleados
         if empleados_procesados is not None:
             progress.empleados_procesados = empleados_procesados
+        elif incrementar_procesados:
+            progress.empleados_procesados = (
+                db.func.coalesce(NominaProgressModel.empleados_procesados, 0) + incrementar_procesados
+            )
         if empleados_con_error is not None:
             progress.empleados_con_error = empleados_con_error
+        elif incrementar_errores:
+            progress.empleados_con_error = (
+                db.func.coalesce(NominaProgressModel.empleados_con_error, 0) + incrementar_errores
+            )
         if errores_calculo is not None:
             progress.errores_calculo = errores_calculo
-        if log_procesamiento is not None:
-            progress.log_procesamiento = log_procesamiento
         if empleado_actual is not None:
             progress.empleado_actual = empleado_actual
+        if eventos:
+            # The UPDATE locks the row until commit, so concurrent workers get disjoint sequences
+            progress.ultimo_evento = NominaProgressModel.ultimo_evento + len(eventos)
         progress.actualizado_en = datetime.now(timezone.utc)
 
+    if eventos:
+        tracking_session.flush()
+        primera = progress.ultimo_evento - len(eventos) + 1
+        tracking_session.add_all(
+            NominaProgressEventoModel(
+                nomina_id=nomina_id,
+                job_id=job_id,
+                secuencia=primera + posicion,
+                empleado=evento.get("empleado"),
+                status=evento.get("status") or "info",
+                message=evento.get("message"),
+            )
+            for posicion, evento in enumerate(eventos)
+        )
+
     tracking_session.commit()
 
 
@@ -252,6 +309,16 @@ def retry_failed_nomina(nomina_id: str, usuario: str | None = None) -> dict[str,
                 "error": "Nomina not found",
             }
 
+        # A sharded run whose worker died mid-shard or mid-reduction never finalizes; take it over
+        if nomina.estado == NominaEstado.CALCULANDO and _reap_stale_shards(nomina):
+            db.session.expire_all()
+            nomina = db.session.get(NominaModel, nomina_id)
+            if nomina.estado == NominaEstado.GENERADO:
+                return {
+                    "success": True,
+                    "message": "Nomina finalized from its completed shards.",
+                }
+
         if nomina.estado == NominaEstado.GENERADO_CON_ERRORES:
             return {
                 "success": False,
@@ -293,6 +360,15 @@ def retry_failed_nomina(nomina_id: str, usuario: str | None = None) -> dict[str,
         # Clear any partial data from previous attempt
         _rollback_nomina_data(nomina_id)
         db.session.execute(db.delete(NominaProgressModel).filter(NominaProgressModel.nomina_id == nomina_id))
+        db.session.execute(
+            db.delete(NominaProgressEventoModel).filter(NominaProgressEventoModel.nomina_id == nomina_id)
+        )
+        fue_particionada = (
+            db.session.execute(
+                db.delete(NominaShardModel).filter(NominaShardModel.nomina_id == nomina_id)
+            ).rowcount
+            > 0
+        )
 
         db.session.commit()
 
@@ -303,7 +379,7 @@ def retry_failed_nomina(nomina_id: str, usuario: str | None = None) -> dict[str,
         periodo_fin_str = nomina.periodo_fin.isoformat()
 
         task_id = queue.enqueue(
-            "process_large_payroll",
+            "process_payroll_parallel" if fue_particionada else "process_large_payroll",
             nomina_id=nomina_id,
             job_id=job_id,
             planilla_id=nomina.planilla_id,
@@ -329,6 +405,73 @@ def retry_failed_nomina(nomina_id: str, usuario: str | None = None) -> dict[str,
         }
 
 
+def _reap_stale_shards(nomina: NominaModel) -> bool:
+    """Fail the shards abandoned by crashed workers and finalize their nomina.
+
+    A shard still in PROCESANDO whose ``iniciado_en`` is older than
+    PAYROLL_SHARD_STALE_MINUTES is set to ERROR. When no shard is left pending
+    or processing, ``finalize_sharded_payroll`` runs here. That also recovers a
+    reduction whose worker died: its claim was rolled back with the rest of its
+    transaction. If any shard failed, the shards' rows are rolled back, the
+    nomina is set to ERROR and its job lock is released; otherwise the nomina
+    is generated.
+
+    Args:
+        nomina: Nomina in CALCULANDO state
+
+    Returns:
+        True if the nomina was finalized and released.
+    """
+    from coati_payroll.enums import NominaShardEstado
+
+    limite = datetime.now(timezone.utc) - timedelta(minutes=_get_payroll_shard_stale_minutes())
+    abandonados = list(
+        db.session.execute(
+            db.select(NominaShardModel).filter(
+                NominaShardModel.nomina_id == nomina.id,
+                NominaShardModel.estado == NominaShardEstado.PROCESANDO,
+                NominaShardModel.iniciado_en < limite,
+            )
+        )
+        .scalars()
+        .all()
+    )
+    for shard in abandonados:
+        log.warning("Shard %s of nomina %s abandoned since %s", shard.indice, nomina.id, shard.iniciado_en)
+        shard.estado = NominaShardEstado.ERROR
+        shard.errores = [f"Lote abandonado: sin finalizar desde {shard.iniciado_en.isoformat()}"]
+        shard.empleados_con_error = shard.total_empleados
+        shard.completado_en = datetime.now(timezone.utc)
+    if abandonados:
+        db.session.commit()
+
+    pendientes = db.session.execute(
+        db.select(db.func.count(NominaShardModel.id)).filter(
+            NominaShardModel.nomina_id == nomina.id,
+            NominaShardModel.estado.in_([NominaShardEstado.PENDIENTE, NominaShardEstado.PROCESANDO]),
+        )
+    ).scalar_one()
+    if pendientes or not nomina.job_id_activo:
+        # Shards still running will finalize the nomina when the last one completes
+        return False
+    if not db.session.execute(
+        db.select(db.func.count(NominaShardModel.id)).filter(NominaShardModel.nomina_id == nomina.id)
+    ).scalar_one():
+        # Not a sharded run
+        return False
+
+    resultado = finalize_sharded_payroll(
+        nomina_id=nomina.id,
+        job_id=nomina.job_id_activo,
+        planilla_id=nomina.planilla_id,
+        periodo_inicio=nomina.periodo_inicio.isoformat(),
+        periodo_fin=nomina.periodo_fin.isoformat(),
+        fecha_calculo=nomina.fecha_generacion.date().isoformat() if nomina.fecha_generacion else None,
+        usuario=nomina.generado_por,
+    )
+    return not resultado.get("skipped", False)
+
+
 def _rollback_nomina_data(nomina_id: str) -> None:
     """Rollback all data created for a nomina during payroll processing.
 
@@ -488,14 +631,21 @@ def process_payroll_parallel(
     fecha_calculo: str | None = None,
     usuario: str | None = None,
     job_id: str | None = None,
+    nomina_id: str | None = None,
+    shard_size: int | None = None,
 ) -> dict[str, Any]:
-    """Process payroll for all employees in parallel (background task).
+    """Fan a payroll out to parallel workers, one message per employee shard (background task).
 
-    NOTE: This function now uses the same defensive mechanism as process_large_payroll
-    to ensure atomicity. If any employee processing fails, all changes are rolled back.
+    The configuration snapshot is captured once on the nomina and the active
+    employees are split into shards of ``shard_size`` employees (default:
+    PAYROLL_SHARD_SIZE). Each shard is enqueued as ``process_payroll_shard``
+    and writes its NominaEmpleado/NominaDetalle rows in its own transaction.
+    The last shard to finish enqueues ``finalize_sharded_payroll``, which
+    applies accumulations, vacations and loan payments, computes totals and the
+    audit voucher and moves the nomina to GENERADO.
 
-    For true parallel processing with multiple workers, use process_large_payroll which
-    processes employees sequentially but provides better error handling and rollback.
+    All-or-nothing semantics are kept: if any shard fails, the rows written by
+    every shard are removed and the nomina is left in ERROR so it can be retried.
 
     Args:
         planilla_id: Planilla ID (ULID string)
@@ -503,24 +653,31 @@ def process_payroll_parallel(
         periodo_fin: End date (ISO format: YYYY-MM-DD)
         fecha_calculo: Calculation date (ISO format, optional)
         usuario: Username executing the payroll (optional)
+        job_id: Job ID for idempotent retries (optional)
+        nomina_id: Existing nomina in CALCULANDO state (optional, created if omitted)
+        shard_size: Employees per shard (optional)
 
     Returns:
-        Dictionary with processing results:
+        Dictionary with fan-out results:
         {
             "success": bool,
+            "nomina_id": str,
+            "job_id": str,
             "total_empleados": int,
-            "empleados_procesados": int,
-            "empleados_con_error": int,
-            "errores": list[str]
+            "total_shards": int
         }
     """
-    from coati_payroll.enums import NominaEstado
+    from coati_payroll.enums import NominaEstado, NominaShardEstado
 
     try:
         log.info("Starting parallel payroll processing for planilla %s", planilla_id)
 
+        periodo_inicio_date = date.fromisoformat(periodo_inicio)
+        periodo_fin_date = date.fromisoformat(periodo_fin)
+        fecha_calculo_date = date.fromisoformat(fecha_calculo) if fecha_calculo else date.today()
+
         # Load planilla
-        planilla = db.session.get(Planilla, planilla_id)
+        planilla = _load_planilla(planilla_id)
         if not planilla:
             return {
                 "success": False,
@@ -537,29 +694,258 @@ def process_payroll_parallel(
                 "error": ERROR_NO_ACTIVE_EMPLOYEES,
             }
 
-        # Create nomina record first
-        nomina = NominaModel(
-            planilla_id=planilla_id,
-            periodo_inicio=date.fromisoformat(periodo_inicio),
-            periodo_fin=date.fromisoformat(periodo_fin),
-            generado_por=usuario,
-            estado=NominaEstado.CALCULANDO,
-            total_bruto=Decimal("0.00"),
-            total_deducciones=Decimal("0.00"),
-            total_neto=Decimal("0.00"),
-            total_empleados=len(empleados),
-            empleados_procesados=0,
-            empleados_con_error=0,
-            procesamiento_en_background=True,
+        if nomina_id:
+            nomina = db.session.get(NominaModel, nomina_id)
+            if not nomina:
+                return {"success": False, "error": "Nomina not found"}
+            if nomina.estado != NominaEstado.CALCULANDO:
+                return {
+                    "success": False,
+                    "error": f"Nomina is not in CALCULANDO state (current: {nomina.estado})",
+                }
+        else:
+            nomina = NominaModel(
+                planilla_id=planilla_id,
+                periodo_inicio=periodo_inicio_date,
+                periodo_fin=periodo_fin_date,
+                generado_por=usuario,
+                estado=NominaEstado.CALCULANDO,
+                total_bruto=Decimal("0.00"),
+                total_deducciones=Decimal("0.00"),
+                total_neto=Decimal("0.00"),
+                procesamiento_en_background=True,
+            )
+            db.session.add(nomina)
+            db.session.flush()
+
+        job_id = _resolve_job_id(nomina, job_id)
+        if not _acquire_nomina_job_lock(nomina.id, job_id):
+            db.session.rollback()
+            return {
+                "success": False,
+                "error": "Nomina is already being processed by another job.",
+            }
+
+        PayrollExecutionService(db.session).prepare_sharded_run(
+            nomina, planilla, periodo_inicio_date, periodo_fin_date, fecha_calculo_date
+        )
+        nomina.total_empleados = len(empleados)
+        nomina.empleados_procesados = 0
+        nomina.empleados_con_error = 0
+        nomina.errores_calculo = {}
+        nomina.log_procesamiento = []
+        nomina.job_completed_at = None
+
+        # Split employees into shards, one Dramatiq message each
+        size = max(1, shard_size or _get_payroll_shard_size())
+        empleado_ids = [empleado.id for empleado in empleados]
+        db.session.execute(db.delete(NominaShardModel).filter(NominaShardModel.nomina_id == nomina.id))
+        shards = [
+            NominaShardModel(
+                nomina_id=nomina.id,
+                job_id=job_id,
+                indice=indice,
+                estado=NominaShardEstado.PENDIENTE,
+                empleado_ids=empleado_ids[inicio : inicio + size],
+                total_empleados=len(empleado_ids[inicio : inicio + size]),
+                creado_por=usuario,
+            )
+            for indice, inicio in enumerate(range(0, len(empleado_ids), size))
+        ]
+        db.session.add_all(shards)
+        db.session.commit()
+
+        tracking_session = _get_tracking_session()
+        try:
+            _upsert_nomina_progress(
+                tracking_session,
+                nomina.id,
+                job_id,
+                total_empleados=len(empleados),
+                empleados_procesados=0,
+                empleados_con_error=0,
+                errores_calculo={},
+                empleado_actual=None,
+            )
+        finally:
+            _release_tracking_session(tracking_session)
+
+        try:
+            for shard in shards:
+                queue.enqueue(
+                    "process_payroll_shard",
+                    nomina_id=nomina.id,
+                    shard_id=shard.id,
+                    job_id=job_id,
+                    planilla_id=planilla_id,
+                    periodo_inicio=periodo_inicio,
+                    periodo_fin=periodo_fin,
+                    fecha_calculo=fecha_calculo_date.isoformat(),
+                    usuario=usuario,
+                )
+        except Exception as e:
+            # Shards already enqueued will find the nomina no longer locked by this job and stop
+            log.error("Error enqueueing payroll shards for nomina %s: %s", nomina.id, e)
+            db.session.rollback()
+            nomina.estado = NominaEstado.ERROR
+            nomina.errores_calculo = {"critical_error": str(e), "error_type": type(e).__name__}
+            _clear_nomina_job_lock(nomina.id)
+            db.session.commit()
+            return {
+                "success": False,
+                "error": str(e),
+            }
+
+        log.info("Enqueued %s shards for nomina %s (%s employees)", len(shards), nomina.id, len(empleados))
+
+        return {
+            "success": True,
+            "nomina_id": nomina.id,
+            "job_id": job_id,
+            "total_empleados": len(empleados),
+            "total_shards": len(shards),
+        }
+
+    except Exception as e:
+        log.error("Error processing parallel payroll: %s", e)
+        db.session.rollback()
+        return {
+            "success": False,
+            "error": str(e),
+        }
+
+
+def process_payroll_shard(
+    nomina_id: str,
+    shard_id: str,
+    job_id: str,
+    planilla_id: str,
+    periodo_inicio: str,
+    periodo_fin: str,
+    fecha_calculo: str | None = None,
+    usuario: str | None = None,
+) -> dict[str, Any]:
+    """Calculate one employee shard of a parallel payroll (background task).
+
+    The shard's NominaEmpleado/NominaDetalle rows and its state are committed
+    together, so a shard is either fully written or not written at all. The
+    worker that completes the last shard enqueues ``finalize_sharded_payroll``.
+
+    Args:
+        nomina_id: Nomina ID (ULID string)
+        shard_id: NominaShard ID (ULID string)
+        job_id: Job ID that owns the nomina lock
+        planilla_id: Planilla ID (ULID string)
+        periodo_inicio: Start date (ISO format: YYYY-MM-DD)
+        periodo_fin: End date (ISO format: YYYY-MM-DD)
+        fecha_calculo: Calculation date (ISO format, optional)
+        usuario: Username executing the payroll (optional)
+
+    Returns:
+        Dictionary with shard results:
+        {
+            "success": bool,
+            "estado": str,
+            "empleados_procesados": int,
+            "empleados_con_error": int
+        }
+    """
+    from coati_payroll.enums import NominaEstado, NominaShardEstado
+
+    shard = db.session.get(NominaShardModel, shard_id)
+    if not shard:
+        return {"success": False, "error": "Shard not found"}
+
+    if shard.estado in (NominaShardEstado.COMPLETADO, NominaShardEstado.ERROR):
+        # Redelivered message: the shard was already processed
+        return {"success": True, "skipped": True, "estado": shard.estado}
+
+    nomina = db.session.get(NominaModel, nomina_id)
+    if not nomina or nomina.estado != NominaEstado.CALCULANDO or nomina.job_id_activo != job_id:
+        return {"success": False, "error": "Nomina is no longer being processed by this job."}
+
+    shard.estado = NominaShardEstado.PROCESANDO
+    shard.iniciado_en = datetime.now(timezone.utc)
+    db.session.commit()
+
+    service = PayrollExecutionService(db.session)
+    service.profiler = RunProfiler().start()
+    try:
+        planilla = _load_planilla(planilla_id)
+        if not planilla:
+            raise NominaValidationError(ERROR_PLANILLA_NOT_FOUND)
+
+        resultados, errors, warnings = service.calculate_shard(
+            nomina,
+            planilla,
+            list(shard.empleado_ids or []),
+            date.fromisoformat(periodo_inicio),
+            date.fromisoformat(periodo_fin),
+            date.fromisoformat(fecha_calculo) if fecha_calculo else date.today(),
         )
-        db.session.add(nomina)
+        service.profiler.stop()
+
+        if errors:
+            db.session.rollback()
+            shard.estado = NominaShardEstado.ERROR
+            shard.errores = errors
+            shard.empleados_con_error = len(errors)
+        else:
+            shard.estado = NominaShardEstado.COMPLETADO
+            shard.resultados = resultados
+            shard.empleados_procesados = len(resultados["empleados"])
+        shard.advertencias = warnings
+        shard.perfil_ejecucion = service.profiler.to_dict()
+        shard.completado_en = datetime.now(timezone.utc)
         db.session.commit()
 
-        # Use process_large_payroll which has the defensive rollback mechanism
-        # This ensures atomicity: if any employee fails, all changes are rolled back
-        result = process_large_payroll(
-            nomina_id=nomina.id,
-            job_id=job_id or uuid4().hex,
+    except Exception as e:
+        log.error("Error processing shard %s of nomina %s: %s", shard_id, nomina_id, e)
+        db.session.rollback()
+        shard.estado = NominaShardEstado.ERROR
+        shard.errores = [f"{type(e).__name__}: {str(e)}"]
+        shard.empleados_con_error = shard.total_empleados
+        shard.completado_en = datetime.now(timezone.utc)
+        db.session.commit()
+    finally:
+        service.profiler.stop()
+        service.profiler = None
+
+    tracking_session = _get_tracking_session()
+    try:
+        _upsert_nomina_progress(
+            tracking_session,
+            nomina_id,
+            job_id,
+            incrementar_procesados=shard.empleados_procesados or 0,
+            incrementar_errores=shard.empleados_con_error or 0,
+            eventos=[
+                {
+                    "empleado": "SISTEMA",
+                    "status": "success" if shard.estado == NominaShardEstado.COMPLETADO else "error",
+                    "message": (
+                        f"Lote {shard.indice + 1}: {shard.empleados_procesados} empleados calculados"
+                        if shard.estado == NominaShardEstado.COMPLETADO
+                        else f"✗ Error en lote {shard.indice + 1}: {'; '.join(shard.errores or [])}"
+                    ),
+                }
+            ],
+        )
+    finally:
+        _release_tracking_session(tracking_session)
+
+    pendientes = db.session.execute(
+        db.select(db.func.count(NominaShardModel.id)).filter(
+            NominaShardModel.nomina_id == nomina_id,
+            NominaShardModel.estado.in_([NominaShardEstado.PENDIENTE, NominaShardEstado.PROCESANDO]),
+        )
+    ).scalar_one()
+    if pendientes == 0:
+        # Several workers may see zero at once; finalize_sharded_payroll claims the nomina atomically
+        queue.enqueue(
+            "finalize_sharded_payroll",
+            nomina_id=nomina_id,
+            job_id=job_id,
             planilla_id=planilla_id,
             periodo_inicio=periodo_inicio,
             periodo_fin=periodo_fin,
@@ -567,14 +953,295 @@ def process_payroll_parallel(
             usuario=usuario,
         )
 
-        return result
+    return {
+        "success": shard.estado == NominaShardEstado.COMPLETADO,
+        "estado": shard.estado,
+        "empleados_procesados": shard.empleados_procesados,
+        "empleados_con_error": shard.empleados_con_error,
+    }
+
+
+def finalize_sharded_payroll(
+    nomina_id: str,
+    job_id: str,
+    planilla_id: str,
+    periodo_inicio: str,
+    periodo_fin: str,
+    fecha_calculo: str | None = None,
+    usuario: str | None = None,
+) -> dict[str, Any]:
+    """Reduce the shards of a parallel payroll into a generated nomina (background task).
+
+    Runs in a single transaction, together with the claim on the nomina:
+    either accumulations, vacations, loan payments, totals, the audit voucher
+    and the GENERADO state are all committed, or every shard's rows are removed
+    and the nomina is set to ERROR. A worker that dies mid-reduction leaves
+    the nomina unclaimed, so ``retry_failed_nomina`` can finalize it again.
+
+    Unlike ``process_large_payroll``, which keeps the employees that were
+    calculated and sets GENERADO_CON_ERRORES, a sharded run is all-or-nothing:
+    one failing employee fails its shard, and any failed shard sets the whole
+    nomina to ERROR.
+
+    Args:
+        nomina_id: Nomina ID (ULID string)
+        job_id: Job ID that owns the nomina lock
+        planilla_id: Planilla ID (ULID string)
+        periodo_inicio: Start date (ISO format: YYYY-MM-DD)
+        periodo_fin: End date (ISO format: YYYY-MM-DD)
+        fecha_calculo: Calculation date (ISO format, optional)
+        usuario: Username executing the payroll (optional)
+
+    Returns:
+        Dictionary with the final state of the nomina.
+    """
+    from coati_payroll.enums import NominaEstado, NominaShardEstado
+
+    omitido = {"success": False, "skipped": True, "error": "Nomina already finalized or not owned by this job."}
+    # Only one finalize message per job may proceed; the claim commits with the reduction
+    if not _claim_sharded_finalize(nomina_id, job_id):
+        db.session.rollback()
+        return omitido
+
+    nomina = db.session.get(NominaModel, nomina_id)
+    shards = list(
+        db.session.execute(
+            db.select(NominaShardModel)
+            .filter(NominaShardModel.nomina_id == nomina_id)
+            .order_by(NominaShardModel.indice)
+        )
+        .scalars()
+        .all()
+    )
+    fallidos = [shard for shard in shards if shard.estado != NominaShardEstado.COMPLETADO]
+    advertencias = [advertencia for shard in shards for advertencia in (shard.advertencias or [])]
+    procesados = sum(shard.empleados_procesados or 0 for shard in shards)
+    con_error = sum(shard.empleados_con_error or 0 for shard in shards)
+    errores_calculo: dict[str, Any] = {}
+    perfiles = [shard.perfil_ejecucion for shard in shards if shard.perfil_ejecucion]
+
+    if not fallidos:
+        service = PayrollExecutionService(db.session)
+        service.profiler = RunProfiler().start()
+        try:
+            planilla = _load_planilla(planilla_id)
+            if not planilla:
+                raise NominaValidationError(ERROR_PLANILLA_NOT_FOUND)
+
+            service.finalize_sharded_run(
+                nomina,
+                planilla,
+                date.fromisoformat(periodo_inicio),
+                date.fromisoformat(periodo_fin),
+                date.fromisoformat(fecha_calculo) if fecha_calculo else date.today(),
+                usuario,
+                [shard.resultados or {} for shard in shards],
+                shard_warnings=advertencias,
+            )
+            nomina.empleados_procesados = procesados
+            nomina.empleados_con_error = 0
+            nomina.empleado_actual = None
+            service.profiler.stop()
+            nomina.perfil_ejecucion = {
+                **merge_profiles([*perfiles, service.profiler.to_dict()]),
+                "shards": len(shards),
+            }
+            # Shards are only needed while the run is in progress
+            db.session.execute(db.delete(NominaShardModel).filter(NominaShardModel.nomina_id == nomina_id))
+            _clear_nomina_job_lock(nomina_id)
+            db.session.commit()
+        except Exception as e:
+            log.error("Error finalizing sharded nomina %s: %s", nomina_id, e)
+            db.session.rollback()
+            # The rollback released the claim; take it again before recording the failure
+            if not _claim_sharded_finalize(nomina_id, job_id):
+                db.session.rollback()
+                return omitido
+            errores_calculo = {
+                "critical_error": str(e),
+                "error_type": type(e).__name__,
+                "is_recoverable": _is_recoverable_error(e),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+        finally:
+            service.profiler.stop()
+    else:
+        errores_calculo = {
+            "shards_fallidos": {str(shard.indice): shard.errores or [] for shard in fallidos},
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+    if errores_calculo:
+        # All-or-nothing: remove every row the completed shards committed
+        _rollback_nomina_data(nomina_id)
+        nomina = db.session.get(NominaModel, nomina_id)
+        timestamp = datetime.now(timezone.utc).isoformat()
+        errores = [error for shard in fallidos for error in (shard.errores or [])]
+        if "critical_error" in errores_calculo:
+            errores.append(errores_calculo["critical_error"])
+        nomina.estado = NominaEstado.ERROR
+        nomina.errores_calculo = errores_calculo
+        nomina.perfil_ejecucion = {**merge_profiles(perfiles), "shards": len(shards)} if perfiles else None
+        nomina.empleados_procesados = procesados
+        nomina.empleados_con_error = con_error
+        nomina.empleado_actual = None
+        nomina.log_procesamiento = [
+            {"timestamp": timestamp, "empleado": "SISTEMA", "status": "error", "message": error} for error in errores
+        ] + [
+            {"timestamp": timestamp, "empleado": "SISTEMA", "status": "warning", "message": advertencia}
+            for advertencia in advertencias
+        ]
+        _clear_nomina_job_lock(nomina_id)
+        db.session.commit()
+
+    tracking_session = _get_tracking_session()
+    try:
+        _upsert_nomina_progress(
+            tracking_session,
+            nomina_id,
+            job_id,
+            empleados_procesados=nomina.empleados_procesados,
+            empleados_con_error=nomina.empleados_con_error,
+            errores_calculo=nomina.errores_calculo or {},
+            empleado_actual=None,
+            eventos=list(nomina.log_procesamiento or []),
+        )
+    finally:
+        _release_tracking_session(tracking_session)
 
+    log.info("Sharded payroll %s finalized with state %s", nomina_id, nomina.estado)
+    _schedule_nomina_comparison(nomina)
+
+    return {
+        "success": nomina.estado == NominaEstado.GENERADO,
+        "estado": nomina.estado,
+        "total_empleados": nomina.total_empleados,
+        "empleados_procesados": nomina.empleados_procesados,
+        "empleados_con_error": nomina.empleados_con_error,
+        "errores": nomina.errores_calculo or {},
+    }
+
+
+def _claim_sharded_finalize(nomina_id: str, job_id: str) -> bool:
+    """Claim the reduction of a sharded nomina in the current transaction.
+
+    The row stays locked until the caller commits or rolls back, so concurrent
+    finalize messages wait and then find the nomina already claimed.
+
+    Returns:
+        True if this job owns the reduction.
+    """
+    from coati_payroll.enums import NominaEstado
+
+    result = cast(
+        Any,
+        db.session.execute(
+            db.update(NominaModel)
+            .where(
+                NominaModel.id == nomina_id,
+                NominaModel.estado == NominaEstado.CALCULANDO,
+                NominaModel.job_id_activo == job_id,
+                NominaModel.job_completed_at.is_(None),
+            )
+            .values(job_completed_at=datetime.now(timezone.utc))
+        ),
+    )
+    return getattr(result, "rowcount", 0) == 1
+
+
+def _load_planilla(planilla_id: str) -> Planilla | None:
+    """Load a planilla with the relationships payroll processing reads for every employee."""
+    return db.session.execute(
+        db.select(Planilla)
+        .options(joinedload(cast(Any, Planilla.tipo_planilla)), joinedload(cast(Any, Planilla.moneda)))
+        .filter_by(id=planilla_id)
+    ).scalar_one_or_none()
+
+
+def _schedule_nomina_comparison(nomina: NominaModel) -> None:
+    """Enqueue the comparison of a freshly generated nomina against the previous one."""
+    from coati_payroll.vistas.planilla.services.nomina_comparison_service import NominaComparisonService
+
+    NominaComparisonService.schedule_precompute(nomina)
+
+
+def precompute_nomina_comparison(nomina_id: str) -> dict[str, Any]:
+    """Build and cache the comparison of a nomina against the previous one (background task).
+
+    Enqueued once the nomina reaches GENERADO, so the comparison page reads
+    the cached result instead of aggregating both nominas inside the request.
+
+    Args:
+        nomina_id: Nomina ID (ULID string)
+
+    Returns:
+        Dictionary with the compared pair, or the reason nothing was compared.
+    """
+    from coati_payroll.vistas.planilla.services.nomina_comparison_service import NominaComparisonService
+
+    try:
+        nomina = db.session.get(NominaModel, nomina_id)
+        if not nomina:
+            return {"success": False, "error": "Nomina not found"}
+
+        nomina_base = NominaComparisonService.get_nomina_base_default(nomina)
+        if nomina_base is None:
+            return {"success": True, "skipped": True, "message": "No previous nomina to compare"}
+
+        planilla = db.session.get(Planilla, nomina.planilla_id)
+        if not planilla:
+            return {"success": False, "error": ERROR_PLANILLA_NOT_FOUND}
+
+        payload = NominaComparisonService.compare_or_cached(planilla, nomina_base, nomina)
+        log.info("Comparison of nomina %s against %s precomputed", nomina_id, nomina_base.id)
+        return {
+            "success": True,
+            "nomina_base_id": nomina_base.id,
+            "nomina_actual_id": nomina_id,
+            "is_cached": payload.get("is_cached", False),
+        }
     except Exception as e:
-        log.error("Error processing parallel payroll: %s", e)
+        log.error("Error precomputing comparison for nomina %s: %s", nomina_id, e)
+        db.session.rollback()
+        return {"success": False, "error": str(e)}
+
+
+def process_liquidation_batch(lote_id: str) -> dict[str, Any]:
+    """Calculate a batch of liquidaciones for a mass termination (background task).
+
+    Progress is committed on the LiquidacionLote after every chunk of
+    employees. If the batch fails, ``procesar_lote_liquidaciones`` keeps the
+    liquidaciones of completed chunks and sets the batch to ERROR.
+
+    Args:
+        lote_id: LiquidacionLote ID (ULID string)
+
+    Returns:
+        Dictionary with the number of liquidaciones created and employees with errors.
+    """
+    try:
+        log.info("Processing liquidation batch %s", lote_id)
+        resultado = procesar_lote_liquidaciones(lote_id)
+        if resultado is None:
+            return {"success": False, "skipped": True, "error": "Batch not found or already processed"}
+        if resultado.error:
+            return {"success": False, "error": resultado.error}
+
+        log.info(
+            "Liquidation batch %s finished: %s liquidaciones, %s employees with errors",
+            lote_id,
+            len(resultado.liquidacion_ids),
+            len(resultado.errores),
+        )
         return {
-            "success": False,
-            "error": str(e),
+            "success": True,
+            "liquidaciones": len(resultado.liquidacion_ids),
+            "empleados_con_error": len(resultado.errores),
         }
+    except Exception as e:
+        log.error("Error processing liquidation batch %s: %s", lote_id, e)
+        db.session.rollback()
+        return {"success": False, "error": str(e)}
 
 
 def generate_audit_voucher(
@@ -732,7 +1399,6 @@ def process_large_payroll(
                 empleados_procesados=0,
                 empleados_con_error=0,
                 errores_calculo={},
-                log_procesamiento=[],
                 empleado_actual=None,
             )
         finally:
@@ -742,6 +1408,7 @@ def process_large_payroll(
         # Process employees with periodic commits to reduce risk of losing all work
         # If ANY employee fails, rollback ALL changes to maintain consistency
         log_entries = []
+        publicados = 0  # log_entries already appended to the progress events
         failed_employees: dict[str, dict[str, str]] = {}
         BATCH_SIZE = 10  # Commit progress every N employees to reduce risk
         processed_count = 0
@@ -776,9 +1443,10 @@ def process_large_payroll(
                             job_id,
                             empleados_procesados=idx - 1,
                             empleados_con_error=error_count,
-                            log_procesamiento=log_entries,
+                            eventos=log_entries[publicados:],
                             empleado_actual=empleado_nombre,
                         )
+                        publicados = len(log_entries)
                     finally:
                         _release_tracking_session(tracking_session)
 
@@ -843,9 +1511,10 @@ def process_large_payroll(
                             job_id,
                             empleados_procesados=idx - 1,
                             empleados_con_error=error_count,
-                            log_procesamiento=log_entries,
+                            eventos=log_entries[publicados:],
                             empleado_actual=None,
                         )
+                        publicados = len(log_entries)
                     finally:
                         _release_tracking_session(tracking_session)
 
@@ -861,9 +1530,10 @@ def process_large_payroll(
                             job_id,
                             empleados_procesados=processed_count,
                             empleados_con_error=error_count,
-                            log_procesamiento=log_entries,
+                            eventos=log_entries[publicados:],
                             empleado_actual=None,
                         )
+                        publicados = len(log_entries)
                         log.info("Progress committed: %s/%s employees processed", idx, len(empleados))
                     finally:
                         _release_tracking_session(tracking_session)
@@ -903,9 +1573,10 @@ def process_large_payroll(
                     empleados_procesados=processed_count,
                     empleados_con_error=error_count,
                     errores_calculo=nomina.errores_calculo,
-                    log_procesamiento=log_entries,
+                    eventos=log_entries[publicados:],
                     empleado_actual=None,
                 )
+                publicados = len(log_entries)
             finally:
                 _release_tracking_session(tracking_session)
 
@@ -913,6 +1584,7 @@ def process_large_payroll(
                 log.warning("Payroll completed with %s employee errors for nomina %s", error_count, nomina_id)
             else:
                 log.info("All employees processed successfully for nomina %s", nomina_id)
+            _schedule_nomina_comparison(nomina)
 
         except Exception as e:
             # CRITICAL: Rollback all changes if any employee fails
@@ -976,9 +1648,10 @@ def process_large_payroll(
                     empleados_procesados=processed_count,
                     empleados_con_error=nomina.empleados_con_error,
                     errores_calculo=nomina.errores_calculo,
-                    log_procesamiento=log_entries,
+                    eventos=log_entries[publicados:],
                     empleado_actual=None,
                 )
+                publicados = len(log_entries)
             finally:
                 _release_tracking_session(tracking_session)
 
@@ -1038,6 +1711,22 @@ process_payroll_parallel_task = queue.register_task(
     max_backoff=int(os.getenv("PAYROLL_PARALLEL_MAX_BACKOFF_MS", "7200000")),  # 2 hours
 )
 
+process_payroll_shard_task = queue.register_task(
+    process_payroll_shard,
+    name="process_payroll_shard",
+    max_retries=0,  # Failures are recorded on the shard; the nomina is retried as a whole
+    min_backoff=0,
+    max_backoff=0,
+)
+
+finalize_sharded_payroll_task = queue.register_task(
+    finalize_sharded_payroll,
+    name="finalize_sharded_payroll",
+    max_retries=0,  # Failures leave the nomina in ERROR for a manual retry
+    min_backoff=0,
+    max_backoff=0,
+)
+
 process_large_payroll_task = queue.register_task(
     process_large_payroll,
     name="process_large_payroll",
@@ -1061,3 +1750,19 @@ generate_audit_voucher_task = queue.register_task(
     min_backoff=60000,  # 1 minute
     max_backoff=3600000,  # 1 hour
 )
+
+process_liquidation_batch_task = queue.register_task(
+    process_liquidation_batch,
+    name="process_liquidation_batch",
+    max_retries=0,  # Completed chunks are kept; a failed batch is reported, not retried
+    min_backoff=0,
+    max_backoff=0,
+)
+
+precompute_nomina_comparison_task = queue.register_task(
+    precompute_nomina_comparison,
+    name="precompute_nomina_comparison",
+    max_retries=2,
+    min_backoff=60000,  # 1 minute
+    max_backoff=3600000,  # 1 hour
+)
@@ -5,7 +5,7 @@
 This module provides the core functionality for executing reports:
 - Query building for custom reports with security constraints
 - Expression evaluation for calculated columns
-- Pagination and result limiting
+- Keyset (seek) pagination with continuation cursors, and result limiting
 - Integration with system report implementations
 """
 
@@ -14,19 +14,25 @@ from __future__ import annotations
 # <-------------------------------------------------------------------------> #
 # Standard library
 # <-------------------------------------------------------------------------> #
-from datetime import datetime, timezone
+import base64
+import binascii
+import hashlib
+from dataclasses import dataclass, field as dataclass_field
+from datetime import date, datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
 
 # <-------------------------------------------------------------------------> #
 # Third party libraries
 # <-------------------------------------------------------------------------> #
-
+import orjson
+from sqlalchemy import and_, case, func, or_
 
 # <-------------------------------------------------------------------------> #
 # Third party libraries
 # <-------------------------------------------------------------------------> #
 from coati_payroll.enums import ReportType, ReportExecutionStatus
+from coati_payroll.excel_stream import STREAM_YIELD_PER
 from coati_payroll.model import (
     db,
     Report,
@@ -136,6 +142,77 @@ ALLOWED_OPERATORS = {
 MAX_ROWS_PER_EXECUTION = 50000
 
 
+# ============================================================================
+# Continuation cursors
+# ============================================================================
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a continuation cursor is malformed, tampered with or issued for another query."""
+
+
+@dataclass
+class ReportPage:
+    """One page of report results.
+
+    Attributes:
+        results: Rows of the page as dicts
+        total_count: Rows matching the filters, or None when counting was skipped
+        next_cursor: Opaque cursor for the next page, or None on the last page
+    """
+
+    results: List[Dict[str, Any]] = dataclass_field(default_factory=list)
+    total_count: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+def query_fingerprint(*parts: Any) -> str:
+    """SHA-256 hex digest of the canonical JSON of ``parts``."""
+    contenido = orjson.dumps(list(parts), option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    return hashlib.sha256(contenido).hexdigest()
+
+
+def encode_cursor(fingerprint: str, **payload: Any) -> str:
+    """Build an opaque continuation cursor bound to a query fingerprint."""
+    contenido = orjson.dumps({**payload, "h": fingerprint}, default=str)
+    return base64.urlsafe_b64encode(contenido).decode("ascii")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> Dict[str, Any]:
+    """Decode a continuation cursor.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for another query
+    """
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, AttributeError, orjson.JSONDecodeError) as e:
+        raise InvalidCursorError("Invalid report cursor") from e
+    if not isinstance(payload, dict) or payload.get("h") != fingerprint:
+        raise InvalidCursorError("Report cursor does not match the report filters")
+    return payload
+
+
+def _cursor_value(column: Any, value: Any) -> Any:
+    """Convert a JSON value from a cursor back to the Python type of ``column``."""
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        if python_type is Decimal:
+            return Decimal(str(value))
+    except (TypeError, ValueError, ArithmeticError) as e:
+        raise InvalidCursorError("Invalid report cursor") from e
+    return value
+
+
 # ============================================================================
 # Custom Report Query Builder
 # ============================================================================
@@ -209,58 +286,48 @@ class CustomReportBuilder:
 
         return errors
 
-    def build_query(self, filters: Optional[Dict[str, Any]] = None, page: int = 1, per_page: int = 100):
+    def build_query(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        per_page: int = 100,
+        cursor: Optional[str] = None,
+        posicion: Optional[Dict[str, Any]] = None,
+    ):
         """Build SQLAlchemy select statement for the report.
 
+        Rows are ordered by the definition's sorting, with NULLs last and the
+        primary key as tie-breaker, so the order is stable and can be resumed
+        from a cursor.
+
         Args:
             filters: Additional runtime filters from user
-            page: Page number for pagination
+            page: Page number for pagination (ignored when ``cursor`` is given)
             per_page: Results per page
+            cursor: Continuation cursor returned with the previous page
+            posicion: ``cursor`` already decoded by ``read_cursor``
 
         Returns:
             SQLAlchemy Select statement
-        """
-        # Start with base entity
-        stmt = db.select(self.base_entity)
-
-        # Apply filters from definition
-        definition_filters = self.definition.get("filters", [])
-        for filt in definition_filters:
-            field_name = filt.get("field")
-            operator = filt.get("operator")
-            value = filt.get("value")
-
-            if field_name and operator in ALLOWED_OPERATORS:
-                field = getattr(self.base_entity, field_name, None)
-                if field is not None:
-                    filter_func = ALLOWED_OPERATORS[operator]
-                    stmt = stmt.filter(filter_func(field, value))
 
-        # Apply runtime filters
-        if filters:
-            for field_name, value in filters.items():
-                if field_name in ALLOWED_FIELDS.get(self.base_entity_name, []):
-                    field = getattr(self.base_entity, field_name, None)
-                    if field is not None:
-                        stmt = stmt.filter(field == value)
-
-        # Apply sorting
-        sorting = self.definition.get("sorting", [])
-        for sort in sorting:
-            field_name = sort.get("field")
-            direction = sort.get("direction", "asc")
+        Raises:
+            InvalidCursorError: If the cursor is invalid for this report and filters
+        """
+        stmt = self._filtered_query(filters)
 
-            if field_name in ALLOWED_FIELDS.get(self.base_entity_name, []):
-                field = getattr(self.base_entity, field_name, None)
-                if field is not None:
-                    if direction.lower() == "desc":
-                        stmt = stmt.order_by(field.desc())
-                    else:
-                        stmt = stmt.order_by(field.asc())
+        sort_keys = self._sort_keys()
+        for _field_name, field, descending in sort_keys:
+            if field is not self.base_entity.id:
+                stmt = stmt.order_by(case((field.is_(None), 1), else_=0))
+            stmt = stmt.order_by(field.desc() if descending else field.asc())
 
-        # Apply pagination
+        # Apply pagination: seek past the cursor row, or skip whole pages
         stmt = stmt.limit(min(per_page, MAX_ROWS_PER_EXECUTION))
-        if page > 1:
+        if posicion is None and cursor:
+            posicion = self.read_cursor(cursor, filters)
+        if posicion is not None:
+            stmt = stmt.filter(self._after(sort_keys, posicion["k"]))
+        elif page > 1:
             stmt = stmt.offset((page - 1) * per_page)
 
         return stmt
@@ -278,11 +345,118 @@ class CustomReportBuilder:
         Returns:
             Tuple of (results as list of dicts, total count)
         """
-        # Build base query without pagination for count
-        from sqlalchemy.sql.functions import count
+        report_page = self.execute_page(filters, per_page=per_page, page=page)
+        return report_page.results, report_page.total_count or 0
+
+    def execute_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        per_page: int = 100,
+        page: int = 1,
+        count: bool = True,
+        posicion: Optional[Dict[str, Any]] = None,
+    ) -> ReportPage:
+        """Execute the report and return one page with a continuation cursor.
+
+        The total count is computed for the first page only and carried in the
+        cursor, so following pages neither count again nor skip rows with OFFSET.
+
+        Args:
+            filters: Additional runtime filters
+            cursor: Continuation cursor returned with the previous page
+            per_page: Results per page
+            page: Page number, used only when no cursor is given
+            count: Whether to count the matching rows when no cursor is given
+            posicion: ``cursor`` already decoded by ``read_cursor``
+
+        Returns:
+            ReportPage with the rows, the total count and the next cursor
+
+        Raises:
+            InvalidCursorError: If the cursor is invalid for this report and filters
+        """
+        per_page = max(1, min(per_page, MAX_ROWS_PER_EXECUTION))
+        fingerprint = self.cursor_fingerprint(filters)
+
+        # Decode the cursor once; the query reuses the decoded position
+        if posicion is None and cursor:
+            posicion = self.read_cursor(cursor, filters)
+        if posicion is not None:
+            total_count = posicion.get("n")
+        elif count:
+            total_count = self.count(filters)
+        else:
+            total_count = None
+
+        # One extra row tells whether there is a next page
+        stmt = self.build_query(filters, page, per_page, posicion=posicion).limit(per_page + 1)
+        rows = db.session.execute(stmt).scalars().all()
+
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            ultimo = rows[-1]
+            valores = [getattr(ultimo, field_name) for field_name, _field, _descending in self._sort_keys()]
+            next_cursor = encode_cursor(fingerprint, k=valores, n=total_count)
+
+        return ReportPage(results=self._to_dicts(rows), total_count=total_count, next_cursor=next_cursor)
+
+    def iter_rows(
+        self, filters: Optional[Dict[str, Any]] = None, limit: int = MAX_ROWS_PER_EXECUTION
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream the report rows in sort order from a server-side cursor.
+
+        Args:
+            filters: Additional runtime filters
+            limit: Maximum number of rows, capped at ``MAX_ROWS_PER_EXECUTION``
+
+        Yields:
+            One dict per row, keyed by column label
+        """
+        stmt = self.build_query(filters, per_page=limit).execution_options(yield_per=STREAM_YIELD_PER)
+        for row in db.session.execute(stmt).scalars():
+            yield self._to_dict(row)
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count the rows matching the definition and runtime filters."""
+        stmt = db.select(func.count()).select_from(self._filtered_query(filters).subquery())
+        return db.session.execute(stmt).scalar() or 0
+
+    def read_cursor(self, cursor: str, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Decode a continuation cursor of this report and check it against the sort order.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed, was issued for other
+                filters or sorting, or its keys do not match the sort keys
+        """
+        payload = decode_cursor(cursor, self.cursor_fingerprint(filters))
+        sort_keys = self._sort_keys()
+        valores = payload.get("k")
+        if not isinstance(valores, list) or len(valores) != len(sort_keys):
+            raise InvalidCursorError("Report cursor does not match the report sorting")
+        if any(isinstance(valor, (list, dict)) for valor in valores):
+            raise InvalidCursorError("Invalid report cursor")
+        total_count = payload.get("n")
+        if total_count is not None and (not isinstance(total_count, int) or isinstance(total_count, bool)):
+            raise InvalidCursorError("Invalid report cursor")
+        # Convert the keys here, so a bad value is rejected before the query runs
+        claves = [_cursor_value(field, valor) for (_field_name, field, _descending), valor in zip(sort_keys, valores)]
+        return {**payload, "k": claves}
+
+    def cursor_fingerprint(self, filters: Optional[Dict[str, Any]] = None) -> str:
+        """Hash of everything that determines the rows and their order; cursors are bound to it."""
+        return query_fingerprint(
+            self.base_entity_name,
+            self.definition.get("filters", []),
+            self.definition.get("sorting", []),
+            filters or {},
+        )
 
+    def _filtered_query(self, filters: Optional[Dict[str, Any]] = None):
+        """Select the base entity with the definition and runtime filters applied."""
         # Start with base entity
-        count_stmt = db.select(self.base_entity)
+        stmt = db.select(self.base_entity)
 
         # Apply filters from definition
         definition_filters = self.definition.get("filters", [])
@@ -295,7 +469,7 @@ class CustomReportBuilder:
                 field = getattr(self.base_entity, field_name, None)
                 if field is not None:
                     filter_func = ALLOWED_OPERATORS[operator]
-                    count_stmt = count_stmt.filter(filter_func(field, value))
+                    stmt = stmt.filter(filter_func(field, value))
 
         # Apply runtime filters
         if filters:
@@ -303,40 +477,69 @@ class CustomReportBuilder:
                 if field_name in ALLOWED_FIELDS.get(self.base_entity_name, []):
                     field = getattr(self.base_entity, field_name, None)
                     if field is not None:
-                        count_stmt = count_stmt.filter(field == value)
-
-        # Get total count (without pagination or sorting)
-        total_count = db.session.execute(db.select(count()).select_from(count_stmt.subquery())).scalar() or 0
-
-        # Build query with pagination for results
-        stmt = self.build_query(filters, page, per_page)
-
-        # Execute statement
-        results = db.session.execute(stmt).scalars().all()
+                        stmt = stmt.filter(field == value)
 
-        # Convert to list of dicts
-        columns = self.definition.get("columns", [])
-        output = []
+        return stmt
 
-        for row in results:
-            row_dict = {}
-            for col in columns:
-                if col.get("type") == "field":
-                    field_name = col.get("field")
-                    label = col.get("label", field_name)
-                    value = getattr(row, field_name, None)
+    def _sort_keys(self) -> List[Tuple[str, Any, bool]]:
+        """Return ``(field name, column, descending)`` of the sort order, ending with the primary key."""
+        keys = []
+        sorting = self.definition.get("sorting", [])
+        for sort in sorting:
+            field_name = sort.get("field")
+            direction = sort.get("direction", "asc")
 
-                    # Convert Decimal to float for JSON serialization
-                    if isinstance(value, Decimal):
-                        value = float(value)
-                    elif isinstance(value, datetime):
-                        value = value.isoformat()
+            if field_name in ALLOWED_FIELDS.get(self.base_entity_name, []):
+                field = getattr(self.base_entity, field_name, None)
+                if field is not None:
+                    keys.append((field_name, field, direction.lower() == "desc"))
 
-                    row_dict[label] = value
+        keys.append(("id", self.base_entity.id, False))
+        return keys
 
-            output.append(row_dict)
+    def _after(self, sort_keys: List[Tuple[str, Any, bool]], valores: List[Any]):
+        """Condition selecting the rows that follow the cursor row in the sort order.
 
-        return output, total_count
+        Expands ``(k1, k2, ...) > (v1, v2, ...)`` column by column, honouring
+        each direction and the NULLs-last ordering. ``valores`` are the keys
+        checked and converted by ``read_cursor``.
+        """
+        siguientes = []
+        iguales: List[Any] = []
+        for (_field_name, field, descending), valor in zip(sort_keys, valores):
+            if valor is None:
+                # NULLs sort last: only other NULLs can follow, and they tie on this key
+                iguales.append(field.is_(None))
+                continue
+            mayor = field < valor if descending else field > valor
+            if field is not self.base_entity.id:
+                mayor = or_(mayor, field.is_(None))
+            siguientes.append(and_(*iguales, mayor))
+            iguales.append(field == valor)
+        return or_(*siguientes)
+
+    def _to_dicts(self, rows: Any) -> List[Dict[str, Any]]:
+        """Convert rows to dicts keyed by column label."""
+        return [self._to_dict(row) for row in rows]
+
+    def _to_dict(self, row: Any) -> Dict[str, Any]:
+        """Convert one row to a dict keyed by column label."""
+        row_dict = {}
+        for col in self.definition.get("columns", []):
+            if col.get("type") == "field":
+                field_name = col.get("field")
+                label = col.get("label", field_name)
+                value = getattr(row, field_name, None)
+
+                # Convert Decimal to float for JSON serialization
+                if isinstance(value, Decimal):
+                    value = float(value)
+                elif isinstance(value, datetime):
+                    value = value.isoformat()
+
+                row_dict[label] = value
+
+        return row_dict
 
 
 # ============================================================================
@@ -370,6 +573,39 @@ class ReportExecutionManager:
         Returns:
             Tuple of (results, total_count, execution_record)
         """
+        report_page, execution = self.execute_page(parameters, per_page=per_page, page=page)
+        return report_page.results, report_page.total_count or 0, execution
+
+    def execute_page(
+        self,
+        parameters: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        per_page: int = 100,
+        page: int = 1,
+    ) -> Tuple[ReportPage, ReportExecution]:
+        """Execute one page of the report and track execution.
+
+        Args:
+            parameters: Runtime parameters/filters
+            cursor: Continuation cursor returned with the previous page
+            per_page: Results per page
+            page: Page number, used only when no cursor is given
+
+        Returns:
+            Tuple of (page with results, total count and next cursor, execution_record)
+
+        Raises:
+            InvalidCursorError: If the cursor is invalid; no execution is recorded
+        """
+        # A bad cursor is a client error, not a report failure: reject it before recording anything
+        builder = None
+        posicion = None
+        if cursor and self.report.type == ReportType.CUSTOM:
+            builder = CustomReportBuilder(self.report)
+            posicion = builder.read_cursor(cursor, parameters)
+        elif cursor:
+            posicion = self._read_system_cursor(cursor, parameters or {})
+
         # Create execution record
         execution = ReportExecution(
             report_id=self.report.id,
@@ -386,48 +622,131 @@ class ReportExecutionManager:
         try:
             if self.report.type == ReportType.CUSTOM:
                 # Execute custom report
-                builder = CustomReportBuilder(self.report)
-                results, total_count = builder.execute(parameters, page, per_page)
+                builder = builder or CustomReportBuilder(self.report)
+                report_page = builder.execute_page(parameters, per_page=per_page, page=page, posicion=posicion)
             else:
-                # Execute system report
-                from coati_payroll.system_reports import get_system_report
-
-                system_report_func = get_system_report(self.report.system_report_id)
-                if not system_report_func:
-                    raise ValueError(f"System report '{self.report.system_report_id}' not found")
-
-                # Execute system report (they handle their own pagination)
-                results = system_report_func(parameters or {})
-                total_count = len(results)
-
-                # Apply pagination to system report results
-                if page > 1 or per_page < len(results):
-                    start_idx = (page - 1) * per_page
-                    end_idx = start_idx + per_page
-                    results = results[start_idx:end_idx]
+                report_page = self._execute_system_report(parameters or {}, posicion, per_page, page)
 
             # Update execution record
             end_time = datetime.now(timezone.utc)
             execution.status = ReportExecutionStatus.COMPLETED
             execution.completed_at = end_time
-            execution.row_count = len(results)
+            execution.row_count = len(report_page.results)
             execution.execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
 
             db.session.commit()
 
-            return results, total_count, execution
+            return report_page, execution
 
         except Exception as e:
             # Update execution record with error
-            execution.status = ReportExecutionStatus.FAILED
-            execution.completed_at = datetime.now(timezone.utc)
-            execution.error_message = str(e)[:1000]  # Truncate to fit column
+            self._fail_execution(execution, e)
+            raise
 
-            db.session.commit()
+    def execute_stream(
+        self, parameters: Optional[Dict[str, Any]] = None, limit: int = MAX_ROWS_PER_EXECUTION
+    ) -> Tuple[Iterator[Dict[str, Any]], int, ReportExecution]:
+        """Execute the whole report as a row stream, for exports, and track execution.
 
-            log.error("Report execution failed: %s", e)
+        Custom reports are counted first and then read from a server-side cursor
+        as the returned iterator is consumed; the execution record is completed
+        (or failed) when the iterator is exhausted (or raises).
+
+        Args:
+            parameters: Runtime parameters/filters
+            limit: Maximum number of rows, capped at ``MAX_ROWS_PER_EXECUTION``
+
+        Returns:
+            Tuple of (row iterator, total_count, execution_record)
+        """
+        limit = max(1, min(limit, MAX_ROWS_PER_EXECUTION))
+        execution = ReportExecution(
+            report_id=self.report.id,
+            status=ReportExecutionStatus.RUNNING,
+            parameters=parameters or {},
+            executed_by=self.user,
+            started_at=datetime.now(timezone.utc),
+        )
+        db.session.add(execution)
+        db.session.commit()
+
+        start_time = datetime.now(timezone.utc)
+
+        try:
+            if self.report.type == ReportType.CUSTOM:
+                builder = CustomReportBuilder(self.report)
+                total_count = min(builder.count(parameters), limit)
+                rows = builder.iter_rows(parameters, limit)
+            else:
+                report_page = self._execute_system_report(parameters or {}, None, limit, 1)
+                total_count = len(report_page.results)
+                rows = iter(report_page.results)
+        except Exception as e:
+            self._fail_execution(execution, e)
             raise
 
+        return self._track_stream(rows, execution, start_time), total_count, execution
+
+    def _track_stream(
+        self, rows: Iterator[Dict[str, Any]], execution: ReportExecution, start_time: datetime
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield ``rows`` and complete the execution record once they are exhausted."""
+        row_count = 0
+        try:
+            for row in rows:
+                row_count += 1
+                yield row
+        except Exception as e:
+            self._fail_execution(execution, e)
+            raise
+
+        end_time = datetime.now(timezone.utc)
+        execution.status = ReportExecutionStatus.COMPLETED
+        execution.completed_at = end_time
+        execution.row_count = row_count
+        execution.execution_time_ms = int((end_time - start_time).total_seconds() * 1000)
+        db.session.commit()
+
+    def _fail_execution(self, execution: ReportExecution, error: Exception) -> None:
+        """Record ``error`` on the execution record."""
+        execution.status = ReportExecutionStatus.FAILED
+        execution.completed_at = datetime.now(timezone.utc)
+        execution.error_message = str(error)[:1000]  # Truncate to fit column
+
+        db.session.commit()
+
+        log.error("Report execution failed: %s", error)
+
+    def _read_system_cursor(self, cursor: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode the continuation cursor of a system report, which carries the row offset."""
+        payload = decode_cursor(cursor, query_fingerprint(self.report.system_report_id, parameters))
+        offset = payload.get("o")
+        if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+            raise InvalidCursorError("Invalid report cursor")
+        return payload
+
+    def _execute_system_report(
+        self, parameters: Dict[str, Any], posicion: Optional[Dict[str, Any]], per_page: int, page: int
+    ) -> ReportPage:
+        """Run a system report and slice the requested page; cursors carry the row offset."""
+        from coati_payroll.system_reports import get_system_report
+
+        system_report_func = get_system_report(self.report.system_report_id)
+        if not system_report_func:
+            raise ValueError(f"System report '{self.report.system_report_id}' not found")
+
+        fingerprint = query_fingerprint(self.report.system_report_id, parameters)
+        start_idx = posicion["o"] if posicion is not None else (page - 1) * per_page
+
+        # Execute system report (they handle their own pagination)
+        results = system_report_func(parameters)
+        total_count = len(results)
+
+        # Apply pagination to system report results
+        end_idx = start_idx + per_page
+        next_cursor = encode_cursor(fingerprint, o=end_idx) if end_idx < total_count else None
+        return ReportPage(results=results[start_idx:end_idx], total_count=total_count, next_cursor=next_cursor)
+
 
 # ============================================================================
 # Permission Checking
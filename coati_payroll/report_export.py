@@ -12,16 +12,15 @@ from __future__ import annotations
 # Standard library
 # <-------------------------------------------------------------------------> #
 from datetime import datetime
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Sized
 
 # <-------------------------------------------------------------------------> #
 # Third party libraries
 # <-------------------------------------------------------------------------> #
 try:
-    from openpyxl import Workbook
     from openpyxl.styles import Font, Alignment, PatternFill
-    from openpyxl.utils import get_column_letter
 
     OPENPYXL_AVAILABLE = True
 except ImportError:
@@ -32,21 +31,35 @@ except ImportError:
 # Local modules
 # <-------------------------------------------------------------------------> #
 from coati_payroll.config import DIRECTORIO_APP
+from coati_payroll.excel_stream import WIDTH_SAMPLE_ROWS, StreamingWorkbook, estimate_column_widths
 from coati_payroll.log import log
 
 
 class ReportExporter:
-    """Handles exporting report results to various formats."""
+    """Handles exporting report results to various formats.
 
-    def __init__(self, report_name: str, results: List[Dict[str, Any]]):
+    Results may be a list or an iterator (e.g. ``ReportExecutionManager.execute_stream``),
+    which is consumed once, as the file is written.
+    """
+
+    def __init__(self, report_name: str, results: Iterable[Dict[str, Any]], total_count: Optional[int] = None):
         """Initialize exporter.
 
         Args:
             report_name: Name of the report
-            results: List of result dictionaries
+            results: Result dictionaries, as a list or an iterator
+            total_count: Number of results; defaults to ``len(results)`` for lists
         """
         self.report_name = report_name
         self.results = results
+        self.total_count = len(results) if total_count is None and isinstance(results, Sized) else total_count
+
+    def _rows(self) -> tuple[List[str], List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+        """Return the headers, the first rows (width sample) and an iterator over every row."""
+        rows = iter(self.results)
+        sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+        headers = list(sample[0].keys()) if sample else []
+        return headers, sample, chain(sample, rows)
 
     def to_excel(self, output_path: Optional[str] = None) -> str:
         """Export results to Excel format.
@@ -76,54 +89,39 @@ class ReportExporter:
 
             output_path = str((exports_dir / filename).absolute())
 
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = self.report_name[:31]  # Excel sheet name limit
+        headers, sample, rows = self._rows()
 
-        # Add metadata
-        ws["A1"] = "Report:"
-        ws["B1"] = self.report_name
-        ws["A2"] = "Generated:"
-        ws["B2"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        ws["A3"] = "Total Records:"
-        ws["B3"] = len(self.results)
+        def filas(results: Iterable[Dict[str, Any]]):
+            return ([row_data.get(header) for header in headers] for row_data in results)
+
+        # Rows are streamed to the file; column widths are estimated from the first rows
+        wb = StreamingWorkbook()
+        ws = wb.add_sheet(self.report_name, column_widths=estimate_column_widths(headers, filas(sample)))
 
-        # Style metadata
-        for cell in ["A1", "A2", "A3"]:
-            ws[cell].font = Font(bold=True)
+        # Add metadata
+        metadata = [
+            ("Report:", self.report_name),
+            ("Generated:", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            ("Total Records:", self.total_count if self.total_count is not None else len(sample)),
+        ]
+        for label, value in metadata:
+            ws.append([ws.cell(label, font=Font(bold=True)), value])
 
         # Add blank row
-        start_row = 5
+        ws.skip()
 
-        if self.results:
+        if headers:
             # Add headers
-            headers = list(self.results[0].keys())
-            for col_idx, header in enumerate(headers, start=1):
-                cell = ws.cell(row=start_row, column=col_idx, value=header)
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center", vertical="center")
+            ws.append(
+                headers,
+                font=Font(bold=True, color="FFFFFF"),
+                fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+                alignment=Alignment(horizontal="center", vertical="center"),
+            )
 
             # Add data
-            for row_idx, row_data in enumerate(self.results, start=start_row + 1):
-                for col_idx, header in enumerate(headers, start=1):
-                    value = row_data.get(header)
-                    ws.cell(row=row_idx, column=col_idx, value=value)
-
-            # Auto-adjust column widths
-            for col_idx, header in enumerate(headers, start=1):
-                column_letter = get_column_letter(col_idx)
-                max_length = len(str(header))
-
-                for row_data in self.results:
-                    value = row_data.get(header)
-                    if value is not None:
-                        max_length = max(max_length, len(str(value)))
-
-                # Set width with some padding
-                adjusted_width = min(max_length + 2, 50)  # Max 50 chars
-                ws.column_dimensions[column_letter].width = adjusted_width
+            for fila in filas(rows):
+                ws.append(fila)
 
         # Save workbook
         wb.save(output_path)
@@ -155,43 +153,54 @@ class ReportExporter:
             output_path = str((exports_dir / filename).absolute())
 
         # Write CSV
-        if self.results:
-            headers = list(self.results[0].keys())
-
+        headers, _sample, rows = self._rows()
+        if headers:
             with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
                 writer = csv.DictWriter(csvfile, fieldnames=headers)
                 writer.writeheader()
-                writer.writerows(self.results)
+                writer.writerows(rows)
 
         log.info("Report exported to: %s", output_path)
         return output_path
 
 
-def export_report_to_excel(report_name: str, results: List[Dict[str, Any]], output_path: Optional[str] = None) -> str:
+def export_report_to_excel(
+    report_name: str,
+    results: Iterable[Dict[str, Any]],
+    output_path: Optional[str] = None,
+    total_count: Optional[int] = None,
+) -> str:
     """Convenience function to export report to Excel.
 
     Args:
         report_name: Name of the report
-        results: Report results
+        results: Report results, as a list or an iterator
         output_path: Optional output path
+        total_count: Number of results when ``results`` is an iterator
 
     Returns:
         Path to exported file
     """
-    exporter = ReportExporter(report_name, results)
+    exporter = ReportExporter(report_name, results, total_count)
     return exporter.to_excel(output_path)
 
 
-def export_report_to_csv(report_name: str, results: List[Dict[str, Any]], output_path: Optional[str] = None) -> str:
+def export_report_to_csv(
+    report_name: str,
+    results: Iterable[Dict[str, Any]],
+    output_path: Optional[str] = None,
+    total_count: Optional[int] = None,
+) -> str:
     """Convenience function to export report to CSV.
 
     Args:
         report_name: Name of the report
-        results: Report results
+        results: Report results, as a list or an iterator
         output_path: Optional output path
+        total_count: Number of results when ``results`` is an iterator
 
     Returns:
         Path to exported file
     """
-    exporter = ReportExporter(report_name, results)
+    exporter = ReportExporter(report_name, results, total_count)
     return exporter.to_csv(output_path)
@@ -12,7 +12,7 @@ from __future__ import annotations
 # <-------------------------------------------------------------------------> #
 # Standard library
 # <-------------------------------------------------------------------------> #
-from datetime import datetime
+from datetime import date, datetime
 from typing import Dict, Any, List, Optional, Callable
 
 # <-------------------------------------------------------------------------> #
@@ -26,6 +26,7 @@ from sqlalchemy.sql.functions import count
 # <-------------------------------------------------------------------------> #
 from coati_payroll.model import (
     db,
+    Adelanto,
     Empleado,
     Nomina,
     NominaEmpleado,
@@ -33,7 +34,7 @@ from coati_payroll.model import (
     VacationAccount,
     VacationLedger,
 )
-from coati_payroll.enums import TipoDetalle
+from coati_payroll.enums import AdelantoEstado, AdelantoTipo, TipoDetalle
 
 # ============================================================================
 # System Report Registry
@@ -456,6 +457,72 @@ def vacation_taken_by_period_report(parameters: Dict[str, Any]) -> List[Dict[str
     ]
 
 
+# ============================================================================
+# Loan Reports
+# ============================================================================
+
+
+@register_system_report("loan_portfolio")
+def loan_portfolio_report(parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Outstanding loans with their remaining scheduled installments.
+
+    Schedules are built in one batch per company, with the company's
+    configuration resolved once.
+
+    Parameters:
+        - empresa_id: Filter by company (optional)
+        - fecha_corte: Installments due after this date are pending (optional, default today)
+    """
+    from coati_payroll.interes_engine import _obtener_config_default, generar_tablas_amortizacion, parametros_prestamo
+
+    empresa_id = parameters.get("empresa_id")
+    fecha_corte = parameters.get("fecha_corte") or date.today()
+    if isinstance(fecha_corte, str):
+        fecha_corte = datetime.fromisoformat(fecha_corte).date()
+
+    stmt = (
+        db.select(Adelanto, Empleado)
+        .join(Empleado, Adelanto.empleado_id == Empleado.id)
+        .filter(
+            Adelanto.tipo == AdelantoTipo.PRESTAMO,
+            Adelanto.estado == AdelantoEstado.APROBADO,
+            Adelanto.saldo_pendiente > 0,
+        )
+    )
+    if empresa_id:
+        stmt = stmt.filter(Empleado.empresa_id == empresa_id)
+    results = db.session.execute(stmt.order_by(Empleado.primer_apellido, Empleado.primer_nombre, Adelanto.id)).all()
+
+    parametros_por_empresa: Dict[Optional[str], Dict[str, Any]] = {}
+    for prestamo, empleado in results:
+        parametros = parametros_prestamo(prestamo)
+        if parametros is not None:
+            parametros_por_empresa.setdefault(empleado.empresa_id, {})[prestamo.id] = parametros
+    tablas: Dict[str, Any] = {}
+    for empresa, parametros in parametros_por_empresa.items():
+        tablas.update(generar_tablas_amortizacion(parametros, config=_obtener_config_default(empresa)))
+
+    filas = []
+    for prestamo, empleado in results:
+        pendientes = [cuota for cuota in tablas.get(prestamo.id, []) if cuota.fecha_estimada > fecha_corte]
+        proxima = pendientes[0] if pendientes else None
+        filas.append(
+            {
+                "Código Empleado": empleado.codigo_empleado,
+                "Nombre": f"{empleado.primer_nombre} {empleado.primer_apellido}",
+                "Monto Aprobado": float(prestamo.monto_aprobado or prestamo.monto_solicitado or 0),
+                "Saldo Pendiente": float(prestamo.saldo_pendiente),
+                "Tasa Interés": float(prestamo.tasa_interes or 0),
+                "Cuotas Pactadas": prestamo.cuotas_pactadas or 0,
+                "Cuotas Pendientes": len(pendientes),
+                "Próxima Cuota": proxima.fecha_estimada.isoformat() if proxima else "",
+                "Monto Próxima Cuota": float(proxima.cuota_total) if proxima else 0.0,
+                "Interés Programado Pendiente": float(sum(cuota.interes for cuota in pendientes)),
+            }
+        )
+    return filas
+
+
 # ============================================================================
 # Report Metadata
 # ============================================================================
@@ -545,6 +612,16 @@ SYSTEM_REPORT_METADATA: Dict[str, Dict[str, Any]] = {
             {"name": "fecha_fin", "type": "date", "required": True},
         ],
     },
+    "loan_portfolio": {
+        "name": "Cartera de Préstamos",
+        "description": "Préstamos con saldo pendiente y sus cuotas programadas por vencer",
+        "category": "loan",
+        "base_entity": "Adelanto",
+        "parameters": [
+            {"name": "empresa_id", "type": "string", "required": False},
+            {"name": "fecha_corte", "type": "date", "required": False},
+        ],
+    },
 }
 
 
@@ -14,7 +14,7 @@ from __future__ import annotations
 from datetime import date
 from decimal import Decimal, ROUND_HALF_UP, ROUND_UP, ROUND_DOWN
 from types import SimpleNamespace
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, Iterable, cast
 
 # <-------------------------------------------------------------------------> #
 # Third party libraries
@@ -33,13 +33,26 @@ if TYPE_CHECKING:
         Planilla,
         VacationPolicy,
         VacationAccount,
+        VacationLedger,
+        VacationNovelty,
         NominaEmpleado,
+        NominaNovedad,
         ConfiguracionCalculos,
     )
 
 
+# Keep IN (...) lists well below the bind parameter limits of every supported backend.
+LOTE_CHUNK_SIZE = 500
+
+
 class VacationService:
-    """Service for vacation accrual and usage during payroll execution."""
+    """Service for vacation accrual and usage during payroll execution.
+
+    A service can be used for one employee at a time, querying as it goes, or
+    for a whole planilla: ``preparar_lote`` then loads accounts, policies,
+    vacation novelties and existing ledger entries for every employee in a few
+    set-based queries, and ledger rows are written in one flush.
+    """
 
     ACCRUAL_PRECISION = Decimal("0.01")
     ROUNDING_RULES = {
@@ -73,6 +86,15 @@ class VacationService:
         self.periodo_fin = periodo_fin
         self.snapshot = snapshot
         self.apply_side_effects = apply_side_effects
+        # Planilla-level batch state loaded by preparar_lote(); None means "query per employee".
+        self._empleados_planilla: frozenset[str] | None = None
+        self._cuentas_por_empleado: dict[str, list[VacationAccount]] | None = None
+        self._empleados_con_descanso: frozenset[str] | None = None
+        self._novedades_por_empleado: dict[str, list[NominaNovedad]] | None = None
+        self._vacation_novelties: dict[str, VacationNovelty] = {}
+        self._usos_registrados: set[tuple[str, str]] | None = None
+        self._acumulaciones_registradas: dict[tuple[str, str], str] | None = None
+        self._cuentas_bloqueadas: dict[str, VacationAccount] = {}
         if self.periodo_inicio and self.periodo_fin and self.periodo_inicio > self.periodo_fin:
             raise ValidationError(f"Período inválido: inicio {self.periodo_inicio} posterior a fin {self.periodo_fin}.")
 
@@ -190,19 +212,195 @@ class VacationService:
         )
 
     def _obtener_balance(self, account: VacationAccount) -> Decimal:
-        from coati_payroll.model import db, VacationLedger
+        """Return the balance maintained on the account, without summing the ledger."""
+        return self._quantize_amount(Decimal(str(account.current_balance or 0)))
+
+    def _bloquear_cuenta(self, account: VacationAccount) -> VacationAccount:
+        """Lock the account row and reload its maintained balance from the database.
+
+        Accounts are locked once per service: later entries build on the balance
+        already held in memory.
+        """
+        from coati_payroll.model import db, VacationAccount
+
+        locked = self._cuentas_bloqueadas.get(account.id)
+        if locked is None:
+            locked = db.session.execute(
+                db.select(VacationAccount)
+                .filter(VacationAccount.id == account.id)
+                .with_for_update()
+                .execution_options(populate_existing=True)
+            ).scalar_one()
+            self._cuentas_bloqueadas[account.id] = locked
+        return locked
+
+    def _registrar_asiento(self, account: VacationAccount, ledger_entry: VacationLedger) -> Decimal:
+        """Apply a new ledger entry to the account balance and return the balance after it."""
+        return registrar_asiento(account, ledger_entry)
+
+    def preparar_lote(
+        self, empleados: Iterable[Empleado], nomina_empleado_ids: Iterable[str] | None = None
+    ) -> "VacationService":
+        """Load the vacation data of every employee of a planilla run in set-based queries.
+
+        After this call, planilla membership, account and policy resolution,
+        vacation-leave checks, vacation novelties and existing ledger entries
+        are answered from memory instead of several queries per employee. When
+        side effects are applied, every resolved account is locked up front.
+
+        Args:
+            empleados: Employees that will be processed.
+            nomina_empleado_ids: NominaEmpleado IDs of the run, used to detect
+                accruals already applied; omit to check them per employee.
+
+        Returns:
+            This service, for chaining.
+        """
+        from collections import defaultdict
+
+        from sqlalchemy.orm import contains_eager
+
+        from coati_payroll.model import (
+            db,
+            NominaNovedad,
+            PlanillaEmpleado,
+            VacationAccount,
+            VacationLedger,
+            VacationNovelty,
+            VacationPolicy,
+        )
 
-        balance = db.session.execute(
-            db.select(db.func.coalesce(db.func.sum(VacationLedger.quantity), 0)).filter(
-                VacationLedger.account_id == account.id
+        if not self.planilla:
+            return self
+
+        ids = sorted({empleado.id for empleado in empleados})
+        chunks = [ids[inicio : inicio + LOTE_CHUNK_SIZE] for inicio in range(0, len(ids), LOTE_CHUNK_SIZE)]
+
+        miembros: set[str] = set()
+        cuentas: dict[str, list[VacationAccount]] = defaultdict(list)
+        con_descanso: set[str] = set()
+        novedades: dict[str, list[NominaNovedad]] = defaultdict(list)
+        snapshot_novelty_ids = (self.snapshot or {}).get("vacation_novelty_ids")
+        for chunk in chunks:
+            miembros.update(
+                db.session.execute(
+                    db.select(PlanillaEmpleado.empleado_id).filter(
+                        PlanillaEmpleado.planilla_id == self.planilla.id,
+                        PlanillaEmpleado.empleado_id.in_(chunk),
+                        PlanillaEmpleado.activo.is_(True),
+                    )
+                ).scalars()
+            )
+
+            # Accounts and policies in one joined query; scopes are resolved in memory.
+            stmt = (
+                db.select(VacationAccount)
+                .join(VacationAccount.policy)
+                .options(contains_eager(VacationAccount.policy))
+                .filter(
+                    VacationAccount.empleado_id.in_(chunk),
+                    VacationAccount.activo.is_(True),
+                    VacationPolicy.activo.is_(True),
+                )
+            )
+            if self.apply_side_effects:
+                stmt = stmt.with_for_update(of=VacationAccount).execution_options(populate_existing=True)
+            for account in db.session.execute(stmt).scalars().all():
+                cuentas[account.empleado_id].append(account)
+                if self.apply_side_effects:
+                    self._cuentas_bloqueadas[account.id] = account
+
+            con_descanso.update(
+                db.session.execute(
+                    db.select(NominaNovedad.empleado_id)
+                    .filter(
+                        NominaNovedad.empleado_id.in_(chunk),
+                        NominaNovedad.es_descanso_vacaciones.is_(True),
+                        NominaNovedad.fecha_novedad >= self.periodo_inicio,
+                        NominaNovedad.fecha_novedad <= self.periodo_fin,
+                    )
+                    .distinct()
+                ).scalars()
+            )
+
+            if snapshot_novelty_ids:
+                stmt = db.select(NominaNovedad).filter(
+                    NominaNovedad.vacation_novelty_id.in_(snapshot_novelty_ids),
+                    NominaNovedad.empleado_id.in_(chunk),
+                )
+            else:
+                stmt = (
+                    db.select(NominaNovedad)
+                    .join(PlanillaEmpleado, PlanillaEmpleado.empleado_id == NominaNovedad.empleado_id)
+                    .filter(
+                        PlanillaEmpleado.planilla_id == self.planilla.id,
+                        PlanillaEmpleado.activo.is_(True),
+                        NominaNovedad.empleado_id.in_(chunk),
+                        NominaNovedad.es_descanso_vacaciones.is_(True),
+                        NominaNovedad.fecha_novedad >= self.periodo_inicio,
+                        NominaNovedad.fecha_novedad <= self.periodo_fin,
+                    )
+                )
+            if self.apply_side_effects:
+                stmt = stmt.with_for_update()
+            for nomina_novedad in db.session.execute(stmt).scalars().all():
+                novedades[nomina_novedad.empleado_id].append(nomina_novedad)
+
+        novelty_ids = sorted(
+            {
+                nomina_novedad.vacation_novelty_id
+                for lista in novedades.values()
+                for nomina_novedad in lista
+                if nomina_novedad.vacation_novelty_id
+            }
+        )
+        vacation_novelties: dict[str, VacationNovelty] = {}
+        usos: set[tuple[str, str]] = set()
+        for inicio in range(0, len(novelty_ids), LOTE_CHUNK_SIZE):
+            chunk = novelty_ids[inicio : inicio + LOTE_CHUNK_SIZE]
+            stmt = db.select(VacationNovelty).filter(VacationNovelty.id.in_(chunk))
+            if self.apply_side_effects:
+                stmt = stmt.with_for_update()
+            vacation_novelties.update((vac.id, vac) for vac in db.session.execute(stmt).scalars().all())
+            usos.update(
+                (account_id, reference_id)
+                for account_id, reference_id in db.session.execute(
+                    db.select(VacationLedger.account_id, VacationLedger.reference_id).filter(
+                        VacationLedger.entry_type == VacationLedgerType.USAGE,
+                        VacationLedger.source == "novelty",
+                        VacationLedger.reference_type == "vacation_novelty",
+                        VacationLedger.reference_id.in_(chunk),
+                    )
+                ).all()
             )
-        ).scalar_one()
-        return self._quantize_amount(Decimal(str(balance)))
 
-    def _recalcular_balance(self, account: VacationAccount) -> Decimal:
-        balance_decimal = self._obtener_balance(account)
-        account.current_balance = balance_decimal
-        return balance_decimal
+        if nomina_empleado_ids is not None:
+            referencias = sorted(set(nomina_empleado_ids))
+            acumulaciones: dict[tuple[str, str], str] = {}
+            for inicio in range(0, len(referencias), LOTE_CHUNK_SIZE):
+                for ledger_id, account_id, reference_id in db.session.execute(
+                    db.select(VacationLedger.id, VacationLedger.account_id, VacationLedger.reference_id).filter(
+                        VacationLedger.entry_type == VacationLedgerType.ACCRUAL,
+                        VacationLedger.source == "payroll",
+                        VacationLedger.reference_type == "nomina_empleado",
+                        VacationLedger.reference_id.in_(referencias[inicio : inicio + LOTE_CHUNK_SIZE]),
+                    )
+                ).all():
+                    acumulaciones.setdefault((account_id, reference_id), ledger_id)
+            self._acumulaciones_registradas = acumulaciones
+
+        self._empleados_planilla = frozenset(miembros)
+        self._cuentas_por_empleado = dict(cuentas)
+        self._empleados_con_descanso = frozenset(con_descanso)
+        self._novedades_por_empleado = dict(novedades)
+        self._vacation_novelties = vacation_novelties
+        self._usos_registrados = usos
+        return self
+
+    def _agregar_cuenta_precargada(self, account: VacationAccount) -> None:
+        """Make an account created or reactivated during a batch visible to later lookups."""
+        if self._cuentas_por_empleado is not None:
+            self._cuentas_por_empleado.setdefault(account.empleado_id, []).append(account)
 
     def _resolver_cuenta_vacaciones(self, empleado: Empleado) -> tuple[VacationAccount | None, str | None]:
         from coati_payroll.model import db, VacationAccount, VacationPolicy
@@ -219,18 +417,23 @@ class VacationService:
             VacationPolicy.activo.is_(True),
         ]
 
+        precargadas = None if self._cuentas_por_empleado is None else self._cuentas_por_empleado.get(empleado.id, [])
+
         # Strong relation: if payroll has an explicit vacation policy binding, use only that rule.
         if self.planilla.vacation_policy_id:
-            bound_accounts = (
-                db.session.execute(
-                    db.select(VacationAccount)
-                    .join(VacationAccount.policy)
-                    .filter(*filtros_base)
-                    .filter(VacationPolicy.id == self.planilla.vacation_policy_id)
+            if precargadas is not None:
+                bound_accounts = [a for a in precargadas if a.policy_id == self.planilla.vacation_policy_id]
+            else:
+                bound_accounts = (
+                    db.session.execute(
+                        db.select(VacationAccount)
+                        .join(VacationAccount.policy)
+                        .filter(*filtros_base)
+                        .filter(VacationPolicy.id == self.planilla.vacation_policy_id)
+                    )
+                    .scalars()
+                    .all()
                 )
-                .scalars()
-                .all()
-            )
             if len(bound_accounts) > 1:
                 raise ValidationError(
                     f"Más de una cuenta de vacaciones encontrada para empleado {empleado.codigo_empleado} "
@@ -277,6 +480,7 @@ class VacationService:
                     if existing_account:
                         if not existing_account.activo:
                             existing_account.activo = True
+                        self._agregar_cuenta_precargada(existing_account)
                         return existing_account, "planilla_bound_reactivated"
 
                     account = VacationAccount(
@@ -287,6 +491,7 @@ class VacationService:
                     )
                     db.session.add(account)
                     db.session.flush()
+                    self._agregar_cuenta_precargada(account)
                     log.info(
                         "Vacation account auto-created for employee %s with policy %s (planilla=%s).",
                         empleado.codigo_empleado,
@@ -296,30 +501,47 @@ class VacationService:
                     return account, "planilla_bound_auto_created"
             return None, None
 
+        planilla_id = self.planilla.id
+        empresa_id = self.planilla.empresa_id
+        # (name, SQL filters, equivalent in-memory check for preloaded accounts)
         scopes = [
             (
                 "planilla",
-                VacationPolicy.planilla_id == self.planilla.id,
-                db.or_(VacationPolicy.empresa_id.is_(None), VacationPolicy.empresa_id == self.planilla.empresa_id),
+                (
+                    VacationPolicy.planilla_id == planilla_id,
+                    db.or_(VacationPolicy.empresa_id.is_(None), VacationPolicy.empresa_id == empresa_id),
+                ),
+                lambda policy: policy.planilla_id == planilla_id
+                and (policy.empresa_id is None or (empresa_id is not None and policy.empresa_id == empresa_id)),
+            ),
+            (
+                "empresa",
+                (VacationPolicy.planilla_id.is_(None), VacationPolicy.empresa_id == empresa_id),
+                lambda policy: policy.planilla_id is None
+                and empresa_id is not None
+                and policy.empresa_id == empresa_id,
             ),
-            ("empresa", VacationPolicy.planilla_id.is_(None), VacationPolicy.empresa_id == self.planilla.empresa_id),
             (
                 "global",
-                VacationPolicy.planilla_id.is_(None),
-                VacationPolicy.empresa_id.is_(None),
+                (VacationPolicy.planilla_id.is_(None), VacationPolicy.empresa_id.is_(None)),
+                lambda policy: policy.planilla_id is None and policy.empresa_id is None,
             ),
         ]
 
-        for scope in scopes:
-            scope_name = scope[0]
-            scope_filters = scope[1:]
-            accounts = (
-                db.session.execute(
-                    db.select(VacationAccount).join(VacationAccount.policy).filter(*filtros_base).filter(*scope_filters)
+        for scope_name, scope_filters, en_scope in scopes:
+            if precargadas is not None:
+                accounts = [a for a in precargadas if en_scope(a.policy)]
+            else:
+                accounts = (
+                    db.session.execute(
+                        db.select(VacationAccount)
+                        .join(VacationAccount.policy)
+                        .filter(*filtros_base)
+                        .filter(*scope_filters)
+                    )
+                    .scalars()
+                    .all()
                 )
-                .scalars()
-                .all()
-            )
             if len(accounts) > 1:
                 raise ValidationError(
                     f"Más de una cuenta/política de vacaciones encontrada para empleado {empleado.codigo_empleado} "
@@ -347,6 +569,13 @@ class VacationService:
         if not self.planilla:
             raise ValidationError("No hay planilla activa para validar el empleado.")
 
+        if self._empleados_planilla is not None:
+            if empleado.id not in self._empleados_planilla:
+                raise ValidationError(
+                    f"Empleado {empleado.codigo_empleado} no está asignado a la planilla {self.planilla.id}."
+                )
+            return
+
         existe = db.session.execute(
             db.select(db.func.count())
             .select_from(PlanillaEmpleado)
@@ -375,6 +604,9 @@ class VacationService:
     def _empleado_tiene_vacaciones_en_periodo(self, empleado: Empleado) -> bool:
         from coati_payroll.model import db, NominaNovedad
 
+        if self._empleados_con_descanso is not None:
+            return empleado.id in self._empleados_con_descanso
+
         existe = db.session.execute(
             db.select(db.func.count())
             .select_from(NominaNovedad)
@@ -387,6 +619,43 @@ class VacationService:
         ).scalar_one()
         return existe > 0
 
+    def _acumulacion_registrada(self, account: VacationAccount, nomina_empleado: NominaEmpleado) -> str | None:
+        """Return the ledger ID of the payroll accrual already applied to this account and nomina, if any."""
+        from coati_payroll.model import db, VacationLedger
+
+        if self._acumulaciones_registradas is not None:
+            return self._acumulaciones_registradas.get((account.id, nomina_empleado.id))
+
+        return db.session.execute(
+            db.select(VacationLedger.id).filter(
+                VacationLedger.entry_type == VacationLedgerType.ACCRUAL,
+                VacationLedger.source == "payroll",
+                VacationLedger.reference_type == "nomina_empleado",
+                VacationLedger.reference_id == nomina_empleado.id,
+                VacationLedger.account_id == account.id,
+            )
+        ).scalar()
+
+    def _uso_registrado(self, account: VacationAccount, vac_novelty: VacationNovelty) -> bool:
+        """Return True when the usage of a vacation novelty is already in the account's ledger."""
+        from coati_payroll.model import db, VacationLedger
+
+        if self._usos_registrados is not None and vac_novelty.id in self._vacation_novelties:
+            return (account.id, vac_novelty.id) in self._usos_registrados
+
+        return (
+            db.session.execute(
+                db.select(VacationLedger.id).filter(
+                    VacationLedger.entry_type == VacationLedgerType.USAGE,
+                    VacationLedger.source == "novelty",
+                    VacationLedger.reference_type == "vacation_novelty",
+                    VacationLedger.reference_id == vac_novelty.id,
+                    VacationLedger.account_id == account.id,
+                )
+            ).scalar()
+            is not None
+        )
+
     def obtener_resumen_vacaciones(self, empleado: Empleado) -> dict[str, Decimal | str] | None:
         self._validar_empleado_en_planilla(empleado)
         account, _scope = self._resolver_cuenta_vacaciones(empleado)
@@ -414,7 +683,7 @@ class VacationService:
         Returns:
             The amount of vacation accrued
         """
-        from coati_payroll.model import db, VacationAccount, VacationLedger
+        from coati_payroll.model import db, generador_de_codigos_unicos, VacationLedger
 
         self._validar_empleado_en_planilla(empleado)
 
@@ -441,25 +710,13 @@ class VacationService:
             )
             return Decimal("0.00")
 
-        existing_entry = (
-            db.session.execute(
-                db.select(VacationLedger).filter(
-                    VacationLedger.entry_type == VacationLedgerType.ACCRUAL,
-                    VacationLedger.source == "payroll",
-                    VacationLedger.reference_type == "nomina_empleado",
-                    VacationLedger.reference_id == nomina_empleado.id,
-                    VacationLedger.account_id == account.id,
-                )
-            )
-            .scalars()
-            .first()
-        )
-        if existing_entry:
+        existing_entry_id = self._acumulacion_registrada(account, nomina_empleado)
+        if existing_entry_id:
             log.info(
                 "Accrual already applied for employee %s on nomina %s (ledger=%s).",
                 empleado.codigo_empleado,
                 nomina_empleado.id,
-                existing_entry.id,
+                existing_entry_id,
             )
             return Decimal("0.00")
 
@@ -482,12 +739,8 @@ class VacationService:
             return Decimal("0.00")
 
         if self.apply_side_effects:
-            account = db.session.execute(
-                db.select(VacationAccount).filter(VacationAccount.id == account.id).with_for_update()
-            ).scalar_one()
-            balance_before = self._recalcular_balance(account)
-        else:
-            balance_before = self._obtener_balance(account)
+            account = self._bloquear_cuenta(account)
+        balance_before = self._obtener_balance(account)
 
         # Check max balance limit
         if policy.max_balance:
@@ -523,6 +776,7 @@ class VacationService:
 
         # Create ledger entry for accrual
         ledger_entry = VacationLedger(
+            id=generador_de_codigos_unicos(),
             account_id=account.id,
             empleado_id=empleado.id,
             fecha=self.periodo_fin,
@@ -535,15 +789,15 @@ class VacationService:
             creado_por=usuario,
         )
 
-        # Update account balance (derived from ledger)
+        # Update account balance (maintained together with the ledger)
         account.last_accrual_date = self.periodo_fin
         account.modificado_por = usuario
 
+        balance_after = self._registrar_asiento(account, ledger_entry)
+        # Inserted with the next flush, together with the rest of the run's ledger rows
         db.session.add(ledger_entry)
-        db.session.flush()
-
-        balance_after = self._recalcular_balance(account)
-        ledger_entry.balance_after = balance_after
+        if self._acumulaciones_registradas is not None:
+            self._acumulaciones_registradas[(account.id, nomina_empleado.id)] = ledger_entry.id
 
         log.info(
             "Accrued %s %s vacation for employee %s policy=%s scope=%s " "balance_before=%s balance_after=%s",
@@ -734,7 +988,7 @@ class VacationService:
             Total vacation days/hours used
         """
         from coati_payroll.enums import VacacionEstado
-        from coati_payroll.model import db, VacationNovelty, VacationLedger, NominaNovedad, VacationAccount
+        from coati_payroll.model import db, generador_de_codigos_unicos, VacationNovelty, VacationLedger, NominaNovedad
 
         total_usado = Decimal("0.00")
 
@@ -744,7 +998,9 @@ class VacationService:
             log.debug("Ignoring novedades parameter for vacation processing; using audit-safe sources.")
 
         # Query vacation-related novedades for this employee in this period
-        if self.snapshot and self.snapshot.get("vacation_novelty_ids"):
+        if self._novedades_por_empleado is not None:
+            nomina_novedades = self._novedades_por_empleado.get(empleado.id, [])
+        elif self.snapshot and self.snapshot.get("vacation_novelty_ids"):
             vacation_novelty_ids = self.snapshot["vacation_novelty_ids"]
             stmt = db.select(NominaNovedad).filter(
                 NominaNovedad.vacation_novelty_id.in_(vacation_novelty_ids),
@@ -777,7 +1033,9 @@ class VacationService:
             if not nomina_novedad.vacation_novelty_id:
                 continue
 
-            if self.apply_side_effects:
+            if nomina_novedad.vacation_novelty_id in self._vacation_novelties:
+                vac_novelty = self._vacation_novelties[nomina_novedad.vacation_novelty_id]
+            elif self.apply_side_effects:
                 vac_novelty = (
                     db.session.execute(
                         db.select(VacationNovelty)
@@ -798,20 +1056,7 @@ class VacationService:
             self._validar_policy(policy)
 
             # Skip if already processed (has ledger entry) or ledger already exists
-            existing_usage = (
-                db.session.execute(
-                    db.select(VacationLedger).filter(
-                        VacationLedger.entry_type == VacationLedgerType.USAGE,
-                        VacationLedger.source == "novelty",
-                        VacationLedger.reference_type == "vacation_novelty",
-                        VacationLedger.reference_id == vac_novelty.id,
-                        VacationLedger.account_id == account.id,
-                    )
-                )
-                .scalars()
-                .first()
-            )
-            if vac_novelty.ledger_entry_id or existing_usage:
+            if vac_novelty.ledger_entry_id or self._uso_registrado(account, vac_novelty):
                 continue
 
             if vac_novelty.start_date > vac_novelty.end_date:
@@ -840,12 +1085,8 @@ class VacationService:
                 )
 
             if self.apply_side_effects:
-                account = db.session.execute(
-                    db.select(VacationAccount).filter(VacationAccount.id == account.id).with_for_update()
-                ).scalar_one()
-                balance_before = self._recalcular_balance(account)
-            else:
-                balance_before = self._obtener_balance(account)
+                account = self._bloquear_cuenta(account)
+            balance_before = self._obtener_balance(account)
 
             if not policy.allow_negative and balance_before - units < 0:
                 raise NominaEngineError(
@@ -866,6 +1107,7 @@ class VacationService:
 
             # Create ledger entry for usage
             ledger_entry = VacationLedger(
+                id=generador_de_codigos_unicos(),
                 account_id=account.id,
                 empleado_id=empleado.id,
                 fecha=self.periodo_fin,
@@ -880,15 +1122,16 @@ class VacationService:
 
             account.modificado_por = usuario
 
+            # Inserted with the next flush, together with the rest of the run's ledger rows
             db.session.add(ledger_entry)
-            db.session.flush()
+            if self._usos_registrados is not None:
+                self._usos_registrados.add((account.id, vac_novelty.id))
 
-            # Link ledger entry to novelty (after flush for real ID)
+            # Link ledger entry to novelty (its ID is assigned up front)
             vac_novelty.ledger_entry_id = ledger_entry.id
             vac_novelty.estado = VacacionEstado.DISFRUTADO
 
-            balance_after = self._recalcular_balance(account)
-            ledger_entry.balance_after = balance_after
+            balance_after = self._registrar_asiento(account, ledger_entry)
 
             total_usado = total_usado + abs(units)
 
@@ -902,3 +1145,79 @@ class VacationService:
             )
 
         return total_usado
+
+
+def registrar_asiento(account: VacationAccount, ledger_entry: VacationLedger) -> Decimal:
+    """Apply a new ledger entry to the account's maintained balance and return the balance after it.
+
+    Adds the entry's quantity to ``current_balance``, bumps ``ledger_version``
+    and stores the resulting balance on the entry. Every ledger mutation goes
+    through here so the maintained balance stays in step with the ledger; the
+    caller adds the entry to the session.
+    """
+    account.current_balance = Decimal(str(account.current_balance or 0)) + Decimal(str(ledger_entry.quantity))
+    account.ledger_version = (account.ledger_version or 0) + 1
+    balance_after = Decimal(str(account.current_balance)).quantize(
+        VacationService.ACCRUAL_PRECISION, rounding=ROUND_HALF_UP
+    )
+    ledger_entry.balance_after = balance_after
+    return balance_after
+
+
+def reconciliar_saldos_vacaciones(
+    account_ids: Iterable[str] | None = None, corregir: bool = True
+) -> list[dict[str, Any]]:
+    """Verify maintained vacation balances against the ledger.
+
+    ``VacationAccount.current_balance`` is updated incrementally with every
+    ledger entry and ``ledger_version`` counts the entries it reflects. This
+    re-sums the ledger in one grouped query and reports accounts whose balance
+    or version drifted, e.g. after ledger rows were written or deleted outside
+    ``VacationService``.
+
+    Args:
+        account_ids: Accounts to check; every account when None.
+        corregir: Rewrite current_balance and ledger_version of drifted accounts.
+
+    Returns:
+        One dictionary per drifted account with the maintained and ledger values.
+    """
+    from coati_payroll.model import db, VacationAccount, VacationLedger
+
+    ledger_query = db.select(
+        VacationLedger.account_id,
+        db.func.coalesce(db.func.sum(VacationLedger.quantity), 0),
+        db.func.count(VacationLedger.id),
+    ).group_by(VacationLedger.account_id)
+    accounts_query = db.select(VacationAccount)
+    if account_ids is not None:
+        ids = list(account_ids)
+        ledger_query = ledger_query.filter(VacationLedger.account_id.in_(ids))
+        accounts_query = accounts_query.filter(VacationAccount.id.in_(ids))
+
+    escala = Decimal("0.0001")
+    ledger = {
+        account_id: (Decimal(str(total)).quantize(escala), entries)
+        for account_id, total, entries in db.session.execute(ledger_query).all()
+    }
+
+    diferencias: list[dict[str, Any]] = []
+    for account in db.session.execute(accounts_query).scalars().all():
+        total, entries = ledger.get(account.id, (Decimal("0.0000"), 0))
+        balance = Decimal(str(account.current_balance or 0)).quantize(escala)
+        if balance == total and (account.ledger_version or 0) == entries:
+            continue
+        diferencias.append(
+            {
+                "account_id": account.id,
+                "empleado_id": account.empleado_id,
+                "current_balance": balance,
+                "ledger_balance": total,
+                "ledger_version": account.ledger_version or 0,
+                "ledger_entries": entries,
+            }
+        )
+        if corregir:
+            account.current_balance = total
+            account.ledger_version = entries
+    return diferencias
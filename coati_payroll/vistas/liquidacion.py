@@ -7,15 +7,21 @@ from __future__ import annotations
 
 from datetime import date
 
-from flask import Blueprint, flash, redirect, render_template, request, send_file, url_for
+from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, send_file, url_for
 from flask_login import login_required, current_user
 
 from coati_payroll.enums import LiquidacionEstado
 from coati_payroll.i18n import _
-from coati_payroll.model import Liquidacion, LiquidacionConcepto, Empleado, db
+from coati_payroll.log import log
+from coati_payroll.model import Liquidacion, LiquidacionConcepto, LiquidacionLote, Empleado, db
 from coati_payroll.model import PlanillaEmpleado
 from coati_payroll.rbac import require_read_access, require_write_access
-from coati_payroll.liquidacion_engine import ejecutar_liquidacion, recalcular_liquidacion
+from coati_payroll.liquidacion_engine import (
+    crear_lote_liquidaciones,
+    ejecutar_liquidacion,
+    procesar_lote_liquidaciones,
+    recalcular_liquidacion,
+)
 from coati_payroll.vistas.planilla.helpers import check_openpyxl_available
 from coati_payroll.vistas.planilla.services import ExportService
 
@@ -23,6 +29,7 @@ liquidacion_bp = Blueprint("liquidacion", __name__, url_prefix="/liquidaciones")
 
 # Constants
 ROUTE_LIQUIDACION_VER = "liquidacion.ver"
+ROUTE_LOTE_VER = "liquidacion.ver_lote"
 
 
 @liquidacion_bp.route("/")
@@ -134,6 +141,124 @@ def nueva():
     )
 
 
+@liquidacion_bp.route("/lotes/nuevo", methods=["GET", "POST"])
+@login_required
+@require_write_access()
+def nuevo_lote():
+    """Create a batch of liquidaciones for several employees (mass termination)."""
+    empleados = (
+        db.session.execute(db.select(Empleado).filter_by(activo=True).order_by(Empleado.primer_apellido))
+        .scalars()
+        .all()
+    )
+    conceptos = (
+        db.session.execute(db.select(LiquidacionConcepto).filter_by(activo=True).order_by(LiquidacionConcepto.nombre))
+        .scalars()
+        .all()
+    )
+
+    if request.method == "POST":
+        empleado_ids = [empleado_id for empleado_id in request.form.getlist("empleado_ids") if empleado_id]
+        concepto_id = request.form.get("concepto_id") or None
+        fecha_calculo_str = request.form.get("fecha_calculo")
+
+        if not empleado_ids:
+            flash(_("Seleccione al menos un empleado."), "error")
+            return redirect(url_for("liquidacion.nuevo_lote"))
+
+        try:
+            fecha_calculo = date.fromisoformat(fecha_calculo_str) if fecha_calculo_str else date.today()
+        except ValueError:
+            flash(_("Formato de fecha inválido."), "error")
+            return redirect(url_for("liquidacion.nuevo_lote"))
+
+        lote = crear_lote_liquidaciones(
+            empleado_ids,
+            concepto_id=concepto_id,
+            fecha_calculo=fecha_calculo,
+            usuario=getattr(current_user, "usuario", None),
+        )
+
+        if _encolar_lote(lote):
+            flash(_("Liquidaciones en lote enviadas a procesamiento en segundo plano."), "info")
+        else:
+            resultado = procesar_lote_liquidaciones(lote.id)
+            if resultado is not None and resultado.error:
+                flash(_("Error al calcular las liquidaciones en lote: %(error)s", error=resultado.error), "error")
+            else:
+                flash(_("Liquidaciones en lote calculadas."), "success")
+        return redirect(url_for(ROUTE_LOTE_VER, lote_id=lote.id))
+
+    return render_template(
+        "modules/liquidacion/lote_nuevo.html", empleados=empleados, conceptos=conceptos, fecha_calculo=date.today()
+    )
+
+
+@liquidacion_bp.route("/lotes/<lote_id>")
+@login_required
+@require_read_access()
+def ver_lote(lote_id: str):
+    """Show the progress and results of a batch of liquidaciones."""
+    lote = db.get_or_404(LiquidacionLote, lote_id)
+    liquidaciones = (
+        db.session.execute(
+            db.select(Liquidacion)
+            .join(Liquidacion.empleado)
+            .filter(Liquidacion.lote_id == lote.id)
+            .order_by(Empleado.primer_apellido, Empleado.primer_nombre)
+        )
+        .scalars()
+        .all()
+    )
+    return render_template("modules/liquidacion/lote.html", lote=lote, liquidaciones=liquidaciones)
+
+
+@liquidacion_bp.route("/lotes/<lote_id>/progreso")
+@login_required
+@require_read_access()
+def progreso_lote(lote_id: str):
+    """API endpoint to check the progress of a batch of liquidaciones."""
+    lote = db.get_or_404(LiquidacionLote, lote_id)
+    return jsonify(
+        {
+            "estado": lote.estado,
+            "total_empleados": lote.total_empleados or 0,
+            "empleados_procesados": lote.empleados_procesados or 0,
+            "empleados_con_error": lote.empleados_con_error or 0,
+            "progreso_porcentaje": _progreso_porcentaje(lote),
+            "errores": lote.errores or {},
+        }
+    )
+
+
+def _progreso_porcentaje(lote: LiquidacionLote) -> int:
+    if not lote.total_empleados:
+        return 0
+    terminados = (lote.empleados_procesados or 0) + (lote.empleados_con_error or 0)
+    return int(terminados / lote.total_empleados * 100)
+
+
+def _encolar_lote(lote: LiquidacionLote) -> bool:
+    """Enqueue the batch on the background queue; False when it must run in this request."""
+    from coati_payroll.queue import get_queue_driver
+    from coati_payroll.queue.drivers.dramatiq_driver import DramatiqDriver
+
+    if not current_app.config.get("QUEUE_ENABLED", False):
+        return False
+    try:
+        queue = get_queue_driver()
+        if not isinstance(queue, DramatiqDriver) or not queue.is_available():
+            return False
+        queue.enqueue("process_liquidation_batch", lote_id=lote.id)
+        return True
+    except Exception as e:
+        log.error(
+            "No se pudo encolar el lote de liquidaciones",
+            extra={"lote_id": lote.id, "error": str(e), "error_type": type(e).__name__},
+        )
+        return False
+
+
 @liquidacion_bp.route("/<liquidacion_id>")
 @login_required
 @require_read_access()
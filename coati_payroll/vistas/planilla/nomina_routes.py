@@ -19,6 +19,7 @@ from coati_payroll.model import (
     NominaDetalle,
     NominaNovedad,
     NominaProgress,
+    NominaProgressEvento,
     ComprobanteContable,
     ComprobanteContableLinea,
     Empleado,
@@ -44,6 +45,8 @@ ROUTE_EJECUTAR_NOMINA = "planilla.ejecutar_nomina"
 ROUTE_VER_NOMINA = "planilla.ver_nomina"
 ROUTE_LISTAR_NOMINAS = "planilla.listar_nominas"
 ERROR_NOMINA_NO_PERTENECE = "La nómina no pertenece a esta planilla."
+# Maximum progress events returned by one poll of the progress endpoint
+PROGRESO_EVENTOS_LIMITE = 200
 
 
 @planilla_bp.route("/<planilla_id>/ejecutar", methods=["GET", "POST"])
@@ -716,6 +719,8 @@ def progreso_nomina(planilla_id: str, nomina_id: str):
 
     progress = _get_nomina_progress_snapshot(nomina_id)
     snapshot = progress or nomina
+    desde = request.args.get("desde", default=0, type=int)
+    eventos = _get_nomina_progress_events(nomina_id, desde) if progress else []
     return jsonify(
         {
             "estado": nomina.estado,
@@ -731,6 +736,17 @@ def progreso_nomina(planilla_id: str, nomina_id: str):
             "procesamiento_en_background": nomina.procesamiento_en_background,
             "empleado_actual": snapshot.empleado_actual or "",
             "log_procesamiento": snapshot.log_procesamiento or [],
+            "eventos": [
+                {
+                    "secuencia": evento.secuencia,
+                    "timestamp": evento.timestamp.isoformat() if evento.timestamp else None,
+                    "empleado": evento.empleado,
+                    "status": evento.status,
+                    "message": evento.message,
+                }
+                for evento in eventos
+            ],
+            "cursor": eventos[-1].secuencia if eventos else max(desde, 0),
         }
     )
 
@@ -761,6 +777,27 @@ def _get_nomina_progress_snapshot(nomina_id: str) -> NominaProgress | None:
     return db.session.execute(db.select(NominaProgress).filter(NominaProgress.nomina_id == nomina_id)).scalars().first()
 
 
+def _get_nomina_progress_events(nomina_id: str, desde: int) -> list[NominaProgressEvento]:
+    """Return progress events after the ``desde`` cursor, or the most recent ones for a new client."""
+    query = db.select(NominaProgressEvento).filter(NominaProgressEvento.nomina_id == nomina_id)
+    if desde > 0:
+        return list(
+            db.session.execute(
+                query.filter(NominaProgressEvento.secuencia > desde)
+                .order_by(NominaProgressEvento.secuencia)
+                .limit(PROGRESO_EVENTOS_LIMITE)
+            )
+            .scalars()
+            .all()
+        )
+    recientes = (
+        db.session.execute(query.order_by(NominaProgressEvento.secuencia.desc()).limit(PROGRESO_EVENTOS_LIMITE))
+        .scalars()
+        .all()
+    )
+    return list(reversed(recientes))
+
+
 def _apply_progress_snapshots(nominas: list[Nomina]) -> None:
     if not nominas:
         return
@@ -779,7 +816,9 @@ def _apply_progress_snapshots(nominas: list[Nomina]) -> None:
         nomina.empleados_procesados = progress.empleados_procesados
         nomina.empleados_con_error = progress.empleados_con_error
         nomina.errores_calculo = progress.errores_calculo
-        nomina.log_procesamiento = progress.log_procesamiento
+        if progress.log_procesamiento:
+            # Progress rows written before progress events kept the whole log inline
+            nomina.log_procesamiento = progress.log_procesamiento
         nomina.empleado_actual = progress.empleado_actual
 
 
@@ -1039,10 +1078,14 @@ def _aplicar_vacaciones_nomina(nomina: Nomina, planilla: Planilla, usuario: str
         apply_side_effects=True,
     )
 
+    empleados = []
     for nomina_empleado in nomina_empleados:
         empleado = nomina_empleado.empleado or db.session.get(Empleado, nomina_empleado.empleado_id)
-        if not empleado or not empleado.activo:
-            continue
+        if empleado and empleado.activo:
+            empleados.append((empleado, nomina_empleado))
+    vacation_service.preparar_lote([empleado for empleado, _ne in empleados], nomina_empleado_ids)
+
+    for empleado, nomina_empleado in empleados:
         # Persist accruals and vacation usage only when the payroll is applied.
         vacation_service.acumular_vacaciones_empleado(empleado, nomina_empleado, usuario)
         vacation_service.procesar_novedades_vacaciones(empleado, {}, usuario)
@@ -1130,6 +1173,7 @@ def ver_log_nomina(planilla_id: str, nomina_id: str):
         nomina=nomina,
         log_entries=log_entries,
         comprobante_warnings=comprobante_warnings,
+        perfil=nomina.perfil_ejecucion,
     )
 
 
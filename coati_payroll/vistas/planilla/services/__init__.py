@@ -7,6 +7,7 @@ from coati_payroll.vistas.planilla.services.nomina_service import NominaService
 from coati_payroll.vistas.planilla.services.export_service import ExportService
 from coati_payroll.vistas.planilla.services.novedad_service import NovedadService
 from coati_payroll.vistas.planilla.services.nomina_comparison_service import NominaComparisonService
+from coati_payroll.vistas.planilla.services.nomina_pivot import NominaPivot
 
 __all__ = [
     "PlanillaService",
@@ -14,4 +15,5 @@ __all__ = [
     "ExportService",
     "NovedadService",
     "NominaComparisonService",
+    "NominaPivot",
 ]
@@ -6,12 +6,13 @@ from io import BytesIO
 from typing import Any, cast
 
 from coati_payroll.enums import NominaEstado, TipoDetalle
+from coati_payroll.excel_stream import STREAM_YIELD_PER, StreamingWorkbook
 from coati_payroll.model import (
     db,
     Planilla,
+    Empleado,
     Nomina,
     NominaEmpleado,
-    NominaDetalle,
     Liquidacion,
     LiquidacionDetalle,
     ComprobanteContable,
@@ -19,31 +20,27 @@ from coati_payroll.model import (
 )
 from coati_payroll.vistas.planilla.helpers.excel_helpers import check_openpyxl_available
 from coati_payroll.nomina_engine.services.accounting_voucher_service import AccountingVoucherService
+from coati_payroll.vistas.planilla.services.nomina_pivot import NominaPivot
 
 # Constants
 ERROR_OPENPYXL_NOT_AVAILABLE = "openpyxl no está disponible"
+CONCEPT_COLUMN_TYPES = frozenset(
+    {"income_catalog", "income_extra", "deduction_catalog", "deduction_extra", "benefit_catalog", "benefit_extra"}
+)
 
 
 class ExportService:
     """Service for Excel export operations."""
 
     @staticmethod
-    def _add_traceability_section(ws, row: int, nomina: Nomina) -> int:
-        """Add user traceability section and return next available row."""
-        ws[f"A{row}"] = "TRAZABILIDAD DE USUARIO:"
-        row += 1
-
-        ws[f"A{row}"] = "Creado por:"
-        ws[f"B{row}"] = nomina.generado_por or "N/A"
-        row += 1
-
-        ws[f"A{row}"] = "Aprobado por:"
-        ws[f"B{row}"] = nomina.aprobado_por or "N/A"
-        row += 1
-
-        ws[f"A{row}"] = "Aplicado por:"
-        ws[f"B{row}"] = nomina.aplicado_por or "N/A"
-        return row + 1
+    def _traceability_rows(nomina: Nomina) -> list[list[Any]]:
+        """Rows of the user traceability section."""
+        return [
+            ["TRAZABILIDAD DE USUARIO:"],
+            ["Creado por:", nomina.generado_por or "N/A"],
+            ["Aprobado por:", nomina.aprobado_por or "N/A"],
+            ["Aplicado por:", nomina.aplicado_por or "N/A"],
+        ]
 
     @staticmethod
     def exportar_nomina_excel(planilla: Planilla, nomina: Nomina) -> tuple[BytesIO, str]:
@@ -52,14 +49,7 @@ class ExportService:
         if not openpyxl_classes:
             raise ImportError(ERROR_OPENPYXL_NOT_AVAILABLE)
 
-        Workbook, Font, Alignment, PatternFill, Border, Side = openpyxl_classes
-
-        def _excel_col(col_num: int) -> str:
-            label = ""
-            while col_num > 0:
-                col_num, remainder = divmod(col_num - 1, 26)
-                label = chr(65 + remainder) + label
-            return label
+        _, Font, Alignment, PatternFill, Border, Side = openpyxl_classes
 
         def _unique_label(existing: set[str], preferred: str | None, fallback: str | None, base: str) -> str:
             raw = (preferred or fallback or base or "").strip()
@@ -73,20 +63,6 @@ class ExportService:
             existing.add(candidate)
             return candidate
 
-        nomina_empleados = db.session.execute(db.select(NominaEmpleado).filter_by(nomina_id=nomina.id)).scalars().all()
-        nomina_empleado_ids = [ne.id for ne in nomina_empleados if ne.id]
-
-        detalles: list[NominaDetalle] = []
-        if nomina_empleado_ids:
-            detalles = cast(
-                list[NominaDetalle],
-                db.session.execute(
-                    db.select(NominaDetalle).where(NominaDetalle.nomina_empleado_id.in_(nomina_empleado_ids))
-                )
-                .scalars()
-                .all(),
-            )
-
         percepciones_planilla = cast(list[Any], planilla.planilla_percepciones)
         deducciones_planilla = cast(list[Any], planilla.planilla_deducciones)
         prestaciones_planilla = cast(list[Any], planilla.planilla_prestaciones)
@@ -112,55 +88,31 @@ class ExportService:
         deducciones_config_ids = {assoc.deduccion_id for assoc in deducciones_asociadas if assoc.deduccion_id}
         prestaciones_config_ids = {assoc.prestacion_id for assoc in prestaciones_asociadas if assoc.prestacion_id}
 
-        ingresos_catalogo_by_ne: dict[str, dict[str, float]] = {}
-        deducciones_catalogo_by_ne: dict[str, dict[str, float]] = {}
-        prestaciones_catalogo_by_ne: dict[str, dict[str, float]] = {}
-        ingresos_extra_by_ne: dict[str, dict[str, float]] = {}
-        deducciones_extra_by_ne: dict[str, dict[str, float]] = {}
-        prestaciones_extra_by_ne: dict[str, dict[str, float]] = {}
-        ingresos_extra_labels: dict[str, tuple[str, str]] = {}
-        deducciones_extra_labels: dict[str, tuple[str, str]] = {}
-        prestaciones_extra_labels: dict[str, tuple[str, str]] = {}
-
-        for detalle in detalles:
-            ne_id = detalle.nomina_empleado_id
-            monto = float(detalle.monto or 0)
-
+        def _columna(detalle: Any) -> tuple[str, str] | None:
             if detalle.tipo == TipoDetalle.INGRESO:
-                if detalle.percepcion_id and detalle.percepcion_id in ingresos_config_ids:
-                    bucket = ingresos_catalogo_by_ne.setdefault(ne_id, {})
-                    bucket[detalle.percepcion_id] = bucket.get(detalle.percepcion_id, 0.0) + monto
-                else:
-                    extra_key = (
-                        f"income:{detalle.percepcion_id or ''}:{detalle.codigo or ''}:{detalle.descripcion or ''}"
-                    )
-                    bucket = ingresos_extra_by_ne.setdefault(ne_id, {})
-                    bucket[extra_key] = bucket.get(extra_key, 0.0) + monto
-                    ingresos_extra_labels.setdefault(extra_key, (detalle.descripcion or "", detalle.codigo or ""))
-
+                concept_id, config_ids, prefix = detalle.percepcion_id, ingresos_config_ids, "income"
             elif detalle.tipo == TipoDetalle.DEDUCCION:
-                if detalle.deduccion_id and detalle.deduccion_id in deducciones_config_ids:
-                    bucket = deducciones_catalogo_by_ne.setdefault(ne_id, {})
-                    bucket[detalle.deduccion_id] = bucket.get(detalle.deduccion_id, 0.0) + monto
-                else:
-                    extra_key = (
-                        f"deduction:{detalle.deduccion_id or ''}:{detalle.codigo or ''}:{detalle.descripcion or ''}"
-                    )
-                    bucket = deducciones_extra_by_ne.setdefault(ne_id, {})
-                    bucket[extra_key] = bucket.get(extra_key, 0.0) + monto
-                    deducciones_extra_labels.setdefault(extra_key, (detalle.descripcion or "", detalle.codigo or ""))
-
+                concept_id, config_ids, prefix = detalle.deduccion_id, deducciones_config_ids, "deduction"
             elif detalle.tipo == TipoDetalle.PRESTACION:
-                if detalle.prestacion_id and detalle.prestacion_id in prestaciones_config_ids:
-                    bucket = prestaciones_catalogo_by_ne.setdefault(ne_id, {})
-                    bucket[detalle.prestacion_id] = bucket.get(detalle.prestacion_id, 0.0) + monto
-                else:
-                    extra_key = (
-                        f"benefit:{detalle.prestacion_id or ''}:{detalle.codigo or ''}:{detalle.descripcion or ''}"
-                    )
-                    bucket = prestaciones_extra_by_ne.setdefault(ne_id, {})
-                    bucket[extra_key] = bucket.get(extra_key, 0.0) + monto
-                    prestaciones_extra_labels.setdefault(extra_key, (detalle.descripcion or "", detalle.codigo or ""))
+                concept_id, config_ids, prefix = detalle.prestacion_id, prestaciones_config_ids, "benefit"
+            else:
+                return None
+            if concept_id and concept_id in config_ids:
+                return (f"{prefix}_catalog", concept_id)
+            return (
+                f"{prefix}_extra",
+                f"{prefix}:{concept_id or ''}:{detalle.codigo or ''}:{detalle.descripcion or ''}",
+            )
+
+        # Column keys are (column type, id), as used by the table columns below
+        pivot = NominaPivot.from_nomina(nomina.id, _columna)
+
+        def _extra_labels(col_type: str) -> list[tuple[str, tuple[str, str]]]:
+            claves = pivot.columns_where(lambda clave: clave[0] == col_type)
+            return sorted(
+                ((clave[1], pivot.etiquetas[clave]) for clave in claves),
+                key=lambda item: ((item[1][0] or item[1][1] or ""), item[0]),
+            )
 
         ingresos_cols: list[dict[str, str]] = []
         deducciones_cols: list[dict[str, str]] = []
@@ -180,9 +132,7 @@ class ExportService:
             if not concept.mostrar_como_ingreso_reportes:
                 reclasificacion_ids.add(concept.id)
 
-        for key, (desc, code) in sorted(
-            ingresos_extra_labels.items(), key=lambda item: ((item[1][0] or item[1][1] or ""), item[0])
-        ):
+        for key, (desc, code) in _extra_labels("income_extra"):
             label = _unique_label(ingreso_headers_seen, desc, code, "Ingreso Extra")
             ingresos_cols.append({"type": "income_extra", "id": key, "header": f"{label} (Extra)"})
 
@@ -193,9 +143,7 @@ class ExportService:
             label = _unique_label(deduccion_headers_seen, concept.nombre, concept.codigo, "Deduccion")
             deducciones_cols.append({"type": "deduction_catalog", "id": concept.id, "header": label})
 
-        for key, (desc, code) in sorted(
-            deducciones_extra_labels.items(), key=lambda item: ((item[1][0] or item[1][1] or ""), item[0])
-        ):
+        for key, (desc, code) in _extra_labels("deduction_extra"):
             label = _unique_label(deduccion_headers_seen, desc, code, "Deduccion Extra")
             deducciones_cols.append({"type": "deduction_extra", "id": key, "header": f"{label} (Extra)"})
 
@@ -206,9 +154,7 @@ class ExportService:
             label = _unique_label(prestacion_headers_seen, concept.nombre, concept.codigo, "Prestacion")
             prestaciones_cols.append({"type": "benefit_catalog", "id": concept.id, "header": label})
 
-        for key, (desc, code) in sorted(
-            prestaciones_extra_labels.items(), key=lambda item: ((item[1][0] or item[1][1] or ""), item[0])
-        ):
+        for key, (desc, code) in _extra_labels("benefit_extra"):
             label = _unique_label(prestacion_headers_seen, desc, code, "Prestacion Extra")
             prestaciones_cols.append({"type": "benefit_extra", "id": key, "header": f"{label} (Extra)"})
 
@@ -221,22 +167,18 @@ class ExportService:
             db.select(ComprobanteContable).filter_by(nomina_id=nomina.id)
         ).scalar_one_or_none()
         if comprobante:
-            vac_lines = (
-                db.session.execute(
-                    db.select(ComprobanteContableLinea).filter_by(
-                        comprobante_id=comprobante.id,
-                        tipo_concepto="vacation_liability",
-                        tipo_debito_credito="credito",
-                    )
+            vac_lines = db.session.execute(
+                db.select(ComprobanteContableLinea.nomina_empleado_id, ComprobanteContableLinea.credito).filter_by(
+                    comprobante_id=comprobante.id,
+                    tipo_concepto="vacation_liability",
+                    tipo_debito_credito="credito",
                 )
-                .scalars()
-                .all()
-            )
+            ).all()
             if vac_lines:
                 show_vacation_liability = True
-            for line in vac_lines:
-                current = vacation_liability_by_ne.get(line.nomina_empleado_id, 0.0)
-                vacation_liability_by_ne[line.nomina_empleado_id] = current + float(line.credito or 0)
+            for nomina_empleado_id, credito in vac_lines:
+                current = vacation_liability_by_ne.get(nomina_empleado_id, 0.0)
+                vacation_liability_by_ne[nomina_empleado_id] = current + float(credito or 0)
 
         employee_cols = [
             {"type": "employee_code", "header": "Codigo"},
@@ -279,9 +221,34 @@ class ExportService:
             if index < len(section_specs) - 1:
                 table_columns.append({"type": "separator", "header": ""})
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Nomina"
+        encabezado = [
+            ["Empresa:", planilla.empresa.razon_social if planilla.empresa else "N/A"],
+            ["ID Empresa:", planilla.empresa_id or "N/A"],
+            ["ID Planilla:", planilla.id or "N/A"],
+            ["Status Planilla:", planilla.estado_aprobacion or "N/A"],
+            [
+                "Periodo:",
+                f"{nomina.periodo_inicio.strftime('%d/%m/%Y')} - {nomina.periodo_fin.strftime('%d/%m/%Y')}",
+            ],
+            ["Estado Nomina:", nomina.estado or "N/A"],
+            [],
+            *ExportService._traceability_rows(nomina),
+            [],
+        ]
+        # Title, blank row and header block come before the section and column headers
+        section_row = 3 + len(encabezado)
+        data_start_row = section_row + 2
+
+        column_widths = [
+            (
+                2.8
+                if column["type"] == "separator"
+                else 22 if column["type"] in {"employee_full_name", "employee_role"} else 16
+            )
+            for column in table_columns
+        ]
+        wb = StreamingWorkbook()
+        ws = wb.add_sheet("Nomina", column_widths=column_widths, freeze_panes=f"A{data_start_row}")
 
         title_font = Font(bold=True, size=14, color="FFFFFF")
         title_fill = PatternFill(start_color="2F5F93", end_color="2F5F93", fill_type="solid")
@@ -298,99 +265,84 @@ class ExportService:
         )
 
         total_columns = len(table_columns) if table_columns else 1
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=total_columns)
-        title_cell = ws["A1"]
-        title_cell.value = f"NOMINA - {planilla.nombre}"
-        title_cell.font = title_font
-        title_cell.fill = title_fill
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        row = 3
-        ws[f"A{row}"] = "Empresa:"
-        ws[f"B{row}"] = planilla.empresa.razon_social if planilla.empresa else "N/A"
-        row += 1
-
-        ws[f"A{row}"] = "ID Empresa:"
-        ws[f"B{row}"] = planilla.empresa_id or "N/A"
-        row += 1
-
-        ws[f"A{row}"] = "ID Planilla:"
-        ws[f"B{row}"] = planilla.id or "N/A"
-        row += 1
-
-        ws[f"A{row}"] = "Status Planilla:"
-        ws[f"B{row}"] = planilla.estado_aprobacion or "N/A"
-        row += 1
-
-        ws[f"A{row}"] = "Periodo:"
-        ws[f"B{row}"] = f"{nomina.periodo_inicio.strftime('%d/%m/%Y')} - {nomina.periodo_fin.strftime('%d/%m/%Y')}"
-        row += 1
-
-        ws[f"A{row}"] = "Estado Nomina:"
-        ws[f"B{row}"] = nomina.estado or "N/A"
-        row += 2
-
-        row = ExportService._add_traceability_section(ws, row, nomina)
-        row += 1
+        ws.append(
+            [
+                ws.cell(
+                    f"NOMINA - {planilla.nombre}",
+                    font=title_font,
+                    fill=title_fill,
+                    alignment=Alignment(horizontal="center", vertical="center"),
+                )
+            ]
+        )
+        if total_columns > 1:
+            ws.merge(1, total_columns)
+        ws.skip()
+        for fila in encabezado:
+            ws.append(fila)
 
-        section_row = row
-        header_row = row + 1
-        data_start_row = header_row + 1
+        def _separator_cell() -> Any:
+            return ws.cell("", fill=separator_fill, border=border)
 
+        section_cells = [_separator_cell() if column["type"] == "separator" else None for column in table_columns]
         for section_name, start_col, end_col in section_ranges:
+            section_cells[start_col - 1] = ws.cell(
+                section_name,
+                font=section_font,
+                fill=section_fill,
+                alignment=Alignment(horizontal="center", vertical="center"),
+                border=border,
+            )
+            for col_idx in range(start_col + 1, end_col + 1):
+                section_cells[col_idx - 1] = ws.cell(fill=section_fill, border=border)
+        ws.append(section_cells)
+        for _section_name, start_col, end_col in section_ranges:
             if start_col < end_col:
-                ws.merge_cells(start_row=section_row, start_column=start_col, end_row=section_row, end_column=end_col)
-            section_cell = ws.cell(row=section_row, column=start_col, value=section_name)
-            section_cell.font = section_font
-            section_cell.fill = section_fill
-            section_cell.alignment = Alignment(horizontal="center", vertical="center")
-            section_cell.border = border
-            if start_col < end_col:
-                for col_idx in range(start_col + 1, end_col + 1):
-                    cell = ws.cell(row=section_row, column=col_idx)
-                    cell.fill = section_fill
-                    cell.border = border
-
-        for col_idx, column in enumerate(table_columns, start=1):
-            if column["type"] == "separator":
-                sep_section_cell = ws.cell(row=section_row, column=col_idx, value="")
-                sep_section_cell.fill = separator_fill
-                sep_section_cell.border = border
-                sep_header_cell = ws.cell(row=header_row, column=col_idx, value="")
-                sep_header_cell.fill = separator_fill
-                sep_header_cell.border = border
-                continue
-
-            header_cell = ws.cell(row=header_row, column=col_idx, value=column["header"])
-            header_cell.font = subheader_font
-            header_cell.fill = subheader_fill
-            header_cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-            header_cell.border = border
-
-        for row_offset, ne in enumerate(nomina_empleados):
-            current_row = data_start_row + row_offset
-            empleado = ne.empleado
+                ws.merge(start_col, end_col)
+
+        ws.append(
+            [
+                (
+                    _separator_cell()
+                    if column["type"] == "separator"
+                    else ws.cell(
+                        column["header"],
+                        font=subheader_font,
+                        fill=subheader_fill,
+                        alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+                        border=border,
+                    )
+                )
+                for column in table_columns
+            ]
+        )
 
-            reclasificacion_total = sum(
-                ingresos_catalogo_by_ne.get(ne.id, {}).get(concept_id, 0.0) for concept_id in reclasificacion_ids
+        benefit_keys = pivot.columns_where(lambda clave: clave[0] in {"benefit_catalog", "benefit_extra"})
+        nomina_empleados = db.session.execute(
+            db.select(NominaEmpleado, Empleado)
+            .join(Empleado, Empleado.id == NominaEmpleado.empleado_id)
+            .filter(NominaEmpleado.nomina_id == nomina.id)
+            .execution_options(yield_per=STREAM_YIELD_PER)
+        )
+        for ne, empleado in nomina_empleados:
+            reclasificacion_total = pivot.total(
+                ne.id, [("income_catalog", concept_id) for concept_id in reclasificacion_ids]
             )
             salario_bruto_visual = float(ne.salario_bruto or 0) - reclasificacion_total
             total_ingresos_visual = float(ne.salario_bruto or 0)
 
             total_prestaciones = (
-                sum(prestaciones_catalogo_by_ne.get(ne.id, {}).values())
-                + sum(prestaciones_extra_by_ne.get(ne.id, {}).values())
+                pivot.total(ne.id, benefit_keys)
                 + (vacation_liability_by_ne.get(ne.id, 0.0) if show_vacation_liability else 0.0)
             )
 
-            for col_idx, column in enumerate(table_columns, start=1):
+            row_cells = []
+            for column in table_columns:
                 value: str | float = ""
                 col_type = column["type"]
 
                 if col_type == "separator":
-                    cell = ws.cell(row=current_row, column=col_idx, value="")
-                    cell.fill = separator_fill
-                    cell.border = border
+                    row_cells.append(_separator_cell())
                     continue
 
                 if col_type == "employee_code":
@@ -425,38 +377,19 @@ class ExportService:
                     value = total_prestaciones
                 elif col_type == "vacation_liability":
                     value = vacation_liability_by_ne.get(ne.id, 0.0)
-                elif col_type == "income_catalog":
-                    value = ingresos_catalogo_by_ne.get(ne.id, {}).get(column["id"], 0.0)
-                elif col_type == "income_extra":
-                    value = ingresos_extra_by_ne.get(ne.id, {}).get(column["id"], 0.0)
-                elif col_type == "deduction_catalog":
-                    value = deducciones_catalogo_by_ne.get(ne.id, {}).get(column["id"], 0.0)
-                elif col_type == "deduction_extra":
-                    value = deducciones_extra_by_ne.get(ne.id, {}).get(column["id"], 0.0)
-                elif col_type == "benefit_catalog":
-                    value = prestaciones_catalogo_by_ne.get(ne.id, {}).get(column["id"], 0.0)
-                elif col_type == "benefit_extra":
-                    value = prestaciones_extra_by_ne.get(ne.id, {}).get(column["id"], 0.0)
-
-                cell = ws.cell(row=current_row, column=col_idx, value=value)
-                cell.border = border
-                if isinstance(value, (int, float)):
-                    cell.number_format = "#,##0.00"
-
-        for col_idx, column in enumerate(table_columns, start=1):
-            col_letter = _excel_col(col_idx)
-            if column["type"] == "separator":
-                ws.column_dimensions[col_letter].width = 2.8
-            elif column["type"] in {"employee_full_name", "employee_role"}:
-                ws.column_dimensions[col_letter].width = 22
-            else:
-                ws.column_dimensions[col_letter].width = 16
-
-        ws.freeze_panes = f"A{data_start_row}"
+                elif col_type in CONCEPT_COLUMN_TYPES:
+                    value = pivot.get(ne.id, (col_type, column["id"]))
+
+                row_cells.append(
+                    ws.cell(
+                        value,
+                        border=border,
+                        number_format="#,##0.00" if isinstance(value, (int, float)) else None,
+                    )
+                )
+            ws.append(row_cells)
 
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        output = wb.to_bytes()
 
         filename = f"nomina_{planilla.nombre}_{nomina.periodo_inicio.strftime('%Y%m%d')}_{nomina.id[:8]}.xlsx"
         return output, filename
@@ -476,15 +409,7 @@ class ExportService:
         if not openpyxl_classes:
             raise ImportError(ERROR_OPENPYXL_NOT_AVAILABLE)
 
-        Workbook, Font, Alignment, PatternFill, Border, Side = openpyxl_classes
-
-        # Get all nomina employees
-        nomina_empleados = db.session.execute(db.select(NominaEmpleado).filter_by(nomina_id=nomina.id)).scalars().all()
-
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Prestaciones"
+        _, Font, Alignment, PatternFill, Border, Side = openpyxl_classes
 
         # Define styles
         header_font = Font(bold=True, size=14, color="FFFFFF")
@@ -498,52 +423,17 @@ class ExportService:
             bottom=Side(style="thin"),
         )
 
-        # Title
-        ws.merge_cells("A1:F1")
-        title_cell = ws["A1"]
-        title_cell.value = f"PRESTACIONES LABORALES - {planilla.nombre}"
-        title_cell.font = header_font
-        title_cell.fill = header_fill
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Nomina info
-        row = 3
-        if planilla.empresa_id and planilla.empresa:
-            ws[f"A{row}"] = "Empresa:"
-            ws[f"B{row}"] = planilla.empresa.razon_social
-            row += 1
-            if planilla.empresa.ruc:
-                ws[f"A{row}"] = "RUC:"
-                ws[f"B{row}"] = planilla.empresa.ruc
-                row += 1
-        ws[f"A{row}"] = "ID Planilla:"
-        ws[f"B{row}"] = planilla.id
-        row += 1
-        ws[f"A{row}"] = "Período:"
-        ws[f"B{row}"] = f"{nomina.periodo_inicio.strftime('%d/%m/%Y')} - {nomina.periodo_fin.strftime('%d/%m/%Y')}"
-        row += 1
-        ws[f"A{row}"] = "Estado Nómina (Generado, Aprobado, Aplicado):"
-        ws[f"B{row}"] = nomina.estado
-        row += 2
-
         # Table headers
         headers = ["Cód. Empleado", "Nombres", "Apellidos"]
 
-        # Get all unique prestaciones
-        prestaciones_set = set()
-        for ne in nomina_empleados:
-            detalles = (
-                db.session.execute(
-                    db.select(NominaDetalle).filter_by(nomina_empleado_id=ne.id, tipo=TipoDetalle.PRESTACION)
-                )
-                .scalars()
-                .all()
-            )
-            for d in detalles:
-                prestaciones_set.add((d.codigo, d.descripcion))
-
-        prestaciones_list = sorted(prestaciones_set, key=lambda x: x[0])
-        headers.extend([p[1] or p[0] for p in prestaciones_list])
+        # One query for every benefit of the nomina, one column per (code, description) pair
+        pivot = NominaPivot.from_nomina(
+            nomina.id,
+            lambda detalle: (detalle.codigo, detalle.descripcion or ""),
+            tipos=[TipoDetalle.PRESTACION],
+        )
+        prestaciones = sorted(pivot.columnas)
+        headers.extend([descripcion or codigo for descripcion, codigo in (pivot.etiquetas[p] for p in prestaciones)])
 
         show_vacation_liability = bool(
             planilla.vacation_policy_id and planilla.vacation_policy and planilla.vacation_policy.son_vacaciones_pagadas
@@ -553,79 +443,82 @@ class ExportService:
             db.select(ComprobanteContable).filter_by(nomina_id=nomina.id)
         ).scalar_one_or_none()
         if comprobante:
-            liability_lines = (
-                db.session.execute(
-                    db.select(ComprobanteContableLinea).filter_by(
-                        comprobante_id=comprobante.id,
-                        tipo_concepto="vacation_liability",
-                        tipo_debito_credito="credito",
-                    )
+            liability_lines = db.session.execute(
+                db.select(ComprobanteContableLinea.nomina_empleado_id, ComprobanteContableLinea.credito).filter_by(
+                    comprobante_id=comprobante.id,
+                    tipo_concepto="vacation_liability",
+                    tipo_debito_credito="credito",
                 )
-                .scalars()
-                .all()
-            )
+            ).all()
             if liability_lines:
                 show_vacation_liability = True
-            for line in liability_lines:
-                current = vacation_liability_by_nomina_empleado.get(line.nomina_empleado_id, 0.0)
-                vacation_liability_by_nomina_empleado[line.nomina_empleado_id] = current + float(line.credito)
+            for nomina_empleado_id, credito in liability_lines:
+                current = vacation_liability_by_nomina_empleado.get(nomina_empleado_id, 0.0)
+                vacation_liability_by_nomina_empleado[nomina_empleado_id] = current + float(credito)
 
         if show_vacation_liability:
             headers.append("Provisión de Vacaciones")
 
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
+        wb = StreamingWorkbook()
+        ws = wb.add_sheet("Prestaciones", column_widths=[15] * min(len(headers), 26))
 
-        # Data rows
-        for ne in nomina_empleados:
-            row += 1
-            emp = ne.empleado
-
-            ws.cell(row=row, column=1, value=emp.codigo_empleado).border = border
-            ws.cell(row=row, column=2, value=f"{emp.primer_nombre} {emp.segundo_nombre or ''}".strip()).border = border
-            ws.cell(row=row, column=3, value=f"{emp.primer_apellido} {emp.segundo_apellido or ''}".strip()).border = (
-                border
-            )
-
-            # Get prestaciones for this employee
-            detalles = (
-                db.session.execute(
-                    db.select(NominaDetalle)
-                    .filter_by(nomina_empleado_id=ne.id, tipo=TipoDetalle.PRESTACION)
-                    .order_by(NominaDetalle.orden)
+        # Title
+        ws.append(
+            [
+                ws.cell(
+                    f"PRESTACIONES LABORALES - {planilla.nombre}",
+                    font=header_font,
+                    fill=header_fill,
+                    alignment=Alignment(horizontal="center", vertical="center"),
                 )
-                .scalars()
-                .all()
-            )
-
-            prestaciones_dict = {d.codigo: float(d.monto) for d in detalles}
+            ]
+        )
+        ws.merge(1, 6)
+        ws.skip()
 
-            # Fill prestacion amounts
-            for col_idx, (codigo, _nombre) in enumerate(prestaciones_list, start=4):
-                cell = ws.cell(row=row, column=col_idx, value=prestaciones_dict.get(codigo, 0.0))
-                cell.border = border
+        # Nomina info
+        if planilla.empresa_id and planilla.empresa:
+            ws.append(["Empresa:", planilla.empresa.razon_social])
+            if planilla.empresa.ruc:
+                ws.append(["RUC:", planilla.empresa.ruc])
+        ws.append(["ID Planilla:", planilla.id])
+        ws.append(
+            ["Período:", f"{nomina.periodo_inicio.strftime('%d/%m/%Y')} - {nomina.periodo_fin.strftime('%d/%m/%Y')}"]
+        )
+        ws.append(["Estado Nómina (Generado, Aprobado, Aplicado):", nomina.estado])
+        ws.skip()
+
+        ws.append(
+            headers,
+            font=subheader_font,
+            fill=subheader_fill,
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=border,
+        )
 
+        # Data rows
+        nomina_empleados = db.session.execute(
+            db.select(NominaEmpleado, Empleado)
+            .join(Empleado, Empleado.id == NominaEmpleado.empleado_id)
+            .filter(NominaEmpleado.nomina_id == nomina.id)
+            .execution_options(yield_per=STREAM_YIELD_PER)
+        )
+        for ne, emp in nomina_empleados:
+            fila: list[Any] = [
+                emp.codigo_empleado,
+                f"{emp.primer_nombre} {emp.segundo_nombre or ''}".strip(),
+                f"{emp.primer_apellido} {emp.segundo_apellido or ''}".strip(),
+            ]
+            fila.extend(pivot.get(ne.id, prestacion) for prestacion in prestaciones)
             if show_vacation_liability:
-                vac_col = 4 + len(prestaciones_list)
-                vac_amount = vacation_liability_by_nomina_empleado.get(ne.id, 0.0)
-                vac_cell = ws.cell(row=row, column=vac_col, value=vac_amount)
-                vac_cell.border = border
-
-        # Auto-adjust column widths
-        for col in range(1, min(len(headers) + 1, 27)):
-            ws.column_dimensions[chr(64 + col)].width = 15
+                fila.append(vacation_liability_by_nomina_empleado.get(ne.id, 0.0))
+            ws.append(fila, border=border)
 
-        row += 2
-        ExportService._add_traceability_section(ws, row, nomina)
+        ws.skip()
+        for fila in ExportService._traceability_rows(nomina):
+            ws.append(fila)
 
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        output = wb.to_bytes()
 
         filename = f"prestaciones_{planilla.nombre}_{nomina.periodo_inicio.strftime('%Y%m%d')}_{nomina.id[:8]}.xlsx"
         return output, filename
@@ -752,7 +645,7 @@ class ExportService:
         if not openpyxl_classes:
             raise ImportError(ERROR_OPENPYXL_NOT_AVAILABLE)
 
-        Workbook, Font, Alignment, PatternFill, Border, Side = openpyxl_classes
+        _, Font, Alignment, PatternFill, Border, Side = openpyxl_classes
 
         if nomina.estado == NominaEstado.GENERADO_CON_ERRORES:
             raise ValueError("Nómina calculada con errores: corrija empleados fallidos y recalcule antes de exportar.")
@@ -789,11 +682,6 @@ class ExportService:
                 "Utilice la exportación detallada para auditoría."
             ) from e
 
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Comprobante Contable"
-
         # Define styles
         header_font = Font(bold=True, size=14, color="FFFFFF")
         header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
@@ -808,143 +696,100 @@ class ExportService:
             bottom=Side(style="thin"),
         )
 
+        wb = StreamingWorkbook()
+        ws = wb.add_sheet("Comprobante Contable", column_widths=[18, 40, 20, 15, 15])
+
         # Title
-        ws.merge_cells("A1:F1")
-        title_cell = ws["A1"]
-        title_cell.value = f"COMPROBANTE CONTABLE - {planilla.nombre}"
-        title_cell.font = header_font
-        title_cell.fill = header_fill
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
+        ws.append(
+            [
+                ws.cell(
+                    f"COMPROBANTE CONTABLE - {planilla.nombre}",
+                    font=header_font,
+                    fill=header_fill,
+                    alignment=Alignment(horizontal="center", vertical="center"),
+                )
+            ]
+        )
+        ws.merge(1, 6)
+        ws.skip()
 
         # Comprobante info
-        row = 3
         if planilla.empresa_id and planilla.empresa:
-            ws[f"A{row}"] = "Empresa:"
-            ws[f"B{row}"] = planilla.empresa.razon_social
-            row += 1
-
-        ws[f"A{row}"] = "Concepto:"
-        ws[f"B{row}"] = comprobante.concepto or ""
-        row += 1
-
-        ws[f"A{row}"] = "Fecha de Cálculo:"
-        ws[f"B{row}"] = comprobante.fecha_calculo.strftime("%d/%m/%Y")
-        row += 1
-
-        ws[f"A{row}"] = "Período:"
-        ws[f"B{row}"] = f"{nomina.periodo_inicio.strftime('%d/%m/%Y')} - {nomina.periodo_fin.strftime('%d/%m/%Y')}"
-        row += 1
-
-        ws[f"A{row}"] = "ID Planilla:"
-        ws[f"B{row}"] = planilla.id
-        row += 1
-
-        ws[f"A{row}"] = "Estatus Planilla:"
-        ws[f"B{row}"] = nomina.estado
-        row += 1
-
+            ws.append(["Empresa:", planilla.empresa.razon_social])
+        ws.append(["Concepto:", comprobante.concepto or ""])
+        ws.append(["Fecha de Cálculo:", comprobante.fecha_calculo.strftime("%d/%m/%Y")])
+        ws.append(
+            ["Período:", f"{nomina.periodo_inicio.strftime('%d/%m/%Y')} - {nomina.periodo_fin.strftime('%d/%m/%Y')}"]
+        )
+        ws.append(["ID Planilla:", planilla.id])
+        ws.append(["Estatus Planilla:", nomina.estado])
         if comprobante.moneda:
-            ws[f"A{row}"] = "Moneda:"
-            ws[f"B{row}"] = f"{comprobante.moneda.codigo} - {comprobante.moneda.nombre}"
-            row += 1
+            ws.append(["Moneda:", f"{comprobante.moneda.codigo} - {comprobante.moneda.nombre}"])
 
         # Audit trail information
         if comprobante.aplicado_por:
-            ws[f"A{row}"] = "Aplicado por:"
-            ws[f"B{row}"] = comprobante.aplicado_por
-            row += 1
-
+            ws.append(["Aplicado por:", comprobante.aplicado_por])
         if comprobante.fecha_aplicacion:
-            ws[f"A{row}"] = "Fecha aplicación:"
-            ws[f"B{row}"] = comprobante.fecha_aplicacion.strftime("%d/%m/%Y %H:%M")
-            row += 1
-
+            ws.append(["Fecha aplicación:", comprobante.fecha_aplicacion.strftime("%d/%m/%Y %H:%M")])
         if comprobante.veces_modificado > 0:
-            ws[f"A{row}"] = "Modificado:"
-            ws[f"B{row}"] = f"{comprobante.veces_modificado} vez/veces"
-            row += 1
-
+            ws.append(["Modificado:", f"{comprobante.veces_modificado} vez/veces"])
             if comprobante.modificado_por:
-                ws[f"A{row}"] = "Última modificación por:"
-                ws[f"B{row}"] = comprobante.modificado_por
-                row += 1
-
+                ws.append(["Última modificación por:", comprobante.modificado_por])
             if comprobante.fecha_modificacion:
-                ws[f"A{row}"] = "Fecha última modificación:"
-                ws[f"B{row}"] = comprobante.fecha_modificacion.strftime("%d/%m/%Y %H:%M")
-                row += 1
-
-        row += 1
+                ws.append(["Fecha última modificación:", comprobante.fecha_modificacion.strftime("%d/%m/%Y %H:%M")])
+        ws.skip()
 
         # Warnings if any
         if comprobante.advertencias:
-            ws[f"A{row}"] = "ADVERTENCIAS:"
-            ws[f"A{row}"].font = Font(bold=True, color="FF0000")
-            row += 1
+            ws.append([ws.cell("ADVERTENCIAS:", font=Font(bold=True, color="FF0000"))])
             for warning in comprobante.advertencias:
-                ws[f"A{row}"] = f"• {warning}"
-                ws[f"A{row}"].font = Font(color="FF0000")
-                row += 1
-            row += 1
+                ws.append([ws.cell(f"• {warning}", font=Font(color="FF0000"))])
+            ws.skip()
 
         # Table headers
         headers = ["Código Cuenta", "Descripción", "Centro de Costos", "Débito", "Crédito"]
-
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
+        ws.append(
+            headers,
+            font=subheader_font,
+            fill=subheader_fill,
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=border,
+        )
 
         # Data rows
         for entry in summarized_entries:
-            row += 1
-            ws.cell(row=row, column=1, value=entry["codigo_cuenta"]).border = border
-            ws.cell(row=row, column=2, value=entry["descripcion"]).border = border
-            ws.cell(row=row, column=3, value=entry["centro_costos"] or "").border = border
-            ws.cell(row=row, column=4, value=float(entry["debito"])).border = border
-            ws.cell(row=row, column=5, value=float(entry["credito"])).border = border
+            ws.append(
+                [
+                    entry["codigo_cuenta"],
+                    entry["descripcion"],
+                    entry["centro_costos"] or "",
+                    float(entry["debito"]),
+                    float(entry["credito"]),
+                ],
+                border=border,
+            )
 
         # Totals row
-        row += 1
-        ws.cell(row=row, column=1, value="TOTALES").font = total_font
-        ws.cell(row=row, column=1).fill = total_fill
-        ws.cell(row=row, column=1).border = border
-        ws.cell(row=row, column=2).border = border
-        ws.cell(row=row, column=3).border = border
-
-        cell_debito = ws.cell(row=row, column=4, value=float(comprobante.total_debitos))
-        cell_debito.font = total_font
-        cell_debito.fill = total_fill
-        cell_debito.border = border
-
-        cell_credito = ws.cell(row=row, column=5, value=float(comprobante.total_creditos))
-        cell_credito.font = total_font
-        cell_credito.fill = total_fill
-        cell_credito.border = border
+        ws.append(
+            [
+                ws.cell("TOTALES", font=total_font, fill=total_fill, border=border),
+                ws.cell(border=border),
+                ws.cell(border=border),
+                ws.cell(float(comprobante.total_debitos), font=total_font, fill=total_fill, border=border),
+                ws.cell(float(comprobante.total_creditos), font=total_font, fill=total_fill, border=border),
+            ]
+        )
 
         # Balance check
-        row += 2
-        ws[f"A{row}"] = "Balance (debe ser 0):"
-        ws[f"B{row}"] = float(comprobante.balance)
-        if comprobante.balance != 0:
-            ws[f"B{row}"].font = Font(bold=True, color="FF0000")
+        ws.skip()
+        balance_font = Font(bold=True, color="FF0000") if comprobante.balance != 0 else None
+        ws.append(["Balance (debe ser 0):", ws.cell(float(comprobante.balance), font=balance_font)])
 
-        row += 2
-        row = ExportService._add_traceability_section(ws, row, nomina)
-
-        # Auto-adjust column widths
-        ws.column_dimensions["A"].width = 18
-        ws.column_dimensions["B"].width = 40
-        ws.column_dimensions["C"].width = 20
-        ws.column_dimensions["D"].width = 15
-        ws.column_dimensions["E"].width = 15
+        ws.skip()
+        for fila in ExportService._traceability_rows(nomina):
+            ws.append(fila)
 
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        output = wb.to_bytes()
 
         filename = f"comprobante_{planilla.nombre}_{nomina.periodo_inicio.strftime('%Y%m%d')}_{nomina.id[:8]}.xlsx"
         return output, filename
@@ -968,7 +813,7 @@ class ExportService:
         if not openpyxl_classes:
             raise ImportError(ERROR_OPENPYXL_NOT_AVAILABLE)
 
-        Workbook, Font, Alignment, PatternFill, Border, Side = openpyxl_classes
+        _, Font, Alignment, PatternFill, Border, Side = openpyxl_classes
 
         # Get comprobante
         comprobante = db.session.execute(
@@ -978,15 +823,6 @@ class ExportService:
         if not comprobante:
             raise ValueError("No existe comprobante contable para esta nómina")
 
-        # Get detailed entries
-        accounting_service = AccountingVoucherService(db.session)
-        detailed_entries = accounting_service.get_detailed_voucher_by_employee(comprobante)
-
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Comprobante Detallado"
-
         # Define styles
         header_font = Font(bold=True, size=14, color="FFFFFF")
         header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
@@ -999,79 +835,66 @@ class ExportService:
             bottom=Side(style="thin"),
         )
 
+        wb = StreamingWorkbook()
+        ws = wb.add_sheet("Comprobante Detallado", column_widths=[18, 30, 30, 18, 35, 15, 15])
+
         # Title
-        ws.merge_cells("A1:G1")
-        title_cell = ws["A1"]
-        title_cell.value = f"COMPROBANTE CONTABLE DETALLADO - {planilla.nombre}"
-        title_cell.font = header_font
-        title_cell.fill = header_fill
-        title_cell.alignment = Alignment(horizontal="center", vertical="center")
+        ws.append(
+            [
+                ws.cell(
+                    f"COMPROBANTE CONTABLE DETALLADO - {planilla.nombre}",
+                    font=header_font,
+                    fill=header_fill,
+                    alignment=Alignment(horizontal="center", vertical="center"),
+                )
+            ]
+        )
+        ws.merge(1, 7)
+        ws.skip()
 
         # Comprobante info
-        row = 3
         if planilla.empresa_id and planilla.empresa:
-            ws[f"A{row}"] = "Empresa:"
-            ws[f"B{row}"] = planilla.empresa.razon_social
-            row += 1
-
-        ws[f"A{row}"] = "Concepto:"
-        ws[f"B{row}"] = comprobante.concepto or ""
-        row += 1
-
-        ws[f"A{row}"] = "Fecha de Cálculo:"
-        ws[f"B{row}"] = comprobante.fecha_calculo.strftime("%d/%m/%Y")
-        row += 1
-
-        ws[f"A{row}"] = "Período:"
-        ws[f"B{row}"] = f"{nomina.periodo_inicio.strftime('%d/%m/%Y')} - {nomina.periodo_fin.strftime('%d/%m/%Y')}"
-        row += 1
-
-        ws[f"A{row}"] = "ID Planilla:"
-        ws[f"B{row}"] = planilla.id
-        row += 1
-
-        ws[f"A{row}"] = "Estatus Planilla:"
-        ws[f"B{row}"] = nomina.estado
-        row += 2
+            ws.append(["Empresa:", planilla.empresa.razon_social])
+        ws.append(["Concepto:", comprobante.concepto or ""])
+        ws.append(["Fecha de Cálculo:", comprobante.fecha_calculo.strftime("%d/%m/%Y")])
+        ws.append(
+            ["Período:", f"{nomina.periodo_inicio.strftime('%d/%m/%Y')} - {nomina.periodo_fin.strftime('%d/%m/%Y')}"]
+        )
+        ws.append(["ID Planilla:", planilla.id])
+        ws.append(["Estatus Planilla:", nomina.estado])
+        ws.skip()
 
         # Table headers
         headers = ["Código Empleado", "Empleado", "Concepto", "Código Cuenta", "Descripción", "Débito", "Crédito"]
+        ws.append(
+            headers,
+            font=subheader_font,
+            fill=subheader_fill,
+            alignment=Alignment(horizontal="center", vertical="center"),
+            border=border,
+        )
 
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = subheader_font
-            cell.fill = subheader_fill
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
-
-        # Data rows - per employee
-        for employee_entry in detailed_entries:
-            for linea in employee_entry["lineas"]:
-                row += 1
-                ws.cell(row=row, column=1, value=employee_entry["empleado_codigo"]).border = border
-                ws.cell(row=row, column=2, value=employee_entry["empleado_nombre"]).border = border
-                ws.cell(row=row, column=3, value=linea["concepto"]).border = border
-                ws.cell(row=row, column=4, value=linea["codigo_cuenta"]).border = border
-                ws.cell(row=row, column=5, value=linea["descripcion_cuenta"]).border = border
-                ws.cell(row=row, column=6, value=float(linea["debito"])).border = border
-                ws.cell(row=row, column=7, value=float(linea["credito"])).border = border
+        # Data rows - one per accounting line, streamed in employee order
+        accounting_service = AccountingVoucherService(db.session)
+        for linea in accounting_service.iter_detailed_voucher_lines(comprobante, yield_per=STREAM_YIELD_PER):
+            ws.append(
+                [
+                    linea.empleado_codigo,
+                    linea.empleado_nombre,
+                    linea.concepto,
+                    linea.codigo_cuenta,
+                    linea.descripcion_cuenta,
+                    float(linea.debito),
+                    float(linea.credito),
+                ],
+                border=border,
+            )
 
-        row += 2
-        row = ExportService._add_traceability_section(ws, row, nomina)
+        ws.skip()
+        for fila in ExportService._traceability_rows(nomina):
+            ws.append(fila)
 
-        # Auto-adjust column widths
-        ws.column_dimensions["A"].width = 18
-        ws.column_dimensions["B"].width = 30
-        ws.column_dimensions["C"].width = 30
-        ws.column_dimensions["D"].width = 18
-        ws.column_dimensions["E"].width = 35
-        ws.column_dimensions["F"].width = 15
-        ws.column_dimensions["G"].width = 15
-
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
+        output = wb.to_bytes()
 
         filename = (
             f"comprobante_detallado_{planilla.nombre}_{nomina.periodo_inicio.strftime('%Y%m%d')}_{nomina.id[:8]}.xlsx"
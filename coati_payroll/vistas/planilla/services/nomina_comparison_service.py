@@ -8,10 +8,12 @@ from collections import defaultdict
 from decimal import Decimal
 from typing import Any
 
+from sqlalchemy import case, distinct, func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from coati_payroll.enums import NominaEstado
+from coati_payroll.log import log
 from coati_payroll.model import (
     Deduccion,
     Nomina,
@@ -41,6 +43,10 @@ class NominaComparisonService:
     ESTABILIDAD_PESO_SEVERIDAD = Decimal("0.25")
     ESTABILIDAD_PESO_CONCENTRACION = Decimal("0.25")
     ESTABILIDAD_PESO_CAMBIOS_ESTRUCTURALES = Decimal("0.15")
+    TIPOS_CONCEPTO = ("income", "deduction", "benefit")
+    DRIVERS_POR_EMPLEADO = 3
+    # Per-employee concept deltas below half a cent round to 0.00 and are not drivers
+    DRIVER_DELTA_MIN = Decimal("0.005")
 
     @staticmethod
     def get_nominas_disponibles(planilla_id: str, excluir_nomina_id: str | None = None) -> list[Nomina]:
@@ -55,8 +61,41 @@ class NominaComparisonService:
             db.select(Nomina)
             .filter(Nomina.planilla_id == nomina_actual.planilla_id, Nomina.periodo_fin < nomina_actual.periodo_fin)
             .order_by(Nomina.periodo_fin.desc())
+            .limit(1)
         ).scalar_one_or_none()
 
+    @classmethod
+    def schedule_precompute(cls, nomina: Nomina) -> Any:
+        """Enqueue the comparison of a generated nomina against the previous one.
+
+        The comparison page then reads the cached result instead of building it
+        inside the request. Nothing is enqueued when background processing is
+        disabled; the page builds the comparison on first view as before.
+
+        Returns:
+            The queue task id, or None when nothing was enqueued.
+        """
+        from flask import current_app, has_app_context
+
+        from coati_payroll.queue import get_queue_driver
+        from coati_payroll.queue.drivers.dramatiq_driver import DramatiqDriver
+
+        if nomina.estado != NominaEstado.GENERADO:
+            return None
+        if not has_app_context() or not current_app.config.get("QUEUE_ENABLED", False):
+            return None
+        try:
+            queue = get_queue_driver()
+            if not isinstance(queue, DramatiqDriver) or not queue.is_available():
+                return None
+            return queue.enqueue("precompute_nomina_comparison", nomina_id=nomina.id)
+        except Exception as e:
+            log.error(
+                "No se pudo encolar la comparación de la nómina",
+                extra={"nomina_id": nomina.id, "error": str(e), "error_type": type(e).__name__},
+            )
+            return None
+
     @classmethod
     def compare_or_cached(cls, planilla: Planilla, nomina_base: Nomina, nomina_actual: Nomina) -> dict[str, Any]:
         base_version = cls._nomina_version(nomina_base)
@@ -292,7 +331,12 @@ class NominaComparisonService:
                 )
 
         resumen_totales = cls._resumen_totales(
-            nomina_base, nomina_actual, empleados_base, empleados_actual, ids_base, ids_actual
+            nomina_base,
+            nomina_actual,
+            cls._estadisticas_salarios(nomina_base.id),
+            cls._estadisticas_salarios(nomina_actual.id),
+            ids_base,
+            ids_actual,
         )
 
         outliers_neto.sort(key=lambda item: abs(item["variacion_neto"]), reverse=True)
@@ -381,8 +425,8 @@ class NominaComparisonService:
         cls,
         nomina_base: Nomina,
         nomina_actual: Nomina,
-        empleados_base: list[NominaEmpleado],
-        empleados_actual: list[NominaEmpleado],
+        estadisticas_base: dict[str, Decimal],
+        estadisticas_actual: dict[str, Decimal],
         ids_base: set[str],
         ids_actual: set[str],
     ) -> dict[str, Any]:
@@ -393,10 +437,6 @@ class NominaComparisonService:
         neto_base = cls._to_decimal(nomina_base.total_neto)
         neto_actual = cls._to_decimal(nomina_actual.total_neto)
 
-        netos_base = [cls._to_decimal(item.salario_neto) for item in empleados_base]
-        netos_actual = [cls._to_decimal(item.salario_neto) for item in empleados_actual]
-        brutos_base = [cls._to_decimal(item.salario_bruto) for item in empleados_base]
-        brutos_actual = [cls._to_decimal(item.salario_bruto) for item in empleados_actual]
         dias_calculo_base = cls._dias_periodo(nomina_base)
         dias_calculo_actual = cls._dias_periodo(nomina_actual)
         variacion_dias_calculo = (
@@ -421,27 +461,84 @@ class NominaComparisonService:
             "total_deducciones_actual": cls._money(ded_actual),
             "variacion_total_deducciones": cls._money(ded_actual - ded_base),
             "variacion_total_deducciones_pct": cls._percent(cls._pct_delta(ded_actual, ded_base)),
-            "promedio_bruto_base": cls._money(cls._avg(brutos_base)),
-            "promedio_bruto_actual": cls._money(cls._avg(brutos_actual)),
-            "promedio_neto_base": cls._money(cls._avg(netos_base)),
-            "promedio_neto_actual": cls._money(cls._avg(netos_actual)),
+            "promedio_bruto_base": cls._money(estadisticas_base["promedio_bruto"]),
+            "promedio_bruto_actual": cls._money(estadisticas_actual["promedio_bruto"]),
+            "promedio_neto_base": cls._money(estadisticas_base["promedio_neto"]),
+            "promedio_neto_actual": cls._money(estadisticas_actual["promedio_neto"]),
             "dias_calculo_base": dias_calculo_base,
             "dias_calculo_actual": dias_calculo_actual,
             "variacion_dias_calculo": variacion_dias_calculo,
-            "mediana_bruto_base": cls._money(cls._median(brutos_base)),
-            "mediana_bruto_actual": cls._money(cls._median(brutos_actual)),
-            "mediana_neto_base": cls._money(cls._median(netos_base)),
-            "mediana_neto_actual": cls._money(cls._median(netos_actual)),
-            "dispersion_neto_base": cls._money(cls._percentile(netos_base, 95) - cls._percentile(netos_base, 5)),
-            "dispersion_neto_actual": cls._money(cls._percentile(netos_actual, 95) - cls._percentile(netos_actual, 5)),
+            "mediana_bruto_base": cls._money(estadisticas_base["mediana_bruto"]),
+            "mediana_bruto_actual": cls._money(estadisticas_actual["mediana_bruto"]),
+            "mediana_neto_base": cls._money(estadisticas_base["mediana_neto"]),
+            "mediana_neto_actual": cls._money(estadisticas_actual["mediana_neto"]),
+            "dispersion_neto_base": cls._money(estadisticas_base["p95_neto"] - estadisticas_base["p5_neto"]),
+            "dispersion_neto_actual": cls._money(estadisticas_actual["p95_neto"] - estadisticas_actual["p5_neto"]),
             "distribucion": {
-                "std_neto_base": cls._money(cls._std_dev(netos_base)),
-                "std_neto_actual": cls._money(cls._std_dev(netos_actual)),
-                "iqr_neto_base": cls._money(cls._iqr(netos_base)),
-                "iqr_neto_actual": cls._money(cls._iqr(netos_actual)),
+                "std_neto_base": cls._money(estadisticas_base["std_neto"]),
+                "std_neto_actual": cls._money(estadisticas_actual["std_neto"]),
+                "iqr_neto_base": cls._money(estadisticas_base["p75_neto"] - estadisticas_base["p25_neto"]),
+                "iqr_neto_actual": cls._money(estadisticas_actual["p75_neto"] - estadisticas_actual["p25_neto"]),
             },
         }
 
+    @classmethod
+    def _estadisticas_salarios(cls, nomina_id: str) -> dict[str, Decimal]:
+        """Averages, medians, percentiles and standard deviation of a nomina's salaries.
+
+        Computed by the database: one aggregate query for the moments and one
+        ranked query per column that returns only the order statistics needed.
+        Percentiles are the value at rank ``int((n - 1) * p / 100)``; medians
+        average the two middle values of an even count; the standard deviation
+        is the population one.
+        """
+        neto = func.coalesce(NominaEmpleado.salario_neto, 0)
+        bruto = func.coalesce(NominaEmpleado.salario_bruto, 0)
+        total, promedio_neto, promedio_bruto, promedio_cuadrado = db.session.execute(
+            db.select(func.count(), func.avg(neto), func.avg(bruto), func.avg(neto * neto)).filter(
+                NominaEmpleado.nomina_id == nomina_id
+            )
+        ).one()
+        if not total:
+            claves = ("promedio_bruto", "promedio_neto", "mediana_bruto", "mediana_neto", "std_neto")
+            return dict.fromkeys(claves + ("p5_neto", "p25_neto", "p75_neto", "p95_neto"), Decimal("0"))
+
+        promedio_neto = cls._to_decimal(promedio_neto)
+        varianza = cls._to_decimal(promedio_cuadrado) - promedio_neto * promedio_neto
+        medianas = ((total - 1) // 2, total // 2)
+        percentiles = {f"p{p}_neto": int((total - 1) * (p / 100)) for p in (5, 25, 75, 95)}
+        netos = cls._valores_en_posiciones(nomina_id, neto, set(medianas) | set(percentiles.values()))
+        brutos = cls._valores_en_posiciones(nomina_id, bruto, set(medianas))
+
+        estadisticas = {
+            "promedio_bruto": cls._to_decimal(promedio_bruto),
+            "promedio_neto": promedio_neto,
+            "mediana_bruto": (brutos[medianas[0]] + brutos[medianas[1]]) / Decimal("2"),
+            "mediana_neto": (netos[medianas[0]] + netos[medianas[1]]) / Decimal("2"),
+            # Rounding can leave a tiny negative variance when every salary is equal
+            "std_neto": max(varianza, Decimal("0")).sqrt(),
+        }
+        estadisticas.update({clave: netos[posicion] for clave, posicion in percentiles.items()})
+        return estadisticas
+
+    @classmethod
+    def _valores_en_posiciones(cls, nomina_id: str, columna: Any, posiciones: set[int]) -> dict[int, Decimal]:
+        """Values of ``columna`` at the given 0-based ranks of the nomina's employees sorted ascending."""
+        ordenados = (
+            db.select(
+                columna.label("valor"),
+                func.row_number().over(order_by=columna).label("posicion"),
+            )
+            .filter(NominaEmpleado.nomina_id == nomina_id)
+            .subquery()
+        )
+        rows = db.session.execute(
+            db.select(ordenados.c.posicion, ordenados.c.valor).filter(
+                ordenados.c.posicion.in_([posicion + 1 for posicion in posiciones])
+            )
+        ).all()
+        return {posicion - 1: cls._to_decimal(valor) for posicion, valor in rows}
+
     @staticmethod
     def _dias_periodo(nomina: Nomina) -> int | None:
         if not nomina.periodo_inicio or not nomina.periodo_fin:
@@ -511,41 +608,39 @@ class NominaComparisonService:
 
     @classmethod
     def _comparar_conceptos(cls, nomina_base_id: str, nomina_actual_id: str) -> dict[str, Any]:
-        def aggregate(
-            nomina_id: str,
-        ) -> tuple[
-            dict[str, dict[str, Decimal]], dict[str, dict[str, set[str]]], dict[str, dict[str, dict[str, Decimal]]]
-        ]:
-            rows = db.session.execute(
-                db.select(NominaDetalle.tipo, NominaDetalle.codigo, NominaDetalle.monto, NominaEmpleado.empleado_id)
-                .join(NominaEmpleado, NominaEmpleado.id == NominaDetalle.nomina_empleado_id)
-                .filter(NominaEmpleado.nomina_id == nomina_id)
-            ).all()
-            grouped: dict[str, dict[str, Decimal]] = defaultdict(lambda: defaultdict(lambda: Decimal("0")))
-            affected: dict[str, dict[str, set[str]]] = defaultdict(lambda: defaultdict(set))
-            by_employee: dict[str, dict[str, dict[str, Decimal]]] = defaultdict(
-                lambda: defaultdict(lambda: defaultdict(lambda: Decimal("0")))
+        rows = db.session.execute(
+            db.select(
+                NominaEmpleado.nomina_id,
+                NominaDetalle.tipo,
+                NominaDetalle.codigo,
+                func.sum(NominaDetalle.monto),
+                func.count(distinct(NominaEmpleado.empleado_id)),
             )
-            for tipo, codigo, monto, empleado_id in rows:
-                monto_decimal = cls._to_decimal(monto)
-                grouped[tipo][codigo] += monto_decimal
-                affected[tipo][codigo].add(empleado_id)
-                by_employee[empleado_id][tipo][codigo] += monto_decimal
-            return grouped, affected, by_employee
-
-        base, base_affected, base_employee = aggregate(nomina_base_id)
-        actual, actual_affected, actual_employee = aggregate(nomina_actual_id)
+            .join(NominaEmpleado, NominaEmpleado.id == NominaDetalle.nomina_empleado_id)
+            .filter(
+                NominaEmpleado.nomina_id.in_([nomina_base_id, nomina_actual_id]),
+                NominaDetalle.tipo.in_(cls.TIPOS_CONCEPTO),
+            )
+            .group_by(NominaEmpleado.nomina_id, NominaDetalle.tipo, NominaDetalle.codigo)
+        ).all()
+        montos: dict[str, dict[tuple[str, str], Decimal]] = {nomina_base_id: {}, nomina_actual_id: {}}
+        afectados: dict[str, dict[tuple[str, str], int]] = {nomina_base_id: {}, nomina_actual_id: {}}
+        for nomina_id, tipo, codigo, monto, empleados in rows:
+            montos[nomina_id][(tipo, codigo)] = cls._to_decimal(monto)
+            afectados[nomina_id][(tipo, codigo)] = empleados
+        base, actual = montos[nomina_base_id], montos[nomina_actual_id]
+        base_affected, actual_affected = afectados[nomina_base_id], afectados[nomina_actual_id]
 
         result: dict[str, list[dict[str, Any]]] = {}
         radar: list[dict[str, Any]] = []
-        for tipo in ["income", "deduction", "benefit"]:
-            codigos = sorted(set(base.get(tipo, {}).keys()) | set(actual.get(tipo, {}).keys()))
+        for tipo in cls.TIPOS_CONCEPTO:
+            codigos = sorted({codigo for t, codigo in base.keys() | actual.keys() if t == tipo})
             result[tipo] = []
             for codigo in codigos:
-                base_monto = base.get(tipo, {}).get(codigo, Decimal("0"))
-                actual_monto = actual.get(tipo, {}).get(codigo, Decimal("0"))
-                empleados_base = len(base_affected.get(tipo, {}).get(codigo, set()))
-                empleados_actual = len(actual_affected.get(tipo, {}).get(codigo, set()))
+                base_monto = base.get((tipo, codigo), Decimal("0"))
+                actual_monto = actual.get((tipo, codigo), Decimal("0"))
+                empleados_base = base_affected.get((tipo, codigo), 0)
+                empleados_actual = actual_affected.get((tipo, codigo), 0)
                 item = {
                     "codigo": codigo,
                     "monto_base": cls._money(base_monto),
@@ -567,7 +662,7 @@ class NominaComparisonService:
 
         radar.sort(key=lambda item: abs(item["variacion"]), reverse=True)
 
-        drivers_empleado = cls._build_employee_drivers(base_employee, actual_employee)
+        drivers_empleado = cls._build_employee_drivers(nomina_base_id, nomina_actual_id)
         return {
             "por_tipo": result,
             "radar_top": radar[:10],
@@ -575,42 +670,58 @@ class NominaComparisonService:
         }
 
     @classmethod
-    def _build_employee_drivers(
-        cls,
-        base_employee: dict[str, dict[str, dict[str, Decimal]]],
-        actual_employee: dict[str, dict[str, dict[str, Decimal]]],
-    ) -> dict[str, list[dict[str, Any]]]:
-        all_emp_ids = set(base_employee.keys()) | set(actual_employee.keys())
-        drivers: dict[str, list[dict[str, Any]]] = {}
-        for empleado_id in all_emp_ids:
-            base_tipos = base_employee.get(empleado_id, {})
-            actual_tipos = actual_employee.get(empleado_id, {})
-            items: list[dict[str, Any]] = []
-            for tipo in ["income", "deduction", "benefit"]:
-                codigos = set(base_tipos.get(tipo, {}).keys()) | set(actual_tipos.get(tipo, {}).keys())
-                for codigo in codigos:
-                    base_val = base_tipos.get(tipo, {}).get(codigo, Decimal("0"))
-                    actual_val = actual_tipos.get(tipo, {}).get(codigo, Decimal("0"))
-                    delta = actual_val - base_val
-                    if delta != Decimal("0"):
-                        items.append(
-                            {
-                                "tipo": tipo,
-                                "codigo": codigo,
-                                "variacion": cls._money(delta),
-                            }
-                        )
-            items.sort(key=lambda item: abs(item["variacion"]), reverse=True)
-            drivers[empleado_id] = items[:3]
-        return drivers
+    def _build_employee_drivers(cls, nomina_base_id: str, nomina_actual_id: str) -> dict[str, list[dict[str, Any]]]:
+        """Largest concept variations of each employee, ranked by the database.
+
+        Employees without concept variations are left out.
+        """
+        monto = func.coalesce(NominaDetalle.monto, 0)
+        delta = func.sum(case((NominaEmpleado.nomina_id == nomina_actual_id, monto), else_=-monto))
+        variaciones = (
+            db.select(
+                NominaEmpleado.empleado_id.label("empleado_id"),
+                NominaDetalle.tipo.label("tipo"),
+                NominaDetalle.codigo.label("codigo"),
+                delta.label("delta"),
+            )
+            .join(NominaEmpleado, NominaEmpleado.id == NominaDetalle.nomina_empleado_id)
+            .filter(
+                NominaEmpleado.nomina_id.in_([nomina_base_id, nomina_actual_id]),
+                NominaDetalle.tipo.in_(cls.TIPOS_CONCEPTO),
+            )
+            .group_by(NominaEmpleado.empleado_id, NominaDetalle.tipo, NominaDetalle.codigo)
+            .having(func.abs(delta) >= cls.DRIVER_DELTA_MIN)
+            .subquery()
+        )
+        ranking = db.select(
+            variaciones,
+            func.row_number()
+            .over(
+                partition_by=variaciones.c.empleado_id,
+                order_by=(func.abs(variaciones.c.delta).desc(), variaciones.c.tipo, variaciones.c.codigo),
+            )
+            .label("posicion"),
+        ).subquery()
+        rows = db.session.execute(
+            db.select(ranking.c.empleado_id, ranking.c.tipo, ranking.c.codigo, ranking.c.delta)
+            .filter(ranking.c.posicion <= cls.DRIVERS_POR_EMPLEADO)
+            .order_by(ranking.c.empleado_id, ranking.c.posicion)
+        ).all()
+
+        drivers: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for empleado_id, tipo, codigo, variacion in rows:
+            drivers[empleado_id].append(
+                {"tipo": tipo, "codigo": codigo, "variacion": cls._money(cls._to_decimal(variacion))}
+            )
+        return dict(drivers)
 
     @classmethod
     def _comparar_reglas_vacaciones(cls, nomina_base_id: str, nomina_actual_id: str) -> dict[str, Any]:
         def aggregate(nomina_id: str) -> dict[str, Decimal]:
             rows = db.session.execute(
-                db.select(NominaNovedad.codigo_concepto, NominaNovedad.valor_cantidad).filter(
-                    NominaNovedad.nomina_id == nomina_id, NominaNovedad.es_descanso_vacaciones.is_(True)
-                )
+                db.select(NominaNovedad.codigo_concepto, func.sum(NominaNovedad.valor_cantidad))
+                .filter(NominaNovedad.nomina_id == nomina_id, NominaNovedad.es_descanso_vacaciones.is_(True))
+                .group_by(NominaNovedad.codigo_concepto)
             ).all()
             grouped: dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
             for codigo_concepto, cantidad in rows:
@@ -786,33 +897,39 @@ class NominaComparisonService:
 
     @classmethod
     def _build_calidad(cls, nomina_base_id: str, nomina_actual_id: str, empleados_actual_total: int) -> dict[str, Any]:
-        empleados_base = set(
-            db.session.execute(db.select(NominaNovedad.empleado_id).filter(NominaNovedad.nomina_id == nomina_base_id))
-            .scalars()
-            .all()
-        )
-        empleados_actual = set(
-            db.session.execute(db.select(NominaNovedad.empleado_id).filter(NominaNovedad.nomina_id == nomina_actual_id))
-            .scalars()
-            .all()
+        conteos = dict(
+            db.session.execute(
+                db.select(NominaNovedad.nomina_id, func.count(distinct(NominaNovedad.empleado_id)))
+                .filter(NominaNovedad.nomina_id.in_([nomina_base_id, nomina_actual_id]))
+                .group_by(NominaNovedad.nomina_id)
+            ).all()
         )
+        empleados_base = conteos.get(nomina_base_id, 0)
+        empleados_actual = conteos.get(nomina_actual_id, 0)
         total = Decimal(empleados_actual_total or 1)
         return {
-            "empleados_con_novedades_base": len(empleados_base),
-            "empleados_con_novedades_actual": len(empleados_actual),
-            "porcentaje_actual": cls._percent((Decimal(len(empleados_actual)) / total) * Decimal("100")),
+            "empleados_con_novedades_base": empleados_base,
+            "empleados_con_novedades_actual": empleados_actual,
+            "porcentaje_actual": cls._percent((Decimal(empleados_actual) / total) * Decimal("100")),
         }
 
     @classmethod
     def _build_cambios_estructurales(cls, nomina_base: Nomina, nomina_actual: Nomina) -> dict[str, bool]:
         return {
-            "reglas_cambiadas": (nomina_base.configuracion_snapshot or {})
-            != (nomina_actual.configuracion_snapshot or {}),
-            "catalogos_cambiados": (nomina_base.catalogos_snapshot or {}) != (nomina_actual.catalogos_snapshot or {}),
-            "tipos_cambio_modificados": (nomina_base.tipos_cambio_snapshot or {})
-            != (nomina_actual.tipos_cambio_snapshot or {}),
+            "reglas_cambiadas": cls._snapshot_cambiado(nomina_base, nomina_actual, "configuracion"),
+            "catalogos_cambiados": cls._snapshot_cambiado(nomina_base, nomina_actual, "catalogos"),
+            "tipos_cambio_modificados": cls._snapshot_cambiado(nomina_base, nomina_actual, "tipos_cambio"),
         }
 
+    @staticmethod
+    def _snapshot_cambiado(nomina_base: Nomina, nomina_actual: Nomina, tipo: str) -> bool:
+        """Compare one snapshot of both nominas, by hash when both reference the snapshot store."""
+        hash_base = getattr(nomina_base, f"{tipo}_snapshot_hash", None)
+        hash_actual = getattr(nomina_actual, f"{tipo}_snapshot_hash", None)
+        if hash_base and hash_actual:
+            return hash_base != hash_actual
+        return (getattr(nomina_base, f"{tipo}_snapshot") or {}) != (getattr(nomina_actual, f"{tipo}_snapshot") or {})
+
     @classmethod
     def _build_indice_estabilidad(
         cls,
@@ -870,18 +987,6 @@ class NominaComparisonService:
             return Decimal("0")
         return (numerator / denominator) * Decimal("100")
 
-    @staticmethod
-    def _std_dev(values: list[Decimal]) -> Decimal:
-        if not values:
-            return Decimal("0")
-        mean = sum(values) / Decimal(len(values))
-        variance = sum((value - mean) ** 2 for value in values) / Decimal(len(values))
-        return variance.sqrt()
-
-    @classmethod
-    def _iqr(cls, values: list[Decimal]) -> Decimal:
-        return cls._percentile(values, 75) - cls._percentile(values, 25)
-
     @staticmethod
     def _employee_list(ids: list[str], source: dict[str, NominaEmpleado]) -> list[dict[str, str]]:
         items: list[dict[str, str]] = []
@@ -927,30 +1032,6 @@ class NominaComparisonService:
             return value
         return Decimal(str(value))
 
-    @staticmethod
-    def _avg(values: list[Decimal]) -> Decimal:
-        if not values:
-            return Decimal("0")
-        return sum(values) / Decimal(len(values))
-
-    @staticmethod
-    def _median(values: list[Decimal]) -> Decimal:
-        if not values:
-            return Decimal("0")
-        ordered = sorted(values)
-        middle = len(ordered) // 2
-        if len(ordered) % 2 == 0:
-            return (ordered[middle - 1] + ordered[middle]) / Decimal("2")
-        return ordered[middle]
-
-    @staticmethod
-    def _percentile(values: list[Decimal], percentile: int) -> Decimal:
-        if not values:
-            return Decimal("0")
-        ordered = sorted(values)
-        index = int((len(ordered) - 1) * (percentile / 100))
-        return ordered[index]
-
     @classmethod
     def _pct_delta(cls, current: Decimal, previous: Decimal) -> Decimal | None:
         if previous == Decimal("0"):
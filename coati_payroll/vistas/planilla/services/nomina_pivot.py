@@ -0,0 +1,108 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Employee x concept pivot of a nomina's details, shared by the Excel exports."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, Iterable
+
+from coati_payroll.excel_stream import STREAM_YIELD_PER
+from coati_payroll.model import db, NominaDetalle, NominaEmpleado
+
+
+class NominaPivot:
+    """Amounts of a nomina's details pivoted into one row per employee.
+
+    Columns are identified by a key chosen by the export (a concept id, a
+    code, ...) and numbered in order of first appearance. Each employee row is
+    a list of amounts indexed by column number; rows only grow up to the last
+    column the employee has, so missing trailing columns read as zero.
+    """
+
+    def __init__(self) -> None:
+        self.columnas: list[Hashable] = []
+        self.etiquetas: dict[Hashable, tuple[str, str]] = {}
+        self.filas: dict[str, list[float]] = {}
+        self._indice: dict[Hashable, int] = {}
+
+    def add(self, nomina_empleado_id: str, clave: Hashable, monto: float, etiqueta: tuple[str, str] = ("", "")) -> None:
+        """Add ``monto`` to the employee's ``clave`` column, creating the column if needed.
+
+        ``etiqueta`` is the (descripcion, codigo) of the column; the first one seen is kept.
+        """
+        indice = self._indice.get(clave)
+        if indice is None:
+            indice = self._indice[clave] = len(self.columnas)
+            self.columnas.append(clave)
+            self.etiquetas[clave] = etiqueta
+        fila = self.filas.setdefault(nomina_empleado_id, [])
+        if len(fila) <= indice:
+            fila.extend([0.0] * (indice + 1 - len(fila)))
+        fila[indice] += monto
+
+    def get(self, nomina_empleado_id: str, clave: Hashable) -> float:
+        """Amount of the employee in column ``clave`` (0.0 when absent)."""
+        indice = self._indice.get(clave)
+        fila = self.filas.get(nomina_empleado_id)
+        if indice is None or fila is None or indice >= len(fila):
+            return 0.0
+        return fila[indice]
+
+    def total(self, nomina_empleado_id: str, claves: Iterable[Hashable]) -> float:
+        """Sum of the employee's amounts over ``claves``."""
+        return sum(self.get(nomina_empleado_id, clave) for clave in claves)
+
+    def columns_where(self, condicion: Callable[[Hashable], bool]) -> list[Hashable]:
+        """Column keys matching ``condicion``, in order of first appearance."""
+        return [clave for clave in self.columnas if condicion(clave)]
+
+    @classmethod
+    def from_nomina(
+        cls,
+        nomina_id: str,
+        clave: Callable[[Any], Hashable | None],
+        tipos: Iterable[str] | None = None,
+    ) -> "NominaPivot":
+        """Pivot every detail of the nomina with a single query.
+
+        Args:
+            nomina_id: Nomina whose details are read
+            clave: Maps a detail row to its column key; rows mapped to None are skipped.
+                Rows expose nomina_empleado_id, tipo, codigo, descripcion, monto,
+                percepcion_id, deduccion_id and prestacion_id.
+            tipos: Only read details of these types (TipoDetalle values)
+
+        Returns:
+            The populated pivot
+        """
+        query = (
+            db.select(
+                NominaDetalle.nomina_empleado_id,
+                NominaDetalle.tipo,
+                NominaDetalle.codigo,
+                NominaDetalle.descripcion,
+                NominaDetalle.monto,
+                NominaDetalle.percepcion_id,
+                NominaDetalle.deduccion_id,
+                NominaDetalle.prestacion_id,
+            )
+            .join(NominaEmpleado, NominaEmpleado.id == NominaDetalle.nomina_empleado_id)
+            .filter(NominaEmpleado.nomina_id == nomina_id)
+            .order_by(NominaDetalle.nomina_empleado_id, NominaDetalle.orden)
+            .execution_options(yield_per=STREAM_YIELD_PER)
+        )
+        if tipos is not None:
+            query = query.filter(NominaDetalle.tipo.in_(list(tipos)))
+
+        pivot = cls()
+        for detalle in db.session.execute(query):
+            columna = clave(detalle)
+            if columna is None:
+                continue
+            pivot.add(
+                detalle.nomina_empleado_id,
+                columna,
+                float(detalle.monto or 0),
+                (detalle.descripcion or "", detalle.codigo or ""),
+            )
+        return pivot
@@ -13,6 +13,7 @@ from coati_payroll.enums import NominaEstado
 from coati_payroll.nomina_engine import NominaEngine
 from coati_payroll.queue import get_queue_driver
 from coati_payroll.queue.drivers.dramatiq_driver import DramatiqDriver
+from coati_payroll.vistas.planilla.services.nomina_comparison_service import NominaComparisonService
 
 
 class NominaService:
@@ -345,9 +346,10 @@ class NominaService:
                 db.session.commit()
 
                 # Enqueue background task
+                sharded = bool(current_app.config.get("BACKGROUND_PAYROLL_SHARDED", False))
                 try:
                     queue.enqueue(
-                        "process_large_payroll",
+                        "process_payroll_parallel" if sharded else "process_large_payroll",
                         nomina_id=nomina.id,
                         job_id=uuid4().hex,
                         planilla_id=planilla.id,
@@ -372,6 +374,8 @@ class NominaService:
         )
 
         nomina_result = engine.ejecutar()
+        if nomina_result:
+            NominaComparisonService.schedule_precompute(nomina_result)
         return nomina_result, engine.errors, warnings + list(engine.warnings or [])
 
     @staticmethod
@@ -392,13 +396,15 @@ class NominaService:
             NominaEmpleado,
             NominaDetalle,
             NominaNovedad,
+            NominaProgressEvento,
+            NominaShard,
             AdelantoAbono,
             ComprobanteContable,
             PrestacionAcumulada,
             VacationLedger,
             VacationAccount,
         )
-        from coati_payroll.vistas.planilla.services.nomina_comparison_service import NominaComparisonService
+        from coati_payroll.vacation_service import reconciliar_saldos_vacaciones
 
         # Store the original period and calculation date for consistency
         periodo_inicio = nomina.periodo_inicio
@@ -445,13 +451,8 @@ class NominaService:
                     .scalars()
                     .all()
                 )
+                reconciliar_saldos_vacaciones(account_ids)
                 for account in accounts:
-                    balance = db.session.execute(
-                        db.select(func.coalesce(func.sum(VacationLedger.quantity), 0)).where(
-                            VacationLedger.account_id == account.id
-                        )
-                    ).scalar_one()
-                    account.current_balance = Decimal(str(balance))
                     last_accrual = db.session.execute(
                         db.select(func.max(VacationLedger.fecha)).where(
                             VacationLedger.account_id == account.id,
@@ -517,6 +518,10 @@ class NominaService:
                 nomina_nueva_id=new_nomina.id,
             )
 
+            # Remove shard and progress bookkeeping of the old nomina.
+            db.session.execute(db.delete(NominaShard).where(NominaShard.nomina_id == nomina.id))
+            db.session.execute(db.delete(NominaProgressEvento).where(NominaProgressEvento.nomina_id == nomina.id))
+
             # Delete the old nomina record after moving linked novelties
             db.session.delete(nomina)
 
@@ -539,5 +544,6 @@ class NominaService:
             )
 
             db.session.commit()
+            NominaComparisonService.schedule_precompute(new_nomina)
 
         return new_nomina, engine.errors, warnings + list(engine.warnings or [])
@@ -15,7 +15,6 @@ from __future__ import annotations
 from datetime import date
 from decimal import Decimal
 from io import BytesIO
-from typing import Any, cast
 
 from flask import (
     Blueprint,
@@ -744,32 +743,16 @@ def generar_tabla_pago(prestamo: Adelanto) -> list[dict]:
         - capital: Principal portion
         - saldo: Remaining balance
     """
-    if not prestamo.cuotas_pactadas or prestamo.cuotas_pactadas <= 0:
-        return []
+    from coati_payroll.interes_engine import _obtener_config_default, generar_tabla_amortizacion, parametros_prestamo
 
-    monto_base = prestamo.monto_aprobado or prestamo.monto_solicitado
-    if not monto_base or monto_base <= 0:
+    parametros = parametros_prestamo(prestamo)
+    if parametros is None:
         return []
 
-    # Determine start date
-    fecha_inicio = prestamo.fecha_aprobacion or prestamo.fecha_solicitud or date.today()
-
-    # Import interest engine
-    from coati_payroll.interes_engine import generar_tabla_amortizacion
-
-    # Get interest rate and type
-    tasa_interes = prestamo.tasa_interes or Decimal("0.0000")
-    tipo_interes = prestamo.tipo_interes or "ninguno"
-    metodo_amortizacion = prestamo.metodo_amortizacion or "frances"
-
     # Generate amortization schedule using the interest engine
     cuotas = generar_tabla_amortizacion(
-        principal=monto_base,
-        tasa_anual=tasa_interes,
-        num_cuotas=prestamo.cuotas_pactadas,
-        fecha_inicio=fecha_inicio,
-        metodo=cast(Any, metodo_amortizacion),
-        tipo_interes=cast(Any, tipo_interes),
+        *parametros,
+        config=_obtener_config_default(prestamo.empleado.empresa_id if prestamo.empleado else None),
     )
 
     # Convert to dict format for template
@@ -16,6 +16,7 @@ from coati_payroll.i18n import _
 from coati_payroll.model import db, Report, ReportRole, ReportExecution, ReportAudit
 from coati_payroll.rbac import require_read_access, require_role
 from coati_payroll.report_engine import (
+    InvalidCursorError,
     ReportExecutionManager,
     can_view_report,
     can_execute_report,
@@ -201,25 +202,30 @@ def run_report(report_id: str):
     # Get parameters from request
     parameters = request.get_json() or {}
 
-    # Get pagination parameters
+    # Get pagination parameters; a cursor from the previous page takes precedence over the page number
     page = parameters.pop("page", 1)
     per_page = parameters.pop("per_page", 100)
+    cursor = parameters.pop("cursor", None)
 
     try:
         # Execute report
         manager = ReportExecutionManager(report, current_user.usuario)
-        results, total_count, execution = manager.execute(parameters, page, per_page)
+        report_page, execution = manager.execute_page(parameters, cursor=cursor, per_page=per_page, page=page)
 
         return jsonify(
             {
                 "success": True,
-                "results": results,
-                "total_count": total_count,
+                "results": report_page.results,
+                "total_count": report_page.total_count,
+                "next_cursor": report_page.next_cursor,
                 "execution_id": execution.id,
                 "execution_time_ms": execution.execution_time_ms,
             }
         )
 
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
+
     except Exception as e:
         log.error("Error executing report: %s", e)
         return jsonify({"error": str(e)}), 500
@@ -252,17 +258,18 @@ def export_report(report_id: str, export_format: str):
     parameters = request.get_json() or {}
 
     try:
-        # Execute report (get all results, no pagination for export)
+        if export_format not in ("excel", "csv"):
+            return jsonify({"error": "Invalid format"}), 400
+
+        # Execute report (all results, no pagination), streaming rows into the file
         manager = ReportExecutionManager(report, current_user.usuario)
-        results, _total_count, execution = manager.execute(parameters, page=1, per_page=50000)
+        results, total_count, execution = manager.execute_stream(parameters)
 
         # Export based on format
         if export_format == "excel":
-            file_path = export_report_to_excel(report.name, results)
-        elif export_format == "csv":
-            file_path = export_report_to_csv(report.name, results)
+            file_path = export_report_to_excel(report.name, results, total_count=total_count)
         else:
-            return jsonify({"error": "Invalid format"}), 400
+            file_path = export_report_to_csv(report.name, results, total_count=total_count)
 
         # Update execution record with export info
         execution.export_file_path = file_path
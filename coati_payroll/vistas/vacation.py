@@ -28,6 +28,7 @@ from coati_payroll.model import (
     Empresa,
 )
 from coati_payroll.rbac import require_role, require_read_access, require_write_access
+from coati_payroll.vacation_service import registrar_asiento
 
 vacation_bp = Blueprint("vacation", __name__, url_prefix="/vacation")
 
@@ -272,14 +273,57 @@ def account_new():
     from coati_payroll.forms import VacationAccountForm
 
     form = VacationAccountForm()
+    # Populate employee and policy choices before validating
+    empleados = (
+        db.session.execute(
+            db.select(Empleado)
+            .filter(Empleado.activo.is_(True))
+            .order_by(Empleado.primer_apellido, Empleado.primer_nombre)
+        )
+        .scalars()
+        .all()
+    )
+    form.empleado_id.choices = [("", _("-- Seleccionar Empleado --"))] + [
+        (e.id, f"{e.codigo_empleado} - {e.primer_nombre} {e.primer_apellido}") for e in empleados
+    ]
+    politicas = (
+        db.session.execute(
+            db.select(VacationPolicy).filter(VacationPolicy.activo.is_(True)).order_by(VacationPolicy.nombre)
+        )
+        .scalars()
+        .all()
+    )
+    form.policy_id.choices = [("", _("-- Seleccionar Política --"))] + [
+        (p.id, f"{p.codigo} - {p.nombre}") for p in politicas
+    ]
 
     if form.validate_on_submit():
         account = VacationAccount()
         form.populate_obj(account)
         account.creado_por = current_user.usuario
 
+        # The opening balance is recorded as a ledger entry, like every other balance change
+        saldo_inicial = Decimal(str(account.current_balance or 0))
+        account.current_balance = Decimal("0.0000")
+        account.ledger_version = 0
+
         db.session.add(account)
         try:
+            if saldo_inicial:
+                db.session.flush()
+                ledger_entry = VacationLedger(
+                    account_id=account.id,
+                    empleado_id=account.empleado_id,
+                    fecha=date.today(),
+                    entry_type=VacationLedgerType.ADJUSTMENT,
+                    quantity=saldo_inicial,
+                    source="initial_balance",
+                    reference_type="manual",
+                    observaciones="Saldo inicial al crear la cuenta",
+                    creado_por=current_user.usuario,
+                )
+                registrar_asiento(account, ledger_entry)
+                db.session.add(ledger_entry)
             db.session.commit()
             flash(_("Cuenta de vacaciones creada exitosamente."), "success")
             return redirect(url_for("vacation.account_detail", account_id=account.id))
@@ -846,6 +890,7 @@ def initial_balance_form():
 
         # Set account balance to initial balance
         account.current_balance = saldo_inicial
+        account.ledger_version = 1
         account.last_accrual_date = fecha_corte
         account.modificado_por = current_user.usuario
 
@@ -987,6 +1032,7 @@ def initial_balance_bulk():
 
                     # Set account balance to initial balance
                     account.current_balance = Decimal(str(saldo_inicial))
+                    account.ledger_version = 1
                     account.last_accrual_date = fecha_corte
                     account.modificado_por = current_user.usuario
 
@@ -3,11 +3,15 @@
 """Factory functions for creating test data."""
 
 from tests.factories.company_factory import create_company
-from tests.factories.employee_factory import create_employee
+from tests.factories.employee_factory import create_employee, create_employees
+from tests.factories.payroll_dataset_factory import create_payroll_dataset, PayrollDataset
 from tests.factories.user_factory import create_user
 
 __all__ = [
     "create_user",
     "create_employee",
+    "create_employees",
+    "create_payroll_dataset",
+    "PayrollDataset",
     "create_company",
 ]
@@ -64,3 +64,54 @@ def create_employee(
     db_session.refresh(empleado)
 
     return empleado
+
+
+def create_employees(
+    db_session,
+    empresa_id,
+    salarios,
+    codigo_prefijo,
+    inicio=0,
+    moneda_id=None,
+    fecha_alta=None,
+    creado_por=None,
+):
+    """
+    Create one employee per salary in a single flush.
+
+    Codes and personal IDs are ``<codigo_prefijo>-<n>`` with ``n`` counted from
+    ``inicio``, so large sets can be created chunk by chunk. The session is
+    flushed but not committed.
+
+    Args:
+        db_session: SQLAlchemy session
+        empresa_id: ID of the company (required)
+        salarios: Base salary of each employee to create
+        codigo_prefijo: Prefix of the employee codes
+        inicio: Number of the first employee (default: 0)
+        moneda_id: Salary currency (optional)
+        fecha_alta: Hire date (default: today)
+        creado_por: Audit user (optional)
+
+    Returns:
+        list[Empleado]: Created employees with IDs assigned
+    """
+    empleados = [
+        Empleado(
+            empresa_id=empresa_id,
+            codigo_empleado=f"{codigo_prefijo}-{n:06d}",
+            primer_nombre="Empleado",
+            primer_apellido=f"Apellido {n}",
+            identificacion_personal=f"{codigo_prefijo}-{n:06d}",
+            fecha_alta=fecha_alta or date.today(),
+            salario_base=salario,
+            moneda_id=moneda_id,
+            activo=True,
+            creado_por=creado_por,
+        )
+        for n, salario in enumerate(salarios, start=inicio)
+    ]
+    db_session.add_all(empleados)
+    db_session.flush()
+
+    return empleados
@@ -0,0 +1,302 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Factory functions for creating complete synthetic planillas.
+
+Used by engine tests and by the payroll benchmarks. Every dataset gets
+its own company, payroll type, planilla and concepts, all coded with a
+unique ``BENCH-<tag>`` prefix, so several datasets can live in the same
+scratch database. Salaries and loans come from a seeded
+random generator: the same parameters always build the same planilla.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+from coati_payroll.enums import AccrualFrequency, AccrualMethod, AdelantoEstado, VacationUnitType
+from coati_payroll.formula_engine_examples import EXAMPLE_PROGRESSIVE_TAX_SCHEMA
+from coati_payroll.model import (
+    Adelanto,
+    Deduccion,
+    Moneda,
+    Percepcion,
+    Planilla,
+    PlanillaDeduccion,
+    PlanillaEmpleado,
+    PlanillaIngreso,
+    PlanillaPrestacion,
+    Prestacion,
+    ReglaCalculo,
+    TipoPlanilla,
+    VacationPolicy,
+    generador_de_codigos_unicos,
+)
+from tests.factories.company_factory import create_company
+from tests.factories.employee_factory import create_employees
+
+# Rows added to the session before each flush while building employees.
+CHUNK_SIZE = 500
+
+# Concept kinds, cycled when more concepts than kinds are requested. The
+# tax kinds run the example progressive tax schema through the formula
+# engine, once as an inline formula and once as a ReglaCalculo.
+PERCEPTION_KINDS = ("fixed", "salary_percentage")
+DEDUCTION_KINDS = ("social_security", "formula_tax", "rule_tax", "fixed")
+BENEFIT_KINDS = ("salary_percentage", "fixed")
+
+CREADO_POR = "payroll-bench"
+
+
+@dataclass
+class PayrollDataset:
+    """Identifiers and sizes of a synthetic planilla."""
+
+    tag: str
+    planilla_id: str
+    empleados: int
+    percepciones: int
+    deducciones: int
+    prestaciones: int
+    prestamos: int
+    vacaciones: bool
+
+    def to_dict(self) -> dict:
+        return {
+            "tag": self.tag,
+            "empleados": self.empleados,
+            "percepciones": self.percepciones,
+            "deducciones": self.deducciones,
+            "prestaciones": self.prestaciones,
+            "prestamos": self.prestamos,
+            "vacaciones": self.vacaciones,
+        }
+
+
+def create_payroll_dataset(
+    db_session,
+    empleados: int,
+    percepciones: int = 3,
+    deducciones: int = 4,
+    prestaciones: int = 2,
+    loan_ratio: float = 0.25,
+    vacaciones: bool = True,
+    seed: int = 42,
+) -> PayrollDataset:
+    """Create a synthetic planilla with its employees, concepts, loans and vacation policy.
+
+    Must run inside an application context. Commits when done.
+
+    Args:
+        db_session: SQLAlchemy session
+        empleados: Number of active employees in the planilla.
+        percepciones: Perceptions assigned to the planilla.
+        deducciones: Deductions assigned to the planilla (social security,
+            formula tax, calculation-rule tax and fixed, cycled).
+        prestaciones: Employer benefits assigned to the planilla.
+        loan_ratio: Share of employees with an approved loan.
+        vacaciones: Whether to attach a monthly vacation accrual policy.
+        seed: Seed of the random generator for salaries and loans.
+
+    Returns:
+        The dataset description, with the planilla ID to run.
+    """
+    rng = random.Random(seed)
+    tag = generador_de_codigos_unicos()[-8:]
+    prefijo = f"BENCH-{tag}"
+
+    moneda = db_session.query(Moneda).filter_by(codigo="NIO").one_or_none()
+    if moneda is None:
+        moneda = Moneda(codigo="NIO", nombre="Córdoba", simbolo="C$", activo=True)
+        db_session.add(moneda)
+
+    empresa = create_company(db_session, codigo=prefijo, razon_social=f"Benchmark {tag}", ruc=prefijo)
+    tipo_planilla = TipoPlanilla(
+        codigo=prefijo,
+        descripcion="Benchmark mensual",
+        periodicidad="monthly",
+        dias=30,
+        periodos_por_anio=12,
+        mes_inicio_fiscal=1,
+        dia_inicio_fiscal=1,
+    )
+    db_session.add(tipo_planilla)
+    db_session.flush()
+
+    planilla = Planilla(
+        nombre=f"Planilla {prefijo}",
+        tipo_planilla_id=tipo_planilla.id,
+        empresa_id=empresa.id,
+        moneda_id=moneda.id,
+        activo=True,
+        creado_por=CREADO_POR,
+    )
+    db_session.add(planilla)
+    db_session.flush()
+
+    _add_perceptions(db_session, planilla, prefijo, percepciones)
+    _add_deductions(db_session, planilla, prefijo, deducciones)
+    _add_benefits(db_session, planilla, prefijo, prestaciones)
+    if vacaciones:
+        db_session.add(
+            VacationPolicy(
+                planilla_id=planilla.id,
+                codigo=f"{prefijo}-VAC",
+                nombre="Benchmark vacation policy",
+                accrual_method=AccrualMethod.PERIODIC,
+                accrual_rate=Decimal("2.50"),
+                accrual_frequency=AccrualFrequency.MONTHLY,
+                unit_type=VacationUnitType.DAYS,
+                min_service_days=0,
+                partial_units_allowed=True,
+                activo=True,
+                creado_por=CREADO_POR,
+            )
+        )
+
+    deduccion_prestamo = Deduccion(
+        codigo=f"{prefijo}-LOAN",
+        nombre="Préstamo",
+        tipo="loan",
+        formula_tipo="fixed",
+        antes_impuesto=False,
+        activo=True,
+        creado_por=CREADO_POR,
+    )
+    db_session.add(deduccion_prestamo)
+    db_session.flush()
+
+    prestamos = 0
+    for inicio in range(0, empleados, CHUNK_SIZE):
+        fin = min(inicio + CHUNK_SIZE, empleados)
+        salarios = [Decimal(rng.randrange(800_000, 12_000_000)) / 100 for _ in range(inicio, fin)]
+        lote = create_employees(
+            db_session,
+            empresa.id,
+            salarios,
+            prefijo,
+            inicio=inicio,
+            moneda_id=moneda.id,
+            fecha_alta=date(2020, 1, 1),
+            creado_por=CREADO_POR,
+        )
+
+        for empleado in lote:
+            db_session.add(PlanillaEmpleado(planilla_id=planilla.id, empleado_id=empleado.id, activo=True))
+            if rng.random() < loan_ratio:
+                monto = Decimal(rng.randrange(500_000, 5_000_000)) / 100
+                db_session.add(
+                    Adelanto(
+                        empleado_id=empleado.id,
+                        deduccion_id=deduccion_prestamo.id,
+                        tipo="loan",
+                        estado=AdelantoEstado.APROBADO,
+                        monto_solicitado=monto,
+                        monto_aprobado=monto,
+                        saldo_pendiente=monto,
+                        cuotas_pactadas=12,
+                        monto_por_cuota=(monto / 12).quantize(Decimal("0.01")),
+                        moneda_id=moneda.id,
+                        fecha_aprobacion=date(2024, 12, 1),
+                        creado_por=CREADO_POR,
+                    )
+                )
+                prestamos += 1
+        db_session.flush()
+        db_session.expunge_all()
+
+    db_session.commit()
+    return PayrollDataset(
+        tag=tag,
+        planilla_id=planilla.id,
+        empleados=empleados,
+        percepciones=percepciones,
+        deducciones=deducciones,
+        prestaciones=prestaciones,
+        prestamos=prestamos,
+        vacaciones=vacaciones,
+    )
+
+
+def _add_perceptions(db_session, planilla: Planilla, prefijo: str, cantidad: int) -> None:
+    for i in range(cantidad):
+        kind = PERCEPTION_KINDS[i % len(PERCEPTION_KINDS)]
+        percepcion = Percepcion(
+            codigo=f"{prefijo}-P{i}",
+            nombre=f"Percepción {i}",
+            formula_tipo=kind,
+            monto_default=Decimal("500.00") if kind == "fixed" else None,
+            porcentaje=Decimal("5.00") if kind == "salary_percentage" else None,
+            gravable=True,
+            activo=True,
+            creado_por=CREADO_POR,
+        )
+        db_session.add(percepcion)
+        db_session.flush()
+        db_session.add(PlanillaIngreso(planilla_id=planilla.id, percepcion_id=percepcion.id, orden=i, activo=True))
+
+
+def _add_deductions(db_session, planilla: Planilla, prefijo: str, cantidad: int) -> None:
+    for i in range(cantidad):
+        kind = DEDUCTION_KINDS[i % len(DEDUCTION_KINDS)]
+        deduccion = Deduccion(
+            codigo=f"{prefijo}-D{i}",
+            nombre=f"Deducción {i}",
+            tipo="tax" if kind.endswith("_tax") else "general",
+            es_impuesto=kind.endswith("_tax"),
+            antes_impuesto=kind == "social_security",
+            formula_tipo={
+                "social_security": "salary_percentage",
+                "formula_tax": "formula",
+                "rule_tax": "calculation_rule",
+                "fixed": "fixed",
+            }[kind],
+            porcentaje=Decimal("7.00") if kind == "social_security" else None,
+            monto_default=Decimal("100.00") if kind == "fixed" else None,
+            formula=EXAMPLE_PROGRESSIVE_TAX_SCHEMA if kind == "formula_tax" else {},
+            recurrente=True,
+            activo=True,
+            creado_por=CREADO_POR,
+        )
+        db_session.add(deduccion)
+        db_session.flush()
+        if kind == "rule_tax":
+            db_session.add(
+                ReglaCalculo(
+                    codigo=f"{prefijo}-R{i}",
+                    nombre=f"Regla {i}",
+                    version="1.0.0",
+                    tipo_regla="tax",
+                    vigente_desde=date(2020, 1, 1),
+                    activo=True,
+                    esquema_json=EXAMPLE_PROGRESSIVE_TAX_SCHEMA,
+                    deduccion_id=deduccion.id,
+                    creado_por=CREADO_POR,
+                )
+            )
+        db_session.add(
+            PlanillaDeduccion(
+                planilla_id=planilla.id, deduccion_id=deduccion.id, prioridad=10 * (i + 1), activo=True
+            )
+        )
+
+
+def _add_benefits(db_session, planilla: Planilla, prefijo: str, cantidad: int) -> None:
+    for i in range(cantidad):
+        kind = BENEFIT_KINDS[i % len(BENEFIT_KINDS)]
+        prestacion = Prestacion(
+            codigo=f"{prefijo}-B{i}",
+            nombre=f"Prestación {i}",
+            formula_tipo=kind,
+            monto_default=Decimal("250.00") if kind == "fixed" else None,
+            porcentaje=Decimal("8.33") if kind == "salary_percentage" else None,
+            activo=True,
+            creado_por=CREADO_POR,
+        )
+        db_session.add(prestacion)
+        db_session.flush()
+        db_session.add(
+            PlanillaPrestacion(planilla_id=planilla.id, prestacion_id=prestacion.id, orden=i, activo=True)
+        )
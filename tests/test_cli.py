@@ -829,6 +829,7 @@ def test_users_cache_maintenance_debug_and_serve_commands(app, monkeypatch):
     monkeypatch.setattr(cli, "_cache_clear", lambda: None)
     monkeypatch.setattr(cli, "_cache_warm", lambda: "es")
     monkeypatch.setattr(cli, "_cache_status", lambda: {"language_cache": "populated"})
+    monkeypatch.setattr(cli, "_maintenance_reconcile_vacations", lambda _fix: [])
     monkeypatch.setattr(cli, "_debug_config", lambda _app: {"DEBUG": False})
     monkeypatch.setattr(cli, "_debug_routes", lambda _app: [{"path": "/", "methods": ["GET"]}])
 
@@ -848,6 +849,7 @@ def test_users_cache_maintenance_debug_and_serve_commands(app, monkeypatch):
         ["maintenance", "cleanup-sessions"],
         ["maintenance", "cleanup-temp"],
         ["maintenance", "run-jobs"],
+        ["maintenance", "reconcile-vacations", "--check-only"],
         ["debug", "config"],
         ["debug", "routes"],
     ]:
@@ -0,0 +1,138 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Tests for NominaEmpleado/NominaDetalle persistence."""
+
+from datetime import date
+from decimal import Decimal
+
+from coati_payroll.enums import NominaEstado, TipoDetalle
+from coati_payroll.model import (
+    Empleado,
+    Empresa,
+    Moneda,
+    Nomina,
+    NominaDetalle,
+    NominaEmpleado,
+    Planilla,
+    TipoPlanilla,
+)
+from coati_payroll.nomina_engine.domain.calculation_items import DeduccionItem, PercepcionItem, PrestacionItem
+from coati_payroll.nomina_engine.domain.employee_calculation import EmpleadoCalculo
+from coati_payroll.nomina_engine.processors import accounting_processor
+from coati_payroll.nomina_engine.processors.accounting_processor import AccountingProcessor
+
+
+def _setup(db_session, empleados=3):
+    moneda = Moneda(codigo="NIO", nombre="Córdoba", simbolo="C$", activo=True)
+    empresa = Empresa(codigo="TEST", razon_social="Test Company", ruc="123", activo=True)
+    db_session.add_all([moneda, empresa])
+    db_session.flush()
+
+    tipo_planilla = TipoPlanilla(
+        codigo="MENSUAL",
+        descripcion="Mensual",
+        periodicidad="monthly",
+        dias=30,
+        periodos_por_anio=12,
+        mes_inicio_fiscal=1,
+        dia_inicio_fiscal=1,
+    )
+    db_session.add(tipo_planilla)
+    db_session.flush()
+
+    planilla = Planilla(
+        nombre="Test Planilla",
+        tipo_planilla_id=tipo_planilla.id,
+        empresa_id=empresa.id,
+        moneda_id=moneda.id,
+        activo=True,
+    )
+    db_session.add(planilla)
+    db_session.flush()
+
+    nomina = Nomina(
+        planilla_id=planilla.id,
+        periodo_inicio=date(2025, 1, 1),
+        periodo_fin=date(2025, 1, 31),
+        estado=NominaEstado.CALCULANDO,
+    )
+    db_session.add(nomina)
+
+    calculos = []
+    for i in range(empleados):
+        empleado = Empleado(
+            codigo_empleado=f"EMP{i}",
+            primer_nombre="Nombre",
+            primer_apellido=f"Apellido{i}",
+            identificacion_personal=f"ID-EMP{i}",
+            fecha_alta=date(2024, 1, 1),
+            salario_base=Decimal("10000.00"),
+            moneda_id=moneda.id,
+            empresa_id=empresa.id,
+            cargo="Analista",
+            activo=True,
+        )
+        db_session.add(empleado)
+        db_session.flush()
+
+        emp_calculo = EmpleadoCalculo(empleado, planilla)
+        emp_calculo.salario_base = Decimal("10000.00")
+        emp_calculo.salario_bruto = Decimal("10500.00")
+        emp_calculo.total_percepciones = Decimal("500.00")
+        emp_calculo.total_deducciones = Decimal("700.00")
+        emp_calculo.salario_neto = Decimal("9800.00")
+        emp_calculo.percepciones = [PercepcionItem("BONO", "Bono", Decimal("500.00"), 1, True, None)]
+        emp_calculo.deducciones = [
+            DeduccionItem("INSS", "INSS", Decimal("650.00"), 1, True, None, "deduccion"),
+            DeduccionItem("CUOTA", "Cuota", Decimal("50.00"), 2, False, None, "prestamo"),
+        ]
+        emp_calculo.prestaciones = [PrestacionItem("INATEC", "INATEC", Decimal("210.00"), 1, None)]
+        calculos.append(emp_calculo)
+    return nomina, calculos
+
+
+class TestBulkPersistence:
+    """Tests for the bulk NominaEmpleado/NominaDetalle write path."""
+
+    def test_bulk_insert_matches_single_insert(self, app, db_session):
+        with app.app_context():
+            nomina, calculos = _setup(db_session, empleados=2)
+            processor = AccountingProcessor()
+
+            single = processor.create_nomina_empleado(calculos[0], nomina)
+            (bulk,) = processor.create_nomina_empleados_bulk(calculos[1:], nomina)
+            db_session.commit()
+
+            campos = ("salario_bruto", "total_ingresos", "total_deducciones", "salario_neto", "cargo_snapshot")
+            assert [getattr(bulk, campo) for campo in campos] == [getattr(single, campo) for campo in campos]
+            assert bulk.timestamp is not None
+
+            def detalles(nomina_empleado):
+                rows = (
+                    db_session.query(NominaDetalle)
+                    .filter_by(nomina_empleado_id=nomina_empleado.id)
+                    .order_by(NominaDetalle.orden)
+                    .all()
+                )
+                return [(d.tipo, d.codigo, d.monto, d.orden) for d in rows]
+
+            assert detalles(bulk) == detalles(single)
+            assert [tipo for tipo, *_ in detalles(bulk)] == [
+                TipoDetalle.INGRESO,
+                TipoDetalle.DEDUCCION,
+                TipoDetalle.DEDUCCION,
+                TipoDetalle.PRESTACION,
+            ]
+
+    def test_bulk_insert_spans_chunks_and_keeps_order(self, app, db_session, monkeypatch):
+        monkeypatch.setattr(accounting_processor, "BULK_CHUNK_SIZE", 2)
+        with app.app_context():
+            nomina, calculos = _setup(db_session, empleados=5)
+
+            nomina_empleados = AccountingProcessor().create_nomina_empleados_bulk(calculos, nomina)
+            db_session.commit()
+
+            assert [ne.empleado_id for ne in nomina_empleados] == [c.empleado.id for c in calculos]
+            assert db_session.query(NominaEmpleado).filter_by(nomina_id=nomina.id).count() == 5
+            assert db_session.query(NominaDetalle).count() == 20
+            assert len(nomina.nomina_empleados) == 5
@@ -17,6 +17,7 @@ from datetime import date, datetime, timezone
 from decimal import Decimal
 
 import pytest
+from sqlalchemy import event
 
 from coati_payroll.model import (
     db,
@@ -867,6 +868,148 @@ class TestAccountingVoucherGeneration:
             assert loan_haber.codigo_cuenta == "1301"  # Loan control
             assert loan_haber.credito == Decimal("1000.00")
 
+    def test_generate_voucher_queries_do_not_grow_with_employees(self, app, db_session):
+        """Test that detail lines, concepts and loans are loaded set-based, not per employee."""
+        with app.app_context():
+            moneda = Moneda(codigo="NIO", nombre="Córdoba", simbolo="C$", activo=True)
+            db_session.add(moneda)
+            empresa = Empresa(codigo="TEST001", razon_social="Test Company SA", ruc="J-12345678")
+            db_session.add(empresa)
+            db_session.flush()
+
+            tipo_planilla = TipoPlanilla(
+                codigo="MENSUAL",
+                descripcion="Mensual",
+                periodicidad="monthly",
+                dias=30,
+                periodos_por_anio=12,
+                mes_inicio_fiscal=1,
+                dia_inicio_fiscal=1,
+            )
+            db_session.add(tipo_planilla)
+            db_session.flush()
+
+            planilla = Planilla(
+                nombre="Planilla Test",
+                tipo_planilla_id=tipo_planilla.id,
+                empresa_id=empresa.id,
+                moneda_id=moneda.id,
+                activo=True,
+                codigo_cuenta_debe_salario="5101",
+                codigo_cuenta_haber_salario="2101",
+            )
+            percepcion = Percepcion(
+                codigo="BONO",
+                nombre="Bono",
+                formula_tipo="fixed",
+                activo=True,
+                contabilizable=True,
+                codigo_cuenta_debe="5102",
+                codigo_cuenta_haber="2102",
+            )
+            deduccion_prestamo = Deduccion(
+                codigo="PREST", nombre="Préstamo", formula_tipo="fixed", activo=True, contabilizable=True
+            )
+            db_session.add_all([planilla, percepcion, deduccion_prestamo])
+            db_session.flush()
+
+            nomina = Nomina(
+                planilla_id=planilla.id,
+                periodo_inicio=date(2024, 12, 1),
+                periodo_fin=date(2024, 12, 31),
+                estado=NominaEstado.GENERADO,
+            )
+            db_session.add(nomina)
+            db_session.flush()
+
+            for i in range(6):
+                empleado = Empleado(
+                    codigo_empleado=f"EMP{i:03d}",
+                    primer_nombre="Nombre",
+                    primer_apellido=f"Apellido{i}",
+                    identificacion_personal=f"ID-{i}",
+                    fecha_alta=date(2024, 1, 1),
+                    salario_base=Decimal("15000.00"),
+                    moneda_id=moneda.id,
+                    empresa_id=empresa.id,
+                    activo=True,
+                )
+                db_session.add(empleado)
+                db_session.flush()
+                db_session.add(
+                    Adelanto(
+                        empleado_id=empleado.id,
+                        deduccion_id=deduccion_prestamo.id,
+                        tipo="loan",
+                        monto_aprobado=Decimal("10000.00"),
+                        saldo_pendiente=Decimal("8000.00"),
+                        cuotas_pactadas=10,
+                        monto_por_cuota=Decimal("1000.00"),
+                        estado=AdelantoEstado.APLICADO,
+                        cuenta_haber="1301",
+                    )
+                )
+                nomina_empleado = NominaEmpleado(
+                    nomina_id=nomina.id,
+                    empleado_id=empleado.id,
+                    salario_bruto=Decimal("15500.00"),
+                    total_deducciones=Decimal("1000.00"),
+                    salario_neto=Decimal("14500.00"),
+                    sueldo_base_historico=Decimal("15000.00"),
+                )
+                db_session.add(nomina_empleado)
+                db_session.flush()
+                db_session.add_all(
+                    [
+                        NominaDetalle(
+                            nomina_empleado_id=nomina_empleado.id,
+                            tipo="income",
+                            codigo="BONO",
+                            monto=Decimal("500.00"),
+                            orden=1,
+                            percepcion_id=percepcion.id,
+                        ),
+                        NominaDetalle(
+                            nomina_empleado_id=nomina_empleado.id,
+                            tipo="deduction",
+                            codigo="PREST",
+                            descripcion="Cuota Préstamo",
+                            monto=Decimal("1000.00"),
+                            orden=2,
+                            deduccion_id=deduccion_prestamo.id,
+                        ),
+                    ]
+                )
+            db_session.commit()
+
+            consultas = []
+
+            def contar(_conn, _cursor, statement, *_args):
+                consultas.append(statement)
+
+            event.listen(db.engine, "before_cursor_execute", contar)
+            try:
+                comprobante = AccountingVoucherService(db_session).generate_audit_voucher(nomina, planilla)
+                db_session.flush()
+            finally:
+                event.remove(db.engine, "before_cursor_execute", contar)
+
+            # Validation, header and set-based loads: independent of the 6 employees
+            assert len(consultas) < 25
+            lineas = (
+                db_session.query(ComprobanteContableLinea)
+                .filter_by(comprobante_id=comprobante.id)
+                .order_by(ComprobanteContableLinea.orden)
+                .all()
+            )
+            assert len(lineas) == 6 * 6
+            assert [linea.orden for linea in lineas] == list(range(1, 37))
+            assert sum(1 for linea in lineas if linea.tipo_concepto == "loan" and linea.codigo_cuenta == "1301") == 6
+            assert sum(1 for linea in lineas if linea.tipo_concepto == "percepcion") == 12
+            assert comprobante.total_debitos == Decimal("6") * Decimal("16500.00")
+            assert comprobante.balance == Decimal("0.00")
+
+
 
 class TestAccountingVoucherSummarization:
     """Tests for voucher summarization and netting."""
@@ -1069,6 +1212,55 @@ class TestAccountingVoucherSummarization:
             assert entry["credito"] == Decimal("15000.00")
 
 
+    def test_line_integrity_rounds_amounts_before_checking(self, app, db_session):
+        """A debit that rounds to zero is reported even though its raw value is positive."""
+        with app.app_context():
+            moneda = Moneda(codigo="NIO", nombre="Córdoba", simbolo="C$", activo=True)
+            db_session.add(moneda)
+            db_session.flush()
+
+            comprobante = ComprobanteContable(
+                nomina_id="test_nomina_id",
+                fecha_calculo=date(2024, 12, 31),
+                concepto="Test Voucher",
+                moneda_id=moneda.id,
+                total_debitos=Decimal("0.00"),
+                total_creditos=Decimal("0.00"),
+                balance=Decimal("0.00"),
+            )
+            db_session.add(comprobante)
+            db_session.flush()
+            for orden, (tipo, debito, credito) in enumerate(
+                [("debito", Decimal("0.004"), Decimal("0.00")), ("credito", Decimal("0.00"), Decimal("25.00"))]
+            ):
+                db_session.add(
+                    ComprobanteContableLinea(
+                        comprobante_id=comprobante.id,
+                        nomina_empleado_id="ne1",
+                        empleado_id="emp1",
+                        empleado_codigo="EMP001",
+                        empleado_nombre="Juan Pérez",
+                        codigo_cuenta="5101",
+                        descripcion_cuenta="Gasto por Salario",
+                        centro_costos="CC-01",
+                        tipo_debito_credito=tipo,
+                        debito=debito,
+                        credito=credito,
+                        monto_calculado=debito + credito,
+                        concepto="Test",
+                        tipo_concepto="salario_base",
+                        concepto_codigo="SALARIO",
+                        orden=orden,
+                    )
+                )
+            db_session.commit()
+
+            service = AccountingVoucherService(db_session)
+            with pytest.raises(ValueError, match="debe contener solo débito o crédito") as error:
+                service.validate_line_integrity(comprobante)
+            assert "25.00" not in str(error.value)
+
+
 class TestAccountingAuditTrail:
     """Tests for audit trail tracking."""
 
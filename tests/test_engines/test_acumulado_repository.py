@@ -5,7 +5,7 @@
 from datetime import date
 from decimal import Decimal
 
-from coati_payroll.model import Empleado, Empresa, Moneda, TipoPlanilla, db
+from coati_payroll.model import AcumuladoAnual, Empleado, Empresa, Moneda, TipoPlanilla, db
 from coati_payroll.nomina_engine.repositories.acumulado_repository import AcumuladoRepository
 
 
@@ -149,3 +149,105 @@ class TestAcumuladoRepository:
             )
 
             assert acumulado.periodos_procesados == 6
+
+    def test_apply_deltas_inserts_missing_rows_and_increments_existing(self, app, db_session):
+        """It should bootstrap missing rows and add a period to every row in set-based statements."""
+        with app.app_context():
+            moneda = Moneda(codigo="NIO", nombre="Cordoba", simbolo="C$", activo=True)
+            db_session.add(moneda)
+
+            empresa = Empresa(
+                codigo="TEST003",
+                razon_social="Test Corp 3",
+                ruc="1122334",
+                primer_mes_nomina=3,
+                primer_anio_nomina=2025,
+            )
+            db_session.add(empresa)
+            db_session.flush()
+
+            tipo_planilla = TipoPlanilla(
+                codigo="MENSUAL",
+                descripcion="Mensual",
+                periodicidad="monthly",
+                dias=30,
+                periodos_por_anio=12,
+                mes_inicio_fiscal=1,
+                dia_inicio_fiscal=1,
+            )
+            db_session.add(tipo_planilla)
+            db_session.flush()
+
+            empleados = []
+            for i in range(2):
+                empleado = Empleado(
+                    codigo_empleado=f"EMP10{i}",
+                    primer_nombre="Ir",
+                    primer_apellido=f"Lote{i}",
+                    identificacion_personal=f"001-010180-010{i}A",
+                    fecha_alta=date(2024, 1, 1),
+                    salario_base=Decimal("10000.00"),
+                    moneda_id=moneda.id,
+                    empresa_id=empresa.id,
+                    activo=True,
+                    salario_acumulado=Decimal("20000.00"),
+                    impuesto_acumulado=Decimal("300.00"),
+                )
+                db_session.add(empleado)
+                empleados.append(empleado)
+            db_session.flush()
+            existente, nuevo = empleados
+
+            repo = AcumuladoRepository(db.session)
+            clave = (tipo_planilla.id, empresa.id, date(2025, 1, 1))
+            valores = repo.initial_values(existente, *clave)
+            valores.update(
+                salario_bruto_acumulado=Decimal("5000.00"),
+                salario_acumulado_mes=Decimal("5000.00"),
+                periodos_procesados=1,
+                mes_actual=3,
+            )
+            db_session.add(AcumuladoAnual(**valores))
+            db_session.commit()
+
+            existentes = repo.load_period([existente.id, nuevo.id], *clave)
+            assert list(existentes) == [existente.id]
+
+            nuevos = {
+                nuevo.id: repo.initial_values(
+                    nuevo,
+                    *clave,
+                    periodo_inicio=date(2025, 3, 1),
+                    empresa_primer_mes_nomina=empresa.primer_mes_nomina,
+                    empresa_primer_anio_nomina=empresa.primer_anio_nomina,
+                )
+            }
+            delta = {
+                "salario_bruto": Decimal("1000.00"),
+                "salario_gravable": Decimal("900.00"),
+                "deducciones_antes_impuesto": Decimal("70.00"),
+                "impuesto_retenido": Decimal("50.00"),
+            }
+            repo.apply_deltas(*clave, date(2025, 3, 31), {existente.id: delta, nuevo.id: delta}, nuevos)
+            db_session.commit()
+
+            acumulados = repo.load_period([existente.id, nuevo.id], *clave)
+            actualizado = acumulados[existente.id]
+            assert actualizado.salario_bruto_acumulado == Decimal("6000.00")
+            assert actualizado.salario_acumulado_mes == Decimal("6000.00")
+            assert actualizado.salario_gravable_acumulado == Decimal("900.00")
+            assert actualizado.periodos_procesados == 2
+
+            creado = acumulados[nuevo.id]
+            assert creado.salario_bruto_acumulado == Decimal("21000.00")
+            assert creado.impuesto_retenido_acumulado == Decimal("350.00")
+            assert creado.deducciones_antes_impuesto_acumulado == Decimal("70.00")
+            assert creado.salario_acumulado_mes == Decimal("1000.00")
+            assert creado.periodos_procesados == 3
+            assert creado.mes_actual == 3
+            assert creado.ultimo_periodo_procesado == date(2025, 3, 31)
+
+            # A new month restarts the monthly accumulation
+            repo.apply_deltas(*clave, date(2025, 4, 30), {existente.id: delta})
+            db_session.commit()
+            assert repo.load_period([existente.id], *clave)[existente.id].salario_acumulado_mes == Decimal("1000.00")
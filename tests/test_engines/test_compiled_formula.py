@@ -0,0 +1,103 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Unit tests for compiled formula schemas and their cache."""
+
+from decimal import Decimal
+
+import pytest
+
+from coati_payroll.formula_engine import CalculationError, FormulaEngine, ValidationError
+from coati_payroll.formula_engine import compiled_formula
+from coati_payroll.formula_engine.compiled_formula import (
+    clear_compiled_formula_cache,
+    get_compiled_formula,
+    schema_fingerprint,
+)
+
+
+def _schema(rate="0.10"):
+    return {
+        "inputs": [{"name": "salario", "default": 0}],
+        "steps": [
+            {"name": "impuesto", "type": "calculation", "formula": f"salario * {rate}"},
+            {
+                "name": "resultado",
+                "type": "conditional",
+                "condition": {"left": "impuesto", "operator": ">", "right": 100},
+                "if_true": "impuesto",
+                "if_false": "0",
+            },
+        ],
+        "output": "resultado",
+    }
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    clear_compiled_formula_cache()
+    yield
+    clear_compiled_formula_cache()
+
+
+class TestCompiledFormulaCache:
+    """Tests for schema compilation reuse."""
+
+    def test_identical_schemas_share_compiled_form(self):
+        first = get_compiled_formula(_schema())
+        second = get_compiled_formula(_schema())
+        assert first is second
+
+    def test_key_order_does_not_change_fingerprint(self):
+        schema = _schema()
+        reordered = dict(reversed(list(schema.items())))
+        assert schema_fingerprint(schema) == schema_fingerprint(reordered)
+
+    def test_different_schema_compiles_separately(self):
+        assert get_compiled_formula(_schema("0.10")) is not get_compiled_formula(_schema("0.20"))
+
+    def test_strict_mode_is_part_of_key(self):
+        assert get_compiled_formula(_schema(), strict_mode=True) is not get_compiled_formula(
+            _schema(), strict_mode=False
+        )
+
+    def test_caller_mutation_does_not_leak_into_cache(self):
+        schema = _schema()
+        engine = FormulaEngine(schema)
+        schema["steps"][0]["formula"] = "salario * 0.50"
+
+        result = FormulaEngine(_schema()).execute({"salario": 2000})
+        assert result["output"] == "200.00"
+        assert engine.execute({"salario": 2000})["output"] == "200.00"
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(compiled_formula, "COMPILED_FORMULA_CACHE_SIZE", 2)
+        oldest = get_compiled_formula(_schema("0.01"))
+        get_compiled_formula(_schema("0.02"))
+        get_compiled_formula(_schema("0.03"))
+        assert get_compiled_formula(_schema("0.01")) is not oldest
+
+    def test_invalid_schema_is_not_cached(self):
+        with pytest.raises(ValidationError):
+            get_compiled_formula({"inputs": []})
+        assert len(compiled_formula._compiled_cache) == 0
+
+
+class TestCompiledFormulaExecution:
+    """Tests that compiled schemas keep the engine's observable behavior."""
+
+    def test_execute_uses_precompiled_steps(self):
+        engine = FormulaEngine(_schema())
+        assert engine.execute({"salario": Decimal("5000")})["output"] == "500.00"
+        assert engine.execute({"salario": Decimal("500")})["output"] == "0.00"
+
+    def test_invalid_syntax_still_fails_on_execute(self):
+        schema = {
+            "inputs": [{"name": "x", "default": 10}],
+            "steps": [{"name": "result", "type": "calculation", "formula": "x +"}],
+            "output": "result",
+        }
+        engine = FormulaEngine(schema)
+        with pytest.raises(CalculationError, match="Invalid expression syntax"):
+            engine.execute({})
+        with pytest.raises(CalculationError, match="Invalid expression syntax"):
+            FormulaEngine(schema).execute({})
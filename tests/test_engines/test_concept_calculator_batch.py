@@ -0,0 +1,179 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Tests for column-wise evaluation of simple payroll concepts."""
+
+from decimal import ROUND_HALF_UP, Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from coati_payroll.enums import FormulaType
+from coati_payroll.nomina_engine.calculators.concept_calculator import ConceptCalculator
+from coati_payroll.nomina_engine.domain.employee_calculation import EmpleadoCalculo
+from coati_payroll.nomina_engine.results.warning_collector import WarningCollector
+
+SALARIOS = ["10000.00", "12345.67", "0.01", "333.33", "1000.05", "0.00"]
+
+
+def _empleados():
+    planilla = SimpleNamespace(empresa_id="EMPRESA")
+    emp_calculos = []
+    for i, salario in enumerate(SALARIOS):
+        empleado = SimpleNamespace(id=f"EMP{i}", salario_base=Decimal(salario), moneda_id="NIO")
+        emp_calculo = EmpleadoCalculo(empleado, planilla)
+        emp_calculo.salario_bruto = Decimal(salario) + Decimal("0.05")
+        emp_calculo.novedades = {"HORAS_EXTRA": Decimal(i), "DIAS_EXTRA": Decimal(i) / 2}
+        emp_calculos.append(emp_calculo)
+    return emp_calculos
+
+
+def _calculator():
+    calculator = ConceptCalculator(None, WarningCollector())
+    calculator.configuracion_snapshot = {"dias_mes_nomina": 30, "horas_jornada_diaria": 8}
+    return calculator
+
+
+def _quantize(valor):
+    return valor.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def _monto_por_fila(
+    emp_calculo, formula_tipo, monto_default, porcentaje, monto_override, porcentaje_override, codigo, base_calculo
+):
+    """Frozen copy of the per-employee arithmetic used before column-wise evaluation (30 days, 8 hours)."""
+    tipo = FormulaType.normalize(formula_tipo)
+    if monto_override:
+        monto = Decimal(str(monto_override))
+    elif porcentaje_override:
+        monto = _quantize(emp_calculo.salario_base * Decimal(str(porcentaje_override)) / Decimal("100"))
+    elif tipo in (FormulaType.PORCENTAJE_SALARIO, FormulaType.PORCENTAJE, FormulaType.PORCENTAJE_BRUTO):
+        base = emp_calculo.salario_bruto if tipo == FormulaType.PORCENTAJE_BRUTO else emp_calculo.salario_base
+        monto = _quantize(base * Decimal(str(porcentaje)) / Decimal("100")) if porcentaje else Decimal("0.00")
+    elif tipo in (FormulaType.HORAS, FormulaType.DIAS):
+        cantidad = emp_calculo.novedades.get(codigo, Decimal("0"))
+        if cantidad <= 0:
+            return Decimal("0.00")
+        base = emp_calculo.salario_bruto if base_calculo == "salario_bruto" else emp_calculo.salario_mensual
+        tasa = _quantize(base / Decimal("30") / Decimal("8")) if tipo == FormulaType.HORAS else _quantize(base / 30)
+        if porcentaje:
+            tasa = _quantize(tasa * Decimal(str(porcentaje)) / Decimal("100"))
+        monto = _quantize(tasa * cantidad)
+    else:
+        monto = Decimal(str(monto_default or 0))
+    return max(monto, Decimal("0.00"))
+
+
+@pytest.mark.parametrize(
+    "formula_tipo,monto_default,porcentaje,monto_override,porcentaje_override,codigo,base_calculo",
+    [
+        (FormulaType.FIJO, Decimal("150.00"), None, None, None, "BONO", None),
+        (FormulaType.PORCENTAJE_SALARIO, None, Decimal("7.25"), None, None, "INSS", None),
+        ("porcentaje", None, Decimal("2.5"), None, None, "LEGACY", None),
+        (FormulaType.PORCENTAJE_BRUTO, None, Decimal("12.5"), None, None, "IR", None),
+        (FormulaType.PORCENTAJE_SALARIO, None, None, None, None, "SIN_PORCENTAJE", None),
+        (FormulaType.FIJO, Decimal("10.00"), None, Decimal("25.00"), None, "OVERRIDE", None),
+        (FormulaType.FIJO, Decimal("10.00"), None, None, Decimal("3.3"), "OVERRIDE_PCT", None),
+        (FormulaType.HORAS, None, Decimal("150"), None, None, "HORAS_EXTRA", None),
+        (FormulaType.HORAS, None, None, None, None, "HORAS_EXTRA", "salario_bruto"),
+        (FormulaType.DIAS, None, Decimal("50"), None, None, "DIAS_EXTRA", None),
+        (FormulaType.DIAS, None, None, None, None, "NO_NOVEDAD", None),
+        (FormulaType.FIJO, Decimal("-5.00"), None, None, None, "NEGATIVO", None),
+    ],
+)
+def test_calculate_many_matches_per_row_arithmetic(
+    formula_tipo, monto_default, porcentaje, monto_override, porcentaje_override, codigo, base_calculo
+):
+    """Column-wise evaluation gives the amounts of the previous one-employee-at-a-time arithmetic."""
+    emp_calculos = _empleados()
+    parametros = (formula_tipo, monto_default, porcentaje, monto_override, porcentaje_override, codigo, base_calculo)
+    esperado = [_monto_por_fila(emp_calculo, *parametros) for emp_calculo in emp_calculos]
+
+    lote = _calculator()
+    montos = lote.calculate_many(
+        emp_calculos,
+        formula_tipo,
+        monto_default,
+        porcentaje,
+        None,
+        monto_override,
+        porcentaje_override,
+        codigo_concepto=codigo,
+        base_calculo=base_calculo,
+    )
+
+    assert montos == esperado
+    negativos = len(emp_calculos) if monto_default is not None and monto_default < 0 else 0
+    assert len(lote.warnings) == negativos
+
+
+@pytest.mark.parametrize(
+    "formula_tipo,monto_default,porcentaje,codigo,esperado",
+    [
+        # 150.00 as configured
+        (FormulaType.FIJO, Decimal("150.00"), None, "BONO", Decimal("150.00")),
+        # 1000.05 * 7.25% = 72.503625
+        (FormulaType.PORCENTAJE_SALARIO, None, Decimal("7.25"), "INSS", Decimal("72.50")),
+        # 1000.05 * 0.0005% = 0.005000250, rounds up
+        (FormulaType.PORCENTAJE_SALARIO, None, Decimal("0.0005"), "TIE", Decimal("0.01")),
+        # 1000.10 * 12.5% = 125.0125
+        (FormulaType.PORCENTAJE_BRUTO, None, Decimal("12.5"), "IR", Decimal("125.01")),
+        # hourly 1000.05 / 30 / 8 = 4.166875 -> 4.17; * 150% = 6.255 -> 6.26; * 3 h = 18.78
+        (FormulaType.HORAS, None, Decimal("150"), "HORAS_EXTRA", Decimal("18.78")),
+        # daily 1000.05 / 30 = 33.335 -> 33.34; * 50% = 16.67; * 1.5 d = 25.005 -> 25.01
+        (FormulaType.DIAS, None, Decimal("50"), "DIAS_EXTRA", Decimal("25.01")),
+    ],
+)
+def test_calculate_many_hand_computed_amounts(formula_tipo, monto_default, porcentaje, codigo, esperado):
+    """Known amounts, including ROUND_HALF_UP ties at every intermediate step."""
+    emp_calculo = _empleados()[4]
+    emp_calculo.novedades = {"HORAS_EXTRA": Decimal("3"), "DIAS_EXTRA": Decimal("1.5")}
+
+    montos = _calculator().calculate_many(
+        [emp_calculo], formula_tipo, monto_default, porcentaje, None, None, None, codigo_concepto=codigo
+    )
+
+    assert montos == [esperado]
+
+
+def test_percentages_round_half_up():
+    """Ties are rounded away from zero, as with a single quantize."""
+    emp_calculo = _empleados()[0]
+    emp_calculo.salario_base = Decimal("0.10")
+
+    montos = _calculator().calculate_many(
+        [emp_calculo], FormulaType.PORCENTAJE_SALARIO, None, Decimal("5"), None, None, None
+    )
+
+    assert montos == [Decimal("0.01")]
+
+
+def test_formula_concepts_run_as_one_batch(monkeypatch):
+    """Formula concepts go through execute_many; a failing employee gets 0.00 and a warning."""
+    from coati_payroll.formula_engine import FormulaEngine
+
+    def execute(self, inputs):
+        raise AssertionError("formula concepts must not be executed row by row")
+
+    monkeypatch.setattr(FormulaEngine, "execute", execute)
+    formula = {
+        "inputs": [{"name": "salario_bruto", "default": 0}, {"name": "divisor", "default": 1, "source": "divisor"}],
+        "steps": [{"name": "result", "type": "calculation", "formula": "salario_bruto / divisor"}],
+        "output": "result",
+    }
+    emp_calculos = _empleados()
+    emp_calculos[0].variables_calculo = {"divisor": Decimal("4")}
+    emp_calculos[1].variables_calculo = {"divisor": Decimal("0")}
+    calculator = _calculator()
+
+    montos = calculator.calculate_many(emp_calculos, FormulaType.FORMULA, None, None, formula, None, None)
+
+    assert montos == [
+        Decimal("2500.01"),
+        Decimal("0.00"),
+        Decimal("0.06"),
+        Decimal("333.38"),
+        Decimal("1000.10"),
+        Decimal("0.05"),
+    ]
+    assert len(calculator.warnings) == 1
+    assert "Error en fórmula" in calculator.warnings.to_list()[0]
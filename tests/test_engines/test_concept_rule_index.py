@@ -0,0 +1,115 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Tests for the run-scoped ReglaCalculo resolution index."""
+
+from datetime import date
+
+from coati_payroll.model import Deduccion, Percepcion, ReglaCalculo
+from coati_payroll.nomina_engine.repositories.concept_rule_index import ConceptRuleIndex
+
+SCHEMA_DB = {"steps": [{"name": "output", "type": "calculation", "formula": "1"}], "output": "output"}
+SCHEMA_SNAPSHOT = {"steps": [{"name": "output", "type": "calculation", "formula": "2"}], "output": "output"}
+
+
+def _regla(codigo, **concepto):
+    return ReglaCalculo(
+        codigo=codigo,
+        nombre=codigo,
+        version="1.0.0",
+        tipo_regla="tax",
+        vigente_desde=date(2025, 1, 1),
+        activo=True,
+        esquema_json=SCHEMA_DB,
+        creado_por="test",
+        **concepto,
+    )
+
+
+def _setup(db_session):
+    deduccion = Deduccion(
+        codigo="IR",
+        nombre="Impuesto",
+        tipo="tax",
+        es_impuesto=True,
+        formula_tipo="regla_calculo",
+        antes_impuesto=False,
+        recurrente=True,
+        activo=True,
+    )
+    percepcion = Percepcion(codigo="BONO", nombre="Bono")
+    db_session.add_all([deduccion, percepcion])
+    db_session.flush()
+    db_session.add_all(
+        [
+            _regla("REGLA_IR", deduccion_id=deduccion.id),
+            _regla("REGLA_BONO", percepcion_id=percepcion.id),
+        ]
+    )
+    inactiva = _regla("REGLA_INACTIVA")
+    inactiva.activo = False
+    db_session.add(inactiva)
+    db_session.commit()
+    return deduccion, percepcion
+
+
+class TestConceptRuleIndex:
+    """Tests for ConceptRuleIndex lookups."""
+
+    def test_resolves_rules_by_concept_id_and_code(self, app, db_session):
+        with app.app_context():
+            deduccion, percepcion = _setup(db_session)
+
+            index = ConceptRuleIndex(db_session).load()
+
+            assert index.resolve_rule(deduccion.id) == (SCHEMA_DB, "REGLA_IR")
+            assert index.resolve_rule("IR") == (SCHEMA_DB, "REGLA_IR")
+            assert index.resolve_rule(percepcion.id) == (SCHEMA_DB, "REGLA_BONO")
+            assert index.resolve_rule("BONO") == (SCHEMA_DB, "REGLA_BONO")
+            assert index.resolve_rule("NO_EXISTE") is None
+            assert index.resolve_rule(None) is None
+            assert index.get_deduccion_metadata(deduccion.id) == {"antes_impuesto": False, "es_impuesto": True}
+            assert index.get_deduccion_metadata("otra") is None
+
+    def test_snapshot_rules_take_precedence(self, app, db_session):
+        with app.app_context():
+            deduccion, _percepcion = _setup(db_session)
+            snapshot = {
+                deduccion.id: {
+                    "id": deduccion.id,
+                    "codigo": "IR",
+                    "es_impuesto": True,
+                    "antes_impuesto": True,
+                    "regla_calculo": {"codigo": "REGLA_IR_V1", "esquema_json": SCHEMA_SNAPSHOT},
+                }
+            }
+
+            index = ConceptRuleIndex(db_session, snapshot).load()
+
+            assert index.resolve_rule("IR") == (SCHEMA_SNAPSHOT, "REGLA_IR_V1")
+            assert index.resolve_rule(deduccion.id) == (SCHEMA_SNAPSHOT, "REGLA_IR_V1")
+            assert index.get_deduccion_metadata(deduccion.id)["antes_impuesto"] is True
+
+    def test_lookups_do_not_query_after_load(self, app, db_session):
+        with app.app_context():
+            deduccion, _percepcion = _setup(db_session)
+            index = ConceptRuleIndex(db_session).load()
+
+            # Rules created after loading belong to the next run
+            nueva = Deduccion(
+                codigo="INSS",
+                nombre="Seguro social",
+                tipo="social_security",
+                es_impuesto=False,
+                formula_tipo="regla_calculo",
+                antes_impuesto=True,
+                recurrente=True,
+                activo=True,
+            )
+            db_session.add(nueva)
+            db_session.flush()
+            db_session.add(_regla("REGLA_INSS", deduccion_id=nueva.id))
+            db_session.commit()
+
+            assert index.resolve_rule("INSS") is None
+            assert index.get_deduccion_metadata(nueva.id) is None
+            assert index.resolve_rule(deduccion.id) == (SCHEMA_DB, "REGLA_IR")
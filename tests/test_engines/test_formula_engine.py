@@ -1225,3 +1225,118 @@ class TestBadInputHandling:
         engine = FormulaEngine(schema)
         with pytest.raises(CalculationError):
             engine.execute({})
+
+
+class TestExecuteMany:
+    """Tests for batch execution of one schema over many input rows."""
+
+    SCHEMA = {
+        "inputs": [{"name": "salario", "default": 0}, {"name": "divisor", "default": 1}],
+        "steps": [{"name": "result", "type": "calculation", "formula": "salario / divisor"}],
+        "output": "result",
+    }
+
+    def test_results_keep_input_order(self):
+        engine = FormulaEngine(self.SCHEMA)
+        outcomes = engine.execute_many([{"salario": 100}, {"salario": 300, "divisor": 3}, {}])
+        assert [o.index for o in outcomes] == [0, 1, 2]
+        assert [o.output for o in outcomes] == ["100.00", "100.00", "0.00"]
+        assert all(o.ok for o in outcomes)
+
+    def test_matches_single_execution(self):
+        engine = FormulaEngine(self.SCHEMA)
+        rows = [{"salario": Decimal("1234.567"), "divisor": 7}, {"salario": 10}]
+        assert [o.result for o in engine.execute_many(rows)] == [engine.execute(row) for row in rows]
+
+    def test_row_errors_do_not_stop_batch(self):
+        engine = FormulaEngine(self.SCHEMA)
+        outcomes = engine.execute_many([{"salario": 100}, {"salario": 100, "divisor": 0}, {"salario": 50}])
+        assert outcomes[0].ok and outcomes[2].ok
+        assert not outcomes[1].ok
+        assert isinstance(outcomes[1].error, CalculationError)
+        assert outcomes[1].output is None
+        assert outcomes[2].output == "50.00"
+
+
+class TestLazyTracing:
+    """Tests that trace messages are only built while a trace sink is active."""
+
+    SCHEMA = {
+        "inputs": [{"name": "salario", "default": 0}],
+        "steps": [
+            {"name": "base", "type": "calculation", "formula": "salario * 2"},
+            {"name": "ir", "type": "tax_lookup", "table": "ir", "input": "base"},
+        ],
+        "tax_tables": {"ir": [{"min": 0, "max": None, "rate": 0.1, "fixed": 0, "over": 0}]},
+        "output": "ir",
+    }
+
+    def test_messages_are_not_built_when_tracing_is_off(self, monkeypatch):
+        from coati_payroll.formula_engine import engine as engine_module
+        from coati_payroll.formula_engine.ast import expression_evaluator
+        from coati_payroll.formula_engine.execution import step_executor
+        from coati_payroll.formula_engine.tables import table_lookup
+
+        def fail(*args, **kwargs):
+            raise AssertionError("trace message built while tracing is off")
+
+        monkeypatch.setattr(engine_module, "get_trace_sink", lambda: None)
+        monkeypatch.setattr(expression_evaluator, "get_trace_sink", lambda: None)
+        for module in (engine_module, expression_evaluator, step_executor, table_lookup):
+            monkeypatch.setattr(module, "_", fail)
+
+        assert FormulaEngine(self.SCHEMA).execute({"salario": 500})["output"] == "100.00"
+
+    def test_messages_reach_active_sink(self, monkeypatch):
+        from coati_payroll.formula_engine import engine as engine_module
+
+        traces: list[str] = []
+        monkeypatch.setattr(engine_module, "get_trace_sink", lambda: traces.append)
+
+        FormulaEngine(self.SCHEMA).execute({"salario": 500})
+        assert any("salario" in trace for trace in traces)
+        assert any("'ir'" in trace for trace in traces)
+
+
+class TestVariableScoping:
+    """Tests for the shared, in-place variable scope of an execution."""
+
+    SCHEMA = {
+        "inputs": [{"name": "salario", "default": 0}],
+        "steps": [
+            {"name": "doble", "type": "calculation", "formula": "salario * 2"},
+            {"name": "total", "type": "calculation", "formula": "doble + salario"},
+        ],
+        "output": "total",
+    }
+
+    def test_steps_see_previous_results_and_audit_is_complete(self):
+        engine = FormulaEngine(self.SCHEMA)
+        inputs = {"salario": 100}
+        result = engine.execute(inputs)
+
+        assert result["output"] == "300.00"
+        assert result["variables"] == {"salario": "100.00", "doble": "200.00", "total": "300.00"}
+        assert set(result["results"]) == {"doble", "total"}
+        assert engine.variables["total"] == Decimal("300")
+        assert set(engine.results) == {"doble", "total"}
+        assert inputs == {"salario": 100}
+
+    def test_each_execution_starts_from_a_fresh_scope(self):
+        engine = FormulaEngine(self.SCHEMA)
+        engine.execute({"salario": 100})
+        first = engine.variables
+        engine.execute({"salario": 1})
+
+        assert first["total"] == Decimal("300")
+        assert engine.variables["total"] == Decimal("3")
+
+    def test_with_variable_leaves_context_untouched(self):
+        from coati_payroll.formula_engine.execution.execution_context import ExecutionContext
+
+        context = ExecutionContext(variables={"a": Decimal("1")}, tax_tables={})
+        derived = context.with_variable("b", Decimal("2"))
+        context.set_variable("c", Decimal("3"))
+
+        assert context.variables == {"a": Decimal("1"), "c": Decimal("3")}
+        assert derived.variables == {"a": Decimal("1"), "b": Decimal("2")}
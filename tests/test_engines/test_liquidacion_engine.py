@@ -6,15 +6,26 @@ from __future__ import annotations
 
 from datetime import date
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
-
-from coati_payroll.enums import NominaEstado, AdelantoEstado
-from coati_payroll.liquidacion_engine import LiquidacionEngine, ejecutar_liquidacion, recalcular_liquidacion
+from sqlalchemy import text
+
+from coati_payroll.enums import NominaEstado, AdelantoEstado, LiquidacionLoteEstado
+from coati_payroll.liquidacion_engine import (
+    LiquidacionBatchEngine,
+    LiquidacionEngine,
+    crear_lote_liquidaciones,
+    ejecutar_liquidacion,
+    procesar_lote_liquidaciones,
+    recalcular_liquidacion,
+)
 from coati_payroll.model import (
     ConfiguracionCalculos,
     Deduccion,
     Empleado,
+    Liquidacion,
+    LiquidacionLote,
     Nomina,
     NominaEmpleado,
     Adelanto,
@@ -256,3 +267,154 @@ def test_deducciones_adelantos_y_recalculo_no_duplica_abonos(app, db_session):
         db_session.refresh(adelanto)
         assert Decimal(str(prestamo.saldo_pendiente)) == Decimal("0.00")
         assert Decimal(str(adelanto.saldo_pendiente)) == Decimal("0.00")
+
+
+def test_lote_liquida_varios_empleados_y_registra_errores(app, db_session):
+    from tests.factories.company_factory import create_company
+
+    with app.app_context():
+        empresa = create_company(db_session, codigo="E5", razon_social="Empresa 5", ruc="RUC5")
+        db_session.add(
+            ConfiguracionCalculos(
+                empresa_id=empresa.id,
+                pais_id=None,
+                activo=True,
+                liquidacion_modo_dias="calendar",
+                liquidacion_factor_calendario=30,
+                liquidacion_factor_laboral=28,
+            )
+        )
+
+        empleados = []
+        for i in range(3):
+            empleado = Empleado(
+                empresa_id=empresa.id,
+                codigo_empleado=f"EMP5{i}",
+                primer_nombre="A",
+                primer_apellido=f"B{i}",
+                identificacion_personal=f"ID-EMP5{i}",
+                fecha_alta=date(2025, 1, 1),
+                salario_base=Decimal("300.00"),
+                activo=True,
+            )
+            db_session.add(empleado)
+            empleados.append(empleado)
+        db_session.flush()
+
+        planilla = _create_minimal_planilla_context(db_session, empresa.id)
+        nomina = Nomina(
+            planilla_id=planilla.id,
+            periodo_inicio=date(2025, 1, 1),
+            periodo_fin=date(2025, 1, 15),
+            estado=NominaEstado.PAGADO,
+        )
+        db_session.add(nomina)
+        db_session.flush()
+        db_session.add(NominaEmpleado(nomina_id=nomina.id, empleado_id=empleados[0].id))
+
+        adelanto = Adelanto(
+            empleado_id=empleados[1].id,
+            deduccion_id=None,
+            tipo="advance",
+            estado=AdelantoEstado.APROBADO,
+            saldo_pendiente=Decimal("3.00"),
+            monto_por_cuota=Decimal("3.00"),
+        )
+        db_session.add(adelanto)
+        db_session.commit()
+
+        lote = crear_lote_liquidaciones(
+            [e.id for e in empleados] + ["NO-EXISTE"], fecha_calculo=date(2025, 1, 17), usuario="test"
+        )
+        assert lote.estado == LiquidacionLoteEstado.PENDIENTE
+
+        resultado = procesar_lote_liquidaciones(lote.id)
+        assert resultado is not None
+        assert len(resultado.liquidacion_ids) == 3
+        assert list(resultado.errores) == ["NO-EXISTE"]
+        assert procesar_lote_liquidaciones(lote.id) is None
+
+        lote = db_session.get(LiquidacionLote, lote.id)
+        assert lote.estado == LiquidacionLoteEstado.COMPLETADO_CON_ERRORES
+        assert lote.total_empleados == 4
+        assert lote.empleados_procesados == 3
+        assert lote.empleados_con_error == 1
+        assert lote.completado_en is not None
+
+        liquidaciones = {
+            liq.empleado_id: liq
+            for liq in db_session.execute(db.select(Liquidacion).filter_by(lote_id=lote.id)).scalars().all()
+        }
+        assert set(liquidaciones) == {e.id for e in empleados}
+        # The paid nomina covers up to Jan 15; the others count from the day before fecha_alta.
+        assert liquidaciones[empleados[0].id].ultimo_dia_pagado == date(2025, 1, 15)
+        assert liquidaciones[empleados[0].id].dias_por_pagar == 2
+        assert liquidaciones[empleados[2].id].dias_por_pagar == 17
+        assert all(liq.detalles for liq in liquidaciones.values())
+
+        abonos = db_session.execute(db.select(AdelantoAbono).filter_by(adelanto_id=adelanto.id)).scalars().all()
+        assert [abono.liquidacion_id for abono in abonos] == [liquidaciones[empleados[1].id].id]
+        db_session.refresh(adelanto)
+        assert Decimal(str(adelanto.saldo_pendiente)) == Decimal("0.00")
+        assert liquidaciones[empleados[1].id].total_deducciones == Decimal("3.00")
+
+
+def test_lote_fallido_queda_en_error(app, db_session):
+    from tests.factories.company_factory import create_company
+
+    with app.app_context():
+        empresa = create_company(db_session, codigo="E6", razon_social="Empresa 6", ruc="RUC6")
+        empleado = Empleado(
+            empresa_id=empresa.id,
+            codigo_empleado="EMP60",
+            primer_nombre="A",
+            primer_apellido="B",
+            identificacion_personal="ID-EMP60",
+            fecha_alta=date(2025, 1, 1),
+            salario_base=Decimal("300.00"),
+            activo=True,
+        )
+        db_session.add(empleado)
+        db_session.commit()
+        lote = crear_lote_liquidaciones([empleado.id], fecha_calculo=date(2025, 1, 17), usuario="test")
+
+        with patch.object(LiquidacionBatchEngine, "_procesar_chunk", side_effect=RuntimeError("sin conexión")):
+            resultado = procesar_lote_liquidaciones(lote.id)
+
+        assert resultado is not None
+        assert resultado.error == "RuntimeError: sin conexión"
+        lote = db_session.get(LiquidacionLote, lote.id)
+        assert lote.estado == LiquidacionLoteEstado.ERROR
+        assert lote.errores["critical_error"] == ["RuntimeError: sin conexión"]
+        assert lote.completado_en is not None
+        assert procesar_lote_liquidaciones(lote.id) is None
+
+
+def test_lote_reclamado_por_otro_worker_no_se_procesa(app, db_session):
+    from tests.factories.company_factory import create_company
+
+    with app.app_context():
+        empresa = create_company(db_session, codigo="E7", razon_social="Empresa 7", ruc="RUC7")
+        empleado = Empleado(
+            empresa_id=empresa.id,
+            codigo_empleado="EMP70",
+            primer_nombre="A",
+            primer_apellido="B",
+            identificacion_personal="ID-EMP70",
+            fecha_alta=date(2025, 1, 1),
+            salario_base=Decimal("300.00"),
+            activo=True,
+        )
+        db_session.add(empleado)
+        db_session.commit()
+        lote = crear_lote_liquidaciones([empleado.id], fecha_calculo=date(2025, 1, 17), usuario="test")
+        assert lote.estado == LiquidacionLoteEstado.PENDIENTE
+
+        # A duplicated message already claimed the batch; this session still holds it as PENDIENTE
+        db_session.execute(
+            text("UPDATE liquidacion_lote SET estado = :estado WHERE id = :id"),
+            {"estado": LiquidacionLoteEstado.PROCESANDO.value, "id": lote.id},
+        )
+
+        assert procesar_lote_liquidaciones(lote.id) is None
+        assert db_session.query(Liquidacion).filter_by(empleado_id=empleado.id).count() == 0
@@ -0,0 +1,214 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Tests for process-pool payroll calculation."""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from coati_payroll.nomina_engine.domain.employee_calculation import EmpleadoCalculo
+from coati_payroll.nomina_engine.results.warning_collector import WarningCollector
+from coati_payroll.nomina_engine.services import parallel_calculation
+from coati_payroll.nomina_engine.services.parallel_calculation import (
+    plan_chunks,
+    supports_process_pool,
+    worker_config,
+)
+from coati_payroll.nomina_engine.services.payroll_execution_service import PayrollExecutionService
+
+SERVICE = "coati_payroll.nomina_engine.services.payroll_execution_service"
+
+
+class TestPoolPlanning:
+    """Tests for deciding when and how to use worker processes."""
+
+    def test_small_planilla_is_not_split(self):
+        assert plan_chunks([str(i) for i in range(10)], 4) == []
+
+    def test_single_process_is_not_split(self):
+        assert plan_chunks([str(i) for i in range(500)], 1) == []
+
+    def test_chunks_cover_every_employee_in_order(self):
+        ids = [str(i) for i in range(500)]
+        chunks = plan_chunks(ids, 4)
+        assert len(chunks) > 4
+        assert [i for chunk in chunks for i in chunk] == ids
+        assert min(len(chunk) for chunk in chunks[:-1]) >= parallel_calculation.MIN_EMPLEADOS_POR_LOTE
+
+    def test_in_memory_sqlite_is_not_shared(self):
+        assert not supports_process_pool("sqlite:///:memory:?check_same_thread=False")
+        assert not supports_process_pool("sqlite://")
+        assert not supports_process_pool(None)
+        assert supports_process_pool("sqlite:////var/lib/coati/coati.db")
+        assert supports_process_pool("postgresql+psycopg2://coati@localhost/coati")
+
+    def test_worker_config_keeps_only_picklable_database_settings(self):
+        config = {
+            "SQLALCHEMY_DATABASE_URI": "postgresql://localhost/coati",
+            "SQLALCHEMY_ENGINE_OPTIONS": {"pool_pre_ping": True},
+            "BABEL_DEFAULT_LOCALE": "es",
+            "SECRET_KEY": "secret",
+            "SESSION_SQLALCHEMY": object(),
+        }
+        assert worker_config(config) == {
+            "SQLALCHEMY_DATABASE_URI": "postgresql://localhost/coati",
+            "SQLALCHEMY_ENGINE_OPTIONS": {"pool_pre_ping": True},
+            "BABEL_DEFAULT_LOCALE": "es",
+        }
+
+
+class TestPoolResultsMerge:
+    """Tests for rebuilding worker results in the parent process."""
+
+    def _planilla_empleados(self, total):
+        return [MagicMock(id=f"pe-{i}", empleado=MagicMock(id=f"emp-{i}")) for i in range(total)]
+
+    def test_results_are_rebuilt_in_chunk_order(self, app, db_session):
+        with app.app_context():
+            planilla_empleados = self._planilla_empleados(60)
+            planilla = MagicMock()
+
+            def fake_pool(procesos, config, chunks, *args):
+                resultados = []
+                for chunk in chunks:
+                    empleados = []
+                    for planilla_empleado_id in chunk:
+                        emp_calculo = EmpleadoCalculo(MagicMock(id=planilla_empleado_id.replace("pe", "emp")), planilla)
+                        emp_calculo.salario_neto = Decimal("100.00")
+                        empleados.append(emp_calculo.to_payload())
+                    resultados.append({"empleados": empleados, "prestamos": [], "errors": [], "warnings": ["w"]})
+                return resultados
+
+            errors: list[str] = []
+            warnings = WarningCollector()
+            service = PayrollExecutionService(db_session)
+            with patch(SERVICE + ".supports_process_pool", return_value=True), patch(
+                SERVICE + ".calculate_in_process_pool",
+                side_effect=fake_pool,
+            ):
+                empleados_calculo, _ = service._calculate_employees_in_pool(
+                    None,
+                    planilla,
+                    planilla_empleados,
+                    date(2025, 1, 1),
+                    date(2025, 1, 31),
+                    date(2025, 1, 31),
+                    {},
+                    {},
+                    errors,
+                    warnings,
+                    4,
+                )
+
+            assert [e.empleado.id for e in empleados_calculo] == [f"emp-{i}" for i in range(60)]
+            assert all(e.salario_neto == Decimal("100.00") for e in empleados_calculo)
+            assert errors == []
+            assert len(warnings) == len(plan_chunks([pe.id for pe in planilla_empleados], 4))
+
+    def test_pool_failure_falls_back_to_in_process(self, app, db_session):
+        with app.app_context():
+            service = PayrollExecutionService(db_session)
+            with patch(SERVICE + ".supports_process_pool", return_value=True), patch(
+                SERVICE + ".calculate_in_process_pool",
+                side_effect=OSError("cannot start processes"),
+            ):
+                result = service._calculate_employees_in_pool(
+                    None,
+                    MagicMock(),
+                    self._planilla_empleados(60),
+                    date(2025, 1, 1),
+                    date(2025, 1, 31),
+                    date(2025, 1, 31),
+                    {},
+                    {},
+                    [],
+                    WarningCollector(),
+                    4,
+                )
+
+            assert result is None
+
+
+class TestSpawnPool:
+    """Runs real worker processes against a database file they can open."""
+
+    def test_pool_matches_in_process_calculation(self, tmp_path):
+        from coati_payroll import create_app
+        from coati_payroll.model import Empleado, Empresa, Moneda, Planilla, PlanillaEmpleado, TipoPlanilla, db
+
+        app = create_app(
+            {
+                "TESTING": True,
+                "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'coati.db'}",
+                "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+                "SECRET_KEY": "test-secret-key",
+            }
+        )
+        with app.app_context():
+            db.create_all()
+            moneda = Moneda(codigo="NIO", nombre="Córdoba", simbolo="C$", activo=True)
+            empresa = Empresa(codigo="POOL", razon_social="Pool Company", ruc="123", activo=True)
+            tipo_planilla = TipoPlanilla(
+                codigo="MENSUAL",
+                descripcion="Mensual",
+                periodicidad="monthly",
+                dias=30,
+                periodos_por_anio=12,
+                mes_inicio_fiscal=1,
+                dia_inicio_fiscal=1,
+            )
+            db.session.add_all([moneda, empresa, tipo_planilla])
+            db.session.flush()
+            planilla = Planilla(
+                nombre="Pool Planilla",
+                tipo_planilla_id=tipo_planilla.id,
+                empresa_id=empresa.id,
+                moneda_id=moneda.id,
+                activo=True,
+            )
+            db.session.add(planilla)
+            db.session.flush()
+            for i in range(2 * parallel_calculation.MIN_EMPLEADOS_POR_LOTE + 10):
+                empleado = Empleado(
+                    codigo_empleado=f"EMP{i}",
+                    primer_nombre="Nombre",
+                    primer_apellido=f"Apellido{i}",
+                    identificacion_personal=f"ID-EMP{i}",
+                    fecha_alta=date(2024, 1, 1),
+                    salario_base=Decimal("10000.00") + Decimal(i) * Decimal("137.33"),
+                    moneda_id=moneda.id,
+                    empresa_id=empresa.id,
+                    activo=True,
+                )
+                db.session.add(empleado)
+                db.session.flush()
+                db.session.add(PlanillaEmpleado(planilla_id=planilla.id, empleado_id=empleado.id, activo=True))
+            db.session.commit()
+
+            periodo = (date(2025, 1, 1), date(2025, 1, 31), date(2025, 1, 31))
+            service = PayrollExecutionService(db.session)
+            snapshot = service.snapshot_service.capture_complete_snapshot(planilla, *periodo)
+            service._bind_snapshot(snapshot)
+            bootstrap_context = service._resolve_company_bootstrap_context(planilla, periodo[0], WarningCollector())
+            planilla_empleados = list(planilla.planilla_empleados)
+
+            errors: list[str] = []
+            serie, _ = service._calculate_employees(
+                None, planilla, planilla_empleados, *periodo, snapshot, bootstrap_context, errors, WarningCollector()
+            )
+            db.session.rollback()
+
+            chunks = plan_chunks([planilla_empleado.id for planilla_empleado in planilla_empleados], 2)
+            resultados = parallel_calculation.calculate_in_process_pool(
+                2, worker_config(app.config), chunks, planilla.id, *periodo, snapshot, bootstrap_context
+            )
+
+            payloads = [payload for resultado in resultados for payload in resultado["empleados"]]
+            assert errors == []
+            assert all(resultado["errors"] == [] for resultado in resultados)
+            assert payloads == [emp_calculo.to_payload() for emp_calculo in serie]
+            assert sum(Decimal(payload["salario_neto"]) for payload in payloads) == sum(e.salario_neto for e in serie)
+
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Smoke tests for the payroll benchmark suite."""
+
+from benchmarks import compare_results, run_payroll_benchmark
+from benchmarks.payroll import PHASE_METHODS
+from tests.factories import create_payroll_dataset
+
+
+def _resultado(employees_per_second, queries_per_employee, seconds, empleados=100):
+    return {
+        "parameters": {"empleados": empleados, "mode": "sync"},
+        "summary": {
+            "employees_per_second": employees_per_second,
+            "queries_per_employee": queries_per_employee,
+            "seconds": seconds,
+        },
+    }
+
+
+class TestPayrollBenchmark:
+    """Tests for dataset building and run measurement."""
+
+    def test_sync_runs_report_throughput_queries_and_phases(self, app, db_session):
+        with app.app_context():
+            dataset = create_payroll_dataset(db_session, 5, loan_ratio=1.0)
+
+            resultado = run_payroll_benchmark(dataset, mode="sync", runs=2)
+
+            assert dataset.prestamos == 5
+            assert [run["periodo_inicio"] for run in resultado["runs"]] == ["2025-01-01", "2025-02-01"]
+            for run in resultado["runs"]:
+                assert run["errors"] == []
+                assert run["employees"] == 5
+                assert run["queries"] > 0
+                assert {"snapshot", "calculation", "persistence", "side_effects", "voucher"} <= set(run["phases"])
+            assert resultado["summary"]["successful_runs"] == 2
+            # Instrumented methods are restored after the run
+            for _phase, owner, nombre in PHASE_METHODS:
+                assert not hasattr(owner.__dict__[nombre], "__wrapped__")
+
+    def test_sharded_runs_deliver_every_shard(self, app, db_session):
+        with app.app_context():
+            dataset = create_payroll_dataset(db_session, 5, deducciones=2, vacaciones=False)
+
+            resultado = run_payroll_benchmark(dataset, mode="sharded", runs=1, shard_size=2)
+
+            run = resultado["runs"][0]
+            assert run["errors"] == []
+            assert run["employees"] == 5
+            assert run["phases"]["calculation"]["calls"] == 3
+
+
+class TestCompareResults:
+    """Tests for run-to-run comparison."""
+
+    def test_flags_throughput_drop_and_query_growth(self):
+        comparacion = compare_results(_resultado(80, 12, 1.0), _resultado(100, 10, 1.0))
+
+        assert comparacion["changes"]["employees_per_second"] == -0.2
+        assert comparacion["regressions"] == ["employees_per_second", "queries_per_employee"]
+        assert comparacion["mismatched_parameters"] == []
+
+    def test_changes_within_tolerance_are_not_regressions(self):
+        comparacion = compare_results(_resultado(95, 10, 1.05), _resultado(100, 10, 1.0, empleados=200))
+
+        assert comparacion["regressions"] == []
+        assert comparacion["mismatched_parameters"] == ["empleados"]
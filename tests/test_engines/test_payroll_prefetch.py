@@ -0,0 +1,217 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Tests for the set-based payroll prefetch."""
+
+from datetime import date
+from decimal import Decimal
+
+from coati_payroll.enums import AdelantoEstado
+from coati_payroll.model import (
+    AcumuladoAnual,
+    Adelanto,
+    Deduccion,
+    Empleado,
+    Empresa,
+    Moneda,
+    NominaNovedad,
+    Planilla,
+    TipoPlanilla,
+)
+from coati_payroll.nomina_engine.processors.loan_processor import LoanProcessor
+from coati_payroll.nomina_engine.repositories.novelty_repository import NoveltyRepository
+from coati_payroll.nomina_engine.repositories.payroll_prefetch import PayrollPrefetch
+
+
+def _setup(db_session, empleados=2):
+    moneda = Moneda(codigo="NIO", nombre="Córdoba", simbolo="C$", activo=True)
+    db_session.add(moneda)
+    empresa = Empresa(codigo="TEST001", razon_social="Test Company SA", ruc="J-12345678")
+    db_session.add(empresa)
+    db_session.flush()
+
+    tipo_planilla = TipoPlanilla(
+        codigo="MENSUAL",
+        descripcion="Mensual",
+        periodicidad="monthly",
+        dias=30,
+        periodos_por_anio=12,
+        mes_inicio_fiscal=1,
+        dia_inicio_fiscal=1,
+    )
+    db_session.add(tipo_planilla)
+    db_session.flush()
+
+    planilla = Planilla(
+        nombre="Planilla Test",
+        tipo_planilla_id=tipo_planilla.id,
+        empresa_id=empresa.id,
+        moneda_id=moneda.id,
+        activo=True,
+    )
+    db_session.add(planilla)
+
+    lista = []
+    for i in range(empleados):
+        empleado = Empleado(
+            empresa_id=empresa.id,
+            codigo_empleado=f"EMP{i}",
+            primer_nombre="Nombre",
+            primer_apellido=f"Apellido{i}",
+            identificacion_personal=f"ID-EMP{i}",
+            fecha_alta=date(2024, 1, 1),
+            salario_base=Decimal("10000.00"),
+            moneda_id=moneda.id,
+            activo=True,
+        )
+        db_session.add(empleado)
+        lista.append(empleado)
+    db_session.flush()
+    return planilla, tipo_planilla, empresa, lista
+
+
+class TestPayrollPrefetch:
+    """Tests for PayrollPrefetch lookups."""
+
+    def test_novelties_are_grouped_by_employee(self, app, db_session):
+        with app.app_context():
+            planilla, _, _, (emp_a, emp_b) = _setup(db_session)
+            for fecha in (date(2025, 1, 10), date(2025, 1, 20), date(2025, 2, 1)):
+                db_session.add(
+                    NominaNovedad(
+                        nomina_id="test_nomina",
+                        empleado_id=emp_a.id,
+                        codigo_concepto="HORAS_EXTRA",
+                        valor_cantidad=Decimal("1.00"),
+                        tipo_valor="horas",
+                        fecha_novedad=fecha,
+                    )
+                )
+            db_session.commit()
+
+            prefetch = PayrollPrefetch(db_session).load(
+                [emp_a, emp_b], planilla, date(2025, 1, 1), date(2025, 1, 31), date(2025, 1, 31)
+            )
+
+            assert len(prefetch.get_novelties(emp_a.id, date(2025, 1, 1), date(2025, 1, 31))) == 2
+            assert prefetch.get_novelties(emp_b.id, date(2025, 1, 1), date(2025, 1, 31)) == []
+            # Other periods and other employees are not covered
+            assert prefetch.get_novelties(emp_a.id, date(2025, 2, 1), date(2025, 2, 28)) is None
+            assert prefetch.get_novelties("otro", date(2025, 1, 1), date(2025, 1, 31)) is None
+
+    def test_repository_answers_from_prefetch(self, app, db_session):
+        with app.app_context():
+            planilla, _, _, (emp_a, _emp_b) = _setup(db_session)
+            db_session.commit()
+
+            prefetch = PayrollPrefetch(db_session).load(
+                [emp_a], planilla, date(2025, 1, 1), date(2025, 1, 31), date(2025, 1, 31)
+            )
+            db_session.add(
+                NominaNovedad(
+                    nomina_id="test_nomina",
+                    empleado_id=emp_a.id,
+                    codigo_concepto="BONO",
+                    valor_cantidad=Decimal("1.00"),
+                    tipo_valor="cantidad",
+                    fecha_novedad=date(2025, 1, 15),
+                )
+            )
+            db_session.commit()
+
+            repo = NoveltyRepository(db_session)
+            repo.prefetch = prefetch
+            assert repo.get_by_employee_and_period(emp_a.id, date(2025, 1, 1), date(2025, 1, 31)) == []
+
+            repo.prefetch = None
+            assert len(repo.get_by_employee_and_period(emp_a.id, date(2025, 1, 1), date(2025, 1, 31))) == 1
+
+    def test_acumulado_distinguishes_missing_from_not_loaded(self, app, db_session):
+        with app.app_context():
+            planilla, tipo_planilla, empresa, (emp_a, emp_b) = _setup(db_session)
+            acumulado = AcumuladoAnual(
+                empleado_id=emp_a.id,
+                tipo_planilla_id=tipo_planilla.id,
+                empresa_id=empresa.id,
+                periodo_fiscal_inicio=date(2025, 1, 1),
+                periodo_fiscal_fin=date(2026, 1, 1),
+            )
+            db_session.add(acumulado)
+            db_session.commit()
+
+            prefetch = PayrollPrefetch(db_session).load(
+                [emp_a, emp_b], planilla, date(2025, 3, 1), date(2025, 3, 31), date(2025, 3, 31)
+            )
+
+            key = (tipo_planilla.id, empresa.id, date(2025, 1, 1))
+            assert prefetch.get_acumulado(emp_a.id, *key) == (True, acumulado)
+            assert prefetch.get_acumulado(emp_b.id, *key) == (True, None)
+            assert prefetch.get_acumulado(emp_a.id, tipo_planilla.id, empresa.id, date(2024, 1, 1)) == (False, None)
+
+    def test_loans_and_advances_feed_deferred_loan_processor(self, app, db_session):
+        with app.app_context():
+            planilla, _, _, (emp_a, _emp_b) = _setup(db_session)
+            deduccion = Deduccion(
+                codigo="DED1",
+                nombre="Deduccion Prestamo",
+                tipo="loan",
+                es_impuesto=False,
+                formula_tipo="fixed",
+                antes_impuesto=False,
+                recurrente=False,
+                activo=True,
+            )
+            db_session.add(deduccion)
+            db_session.flush()
+            db_session.add(
+                Adelanto(
+                    empleado_id=emp_a.id,
+                    deduccion_id=deduccion.id,
+                    tipo="loan",
+                    estado=AdelantoEstado.APROBADO,
+                    saldo_pendiente=Decimal("500.00"),
+                    monto_por_cuota=Decimal("100.00"),
+                )
+            )
+            db_session.add(
+                Adelanto(
+                    empleado_id=emp_a.id,
+                    deduccion_id=None,
+                    tipo="advance",
+                    estado=AdelantoEstado.APROBADO,
+                    saldo_pendiente=Decimal("50.00"),
+                    monto_por_cuota=Decimal("50.00"),
+                )
+            )
+            db_session.commit()
+
+            prefetch = PayrollPrefetch(db_session).load(
+                [emp_a], planilla, date(2025, 1, 1), date(2025, 1, 31), date(2025, 1, 31)
+            )
+            assert len(prefetch.get_loans(emp_a.id)) == 1
+            assert len(prefetch.get_advances(emp_a.id)) == 1
+
+            processor = LoanProcessor(
+                None,
+                date(2025, 1, 31),
+                date(2025, 1, 1),
+                date(2025, 1, 31),
+                apply_side_effects=False,
+                prefetch=prefetch,
+            )
+            loans = processor.process_loans(emp_a.id, Decimal("1000.00"), True, 1)
+            advances = processor.process_advances(emp_a.id, Decimal("900.00"), True, 2)
+
+            assert [d.monto for d in loans] == [Decimal("100.00")]
+            assert [d.monto for d in advances] == [Decimal("50.00")]
+
+    def test_loan_processor_ignores_prefetch_when_applying_side_effects(self, app, db_session):
+        with app.app_context():
+            processor = LoanProcessor(
+                None,
+                date(2025, 1, 31),
+                date(2025, 1, 1),
+                date(2025, 1, 31),
+                apply_side_effects=True,
+                prefetch=PayrollPrefetch(db_session),
+            )
+            assert processor.prefetch is None
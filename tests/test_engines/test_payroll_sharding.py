@@ -0,0 +1,275 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Tests for parallel payroll processing with employee shards."""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from coati_payroll.enums import NominaEstado, NominaShardEstado
+from coati_payroll.model import (
+    Empleado,
+    Empresa,
+    Moneda,
+    Nomina,
+    NominaEmpleado,
+    NominaShard,
+    Planilla,
+    PlanillaEmpleado,
+    TipoPlanilla,
+)
+from coati_payroll.nomina_engine.domain.calculation_items import DeduccionItem, PercepcionItem
+from coati_payroll.nomina_engine.domain.employee_calculation import EmpleadoCalculo
+from coati_payroll.nomina_engine.services.payroll_execution_service import PayrollExecutionService
+from coati_payroll.queue import tasks
+
+
+def _setup(db_session, empleados=3):
+    moneda = Moneda(codigo="NIO", nombre="Córdoba", simbolo="C$", activo=True)
+    empresa = Empresa(codigo="TEST", razon_social="Test Company", ruc="123", activo=True)
+    db_session.add_all([moneda, empresa])
+    db_session.flush()
+
+    tipo_planilla = TipoPlanilla(
+        codigo="MENSUAL",
+        descripcion="Mensual",
+        periodicidad="monthly",
+        dias=30,
+        periodos_por_anio=12,
+        mes_inicio_fiscal=1,
+        dia_inicio_fiscal=1,
+    )
+    db_session.add(tipo_planilla)
+    db_session.flush()
+
+    planilla = Planilla(
+        nombre="Test Planilla",
+        tipo_planilla_id=tipo_planilla.id,
+        empresa_id=empresa.id,
+        moneda_id=moneda.id,
+        activo=True,
+    )
+    db_session.add(planilla)
+    db_session.flush()
+
+    for i in range(empleados):
+        empleado = Empleado(
+            codigo_empleado=f"EMP{i}",
+            primer_nombre="Nombre",
+            primer_apellido=f"Apellido{i}",
+            identificacion_personal=f"ID-EMP{i}",
+            fecha_alta=date(2024, 1, 1),
+            salario_base=Decimal("15000.00"),
+            moneda_id=moneda.id,
+            empresa_id=empresa.id,
+            activo=True,
+        )
+        db_session.add(empleado)
+        db_session.flush()
+        db_session.add(PlanillaEmpleado(planilla_id=planilla.id, empleado_id=empleado.id, activo=True))
+    db_session.commit()
+    return planilla
+
+
+def _run(planilla, queue_mock, shard_size=2):
+    result = tasks.process_payroll_parallel(
+        planilla_id=planilla.id,
+        periodo_inicio="2024-01-01",
+        periodo_fin="2024-01-31",
+        fecha_calculo="2024-01-31",
+        usuario="test_user",
+        shard_size=shard_size,
+    )
+    assert result["success"] is True
+
+    # Deliver every message the fan-out and the shards enqueue, like a worker pool would
+    delivered = 0
+    while delivered < len(queue_mock.enqueue.call_args_list):
+        call = queue_mock.enqueue.call_args_list[delivered]
+        delivered += 1
+        getattr(tasks, call.args[0])(**call.kwargs)
+    return result
+
+
+class TestEmpleadoCalculoPayload:
+    """Tests for the plain-data form of employee calculations."""
+
+    def test_round_trip_keeps_amounts_and_items(self):
+        empleado = MagicMock(id="emp-1")
+        planilla = MagicMock()
+        original = EmpleadoCalculo(empleado, planilla)
+        original.salario_bruto = Decimal("15000.123456")
+        original.salario_neto = Decimal("14000.00")
+        original.novedades = {"HORAS_EXTRA": Decimal("4.5")}
+        original.percepciones = [PercepcionItem("BONO", "Bono", Decimal("100.00"), 1, True, "p-1")]
+        original.deducciones = [DeduccionItem("INSS", "INSS", Decimal("50.00"), 10, True, "d-1", "deduccion")]
+
+        rebuilt = EmpleadoCalculo.from_payload(empleado, planilla, original.to_payload())
+
+        assert rebuilt.salario_bruto == Decimal("15000.123456")
+        assert rebuilt.salario_neto == Decimal("14000.00")
+        assert rebuilt.novedades == {"HORAS_EXTRA": Decimal("4.5")}
+        assert rebuilt.percepciones == original.percepciones
+        assert rebuilt.deducciones == original.deducciones
+
+
+class TestShardedPayroll:
+    """Tests for the fan-out, shard and finalize tasks."""
+
+    def test_shards_are_reduced_into_generated_nomina(self, app, db_session):
+        with app.app_context():
+            planilla = _setup(db_session)
+
+            with patch.object(tasks, "queue") as queue_mock:
+                result = _run(planilla, queue_mock)
+
+            assert result["total_shards"] == 2
+            nomina = db_session.get(Nomina, result["nomina_id"])
+            assert nomina.estado == NominaEstado.GENERADO
+            assert nomina.empleados_procesados == 3
+            assert nomina.job_id_activo is None
+            assert nomina.total_bruto == Decimal("45000.00")
+            assert db_session.query(NominaEmpleado).filter_by(nomina_id=nomina.id).count() == 3
+            # Shard bookkeeping is removed once the nomina is generated
+            assert db_session.query(NominaShard).filter_by(nomina_id=nomina.id).count() == 0
+
+    def test_sharded_run_records_combined_profile(self, app, db_session):
+        with app.app_context():
+            planilla = _setup(db_session)
+
+            with patch.object(tasks, "queue") as queue_mock:
+                result = _run(planilla, queue_mock)
+
+            perfil = db_session.get(Nomina, result["nomina_id"]).perfil_ejecucion
+            assert perfil["shards"] == 2
+            assert {"snapshot", "calculation", "persistence", "side_effects", "voucher", "log"} <= set(perfil["phases"])
+            assert perfil["phases"]["calculation"]["queries"] > 0
+            assert perfil["total_queries"] >= sum(fase["queries"] for fase in perfil["phases"].values())
+            assert perfil["employees"]["preparation"]["count"] == 3
+
+    def test_failed_shard_rolls_back_every_shard(self, app, db_session):
+        with app.app_context():
+            planilla = _setup(db_session)
+            original = PayrollExecutionService.calculate_shard
+
+            def calculate_shard(self, nomina, planilla, empleado_ids, *args):
+                if len(empleado_ids) == 1:
+                    raise RuntimeError("worker crashed")
+                return original(self, nomina, planilla, empleado_ids, *args)
+
+            with patch.object(tasks, "queue") as queue_mock, patch.object(
+                PayrollExecutionService, "calculate_shard", calculate_shard
+            ):
+                result = _run(planilla, queue_mock)
+
+            nomina = db_session.get(Nomina, result["nomina_id"])
+            assert nomina.estado == NominaEstado.ERROR
+            assert "1" in nomina.errores_calculo["shards_fallidos"]
+            assert db_session.query(NominaEmpleado).filter_by(nomina_id=nomina.id).count() == 0
+            estados = {shard.estado for shard in db_session.query(NominaShard).filter_by(nomina_id=nomina.id)}
+            assert estados == {NominaShardEstado.COMPLETADO, NominaShardEstado.ERROR}
+
+    def test_finalize_runs_once_per_job(self, app, db_session):
+        with app.app_context():
+            planilla = _setup(db_session, empleados=1)
+
+            with patch.object(tasks, "queue") as queue_mock:
+                result = _run(planilla, queue_mock)
+
+            again = tasks.finalize_sharded_payroll(
+                nomina_id=result["nomina_id"],
+                job_id=result["job_id"],
+                planilla_id=planilla.id,
+                periodo_inicio="2024-01-01",
+                periodo_fin="2024-01-31",
+            )
+            assert again["skipped"] is True
+            assert db_session.get(Nomina, result["nomina_id"]).estado == NominaEstado.GENERADO
+
+    def test_retry_takes_over_shard_abandoned_by_dead_worker(self, app, db_session):
+        with app.app_context():
+            planilla = _setup(db_session)
+
+            with patch.object(tasks, "queue") as queue_mock:
+                result = tasks.process_payroll_parallel(
+                    planilla_id=planilla.id,
+                    periodo_inicio="2024-01-01",
+                    periodo_fin="2024-01-31",
+                    fecha_calculo="2024-01-31",
+                    usuario="test_user",
+                    shard_size=2,
+                )
+                primero, segundo = queue_mock.enqueue.call_args_list
+                # The first shard completes; the worker of the second dies after claiming it
+                tasks.process_payroll_shard(**primero.kwargs)
+                abandonado = db_session.get(NominaShard, segundo.kwargs["shard_id"])
+                abandonado.estado = NominaShardEstado.PROCESANDO
+                abandonado.iniciado_en = datetime.now(timezone.utc) - timedelta(hours=2)
+                db_session.commit()
+
+                nomina = db_session.get(Nomina, result["nomina_id"])
+                assert nomina.estado == NominaEstado.CALCULANDO
+                assert nomina.job_id_activo == result["job_id"]
+
+                queue_mock.enqueue.reset_mock()
+                retry = tasks.retry_failed_nomina(result["nomina_id"])
+
+            assert retry["success"] is True
+            assert queue_mock.enqueue.call_args.args[0] == "process_payroll_parallel"
+            nomina = db_session.get(Nomina, result["nomina_id"])
+            assert nomina.estado == NominaEstado.CALCULANDO
+            assert nomina.job_id_activo is None
+            assert db_session.query(NominaEmpleado).filter_by(nomina_id=nomina.id).count() == 0
+            assert db_session.query(NominaShard).filter_by(nomina_id=nomina.id).count() == 0
+
+    def test_retry_finalizes_reduction_lost_with_its_worker(self, app, db_session):
+        with app.app_context():
+            planilla = _setup(db_session)
+
+            with patch.object(tasks, "queue") as queue_mock:
+                result = tasks.process_payroll_parallel(
+                    planilla_id=planilla.id,
+                    periodo_inicio="2024-01-01",
+                    periodo_fin="2024-01-31",
+                    fecha_calculo="2024-01-31",
+                    usuario="test_user",
+                    shard_size=2,
+                )
+                for call in list(queue_mock.enqueue.call_args_list):
+                    tasks.process_payroll_shard(**call.kwargs)
+                # The worker running finalize_sharded_payroll dies, so its claim is never committed
+                assert queue_mock.enqueue.call_args.args[0] == "finalize_sharded_payroll"
+
+                nomina = db_session.get(Nomina, result["nomina_id"])
+                assert nomina.estado == NominaEstado.CALCULANDO
+                assert nomina.job_completed_at is None
+
+                retry = tasks.retry_failed_nomina(result["nomina_id"])
+
+            assert retry["success"] is True
+            nomina = db_session.get(Nomina, result["nomina_id"])
+            assert nomina.estado == NominaEstado.GENERADO
+            assert nomina.job_id_activo is None
+            assert db_session.query(NominaEmpleado).filter_by(nomina_id=nomina.id).count() == 3
+
+    def test_retry_leaves_recent_processing_shard_alone(self, app, db_session):
+        with app.app_context():
+            planilla = _setup(db_session, empleados=1)
+
+            with patch.object(tasks, "queue") as queue_mock:
+                result = tasks.process_payroll_parallel(
+                    planilla_id=planilla.id,
+                    periodo_inicio="2024-01-01",
+                    periodo_fin="2024-01-31",
+                    usuario="test_user",
+                )
+                shard = db_session.get(NominaShard, queue_mock.enqueue.call_args.kwargs["shard_id"])
+                shard.estado = NominaShardEstado.PROCESANDO
+                shard.iniciado_en = datetime.now(timezone.utc)
+                db_session.commit()
+
+                retry = tasks.retry_failed_nomina(result["nomina_id"])
+
+            assert retry["success"] is False
+            assert db_session.get(NominaShard, shard.id).estado == NominaShardEstado.PROCESANDO
+            assert db_session.get(Nomina, result["nomina_id"]).job_id_activo == result["job_id"]
@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Tests for the payroll run profiler."""
+
+import threading
+from datetime import date
+
+from sqlalchemy import text
+
+from coati_payroll.model import Planilla, db
+from coati_payroll.nomina_engine import NominaEngine
+from coati_payroll.nomina_engine.results import merge_profiles, RunProfiler
+from coati_payroll.nomina_engine.results.run_profile import _distribution
+from tests.factories import create_payroll_dataset
+
+
+class TestRunProfiler:
+    """Tests for phase timing, statement counting and employee percentiles."""
+
+    def test_phases_count_statements_issued_inside_them(self, app, db_session):
+        with app.app_context():
+            profiler = RunProfiler().start()
+            with profiler.phase("calculation"):
+                db.session.execute(text("SELECT 1"))
+                db.session.execute(text("SELECT 2"))
+            with profiler.phase("log"):
+                pass
+            with profiler.phase("calculation"):
+                db.session.execute(text("SELECT 3"))
+            profiler.stop()
+            profiler.stop()
+            db.session.execute(text("SELECT 4"))
+
+            perfil = profiler.to_dict()
+
+            assert perfil["total_queries"] == 3
+            assert perfil["phases"]["calculation"]["queries"] == 3
+            assert perfil["phases"]["log"]["queries"] == 0
+            assert perfil["total_seconds"] >= perfil["phases"]["calculation"]["seconds"]
+
+    def test_statements_of_other_threads_are_not_counted(self, app, db_session):
+        with app.app_context():
+            engine = db.engine
+
+            def otra_peticion():
+                with engine.connect() as conexion:
+                    conexion.execute(text("SELECT 1"))
+
+            profiler = RunProfiler().start()
+            hilo = threading.Thread(target=otra_peticion)
+            hilo.start()
+            hilo.join()
+            db.session.execute(text("SELECT 2"))
+            profiler.stop()
+
+            assert profiler.queries == 1
+
+    def test_nested_profilers_restore_the_outer_one(self, app, db_session):
+        with app.app_context():
+            exterior = RunProfiler().start()
+            interior = RunProfiler().start()
+            db.session.execute(text("SELECT 1"))
+            interior.stop()
+            db.session.execute(text("SELECT 2"))
+            exterior.stop()
+
+            assert interior.queries == 1
+            assert exterior.queries == 1
+
+    def test_employee_stages_report_percentiles(self, app, db_session):
+        with app.app_context():
+            profiler = RunProfiler()
+            for _ in range(3):
+                with profiler.employee("preparation"):
+                    pass
+
+            perfil = profiler.to_dict()
+
+            assert perfil["employees"]["preparation"]["count"] == 3
+            assert perfil["phases"] == {}
+
+    def test_distribution_uses_nearest_rank(self):
+        muestras = [i / 1000 for i in range(1, 101)]
+
+        assert _distribution(muestras) == {"count": 100, "p50_ms": 50.0, "p95_ms": 95.0, "max_ms": 100.0}
+        assert _distribution([0.002]) == {"count": 1, "p50_ms": 2.0, "p95_ms": 2.0, "max_ms": 2.0}
+
+    def test_payroll_run_stores_profile_on_nomina(self, app, db_session):
+        with app.app_context():
+            dataset = create_payroll_dataset(db_session, 3, loan_ratio=1.0)
+            engine = NominaEngine(
+                planilla=db.session.get(Planilla, dataset.planilla_id),
+                periodo_inicio=date(2025, 1, 1),
+                periodo_fin=date(2025, 1, 31),
+                fecha_calculo=date(2025, 1, 31),
+                usuario="test",
+            )
+
+            nomina = engine.ejecutar()
+
+            perfil = nomina.perfil_ejecucion
+            assert engine.errors == []
+            assert {"validation", "snapshot", "calculation", "persistence", "side_effects", "voucher", "log"} <= set(
+                perfil["phases"]
+            )
+            assert perfil["total_queries"] >= sum(fase["queries"] for fase in perfil["phases"].values())
+            assert perfil["employees"]["preparation"]["count"] == 3
+            assert perfil["employees"]["side_effects"]["count"] == 3
+
+    def test_merge_profiles_sums_phases_and_keeps_worst_percentiles(self):
+        fragmento = {
+            "total_seconds": 1.0,
+            "total_queries": 10,
+            "unaccounted_seconds": 0.1,
+            "phases": {"calculation": {"seconds": 0.9, "queries": 10}},
+            "employees": {"preparation": {"count": 2, "p50_ms": 3.0, "p95_ms": 5.0, "max_ms": 5.0}},
+        }
+        cierre = {
+            "total_seconds": 0.5,
+            "total_queries": 4,
+            "unaccounted_seconds": 0.0,
+            "phases": {"calculation": {"seconds": 0.1, "queries": 1}, "voucher": {"seconds": 0.4, "queries": 3}},
+            "employees": {"preparation": {"count": 1, "p50_ms": 4.0, "p95_ms": 4.0, "max_ms": 4.0}},
+        }
+
+        perfil = merge_profiles([fragmento, cierre])
+
+        assert perfil["total_seconds"] == 1.5
+        assert perfil["total_queries"] == 14
+        assert perfil["phases"] == {
+            "calculation": {"seconds": 1.0, "queries": 11},
+            "voucher": {"seconds": 0.4, "queries": 3},
+        }
+        assert perfil["employees"]["preparation"] == {"count": 3, "p50_ms": 4.0, "p95_ms": 5.0, "max_ms": 5.0}
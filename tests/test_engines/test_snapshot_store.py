@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: 2025 - 2026 BMO Soluciones, S.A.
+"""Tests for the content-addressed snapshot store."""
+
+from datetime import date
+
+from coati_payroll.model import Percepcion, Planilla, PlanillaIngreso, SnapshotContenido, db
+from coati_payroll.nomina_engine import NominaEngine
+from coati_payroll.nomina_engine.repositories import SnapshotRepository
+from coati_payroll.nomina_engine.repositories.snapshot_repository import snapshot_hash
+from coati_payroll.nomina_engine.services.snapshot_service import SnapshotService
+from tests.factories import create_payroll_dataset
+
+
+def _ejecutar(planilla_id: str, mes: int):
+    inicio = date(2025, mes, 1)
+    fin = date(2025, mes, 28)
+    engine = NominaEngine(
+        planilla=db.session.get(Planilla, planilla_id),
+        periodo_inicio=inicio,
+        periodo_fin=fin,
+        fecha_calculo=fin,
+        usuario="test",
+    )
+    nomina = engine.ejecutar()
+    assert engine.errors == []
+    db.session.commit()
+    return nomina
+
+
+class TestSnapshotRepository:
+    """Tests for hashing and deduplication of snapshot content."""
+
+    def test_hash_ignores_key_order(self):
+        assert snapshot_hash({"a": 1, "b": [1, 2]}) == snapshot_hash({"b": [1, 2], "a": 1})
+        assert snapshot_hash({"a": 1}) != snapshot_hash({"a": 2})
+
+    def test_put_stores_identical_content_once(self, app, db_session):
+        with app.app_context():
+            repo = SnapshotRepository(db.session)
+
+            primero = repo.put("configuracion", {"dias_mes_nomina": 30, "horas_jornada_diaria": "8"})
+            segundo = repo.put("configuracion", {"horas_jornada_diaria": "8", "dias_mes_nomina": 30})
+
+            assert primero == segundo
+            assert db.session.execute(db.select(db.func.count()).select_from(SnapshotContenido)).scalar() == 1
+            assert repo.get_by_id(primero).contenido == {"dias_mes_nomina": 30, "horas_jornada_diaria": "8"}
+
+
+class TestNominaSnapshots:
+    """Tests for nominas referencing snapshots by hash."""
+
+    def test_runs_with_unchanged_catalogs_share_snapshot_rows(self, app, db_session):
+        with app.app_context():
+            dataset = create_payroll_dataset(db_session, 2, loan_ratio=0.0)
+
+            enero = _ejecutar(dataset.planilla_id, 1)
+            febrero = _ejecutar(dataset.planilla_id, 2)
+
+            assert enero.catalogos_snapshot_hash == febrero.catalogos_snapshot_hash
+            assert enero.configuracion_snapshot_hash == febrero.configuracion_snapshot_hash
+            assert enero._catalogos_snapshot is None
+            assert len(febrero.catalogos_snapshot["percepciones"]) == 3
+            catalogos = db.session.execute(
+                db.select(db.func.count()).select_from(SnapshotContenido).filter_by(tipo="catalogos")
+            ).scalar()
+            assert catalogos == 1
+
+    def test_assigning_a_snapshot_stores_it_inline(self, app, db_session):
+        with app.app_context():
+            dataset = create_payroll_dataset(db_session, 1, loan_ratio=0.0)
+            nomina = _ejecutar(dataset.planilla_id, 1)
+
+            nomina.configuracion_snapshot = {"dias_mes_nomina": 10}
+
+            assert nomina.configuracion_snapshot_hash is None
+            assert nomina.configuracion_snapshot == {"dias_mes_nomina": 10}
+
+
+class TestCatalogsFingerprint:
+    """Tests for reusing catalog snapshots while catalogs are unchanged."""
+
+    def test_catalog_change_invalidates_cached_snapshot(self, app, db_session):
+        with app.app_context():
+            dataset = create_payroll_dataset(db_session, 1, loan_ratio=0.0)
+            planilla = db.session.get(Planilla, dataset.planilla_id)
+            service = SnapshotService(db.session)
+
+            antes = service.capture_catalogs_snapshot(planilla)
+            huella = service.catalogs_fingerprint(planilla)
+            assert service.capture_catalogs_snapshot(planilla) == antes
+            assert service.catalogs_fingerprint(planilla) == huella
+
+            percepcion = db.session.execute(
+                db.select(Percepcion)
+                .join(PlanillaIngreso, PlanillaIngreso.percepcion_id == Percepcion.id)
+                .filter(PlanillaIngreso.planilla_id == planilla.id)
+            ).scalars().first()
+            percepcion.nombre = "Percepcion renombrada"
+            db.session.commit()
+
+            assert service.catalogs_fingerprint(planilla) != huella
+            nombres = {p["nombre"] for p in service.capture_catalogs_snapshot(planilla)["percepciones"]}
+            assert "Percepcion renombrada" in nombres
+
+    def test_cached_snapshot_is_not_shared_between_captures(self, app, db_session):
+        with app.app_context():
+            dataset = create_payroll_dataset(db_session, 1, loan_ratio=0.0)
+            planilla = db.session.get(Planilla, dataset.planilla_id)
+            service = SnapshotService(db.session)
+
+            primero = service.capture_catalogs_snapshot(planilla)
+            original = snapshot_hash(primero)
+            primero["percepciones"][0]["nombre"] = "Modificada por otra nomina"
+            primero["percepciones"].append({"codigo": "EXTRA"})
+
+            segundo = service.capture_catalogs_snapshot(planilla)
+            assert snapshot_hash(segundo) == original
+            segundo["percepciones"].clear()
+            assert snapshot_hash(service.capture_catalogs_snapshot(planilla)) == original
@@ -8,6 +8,14 @@ import pytest
 
 from coati_payroll.formula_engine import CalculationError
 from coati_payroll.formula_engine.tables.table_lookup import TableLookup
+from coati_payroll.formula_engine.tables.tax_table import CompiledTaxTable
+
+IR_TABLE = [
+    {"min": 0, "max": 100000, "rate": 0, "fixed": 0, "over": 0},
+    {"min": 100000.01, "max": 200000, "rate": 0.15, "fixed": 0, "over": 100000},
+    {"min": 200000.01, "max": 350000, "rate": 0.20, "fixed": 15000, "over": 200000},
+    {"min": 350000.01, "max": None, "rate": 0.30, "fixed": 45000, "over": 350000},
+]
 
 
 class TestTableLookupStrictMode:
@@ -65,3 +73,66 @@ class TestTableLookupStrictMode:
             "fixed": Decimal("0"),
             "over": Decimal("0"),
         }
+
+
+class TestCompiledTaxTable:
+    """Tests for the bisect-based bracket lookup."""
+
+    def test_disjoint_table_uses_bisect(self):
+        compiled = CompiledTaxTable("ir", IR_TABLE)
+        assert compiled.disjoint
+        assert compiled.find(Decimal("0")) == (0, 1)
+        assert compiled.find(Decimal("100000")) == (0, 1)
+        assert compiled.find(Decimal("100000.01")) == (1, 1)
+        assert compiled.find(Decimal("350000")) == (2, 1)
+        assert compiled.find(Decimal("9999999")) == (3, 1)
+        # Below the first bracket and inside the gap between brackets
+        assert compiled.find(Decimal("-1")) == (None, 0)
+        assert compiled.find(Decimal("100000.005")) == (None, 0)
+
+    def test_overlapping_table_reports_every_match(self):
+        compiled = CompiledTaxTable(
+            "ir",
+            [
+                {"min": 0, "max": 200000, "rate": 0, "fixed": 0, "over": 0},
+                {"min": 100000, "max": 300000, "rate": 0.15, "fixed": 0, "over": 100000},
+            ],
+        )
+        assert not compiled.disjoint
+        assert compiled.find(Decimal("150000")) == (0, 2)
+        assert compiled.find(Decimal("250000")) == (1, 1)
+
+    def test_lookup_matches_bracket_calculation(self):
+        lookup = TableLookup({"ir": IR_TABLE})
+        result = lookup.lookup("ir", Decimal("250000"))
+        assert result["tax"] == Decimal("25000.00")
+        assert result["rate"] == Decimal("0.2")
+        assert lookup.lookup("ir", Decimal("400000"))["tax"] == Decimal("60000.00")
+
+    def test_lookup_reuses_shared_compiled_tables(self):
+        tables = {"ir": IR_TABLE}
+        compiled = {"ir": CompiledTaxTable("ir", IR_TABLE)}
+        TableLookup(tables, compiled_tables=compiled).lookup("ir", Decimal("150000"))
+        assert compiled["ir"].source is IR_TABLE
+
+        # A compiled table built from another list is rebuilt, never trusted
+        stale = CompiledTaxTable("ir", [{"min": 0, "max": None, "rate": 1, "fixed": 0, "over": 0}])
+        compiled = {"ir": stale}
+        result = TableLookup(tables, compiled_tables=compiled).lookup("ir", Decimal("150000"))
+        assert result["tax"] == Decimal("7500.00")
+        assert compiled["ir"] is not stale
+
+    def test_invalid_brackets_are_skipped_and_traced(self):
+        traces: list[str] = []
+        lookup = TableLookup(
+            {
+                "ir": [
+                    {"min": 0, "max": 100, "rate": 0, "fixed": 0, "over": 0},
+                    {"min": 500, "max": 200, "rate": 0.5, "fixed": 0, "over": 0},
+                    {"min": 101, "max": None, "rate": 0.1, "fixed": 0, "over": 100},
+                ]
+            },
+            trace_callback=traces.append,
+        )
+        assert lookup.lookup("ir", Decimal("300"))["tax"] == Decimal("20.00")
+        assert any("max < min" in trace for trace in traces)
@@ -10,6 +10,7 @@ import pytest
 from coati_payroll.enums import (
     AccrualFrequency,
     AccrualMethod,
+    VacacionEstado,
     VacationLedgerType,
     VacationUnitType,
 )
@@ -18,15 +19,17 @@ from coati_payroll.model import (
     Empresa,
     Moneda,
     NominaEmpleado,
+    NominaNovedad,
     Planilla,
     PlanillaEmpleado,
     TipoPlanilla,
     VacationAccount,
     VacationLedger,
+    VacationNovelty,
     VacationPolicy,
     Nomina,
 )
-from coati_payroll.vacation_service import VacationService
+from coati_payroll.vacation_service import VacationService, reconciliar_saldos_vacaciones
 
 
 @pytest.fixture
@@ -933,3 +936,262 @@ def test_calcular_acumulacion_annual_frequency(app, db_session, planilla):
 
         # Should return full annual rate
         assert accrual == Decimal("15.00")
+
+
+def test_accrual_updates_maintained_balance_incrementally(app, db_session, planilla, empleado, periodic_policy, moneda):
+    """Accrual adds to current_balance and bumps ledger_version without re-summing the ledger."""
+    with app.app_context():
+        periodo_inicio = date.today() - timedelta(days=30)
+        periodo_fin = date.today()
+
+        account = VacationAccount(
+            empleado_id=empleado.id,
+            policy_id=periodic_policy.id,
+            current_balance=Decimal("4.00"),
+            ledger_version=1,
+            activo=True,
+            creado_por="test_system",
+        )
+        db_session.add(account)
+        db_session.flush()
+        db_session.add(
+            VacationLedger(
+                account_id=account.id,
+                empleado_id=empleado.id,
+                fecha=date.today() - timedelta(days=60),
+                entry_type=VacationLedgerType.ADJUSTMENT,
+                quantity=Decimal("4.00"),
+                source="initial_balance",
+                reference_type="manual",
+                creado_por="test_system",
+            )
+        )
+        db_session.add(
+            PlanillaEmpleado(
+                planilla_id=planilla.id, empleado_id=empleado.id, fecha_inicio=empleado.fecha_alta, activo=True
+            )
+        )
+        nomina = Nomina(
+            planilla_id=planilla.id, periodo_inicio=periodo_inicio, periodo_fin=periodo_fin, generado_por="test_user"
+        )
+        db_session.add(nomina)
+        db_session.flush()
+        nomina_empleado = NominaEmpleado(
+            nomina_id=nomina.id,
+            empleado_id=empleado.id,
+            sueldo_base_historico=Decimal("1000.00"),
+            moneda_origen_id=moneda.id,
+        )
+        db_session.add(nomina_empleado)
+        db_session.flush()
+
+        service = VacationService(planilla, periodo_inicio, periodo_fin)
+        accrued = service.acumular_vacaciones_empleado(empleado, nomina_empleado, "test_user")
+
+        assert accrued > Decimal("0.00")
+        db_session.refresh(account)
+        assert account.current_balance == Decimal("4.00") + accrued
+        assert account.ledger_version == 2
+        assert service.obtener_resumen_vacaciones(empleado)["balance"] == Decimal("4.00") + accrued
+        assert reconciliar_saldos_vacaciones([account.id], corregir=False) == []
+
+
+def test_reconciliar_saldos_vacaciones_fixes_drift(app, db_session, empleado, periodic_policy):
+    """Reconciliation reports and corrects balances that drifted from the ledger."""
+    with app.app_context():
+        account = VacationAccount(
+            empleado_id=empleado.id,
+            policy_id=periodic_policy.id,
+            current_balance=Decimal("1.00"),
+            activo=True,
+            creado_por="test_system",
+        )
+        db_session.add(account)
+        db_session.flush()
+        for quantity in (Decimal("3.00"), Decimal("-0.50")):
+            db_session.add(
+                VacationLedger(
+                    account_id=account.id,
+                    empleado_id=empleado.id,
+                    fecha=date.today(),
+                    entry_type=VacationLedgerType.ADJUSTMENT,
+                    quantity=quantity,
+                    source="manual",
+                    creado_por="test_system",
+                )
+            )
+        db_session.flush()
+
+        diferencias = reconciliar_saldos_vacaciones(corregir=False)
+        assert [d["account_id"] for d in diferencias] == [account.id]
+        assert diferencias[0]["ledger_balance"] == Decimal("2.5000")
+        assert diferencias[0]["ledger_entries"] == 2
+        assert account.current_balance == Decimal("1.00")
+
+        reconciliar_saldos_vacaciones()
+        assert account.current_balance == Decimal("2.5000")
+        assert account.ledger_version == 2
+        assert reconciliar_saldos_vacaciones(corregir=False) == []
+
+
+def test_preparar_lote_matches_per_employee_resolution(app, db_session, planilla, periodic_policy, moneda):
+    """A planilla-scoped service resolves the same accounts and accruals as per-employee lookups."""
+    with app.app_context():
+        periodo_inicio = date.today() - timedelta(days=30)
+        periodo_fin = date.today()
+
+        nomina = Nomina(
+            planilla_id=planilla.id, periodo_inicio=periodo_inicio, periodo_fin=periodo_fin, generado_por="test_user"
+        )
+        db_session.add(nomina)
+        db_session.flush()
+
+        empleados = []
+        nomina_empleados = []
+        for i in range(3):
+            empleado = Empleado(
+                empresa_id=planilla.empresa_id,
+                codigo_empleado=f"VAC-LOTE-{i}",
+                primer_nombre="Lote",
+                primer_apellido=f"Apellido{i}",
+                identificacion_personal=f"ID-VAC-LOTE-{i}",
+                fecha_alta=date.today() - timedelta(days=400),
+                salario_base=Decimal("1000.00"),
+                moneda_id=moneda.id,
+                activo=True,
+            )
+            db_session.add(empleado)
+            db_session.flush()
+            db_session.add(
+                PlanillaEmpleado(
+                    planilla_id=planilla.id, empleado_id=empleado.id, fecha_inicio=empleado.fecha_alta, activo=True
+                )
+            )
+            db_session.add(
+                VacationAccount(
+                    empleado_id=empleado.id,
+                    policy_id=periodic_policy.id,
+                    current_balance=Decimal("0.00"),
+                    activo=True,
+                    creado_por="test_system",
+                )
+            )
+            nomina_empleado = NominaEmpleado(
+                nomina_id=nomina.id,
+                empleado_id=empleado.id,
+                sueldo_base_historico=Decimal("1000.00"),
+                moneda_origen_id=moneda.id,
+            )
+            db_session.add(nomina_empleado)
+            empleados.append(empleado)
+            nomina_empleados.append(nomina_empleado)
+        db_session.flush()
+
+        individual = VacationService(planilla, periodo_inicio, periodo_fin, apply_side_effects=False)
+        esperado = [
+            individual.acumular_vacaciones_empleado(empleado, nomina_empleado, "test_user")
+            for empleado, nomina_empleado in zip(empleados, nomina_empleados)
+        ]
+
+        lote = VacationService(planilla, periodo_inicio, periodo_fin).preparar_lote(
+            empleados, [ne.id for ne in nomina_empleados]
+        )
+        acumulado = [
+            lote.acumular_vacaciones_empleado(empleado, nomina_empleado, "test_user")
+            for empleado, nomina_empleado in zip(empleados, nomina_empleados)
+        ]
+        db_session.flush()
+
+        assert acumulado == esperado
+        assert all(monto > Decimal("0.00") for monto in acumulado)
+        for empleado, monto in zip(empleados, acumulado):
+            assert lote.obtener_resumen_vacaciones(empleado)["balance"] == monto
+        # Accruals recorded in this run are not applied twice
+        assert lote.acumular_vacaciones_empleado(empleados[0], nomina_empleados[0], "test_user") == Decimal("0.00")
+        assert reconciliar_saldos_vacaciones(corregir=False) == []
+
+
+def test_preparar_lote_debits_vacation_usage_once(app, db_session, planilla, empleado, periodic_policy):
+    """A vacation novelty processed by a batched run is debited once and bumps ledger_version."""
+    with app.app_context():
+        periodo_inicio = date.today() - timedelta(days=30)
+        periodo_fin = date.today()
+
+        account = VacationAccount(
+            empleado_id=empleado.id,
+            policy_id=periodic_policy.id,
+            current_balance=Decimal("10.00"),
+            ledger_version=1,
+            activo=True,
+            creado_por="test_system",
+        )
+        db_session.add(account)
+        db_session.add(
+            PlanillaEmpleado(
+                planilla_id=planilla.id, empleado_id=empleado.id, fecha_inicio=empleado.fecha_alta, activo=True
+            )
+        )
+        nomina = Nomina(
+            planilla_id=planilla.id, periodo_inicio=periodo_inicio, periodo_fin=periodo_fin, generado_por="test_user"
+        )
+        db_session.add(nomina)
+        db_session.flush()
+        db_session.add(
+            VacationLedger(
+                account_id=account.id,
+                empleado_id=empleado.id,
+                fecha=periodo_inicio - timedelta(days=30),
+                entry_type=VacationLedgerType.ADJUSTMENT,
+                quantity=Decimal("10.00"),
+                source="initial_balance",
+                reference_type="manual",
+                creado_por="test_system",
+            )
+        )
+        vac_novelty = VacationNovelty(
+            empleado_id=empleado.id,
+            account_id=account.id,
+            start_date=periodo_inicio + timedelta(days=5),
+            end_date=periodo_inicio + timedelta(days=7),
+            units=Decimal("3.00"),
+            estado=VacacionEstado.APROBADO,
+            creado_por="test_user",
+        )
+        db_session.add(vac_novelty)
+        db_session.flush()
+        db_session.add(
+            NominaNovedad(
+                nomina_id=nomina.id,
+                empleado_id=empleado.id,
+                tipo_valor="dias",
+                codigo_concepto="VACACIONES",
+                valor_cantidad=Decimal("3.00"),
+                fecha_novedad=vac_novelty.start_date,
+                es_descanso_vacaciones=True,
+                vacation_novelty_id=vac_novelty.id,
+            )
+        )
+        db_session.flush()
+
+        lote = VacationService(planilla, periodo_inicio, periodo_fin).preparar_lote([empleado])
+        assert lote.procesar_novedades_vacaciones(empleado, [], "test_user") == Decimal("3.00")
+        # The same run, and a later run over the same period, find the usage already recorded
+        assert lote.procesar_novedades_vacaciones(empleado, [], "test_user") == Decimal("0.00")
+        db_session.flush()
+        siguiente = VacationService(planilla, periodo_inicio, periodo_fin).preparar_lote([empleado])
+        assert siguiente.procesar_novedades_vacaciones(empleado, [], "test_user") == Decimal("0.00")
+        db_session.flush()
+
+        db_session.refresh(account)
+        usos = (
+            db_session.query(VacationLedger)
+            .filter_by(account_id=account.id, entry_type=VacationLedgerType.USAGE)
+            .all()
+        )
+        assert [uso.quantity for uso in usos] == [Decimal("-3.00")]
+        assert account.current_balance == Decimal("7.00")
+        assert account.ledger_version == 2
+        db_session.refresh(vac_novelty)
+        assert vac_novelty.estado == VacacionEstado.DISFRUTADO
+        assert vac_novelty.ledger_entry_id == usos[0].id
+        assert reconciliar_saldos_vacaciones([account.id], corregir=False) == []
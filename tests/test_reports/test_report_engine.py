@@ -4,17 +4,21 @@
 
 from decimal import Decimal
 
+import pytest
+
 from coati_payroll.enums import ReportExecutionStatus, ReportStatus, ReportType
-from coati_payroll.model import Report, ReportRole
+from coati_payroll.model import Empleado, Report, ReportExecution, ReportRole, db
 from coati_payroll.report_engine import (
     ALLOWED_ENTITIES,
     ALLOWED_FIELDS,
     ALLOWED_OPERATORS,
     CustomReportBuilder,
+    InvalidCursorError,
     ReportExecutionManager,
     can_execute_report,
     can_export_report,
     can_view_report,
+    encode_cursor,
 )
 from tests.factories.company_factory import create_company
 from tests.factories.employee_factory import create_employee
@@ -321,6 +325,139 @@ def test_custom_report_execute_with_data(app, db_session):
         assert results[1]["Apellido"] == "Perez"
 
 
+def test_custom_report_keyset_pagination(app, db_session):
+    """
+    Test paging a custom report with continuation cursors.
+
+    Setup:
+        - Create employees with repeated sort values and NULL second surnames
+        - Create report sorted by a nullable field and a descending field
+
+    Action:
+        - Follow next_cursor until the last page
+
+    Verification:
+        - Pages cover every employee once, in the stable sort order (NULLs last)
+        - The total count is carried from the first page
+        - A cursor is rejected for other filters
+    """
+    with app.app_context():
+        empresa = create_company(db_session, "TEST_KEYSET", "Keyset Company", "J9999")
+        datos = [
+            ("Ana", "Diaz", Decimal("900.00")),
+            ("Beto", None, Decimal("1500.00")),
+            ("Carla", "Diaz", Decimal("900.00")),
+            ("Dario", "Arce", Decimal("1200.00")),
+            ("Elena", None, Decimal("1500.00")),
+            ("Fabio", "Diaz", Decimal("1100.00")),
+            ("Gina", None, Decimal("800.00")),
+        ]
+        for nombre, segundo_apellido, salario in datos:
+            create_employee(
+                db_session,
+                empresa_id=empresa.id,
+                primer_nombre=nombre,
+                segundo_apellido=segundo_apellido,
+                salario_base=salario,
+            )
+        db_session.commit()
+
+        definition = {
+            "columns": [{"type": "field", "entity": "Employee", "field": "primer_nombre", "label": "Nombre"}],
+            "filters": [],
+            "sorting": [
+                {"field": "segundo_apellido", "direction": "asc"},
+                {"field": "salario_base", "direction": "desc"},
+            ],
+        }
+        report = Report(
+            name="Employee Keyset",
+            type=ReportType.CUSTOM,
+            status=ReportStatus.ENABLED,
+            base_entity="Employee",
+            definition=definition,
+        )
+        builder = CustomReportBuilder(report)
+
+        empleados = db_session.execute(db.select(Empleado)).scalars().all()
+        esperado = [
+            e.primer_nombre
+            for e in sorted(
+                empleados,
+                key=lambda e: (e.segundo_apellido is None, e.segundo_apellido or "", -e.salario_base, e.id),
+            )
+        ]
+
+        nombres = []
+        totales = []
+        cursor = None
+        while True:
+            page = builder.execute_page(cursor=cursor, per_page=3)
+            nombres.extend(row["Nombre"] for row in page.results)
+            totales.append(page.total_count)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert nombres == esperado
+        assert nombres[:2] == ["Dario", "Fabio"]
+        assert set(nombres[-3:]) == {"Beto", "Elena", "Gina"}
+        assert totales == [7, 7, 7]
+
+        # Offset pages follow the same stable order
+        segunda, total = builder.execute(page=2, per_page=3)
+        assert [row["Nombre"] for row in segunda] == esperado[3:6]
+        assert total == 7
+
+        primera = builder.execute_page(per_page=3)
+        with pytest.raises(ValueError):
+            builder.execute_page({"activo": False}, cursor=primera.next_cursor, per_page=3)
+
+
+def test_invalid_cursor_is_rejected_without_recording_execution(app, db_session):
+    """
+    Test that malformed, tampered or mismatched cursors are client errors.
+
+    Setup:
+        - Create a custom report sorted by one field
+
+    Action:
+        - Execute pages with bad cursors through the execution manager
+
+    Verification:
+        - Each raises InvalidCursorError
+        - No ReportExecution is recorded
+    """
+    with app.app_context():
+        report = Report(
+            name="Employee Cursor",
+            type=ReportType.CUSTOM,
+            status=ReportStatus.ENABLED,
+            base_entity="Employee",
+            definition={
+                "columns": [{"type": "field", "entity": "Employee", "field": "primer_nombre", "label": "Nombre"}],
+                "sorting": [{"field": "salario_base", "direction": "asc"}],
+            },
+        )
+        db_session.add(report)
+        db_session.commit()
+        fingerprint = CustomReportBuilder(report).cursor_fingerprint({})
+        manager = ReportExecutionManager(report, "testuser")
+
+        for cursor in [
+            "not a cursor",
+            encode_cursor("other-query", k=["1.00", "ID"], n=1),
+            encode_cursor(fingerprint, k="1.00", n=1),
+            encode_cursor(fingerprint, k=["1.00"], n=1),
+            encode_cursor(fingerprint, k=[{"a": 1}, "ID"], n=1),
+            encode_cursor(fingerprint, k=["1.00", "ID"], n="1"),
+        ]:
+            with pytest.raises(InvalidCursorError):
+                manager.execute_page({}, cursor=cursor, per_page=3)
+
+        assert db_session.query(ReportExecution).count() == 0
+
+
 def test_can_view_report_admin():
     """
     Test admin can view any report.
@@ -510,3 +647,37 @@ def test_report_execution_manager(app, db_session):
         assert execution.row_count == 1
         assert execution.execution_time_ms > 0
         assert len(results) == 1
+
+
+def test_execution_manager_execute_stream(app, db_session):
+    """The export stream yields rows lazily and completes the execution once exhausted."""
+    with app.app_context():
+        empresa = create_company(db_session, "STREAM_CO", "Stream Company", "J7777")
+        for i in range(3):
+            create_employee(db_session, empresa_id=empresa.id, codigo=f"STR{i:03d}")
+        db_session.commit()
+
+        report = Report(
+            name="Stream Execution",
+            type=ReportType.CUSTOM,
+            status=ReportStatus.ENABLED,
+            base_entity="Employee",
+            definition={
+                "columns": [{"type": "field", "entity": "Employee", "field": "codigo_empleado", "label": "Código"}],
+                "filters": [],
+                "sorting": [{"field": "codigo_empleado", "direction": "desc"}],
+            },
+        )
+        db_session.add(report)
+        db_session.commit()
+
+        manager = ReportExecutionManager(report, "test_user")
+        rows, total_count, execution = manager.execute_stream(limit=2)
+
+        assert not isinstance(rows, list)
+        assert total_count == 2
+        assert execution.status == ReportExecutionStatus.RUNNING
+
+        assert [row["Código"] for row in rows] == ["STR002", "STR001"]
+        assert execution.status == ReportExecutionStatus.COMPLETED
+        assert execution.row_count == 2
@@ -403,6 +403,32 @@ def test_export_to_excel(tmpdir):
         assert ws["B3"].value == 2  # Total records
 
 
+@pytest.mark.skipif(not OPENPYXL_AVAILABLE, reason="openpyxl not installed")
+def test_export_to_excel_from_generator(tmpdir):
+    """Rows fed from a generator are streamed into the file, past the width sample."""
+    from openpyxl import load_workbook
+
+    consumed = []
+
+    def rows():
+        for i in range(250):
+            consumed.append(i)
+            yield {"Name": f"Row {i}", "Value": i}
+
+    output_path = str(tmpdir.join("generator_report.xlsx"))
+
+    exporter = ReportExporter("Generator Report", rows(), total_count=250)
+    assert consumed == []
+    file_path = exporter.to_excel(output_path)
+
+    ws = load_workbook(file_path).active
+    assert ws["B3"].value == 250  # Total records
+    assert [cell.value for cell in ws[5]] == ["Name", "Value"]
+    assert [cell.value for cell in ws[6]] == ["Row 0", 0]
+    assert [cell.value for cell in ws[255]] == ["Row 249", 249]
+    assert len(consumed) == 250
+
+
 @pytest.mark.skipif(not OPENPYXL_AVAILABLE, reason="openpyxl not installed")
 def test_export_to_excel_with_empty_results(tmpdir):
     """
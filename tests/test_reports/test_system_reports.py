@@ -3,7 +3,12 @@
 """Tests for system reports."""
 
 from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
 
+from coati_payroll import interes_engine
+from coati_payroll.enums import AdelantoEstado, AdelantoTipo
+from coati_payroll.model import Adelanto
 from coati_payroll.system_reports import (
     SYSTEM_REPORT_METADATA,
     SYSTEM_REPORTS,
@@ -406,3 +411,53 @@ def test_payroll_by_period_report_structure():
     assert metadata["name"] == "Nómina por Período"
     assert metadata["category"] == "payroll"
     assert "parameters" in metadata
+
+
+def test_loan_portfolio_report(app, db_session):
+    """
+    Test loan portfolio report builds every schedule in one batch.
+
+    Setup:
+        - Create two approved loans and one draft loan for the same company
+
+    Action:
+        - Execute loan_portfolio with a cut-off date
+
+    Verification:
+        - Only approved loans are listed, with their pending installments
+        - Schedules are generated by a single generar_tablas_amortizacion call
+    """
+    with app.app_context():
+        empresa = create_company(db_session, "TEST_LOANS", "Loan Company", "J0042")
+        ana = create_employee(db_session, empresa_id=empresa.id, primer_nombre="Ana", primer_apellido="Arce")
+        beto = create_employee(db_session, empresa_id=empresa.id, primer_nombre="Beto", primer_apellido="Baez")
+        for empleado, estado in [(ana, AdelantoEstado.APROBADO), (beto, AdelantoEstado.APROBADO), (beto, "draft")]:
+            db_session.add(
+                Adelanto(
+                    empleado_id=empleado.id,
+                    tipo=AdelantoTipo.PRESTAMO,
+                    fecha_solicitud=date(2024, 1, 10),
+                    monto_solicitado=Decimal("6000.00"),
+                    monto_aprobado=Decimal("6000.00"),
+                    saldo_pendiente=Decimal("3000.00"),
+                    cuotas_pactadas=6,
+                    estado=estado,
+                    fecha_aprobacion=date(2024, 1, 15),
+                    tasa_interes=Decimal("0.0000"),
+                    tipo_interes="none",
+                    metodo_amortizacion="french",
+                )
+            )
+        db_session.commit()
+
+        with patch.object(
+            interes_engine, "generar_tablas_amortizacion", wraps=interes_engine.generar_tablas_amortizacion
+        ) as lote:
+            results = get_system_report("loan_portfolio")({"empresa_id": empresa.id, "fecha_corte": "2024-03-20"})
+
+        assert lote.call_count == 1
+        assert [row["Nombre"] for row in results] == ["Ana Arce", "Beto Baez"]
+        assert results[0]["Cuotas Pendientes"] == 3
+        assert results[0]["Próxima Cuota"] == "2024-04-15"
+        assert results[0]["Monto Próxima Cuota"] == 1000.0
+        assert results[0]["Interés Programado Pendiente"] == 0.0
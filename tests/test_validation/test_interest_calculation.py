@@ -6,12 +6,16 @@ from datetime import date
 from decimal import Decimal
 
 from coati_payroll.enums import MetodoAmortizacion, TipoInteres
+from coati_payroll import interes_engine
 from coati_payroll.interes_engine import (
+    ParametrosAmortizacion,
     calcular_cuota_frances,
     calcular_interes_compuesto,
     calcular_interes_periodo,
     calcular_interes_simple,
+    clear_amortizacion_cache,
     generar_tabla_amortizacion,
+    generar_tablas_amortizacion,
 )
 
 
@@ -371,3 +375,62 @@ class TestTablaAmortizacion:
         tabla = generar_tabla_amortizacion(principal, tasa_anual, num_cuotas, fecha_inicio)
 
         assert len(tabla) == 0
+
+
+class TestTablaAmortizacionCache:
+    """Tests for memoized and batch amortization schedules."""
+
+    def setup_method(self):
+        clear_amortizacion_cache()
+
+    def teardown_method(self):
+        clear_amortizacion_cache()
+
+    def test_tabla_repetida_se_reutiliza(self):
+        """Regenerating an unchanged schedule reuses the cached result."""
+        args = (Decimal("12000.00"), Decimal("12.0"), 12, date(2024, 1, 31))
+
+        primera = generar_tabla_amortizacion(*args, tipo_interes=TipoInteres.COMPUESTO)
+        segunda = generar_tabla_amortizacion(*args, tipo_interes=TipoInteres.COMPUESTO)
+
+        assert primera == segunda
+        assert primera is not segunda
+        assert len(interes_engine._amortizacion_cache) == 1
+
+        generar_tabla_amortizacion(*args, fecha_desembolso=date(2024, 1, 10), tipo_interes=TipoInteres.COMPUESTO)
+        assert len(interes_engine._amortizacion_cache) == 2
+
+    def test_cambio_de_configuracion_invalida_tabla(self):
+        """Schedules are keyed by the financial-year settings of the configuration."""
+        config = interes_engine._obtener_config_default(None)
+        args = (Decimal("12000.00"), Decimal("12.0"), 12, date(2024, 1, 31))
+
+        anio_365 = generar_tabla_amortizacion(*args, config=config)
+        config.dias_anio_financiero = 360
+        anio_360 = generar_tabla_amortizacion(*args, config=config)
+
+        assert anio_360[0].interes > anio_365[0].interes
+        assert len(interes_engine._amortizacion_cache) == 2
+
+    def test_lote_coincide_con_tablas_individuales(self):
+        """Batch schedules equal the single-loan ones and share identical loans."""
+        frances = ParametrosAmortizacion(Decimal("5000.00"), Decimal("18.0"), 24, date(2024, 3, 15))
+        aleman = ParametrosAmortizacion(
+            Decimal("8000.00"),
+            Decimal("9.5"),
+            10,
+            date(2024, 2, 29),
+            fecha_desembolso=date(2024, 2, 1),
+            metodo=MetodoAmortizacion.ALEMAN,
+            tipo_interes=TipoInteres.COMPUESTO,
+        )
+        sin_cuotas = ParametrosAmortizacion(Decimal("1000.00"), Decimal("5.0"), 0, date(2024, 1, 1))
+
+        tablas = generar_tablas_amortizacion({"A": frances, "B": aleman, "C": frances, "D": sin_cuotas})
+
+        assert tablas["A"] == generar_tabla_amortizacion(*frances)
+        assert tablas["B"] == generar_tabla_amortizacion(*aleman)
+        assert tablas["C"] == tablas["A"]
+        assert tablas["D"] == []
+        assert tablas["B"][-1].saldo == Decimal("0.00")
+        assert len(interes_engine._amortizacion_cache) == 2
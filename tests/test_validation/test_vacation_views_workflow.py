@@ -468,3 +468,45 @@ def test_vacation_initial_balance_bulk_post_applies_balance_from_excel(app, clie
         assert len(ledger_entries) == 1
         assert ledger_entries[0].quantity == Decimal("7.5")
         assert ledger_entries[0].balance_after == Decimal("7.5")
+
+
+@pytest.mark.validation
+def test_vacation_account_new_records_opening_balance_in_ledger(app, client, db_session):
+    with app.app_context():
+        admin = create_user(db_session, "admin_cuenta", "password", tipo=TipoUsuario.ADMIN)
+
+        empresa, moneda, _, planilla = _create_base_company_struct(db_session)
+        empleado = _create_employee(db_session, empresa.id, moneda.id, codigo="EMP-NEW")
+
+        policy = VacationPolicy(
+            codigo="POL-NEW",
+            nombre="Test Policy",
+            empresa_id=empresa.id,
+            planilla_id=planilla.id,
+            accrual_rate=Decimal("15.0000"),
+            allow_negative=False,
+            activo=True,
+        )
+        db_session.add(policy)
+        db_session.commit()
+
+        login_user(client, admin.usuario, "password")
+
+        response = client.post(
+            "/vacation/accounts/new",
+            data={"empleado_id": empleado.id, "policy_id": policy.id, "current_balance": "4.5", "activo": "y"},
+            follow_redirects=False,
+        )
+
+        assert response.status_code == 302
+
+        account = db_session.query(VacationAccount).filter(VacationAccount.empleado_id == empleado.id).one()
+        assert account.current_balance == Decimal("4.5")
+        assert account.ledger_version == 1
+
+        ledger_entries = db_session.query(VacationLedger).filter(VacationLedger.account_id == account.id).all()
+        assert len(ledger_entries) == 1
+        assert ledger_entries[0].entry_type == VacationLedgerType.ADJUSTMENT
+        assert ledger_entries[0].source == "initial_balance"
+        assert ledger_entries[0].quantity == Decimal("4.5")
+        assert ledger_entries[0].balance_after == Decimal("4.5")
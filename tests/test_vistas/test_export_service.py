@@ -590,6 +590,26 @@ class TestExportarNominaExcel:
             assert "Salario Neto" in headers
             assert "Total Prestaciones" in headers
 
+    def test_exportar_nomina_excel_fija_encabezados_y_titulo(self, app, db_session, planilla, nomina, nomina_empleado):
+        """Streamed export keeps the merged title and freezes panes at the first data row."""
+        from openpyxl import load_workbook
+        from coati_payroll.vistas.planilla.services.export_service import ExportService
+
+        with app.app_context():
+            planilla, nomina = _prepare_objects_for_export(planilla, nomina)
+            output, _filename = ExportService.exportar_nomina_excel(planilla, nomina)
+
+            wb = load_workbook(output)
+            ws = wb.active
+
+            assert ws.title == "Nomina"
+            assert ws["A1"].value == f"NOMINA - {planilla.nombre}"
+            assert any(str(rango).startswith("A1:") for rango in ws.merged_cells.ranges)
+
+            data_row = int(ws.freeze_panes[1:])
+            assert ws.cell(row=data_row - 1, column=1).value == "Codigo"
+            assert ws.cell(row=data_row, column=1).value == nomina_empleado.empleado.codigo_empleado
+
     def test_exportar_nomina_excel_ajuste_reclasificacion_salario_bruto(
         self, app, db_session, planilla, nomina, nomina_empleado
     ):
@@ -845,6 +865,109 @@ class TestExportarPrestacionesExcel:
             assert isinstance(output, BytesIO)
             assert filename is not None
 
+    def test_exportar_prestaciones_excel_same_code_different_description(
+        self, app, db_session, planilla, nomina, nomina_empleado
+    ):
+        """Benefits sharing a code under different descriptions keep separate columns."""
+        from openpyxl import load_workbook
+        from coati_payroll.vistas.planilla.services.export_service import ExportService
+
+        with app.app_context():
+            for orden, (descripcion, monto) in enumerate([("Aguinaldo", "80.00"), ("Indemnización", "20.00")], 1):
+                db_session.add(
+                    NominaDetalle(
+                        nomina_empleado_id=nomina_empleado.id,
+                        tipo="benefit",
+                        codigo="PRE001",
+                        descripcion=descripcion,
+                        monto=Decimal(monto),
+                        orden=orden,
+                    )
+                )
+            db_session.commit()
+
+            planilla, nomina = _prepare_objects_for_export(planilla, nomina)
+
+            output, _filename = ExportService.exportar_prestaciones_excel(planilla, nomina)
+
+            ws = load_workbook(output).active
+            header_row = next(row for row in range(1, 30) if ws.cell(row=row, column=1).value == "Cód. Empleado")
+            assert ws.cell(row=header_row, column=4).value == "Aguinaldo"
+            assert ws.cell(row=header_row, column=5).value == "Indemnización"
+            assert ws.cell(row=header_row + 1, column=4).value == 80.0
+            assert ws.cell(row=header_row + 1, column=5).value == 20.0
+
+    def test_exportar_prestaciones_excel_queries_do_not_grow_with_employees(
+        self, app, db_session, planilla, nomina, empresa, moneda
+    ):
+        """Benefits are read with one pivot query, whatever the number of employees."""
+        from openpyxl import load_workbook
+        from sqlalchemy import event
+        from coati_payroll.vistas.planilla.services.export_service import ExportService
+
+        with app.app_context():
+            for i in range(6):
+                empleado = Empleado(
+                    empresa_id=empresa.id,
+                    codigo_empleado=f"PIV{i:03d}",
+                    primer_nombre=f"Nombre{i}",
+                    primer_apellido=f"Apellido{i}",
+                    identificacion_personal=f"PIV-ID-{i}",
+                    salario_base=Decimal("1000.00"),
+                    moneda_id=moneda.id,
+                    fecha_alta=date.today() - timedelta(days=365),
+                    activo=True,
+                )
+                db_session.add(empleado)
+                db_session.flush()
+                ne = NominaEmpleado(
+                    nomina_id=nomina.id,
+                    empleado_id=empleado.id,
+                    salario_bruto=Decimal("1000.00"),
+                    total_ingresos=Decimal("1000.00"),
+                    total_deducciones=Decimal("0.00"),
+                    salario_neto=Decimal("1000.00"),
+                    sueldo_base_historico=Decimal("1000.00"),
+                )
+                db_session.add(ne)
+                db_session.flush()
+                db_session.add(
+                    NominaDetalle(
+                        nomina_empleado_id=ne.id,
+                        tipo="benefit",
+                        codigo="BON001",
+                        descripcion="Bono",
+                        monto=Decimal(10 * (i + 1)),
+                        orden=1,
+                    )
+                )
+            db_session.commit()
+
+            planilla, nomina = _prepare_objects_for_export(planilla, nomina)
+            _ = planilla.vacation_policy
+
+            sentencias = []
+
+            def contar(*_args):
+                sentencias.append(1)
+
+            event.listen(db.engine, "before_cursor_execute", contar)
+            try:
+                output, _filename = ExportService.exportar_prestaciones_excel(planilla, nomina)
+            finally:
+                event.remove(db.engine, "before_cursor_execute", contar)
+
+            assert len(sentencias) <= 4
+
+            ws = load_workbook(output).active
+            header_row = next(row for row in range(1, 30) if ws.cell(row=row, column=1).value == "Cód. Empleado")
+            assert ws.cell(row=header_row, column=4).value == "Bono"
+            montos = {
+                ws.cell(row=row, column=1).value: ws.cell(row=row, column=4).value
+                for row in range(header_row + 1, header_row + 7)
+            }
+            assert montos == {f"PIV{i:03d}": 10.0 * (i + 1) for i in range(6)}
+
     def test_exportar_prestaciones_excel_no_prestaciones(self, app, db_session, planilla, nomina, nomina_empleado):
         """
         Test that export works when there are no prestaciones.
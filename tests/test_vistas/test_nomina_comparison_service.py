@@ -9,7 +9,11 @@ from types import SimpleNamespace
 from sqlalchemy.exc import IntegrityError
 
 from coati_payroll.enums import NominaEstado
+from coati_payroll.model import NominaComparacion, NominaDetalle, NominaEmpleado, Planilla, db
+from coati_payroll.nomina_engine import NominaEngine
+from coati_payroll.queue.tasks import precompute_nomina_comparison
 from coati_payroll.vistas.planilla.services.nomina_comparison_service import NominaComparisonService
+from tests.factories import create_payroll_dataset
 
 
 def _nomina_empleado(
@@ -163,14 +167,99 @@ def test_pct_delta_and_percent_helpers_handle_zero_base_case() -> None:
     assert NominaComparisonService._percent(None) is None
 
 
-def test_statistical_helpers_return_expected_values() -> None:
-    values = [Decimal("1"), Decimal("2"), Decimal("3"), Decimal("4")]
+def _estadisticas(neto: str, bruto: str) -> dict[str, Decimal]:
+    """Salary statistics of a nomina whose employees all earn the same."""
+    claves_neto = ("promedio_neto", "mediana_neto", "p5_neto", "p25_neto", "p75_neto", "p95_neto")
+    return {
+        **dict.fromkeys(claves_neto, Decimal(neto)),
+        "std_neto": Decimal("0"),
+        "promedio_bruto": Decimal(bruto),
+        "mediana_bruto": Decimal(bruto),
+    }
+
 
-    assert NominaComparisonService._avg(values) == Decimal("2.5")
-    assert NominaComparisonService._median(values) == Decimal("2.5")
-    assert NominaComparisonService._percentile(values, 75) == Decimal("3")
-    assert NominaComparisonService._iqr(values) == Decimal("2")
-    assert NominaComparisonService._std_dev(values).quantize(Decimal("0.0001")) == Decimal("1.1180")
+def _ejecutar(planilla_id: str, mes: int):
+    fin = date(2025, mes, 28)
+    engine = NominaEngine(
+        planilla=db.session.get(Planilla, planilla_id),
+        periodo_inicio=date(2025, mes, 1),
+        periodo_fin=fin,
+        fecha_calculo=fin,
+        usuario="test",
+    )
+    nomina = engine.ejecutar()
+    assert engine.errors == []
+    db.session.commit()
+    return nomina
+
+
+def test_estadisticas_salarios_are_computed_by_the_database(app, db_session) -> None:
+    with app.app_context():
+        dataset = create_payroll_dataset(db_session, 4, loan_ratio=0.0)
+        nomina = _ejecutar(dataset.planilla_id, 1)
+        empleados = db.session.execute(db.select(NominaEmpleado).filter_by(nomina_id=nomina.id)).scalars().all()
+        for empleado, neto in zip(empleados, ("4", "1", "3", "2")):
+            empleado.salario_neto = Decimal(neto)
+            empleado.salario_bruto = Decimal(neto) * 10
+        db.session.commit()
+
+        estadisticas = NominaComparisonService._estadisticas_salarios(nomina.id)
+
+        assert estadisticas["promedio_neto"] == Decimal("2.5")
+        assert estadisticas["mediana_neto"] == Decimal("2.5")
+        assert estadisticas["mediana_bruto"] == Decimal("25")
+        assert estadisticas["p75_neto"] == Decimal("3")
+        assert estadisticas["p75_neto"] - estadisticas["p25_neto"] == Decimal("2")
+        assert estadisticas["std_neto"].quantize(Decimal("0.0001")) == Decimal("1.1180")
+
+
+def test_build_comparison_aggregates_concepts_and_drivers_in_sql(app, db_session) -> None:
+    with app.app_context():
+        dataset = create_payroll_dataset(db_session, 3, loan_ratio=0.0)
+        enero = _ejecutar(dataset.planilla_id, 1)
+        febrero = _ejecutar(dataset.planilla_id, 2)
+        planilla = db.session.get(Planilla, dataset.planilla_id)
+        detalle = (
+            db.session.execute(
+                db.select(NominaDetalle)
+                .join(NominaEmpleado, NominaEmpleado.id == NominaDetalle.nomina_empleado_id)
+                .filter(NominaEmpleado.nomina_id == febrero.id, NominaDetalle.tipo == "income")
+                .order_by(NominaDetalle.id)
+            )
+            .scalars()
+            .first()
+        )
+        empleado_id = db.session.get(NominaEmpleado, detalle.nomina_empleado_id).empleado_id
+
+        def concepto(payload):
+            return next(item for item in payload["conceptos"]["por_tipo"]["income"] if item["codigo"] == detalle.codigo)
+
+        antes = concepto(NominaComparisonService.build_comparison(planilla, enero, febrero))
+        detalle.monto = Decimal(str(detalle.monto)) + Decimal("50000")
+        db.session.commit()
+        payload = NominaComparisonService.build_comparison(planilla, enero, febrero)
+
+        assert concepto(payload)["variacion"] - antes["variacion"] == 50000.0
+        assert concepto(payload)["empleados_actual"] == antes["empleados_actual"] > 0
+        driver = payload["conceptos"]["drivers_empleado"][empleado_id][0]
+        assert (driver["tipo"], driver["codigo"]) == ("income", detalle.codigo)
+
+
+def test_precompute_task_caches_comparison_against_previous_nomina(app, db_session) -> None:
+    with app.app_context():
+        dataset = create_payroll_dataset(db_session, 2, loan_ratio=0.0)
+        enero = _ejecutar(dataset.planilla_id, 1)
+        febrero = _ejecutar(dataset.planilla_id, 2)
+        marzo = _ejecutar(dataset.planilla_id, 3)
+
+        assert precompute_nomina_comparison(enero.id)["skipped"] is True
+        resultado = precompute_nomina_comparison(marzo.id)
+
+        assert resultado["success"] is True
+        assert resultado["nomina_base_id"] == febrero.id
+        cache = db.session.execute(db.select(NominaComparacion).filter_by(nomina_actual_id=marzo.id)).scalar_one()
+        assert cache.nomina_base_id == febrero.id
+        assert cache.resumen_json["resumen"]["empleados_actual"] == 2
 
 
 def test_resumen_totales_includes_period_days_variation() -> None:
@@ -188,14 +277,11 @@ def test_resumen_totales_includes_period_days_variation() -> None:
         periodo_inicio=date(2026, 1, 1),
         periodo_fin=date(2026, 1, 1),
     )
-    empleados_base = [SimpleNamespace(salario_neto=Decimal("900"), salario_bruto=Decimal("1000"))]
-    empleados_actual = [SimpleNamespace(salario_neto=Decimal("45"), salario_bruto=Decimal("50"))]
-
     resumen = NominaComparisonService._resumen_totales(
         nomina_base=nomina_base,
         nomina_actual=nomina_actual,
-        empleados_base=empleados_base,
-        empleados_actual=empleados_actual,
+        estadisticas_base=_estadisticas(neto="900", bruto="1000"),
+        estadisticas_actual=_estadisticas(neto="45", bruto="50"),
         ids_base={"E1"},
         ids_actual={"E1"},
     )
@@ -203,6 +289,8 @@ def test_resumen_totales_includes_period_days_variation() -> None:
     assert resumen["dias_calculo_base"] == 28
     assert resumen["dias_calculo_actual"] == 1
     assert resumen["variacion_dias_calculo"] == -27
+    assert resumen["mediana_neto_actual"] == 45.0
+    assert resumen["distribucion"]["iqr_neto_base"] == 0.0
 
 
 def test_iso_utc_normalizes_naive_and_aware_datetimes() -> None:
@@ -725,6 +725,47 @@ def test_progreso_nomina_returns_json(app, client, admin_user, db_session, plani
         assert data["procesamiento_en_background"] is True
 
 
+def test_progreso_nomina_returns_only_events_after_cursor(app, client, admin_user, db_session, planilla, nomina):
+    """Test that progreso_nomina pages append-only progress events with a cursor."""
+    with app.app_context():
+        login_user(client, admin_user.usuario, "admin-password")
+
+        from coati_payroll.model import NominaProgress, NominaProgressEvento, db
+        from coati_payroll.queue.tasks import _upsert_nomina_progress
+
+        nomina = db.session.merge(nomina)
+        nomina.procesamiento_en_background = True
+        nomina.estado = "calculando"
+        db.session.commit()
+
+        _upsert_nomina_progress(db.session, nomina.id, "job-1", total_empleados=4)
+        for i in range(4):
+            _upsert_nomina_progress(
+                db.session,
+                nomina.id,
+                "job-1",
+                incrementar_procesados=1,
+                eventos=[{"empleado": f"Empleado {i}", "status": "success", "message": f"Empleado {i}"}],
+            )
+
+        progress = db.session.execute(db.select(NominaProgress).filter_by(nomina_id=nomina.id)).scalar_one()
+        assert progress.empleados_procesados == 4
+        assert progress.ultimo_evento == 4
+        assert not progress.log_procesamiento
+        assert db.session.query(NominaProgressEvento).filter_by(nomina_id=nomina.id).count() == 4
+
+        data = client.get(f"/planilla/{planilla.id}/nomina/{nomina.id}/progreso").get_json()
+        assert [evento["secuencia"] for evento in data["eventos"]] == [1, 2, 3, 4]
+        assert data["cursor"] == 4
+
+        data = client.get(f"/planilla/{planilla.id}/nomina/{nomina.id}/progreso?desde=2").get_json()
+        assert [evento["message"] for evento in data["eventos"]] == ["Empleado 2", "Empleado 3"]
+
+        data = client.get(f"/planilla/{planilla.id}/nomina/{nomina.id}/progreso?desde=4").get_json()
+        assert data["eventos"] == []
+        assert data["cursor"] == 4
+
+
 def test_progreso_nomina_wrong_planilla_returns_404(app, client, admin_user, db_session, planilla, nomina):
     """Test that progreso_nomina returns 404 if nomina doesn't belong to planilla."""
     with app.app_context():
@@ -1300,6 +1341,28 @@ def test_ver_log_nomina_accessible_to_authenticated_users(app, client, admin_use
         assert response.status_code == 200
 
 
+def test_ver_log_nomina_shows_execution_profile(app, client, admin_user, db_session, planilla, nomina):
+    """Test that the nomina log shows the per-phase execution profile."""
+    with app.app_context():
+        login_user(client, admin_user.usuario, "admin-password")
+
+        nomina.perfil_ejecucion = {
+            "version": 1,
+            "total_seconds": 1.25,
+            "total_queries": 42,
+            "unaccounted_seconds": 0.05,
+            "phases": {"calculation": {"seconds": 0.9, "queries": 30}},
+            "employees": {"preparation": {"count": 3, "p50_ms": 1.5, "p95_ms": 2.0, "max_ms": 2.0}},
+        }
+        db_session.commit()
+
+        response = client.get(f"/planilla/{planilla.id}/nomina/{nomina.id}/log")
+        assert response.status_code == 200
+        assert "Perfil de Ejecución".encode() in response.data
+        assert b"calculation" in response.data
+        assert b"preparation" in response.data
+
+
 def test_ver_log_nomina_wrong_planilla_redirects(app, client, admin_user, db_session, planilla, nomina):
     """Test that ver_log_nomina redirects if nomina doesn't belong to planilla."""
     with app.app_context():
@@ -159,6 +159,29 @@ def test_report_run_not_found(app, client, db_session, admin_user):
         assert response.status_code == 404
 
 
+def test_report_run_invalid_cursor_is_bad_request(app, client, db_session, admin_user):
+    """Test a tampered cursor is a client error and records no execution."""
+    with app.app_context():
+        from coati_payroll.enums import ReportStatus, ReportType
+        from coati_payroll.model import Report, ReportExecution
+
+        report = Report(
+            name="Cursor Report",
+            type=ReportType.CUSTOM,
+            status=ReportStatus.ENABLED,
+            base_entity="Employee",
+            definition={"columns": [{"type": "field", "entity": "Employee", "field": "primer_nombre"}]},
+        )
+        db_session.add(report)
+        db_session.commit()
+
+        login_user(client, admin_user.usuario, "admin-password")
+
+        response = client.post(f"/report/{report.id}/run", json={"cursor": "tampered"}, follow_redirects=False)
+        assert response.status_code == 400
+        assert db_session.query(ReportExecution).count() == 0
+
+
 def test_report_export_not_found(app, client, db_session, admin_user):
     """Test exporting a non-existent report."""
     with app.app_context():